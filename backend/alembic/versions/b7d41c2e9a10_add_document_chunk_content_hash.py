@@ -0,0 +1,66 @@
+"""Add indexed content_hash column to document_chunks
+
+Revision ID: b7d41c2e9a10
+Revises: e96259faffa3
+Create Date: 2026-10-16 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7d41c2e9a10'
+down_revision = 'e96259faffa3'
+branch_labels = None
+depends_on = None
+
+# Rows hashed per UPDATE, each committed separately
+BACKFILL_BATCH_SIZE = 5000
+
+
+def upgrade() -> None:
+    op.add_column('document_chunks', sa.Column('content_hash', sa.String(length=64), nullable=True))
+
+    # The column is committed before the backfill, which runs in autocommit
+    # mode so every batch commits (and drops its row locks) on its own; the
+    # index is then built CONCURRENTLY, without blocking chunk writes.
+    with op.get_context().autocommit_block():
+        # Backfill in bounded batches, walking the primary key so each batch is
+        # an index range scan. Uses pgcrypto (enabled in e96259faffa3); digest()
+        # over text hashes its UTF-8 bytes, matching compute_content_hash().
+        bind = op.get_bind()
+        backfill = sa.text("""
+            WITH batch AS (
+                SELECT id FROM document_chunks
+                WHERE id > :last_id
+                ORDER BY id
+                LIMIT :batch_size
+            )
+            UPDATE document_chunks AS chunk
+            SET content_hash = encode(digest(chunk.content, 'sha256'), 'hex')
+            FROM batch
+            WHERE chunk.id = batch.id
+            RETURNING chunk.id
+        """)
+        last_id = '00000000-0000-0000-0000-000000000000'
+        while True:
+            updated_ids = bind.execute(
+                backfill, {'last_id': last_id, 'batch_size': BACKFILL_BATCH_SIZE}
+            ).scalars().all()
+            if not updated_ids:
+                break
+            last_id = str(max(updated_ids))
+
+        op.create_index(
+            'ix_document_chunks_bot_id_content_hash',
+            'document_chunks',
+            ['bot_id', 'content_hash'],
+            unique=False,
+            postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_document_chunks_bot_id_content_hash', table_name='document_chunks')
+    op.drop_column('document_chunks', 'content_hash')
@@ -0,0 +1,27 @@
+"""Add minhash_signature column to document_chunks
+
+Revision ID: c4e8a1f2b3d5
+Revises: b7d41c2e9a10
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4e8a1f2b3d5'
+down_revision = 'b7d41c2e9a10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # New chunks get a signature on insert. Existing rows are left NULL and
+    # signed in batches by ChunkDeduplicationService the first time their bot
+    # is audited, since MinHash cannot be computed in SQL.
+    op.add_column('document_chunks', sa.Column('minhash_signature', sa.LargeBinary(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('document_chunks', 'minhash_signature')
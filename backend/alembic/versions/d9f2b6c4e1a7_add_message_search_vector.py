@@ -0,0 +1,91 @@
+"""Add full-text search vector and indexes to messages
+
+Revision ID: d9f2b6c4e1a7
+Revises: c4e8a1f2b3d5
+Create Date: 2026-10-16 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'd9f2b6c4e1a7'
+down_revision = 'c4e8a1f2b3d5'
+branch_labels = None
+depends_on = None
+
+# Rows indexed per UPDATE; each UPDATE commits on its own
+BACKFILL_BATCH_SIZE = 5000
+
+# Must match MESSAGE_SEARCH_CONFIG in src/models/conversation.py
+SEARCH_CONFIG = 'pg_catalog.english'
+
+
+def upgrade() -> None:
+    op.add_column('messages', sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True))
+
+    # Keep the vector in step with content for every row written from now on,
+    # including rows inserted while the backfill below runs
+    op.execute(f"""
+        CREATE TRIGGER messages_search_vector_update
+        BEFORE INSERT OR UPDATE OF content ON messages
+        FOR EACH ROW EXECUTE FUNCTION
+        tsvector_update_trigger(search_vector, '{SEARCH_CONFIG}', content)
+    """)
+
+    # Commit the column and trigger (ADD COLUMN without a default only touches
+    # the catalog), then run the rest in autocommit mode: each backfill batch
+    # is its own transaction, so its row locks are released as it finishes,
+    # and the indexes are built CONCURRENTLY while messages stay writable
+    with op.get_context().autocommit_block():
+        # Backfill existing rows in bounded batches, walking the primary key so
+        # each batch is an index range scan
+        bind = op.get_bind()
+        backfill = sa.text(f"""
+            WITH batch AS (
+                SELECT id FROM messages
+                WHERE id > :last_id
+                ORDER BY id
+                LIMIT :batch_size
+            )
+            UPDATE messages AS message
+            SET search_vector = to_tsvector('{SEARCH_CONFIG}', message.content)
+            FROM batch
+            WHERE message.id = batch.id
+            RETURNING message.id
+        """)
+        last_id = '00000000-0000-0000-0000-000000000000'
+        while True:
+            updated_ids = bind.execute(
+                backfill, {'last_id': last_id, 'batch_size': BACKFILL_BATCH_SIZE}
+            ).scalars().all()
+            if not updated_ids:
+                break
+            last_id = str(max(updated_ids))
+
+        op.create_index(
+            'ix_messages_search_vector',
+            'messages',
+            ['search_vector'],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_concurrently=True
+        )
+        # Lets newest-first searches for common terms walk the index instead of
+        # sorting every match
+        op.create_index(
+            'ix_messages_created_at_id',
+            'messages',
+            ['created_at', 'id'],
+            unique=False,
+            postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_messages_created_at_id', table_name='messages')
+    op.drop_index('ix_messages_search_vector', table_name='messages')
+    op.execute("DROP TRIGGER IF EXISTS messages_search_vector_update ON messages")
+    op.drop_column('messages', 'search_vector')
@@ -0,0 +1,106 @@
+"""Add daily bot usage rollup tables
+
+Revision ID: e1a5c7d9b3f2
+Revises: d9f2b6c4e1a7
+Create Date: 2026-10-16 18:00:00.000000
+
+"""
+from datetime import datetime, timedelta, timezone
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'e1a5c7d9b3f2'
+down_revision = 'd9f2b6c4e1a7'
+branch_labels = None
+depends_on = None
+
+# Days of messages rolled up per INSERT so the backfill stays in bounded scans
+BACKFILL_BATCH_DAYS = 31
+
+# Same aggregation as UsageRollupService._aggregate_messages
+ROLL_UP = sa.text(r"""
+    INSERT INTO bot_usage_daily (
+        bot_id, day, user_id, role, message_count, tokens_sum, latency_sum, latency_count
+    )
+    SELECT bot_id,
+           CAST(timezone('UTC', created_at) AS date) AS day,
+           user_id,
+           role,
+           count(*),
+           coalesce(sum(CASE WHEN tokens ~ '^-?[0-9]+(\.[0-9]+)?([eE][-+]?[0-9]+)?$'
+                             THEN CAST(tokens AS numeric) END), 0),
+           coalesce(sum(CASE WHEN latency ~ '^-?[0-9]+(\.[0-9]+)?([eE][-+]?[0-9]+)?$'
+                             THEN CAST(latency AS numeric) END), 0),
+           count(CASE WHEN latency ~ '^-?[0-9]+(\.[0-9]+)?([eE][-+]?[0-9]+)?$' THEN 1 END)
+    FROM (
+        SELECT bot_id, created_at, user_id, role,
+               json_extract_path_text(message_metadata, 'tokens_used') AS tokens,
+               json_extract_path_text(message_metadata, 'response_time') AS latency
+        FROM messages
+        WHERE created_at >= :start AND created_at < :end
+    ) AS batch
+    GROUP BY 1, 2, 3, 4
+""")
+
+
+def upgrade() -> None:
+    op.create_table('bot_usage_daily',
+    sa.Column('bot_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('role', sa.String(length=20), nullable=False),
+    sa.Column('message_count', sa.Integer(), nullable=False),
+    sa.Column('tokens_sum', sa.BigInteger(), nullable=False),
+    sa.Column('latency_sum', sa.Float(), nullable=False),
+    sa.Column('latency_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['bot_id'], ['bots.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('bot_id', 'day', 'user_id', 'role')
+    )
+    op.create_index('ix_bot_usage_daily_day', 'bot_usage_daily', ['day'], unique=False)
+    op.create_index('ix_bot_usage_daily_user_id_day', 'bot_usage_daily', ['user_id', 'day'], unique=False)
+
+    op.create_table('usage_rollup_state',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('rolled_up_until', sa.Date(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+    # Per-session message counts on the dashboard read messages by session
+    op.create_index(
+        'ix_messages_session_id_created_at', 'messages', ['session_id', 'created_at'], unique=False
+    )
+
+    # Backfill every completed UTC day in bounded batches; today and later
+    # are read raw until the application compacts them
+    bind = op.get_bind()
+    today = datetime.now(timezone.utc).date()
+    first = bind.execute(
+        sa.text("SELECT min(CAST(timezone('UTC', created_at) AS date)) FROM messages")
+    ).scalar()
+    day = first or today
+    while day < today:
+        batch_end = min(today, day + timedelta(days=BACKFILL_BATCH_DAYS))
+        bind.execute(ROLL_UP, {
+            'start': datetime.combine(day, datetime.min.time(), tzinfo=timezone.utc),
+            'end': datetime.combine(batch_end, datetime.min.time(), tzinfo=timezone.utc),
+        })
+        day = batch_end
+
+    bind.execute(
+        sa.text("INSERT INTO usage_rollup_state (id, rolled_up_until) VALUES (1, :day)"),
+        {'day': today}
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_messages_session_id_created_at', table_name='messages')
+    op.drop_table('usage_rollup_state')
+    op.drop_index('ix_bot_usage_daily_user_id_day', table_name='bot_usage_daily')
+    op.drop_index('ix_bot_usage_daily_day', table_name='bot_usage_daily')
+    op.drop_table('bot_usage_daily')
@@ -0,0 +1,118 @@
+"""Store document-level metadata once on documents and compact chunk metadata
+
+Revision ID: f3b8d2a6c9e4
+Revises: e1a5c7d9b3f2
+Create Date: 2026-10-16 20:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3b8d2a6c9e4'
+down_revision = 'e1a5c7d9b3f2'
+branch_labels = None
+depends_on = None
+
+# Rows rewritten per UPDATE statement
+BACKFILL_BATCH_SIZE = 5000
+
+# Must match DOCUMENT_LEVEL_METADATA_KEYS in src/models/document.py
+DOCUMENT_LEVEL_KEYS = [
+    'document_id', 'bot_id', 'uploaded_by', 'filename', 'mime_type', 'file_size',
+    'text_length', 'extraction_metadata', 'chunking_metrics', 'optimization_report',
+    'chunking_config',
+]
+
+NIL_UUID = '00000000-0000-0000-0000-000000000000'
+
+
+def upgrade() -> None:
+    op.add_column('documents', sa.Column('document_metadata', postgresql.JSONB(), nullable=True))
+
+    # Only the new column is created in the migration transaction. Everything
+    # below runs in autocommit mode: the index is built CONCURRENTLY, and each
+    # UPDATE batch commits by itself, so no lock outlives its batch
+    with op.get_context().autocommit_block():
+        # Lets the per-document lookup below, and deleting a document's chunks,
+        # use an index instead of scanning document_chunks
+        op.create_index(
+            'ix_document_chunks_document_id_chunk_index',
+            'document_chunks',
+            ['document_id', 'chunk_index'],
+            unique=False,
+            postgresql_concurrently=True
+        )
+
+        bind = op.get_bind()
+
+        # Every chunk of a document carried the same copy; keep the first chunk's
+        # document-level keys on the document row
+        copy_to_documents = sa.text("""
+            WITH batch AS (
+                SELECT id FROM documents
+                WHERE id > :last_id
+                ORDER BY id
+                LIMIT :batch_size
+            )
+            UPDATE documents AS document
+            SET document_metadata = (
+                SELECT jsonb_object_agg(entry.key, entry.value)
+                FROM (
+                    SELECT chunk_metadata FROM document_chunks
+                    WHERE document_id = document.id AND chunk_metadata IS NOT NULL
+                    ORDER BY chunk_index
+                    LIMIT 1
+                ) AS first_chunk,
+                jsonb_each(first_chunk.chunk_metadata) AS entry
+                WHERE entry.key = ANY(CAST(:keys AS text[]))
+            )
+            FROM batch
+            WHERE document.id = batch.id
+            RETURNING document.id
+        """)
+        last_id = NIL_UUID
+        while True:
+            updated_ids = bind.execute(copy_to_documents, {
+                'last_id': last_id, 'batch_size': BACKFILL_BATCH_SIZE, 'keys': DOCUMENT_LEVEL_KEYS
+            }).scalars().all()
+            if not updated_ids:
+                break
+            last_id = str(max(updated_ids))
+
+        # Then strip those keys from the chunks, walking the primary key; rows
+        # without any of them are left untouched
+        compact_chunks = sa.text("""
+            WITH batch AS (
+                SELECT id FROM document_chunks
+                WHERE id > :last_id
+                ORDER BY id
+                LIMIT :batch_size
+            ), compacted AS (
+                UPDATE document_chunks AS chunk
+                SET chunk_metadata = chunk.chunk_metadata - CAST(:keys AS text[])
+                FROM batch
+                WHERE chunk.id = batch.id
+                  AND chunk.chunk_metadata ?| CAST(:keys AS text[])
+            )
+            SELECT id FROM batch ORDER BY id DESC LIMIT 1
+        """)
+        last_id = NIL_UUID
+        while True:
+            batch_last_id = bind.execute(compact_chunks, {
+                'last_id': last_id, 'batch_size': BACKFILL_BATCH_SIZE, 'keys': DOCUMENT_LEVEL_KEYS
+            }).scalar()
+            if batch_last_id is None:
+                break
+            last_id = str(batch_last_id)
+
+    # Vector payloads written before this revision keep their copies until
+    # the bot's documents are reprocessed
+
+
+def downgrade() -> None:
+    # Chunk metadata is not re-expanded; the copies were redundant
+    op.drop_index('ix_document_chunks_document_id_chunk_index', table_name='document_chunks')
+    op.drop_column('documents', 'document_metadata')
@@ -0,0 +1,135 @@
+"""
+Benchmark: time to first token for streamed versus buffered chat generation.
+
+Generates responses through LLMProviderService against an in-process mock
+provider (an httpx MockTransport speaking the OpenAI, OpenRouter, Anthropic and
+Gemini chat APIs) that emits one token every --token-delay seconds after a
+fixed --latency before the first one. Reports time to first token and total
+time for generate_response, where the first token is only seen with the whole
+response, and for stream_response, which yields each SSE delta as it arrives.
+
+Usage (from backend/):
+    SECRET_KEY=<32+ chars> python -m benchmarks.bench_chat_streaming --tokens 200
+"""
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import time
+
+import httpx
+
+from src.services.llm_service import LLMProviderService
+from src.services.providers import ChatMessage
+
+MODELS = {
+    "openai": "gpt-4o-mini",
+    "openrouter": "openai/gpt-4o-mini",
+    "anthropic": "claude-3-haiku-20240307",
+    "gemini": "gemini-1.5-flash",
+}
+
+
+class MockProvider:
+    """Chat API stand-in producing tokens at a fixed rate."""
+
+    def __init__(self, provider: str, tokens: int, latency: float, token_delay: float):
+        self.provider = provider
+        self.tokens = [f"tok{i} " for i in range(tokens)]
+        self.latency = latency
+        self.token_delay = token_delay
+
+    def _sse_event(self, token: str) -> str:
+        if self.provider == "anthropic":
+            event = {"type": "content_block_delta", "index": 0,
+                     "delta": {"type": "text_delta", "text": token}}
+            return f"event: content_block_delta\ndata: {json.dumps(event)}\n\n"
+        if self.provider == "gemini":
+            event = {"candidates": [{"content": {"role": "model", "parts": [{"text": token}]}}]}
+            return f"data: {json.dumps(event)}\n\n"
+        event = {"choices": [{"index": 0, "delta": {"content": token}}]}
+        return f"data: {json.dumps(event)}\n\n"
+
+    def _full_body(self) -> dict:
+        text = "".join(self.tokens)
+        if self.provider == "anthropic":
+            return {"content": [{"type": "text", "text": text}]}
+        if self.provider == "gemini":
+            return {"candidates": [{"content": {"parts": [{"text": text}]}}]}
+        return {"choices": [{"message": {"content": text}}]}
+
+    async def _stream(self):
+        await asyncio.sleep(self.latency)
+        for token in self.tokens:
+            yield self._sse_event(token).encode()
+            await asyncio.sleep(self.token_delay)
+        if self.provider == "anthropic":
+            yield b'event: message_stop\ndata: {"type": "message_stop"}\n\n'
+        elif self.provider != "gemini":
+            yield b"data: [DONE]\n\n"
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        payload = json.loads(request.content)
+        streaming = payload.get("stream") or "streamGenerateContent" in request.url.path
+        if streaming:
+            return httpx.Response(
+                200, headers={"content-type": "text/event-stream"}, content=self._stream()
+            )
+        await asyncio.sleep(self.latency + self.token_delay * len(self.tokens))
+        return httpx.Response(200, json=self._full_body())
+
+
+async def _run(args, streaming: bool) -> tuple:
+    mock = MockProvider(args.provider, args.tokens, args.latency, args.token_delay)
+    client = httpx.AsyncClient(transport=httpx.MockTransport(mock))
+    service = LLMProviderService(client)
+    messages = [
+        ChatMessage(role="system", content="You are a helpful assistant."),
+        ChatMessage(role="user", content="Tell me a story."),
+    ]
+    call = dict(provider=args.provider, model=MODELS[args.provider],
+                messages=messages, api_key="bench-key")
+    try:
+        start = time.perf_counter()
+        first_token = None
+        if streaming:
+            parts = []
+            async for delta in service.stream_response(**call):
+                if first_token is None:
+                    first_token = time.perf_counter() - start
+                parts.append(delta)
+            text = "".join(parts)
+        else:
+            text = await service.generate_response(**call)
+            first_token = time.perf_counter() - start
+        total = time.perf_counter() - start
+    finally:
+        await client.aclose()
+    assert text == "".join(mock.tokens)
+    return first_token, total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--provider", choices=sorted(MODELS), default="openai")
+    parser.add_argument("--tokens", type=int, default=200, help="tokens per response")
+    parser.add_argument("--latency", type=float, default=0.3, help="seconds before the first token")
+    parser.add_argument("--token-delay", type=float, default=0.01, help="seconds between tokens")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    print(
+        f"provider={args.provider} tokens={args.tokens} latency={args.latency}s "
+        f"token_delay={args.token_delay}s runs={args.runs}"
+    )
+    for name, streaming in (("buffered", False), ("streamed", True)):
+        results = [asyncio.run(_run(args, streaming)) for _ in range(args.runs)]
+        ttft = statistics.median(r[0] for r in results)
+        total = statistics.median(r[1] for r in results)
+        print(f"{name:>9}: time_to_first_token={ttft * 1000:8.1f}ms total={total * 1000:8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
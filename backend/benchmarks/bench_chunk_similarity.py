@@ -0,0 +1,117 @@
+"""
+Benchmark: chunk similarity detection runtime versus chunk count.
+
+Generates a synthetic corpus (random-word chunks, a tenth of them light edits
+of another chunk) and times the pairwise scan the deduplication service used
+to run over every chunk pair against MinHash/LSH candidate generation followed
+by the same exact scoring on candidates only. Signing is reported separately
+since signatures are computed once, when chunks are inserted. Runs in-process
+with ChunkDeduplicationService's scoring; no database is required.
+
+Usage (from backend/):
+    SECRET_KEY=<32+ chars> python -m benchmarks.bench_chunk_similarity --sizes 500,5000,20000
+"""
+import argparse
+import asyncio
+import hashlib
+import logging
+import random
+import time
+import uuid
+from types import SimpleNamespace
+
+from src.services.chunk_deduplication_service import ChunkDeduplicationService
+from src.utils.minhash import build_lsh_index, compute_minhash_signature, decode_signature
+
+
+def build_corpus(size: int, words_per_chunk: int, duplicate_ratio: float, seed: int = 0):
+    rng = random.Random(seed)
+    vocabulary = [
+        "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(2, 9)))
+        for _ in range(5000)
+    ]
+    texts = []
+    for _ in range(size):
+        if texts and rng.random() < duplicate_ratio:
+            words = rng.choice(texts).split()
+            for i in range(len(words)):
+                if rng.random() < 0.02:
+                    words[i] = rng.choice(vocabulary)
+        else:
+            words = [rng.choice(vocabulary) for _ in range(words_per_chunk)]
+        texts.append(" ".join(words))
+    return [
+        SimpleNamespace(
+            id=uuid.uuid4(),
+            content=text,
+            content_hash=hashlib.sha256(text.encode("utf-8")).hexdigest(),
+            chunk_metadata={},
+        )
+        for text in texts
+    ]
+
+
+async def _pairwise(service, chunks, threshold):
+    found = 0
+    for i, chunk1 in enumerate(chunks):
+        for chunk2 in chunks[i + 1:]:
+            if (await service._analyze_chunk_pair(chunk1, chunk2)).similarity_score >= threshold:
+                found += 1
+    return found
+
+
+async def _lsh(service, chunks, signatures, threshold):
+    by_id = {chunk.id: chunk for chunk in chunks}
+    pairs = build_lsh_index(signatures.items()).candidate_pairs()
+    found = 0
+    for chunk1_id, chunk2_id in pairs:
+        similarity = await service._analyze_chunk_pair(by_id[chunk1_id], by_id[chunk2_id])
+        if similarity.similarity_score >= threshold:
+            found += 1
+    return found, len(pairs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", default="200,500,1000,5000,20000")
+    parser.add_argument("--words", type=int, default=120, help="words per chunk")
+    parser.add_argument("--duplicate-ratio", type=float, default=0.1)
+    parser.add_argument("--threshold", type=float, default=0.95)
+    parser.add_argument(
+        "--max-pairwise", type=int, default=500,
+        help="largest corpus to run the all-pairs scan on"
+    )
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    service = ChunkDeduplicationService(db=None)
+    for size in [int(s) for s in args.sizes.split(",")]:
+        chunks = build_corpus(size, args.words, args.duplicate_ratio)
+
+        start = time.perf_counter()
+        signatures = {
+            chunk.id: decode_signature(compute_minhash_signature(chunk.content))
+            for chunk in chunks
+        }
+        sign_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        lsh_found, candidates = asyncio.run(_lsh(service, chunks, signatures, args.threshold))
+        lsh_s = time.perf_counter() - start
+
+        line = (
+            f"chunks={size:>6}: lsh={lsh_s:8.3f}s candidates={candidates:>6} "
+            f"found={lsh_found:>5} signing={sign_s:7.3f}s"
+        )
+        if size <= args.max_pairwise:
+            start = time.perf_counter()
+            pairwise_found = asyncio.run(_pairwise(service, chunks, args.threshold))
+            pairwise_s = time.perf_counter() - start
+            line += f" | pairwise={pairwise_s:8.3f}s found={pairwise_found:>5}"
+        else:
+            line += f" | pairwise skipped ({size * (size - 1) // 2} pairs)"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
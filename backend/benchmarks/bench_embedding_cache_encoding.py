@@ -0,0 +1,61 @@
+"""
+Benchmark: JSON vs. binary embedding encoding in the Redis embedding cache.
+
+Measures the stored size of the embedding field and the time to turn a cache
+hit back into a vector for the legacy JSON format and the binary float32 /
+float16 formats, using the same encode/decode functions as
+EmbeddingCacheService. Runs in-process; no Redis server is required.
+
+Usage (from backend/):
+    SECRET_KEY=<32+ chars> python -m benchmarks.bench_embedding_cache_encoding --dimension 1536
+"""
+import argparse
+import json
+import random
+import statistics
+import time
+
+from src.services.embedding_cache_service import (
+    EMBEDDING_FORMAT_JSON,
+    decode_embedding,
+    encode_embedding,
+)
+
+
+def _time_decode(raw, fmt, rounds: int, as_list: bool):
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        vector = decode_embedding(raw, fmt)
+        if as_list:
+            vector.tolist()
+        samples.append((time.perf_counter() - start) * 1_000_000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--dimension", type=int, default=1536)
+    parser.add_argument("--rounds", type=int, default=2000)
+    args = parser.parse_args()
+
+    embedding = [random.uniform(-1.0, 1.0) for _ in range(args.dimension)]
+    encodings = [("json", json.dumps(embedding).encode(), EMBEDDING_FORMAT_JSON)]
+    for dtype in ("float32", "float16"):
+        raw, fmt = encode_embedding(embedding, dtype)
+        encodings.append((dtype, raw, fmt))
+
+    print(f"dimension={args.dimension} rounds={args.rounds}")
+    for name, raw, fmt in encodings:
+        decoded = decode_embedding(raw, fmt)
+        max_error = max(abs(a - b) for a, b in zip(embedding, decoded.tolist()))
+        view_us = _time_decode(raw, fmt, args.rounds, as_list=False)
+        list_us = _time_decode(raw, fmt, args.rounds, as_list=True)
+        print(
+            f"{name:>8}: bytes/entry={len(raw):>6} decode={view_us:8.1f}us "
+            f"decode+tolist={list_us:8.1f}us max_abs_error={max_error:.2e}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Benchmark: embedding cache write latency as the cache grows.
+
+Fills an EmbeddingCacheService up to and past max_cache_size against a local
+Redis and reports p50/p99 cache_embedding latency per fill level, for the
+recency-index eviction and (with --legacy) the previous KEYS + per-key HGET
+scan. With the recency index, latency should stay flat as the cache grows.
+Keys use a run-specific prefix and are removed afterwards.
+
+Usage (from backend/, with Redis on localhost):
+    SECRET_KEY=<32+ chars> python -m benchmarks.bench_embedding_cache_eviction \\
+        --redis-url redis://localhost:6379/15 --max-size 20000 --legacy
+"""
+import argparse
+import asyncio
+import logging
+import random
+import statistics
+import time
+import uuid
+
+from src.services.embedding_cache_service import EmbeddingCacheService
+
+
+class KeysScanEvictionCache(EmbeddingCacheService):
+    """Previous eviction strategy: KEYS the prefix and HGET every entry's access time."""
+
+    async def _ensure_cache_space(self, incoming: int = 1):
+        cache_keys = await self.redis_client.keys(f"{self.cache_prefix}*")
+        if len(cache_keys) < self.max_cache_size:
+            return
+        pipe = self.redis_client.pipeline()
+        for key in cache_keys:
+            pipe.hget(key, 'last_accessed')
+        access_times = await pipe.execute()
+        oldest = sorted(
+            zip(cache_keys, access_times), key=lambda item: float(item[1] or 0.0)
+        )[:max(1, int(self.max_cache_size * self.eviction_batch_ratio))]
+        if oldest:
+            await self.redis_client.delete(*[key for key, _ in oldest])
+
+
+def _percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+async def _run(cache_class, redis_url: str, max_size: int, dimension: int, levels: int):
+    cache = cache_class(redis_url)
+    run_id = uuid.uuid4().hex[:8]
+    cache.cache_prefix = f"bench_embedding_cache:{run_id}:"
+    cache.stats_key = f"bench_embedding_cache_stats:{run_id}"
+    cache.expiry_key = f"bench_embedding_cache_index:{run_id}"
+    cache.max_cache_size = max_size
+    await cache.initialize()
+
+    embedding = [random.uniform(-1.0, 1.0) for _ in range(dimension)]
+    # Write up to 1.5x capacity so the last levels run with eviction active
+    total = int(max_size * 1.5)
+    per_level = total // levels
+    report = []
+    try:
+        written = 0
+        for level in range(levels):
+            latencies = []
+            for _ in range(per_level):
+                start = time.perf_counter()
+                await cache.cache_embedding(f"text {written}", "bench", "bench-model", embedding)
+                latencies.append((time.perf_counter() - start) * 1000)
+                written += 1
+            report.append((written, statistics.median(latencies), _percentile(latencies, 99)))
+    finally:
+        await cache.clear_cache()
+        await cache.redis_client.delete(cache.stats_key, cache.expiry_key)
+        await cache.close()
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--redis-url", default="redis://localhost:6379/15")
+    parser.add_argument("--max-size", type=int, default=20000)
+    parser.add_argument("--dimension", type=int, default=768)
+    parser.add_argument("--levels", type=int, default=6)
+    parser.add_argument("--legacy", action="store_true", help="also run the KEYS-based eviction")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    modes = [("recency_index", EmbeddingCacheService)]
+    if args.legacy:
+        modes.append(("keys_scan", KeysScanEvictionCache))
+    for name, cache_class in modes:
+        report = asyncio.run(
+            _run(cache_class, args.redis_url, args.max_size, args.dimension, args.levels)
+        )
+        for written, p50, p99 in report:
+            print(f"{name:>13}: entries_written={written:>7} p50={p50:.3f}ms p99={p99:.3f}ms")
+
+
+if __name__ == "__main__":
+    main()
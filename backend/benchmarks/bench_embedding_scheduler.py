@@ -0,0 +1,119 @@
+"""
+Benchmark: embedding throughput through EmbeddingProviderService.
+
+Embeds N chunks against an in-process mock provider (an httpx MockTransport
+that answers the OpenAI /embeddings and Gemini batchEmbedContents endpoints
+after a fixed per-request latency, and returns 429 with Retry-After once a
+per-second request quota is exceeded). Runs the batches one at a time, as the
+service used to, and then with the default scheduler limits, reporting
+chunks/sec and the number of 429s seen.
+
+Usage (from backend/):
+    SECRET_KEY=<32+ chars> python -m benchmarks.bench_embedding_scheduler --chunks 10000
+"""
+import argparse
+import asyncio
+import json
+import logging
+import time
+
+import httpx
+
+from src.services.embedding_scheduler import (
+    DEFAULT_PROVIDER_LIMITS,
+    EmbeddingScheduler,
+    ProviderLimits,
+)
+from src.services.embedding_service import EmbeddingProviderService
+
+MODELS = {"openai": "text-embedding-3-small", "gemini": "text-embedding-004"}
+
+
+class MockProvider:
+    """Embedding API stand-in with fixed latency and a per-second request quota."""
+
+    def __init__(self, latency: float, quota: int, dimension: int):
+        self.latency = latency
+        self.quota = quota
+        self.dimension = dimension
+        self.window_start = 0.0
+        self.window_requests = 0
+        self.requests = 0
+        self.rate_limited = 0
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        now = time.monotonic()
+        if now - self.window_start >= 1.0:
+            self.window_start = now
+            self.window_requests = 0
+        self.window_requests += 1
+        if self.window_requests > self.quota:
+            self.rate_limited += 1
+            retry_after = max(0.0, 1.0 - (now - self.window_start))
+            return httpx.Response(429, headers={"Retry-After": f"{retry_after:.3f}"})
+
+        await asyncio.sleep(self.latency)
+        payload = json.loads(request.content)
+        vector = [0.0] * self.dimension
+        if request.url.path.endswith(":batchEmbedContents"):
+            return httpx.Response(
+                200, json={"embeddings": [{"values": vector} for _ in payload["requests"]]}
+            )
+        return httpx.Response(
+            200,
+            json={"data": [
+                {"index": i, "embedding": vector} for i in range(len(payload["input"]))
+            ]},
+        )
+
+
+async def _run(provider: str, limits: ProviderLimits, args) -> tuple:
+    mock = MockProvider(args.latency, args.quota, args.dimension)
+    client = httpx.AsyncClient(transport=httpx.MockTransport(mock))
+    service = EmbeddingProviderService(
+        client, scheduler=EmbeddingScheduler({provider: limits})
+    )
+    service.retry_delay = 0.1
+    texts = [f"chunk {i} of the benchmark corpus" for i in range(args.chunks)]
+    try:
+        start = time.perf_counter()
+        embeddings = await service.generate_embeddings(
+            provider, texts, MODELS[provider], api_key="bench-key", batch_size=args.batch_size
+        )
+        elapsed = time.perf_counter() - start
+    finally:
+        await client.aclose()
+    assert len(embeddings) == len(texts)
+    return elapsed, mock.requests, mock.rate_limited
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--provider", choices=sorted(MODELS), default="openai")
+    parser.add_argument("--chunks", type=int, default=10000)
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.2, help="seconds per mock request")
+    parser.add_argument("--quota", type=int, default=30, help="mock requests allowed per second")
+    parser.add_argument("--dimension", type=int, default=1536)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    print(
+        f"provider={args.provider} chunks={args.chunks} batch_size={args.batch_size} "
+        f"latency={args.latency}s quota={args.quota}/s"
+    )
+    modes = [
+        ("sequential", ProviderLimits(max_concurrency=1, requests_per_second=1000.0, burst=1000)),
+        ("scheduled", DEFAULT_PROVIDER_LIMITS[args.provider]),
+    ]
+    for name, limits in modes:
+        elapsed, requests, rate_limited = asyncio.run(_run(args.provider, limits, args))
+        print(
+            f"{name:>10}: {args.chunks / elapsed:8.1f} chunks/sec elapsed={elapsed:.2f}s "
+            f"requests={requests} rate_limited={rate_limited}"
+        )
+
+
+if __name__ == "__main__":
+    main()
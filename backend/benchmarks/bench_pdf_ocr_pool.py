@@ -0,0 +1,78 @@
+"""
+Benchmark: OCR throughput of PDF extraction versus OCR worker count.
+
+Builds a synthetic scanned PDF (each page is a single image of rendered text,
+with no text layer) and extracts it with DocumentExtractor for each worker
+count, reporting pages/sec. Requires the tesseract binary.
+
+Usage (from backend/):
+    SECRET_KEY=<32+ chars> python -m benchmarks.bench_pdf_ocr_pool --pages 40
+"""
+import argparse
+import io
+import logging
+import os
+import time
+
+import fitz
+import pytesseract
+from PIL import Image, ImageDraw
+
+from src.core.ocr_config import ocr_settings
+from src.utils.ocr_workers import shutdown_ocr_pool
+from src.utils.text_processing import DocumentExtractor
+
+
+def build_scanned_pdf(pages: int) -> bytes:
+    """Create a PDF whose pages are images of text, as a scanner would produce."""
+    document = fitz.open()
+    for page_num in range(pages):
+        image = Image.new("L", (1240, 1754), color=255)
+        draw = ImageDraw.Draw(image)
+        for line in range(40):
+            draw.text(
+                (80, 80 + line * 40),
+                f"Page {page_num + 1} line {line + 1}: the quick brown fox jumps over the lazy dog",
+                fill=0,
+            )
+        buffer = io.BytesIO()
+        image.save(buffer, format="PNG")
+        page = document.new_page(width=595, height=842)
+        page.insert_image(page.rect, stream=buffer.getvalue())
+    data = document.tobytes()
+    document.close()
+    return data
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pages", type=int, default=40)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    try:
+        pytesseract.get_tesseract_version()
+    except Exception as e:
+        raise SystemExit(f"tesseract is required for this benchmark: {e}")
+
+    logging.disable(logging.CRITICAL)
+    pdf = build_scanned_pdf(args.pages)
+    print(f"pages={args.pages} cpu_count={os.cpu_count()} pdf_bytes={len(pdf)}")
+
+    worker_counts = sorted({1, 2, 4, 8, args.max_workers} & set(range(1, args.max_workers + 1)))
+    for workers in worker_counts:
+        shutdown_ocr_pool()
+        ocr_settings.ocr_max_workers = workers
+        extractor = DocumentExtractor(enable_ocr=True)
+        start = time.perf_counter()
+        text, metadata = extractor.extract_text(pdf, "application/pdf", "scanned.pdf")
+        elapsed = time.perf_counter() - start
+        print(
+            f"workers={workers:>2}: {args.pages / elapsed:6.2f} pages/sec "
+            f"elapsed={elapsed:.2f}s ocr_pages={len(metadata['ocr_pages'])} chars={len(text)}"
+        )
+    shutdown_ocr_pool()
+
+
+if __name__ == "__main__":
+    main()
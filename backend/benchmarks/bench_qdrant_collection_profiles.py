@@ -0,0 +1,130 @@
+"""
+Benchmark: recall, latency and memory of the Qdrant collection profiles.
+
+For each profile, creates a collection with the default (small) profile,
+seeds it with clustered random vectors through QdrantVectorStore, then moves
+it to the profile with apply_collection_profile, the online reconfigure
+VectorCollectionManager.optimize_collection uses, and waits for Qdrant to
+finish re-indexing. It then reports recall@k of search_similar against an
+exact search, p50/p95 search latency, and the RAM the profile needs for
+vectors, quantized vectors and the HNSW graph (estimated from the
+configuration, since Qdrant reports no per-collection memory).
+
+Needs a Qdrant server; embedded Qdrant ignores quantization and on-disk
+settings.
+
+Usage (from backend/):
+    docker run -p 6333:6333 qdrant/qdrant
+    SECRET_KEY=<32+ chars> python -m benchmarks.bench_qdrant_collection_profiles --points 50000
+"""
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import time
+import uuid
+
+import numpy as np
+from qdrant_client import QdrantClient, models
+
+from src.services.qdrant_collection_profiles import COLLECTION_PROFILES, CollectionProfile
+from src.services.vector_store import QdrantVectorStore
+
+
+def _dataset(points: int, queries: int, dimension: int, rng: np.random.Generator):
+    centers = rng.normal(size=(max(1, points // 500), dimension))
+    vectors = centers[rng.integers(len(centers), size=points)] + rng.normal(scale=0.6, size=(points, dimension))
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    probes = vectors[rng.integers(points, size=queries)] + rng.normal(scale=0.3, size=(queries, dimension))
+    return vectors.astype(np.float32), probes.astype(np.float32)
+
+
+def _ram_bytes(profile: CollectionProfile, points: int, dimension: int) -> int:
+    vectors = 0 if profile.vectors_on_disk else points * dimension * 4
+    quantization = profile.quantization_type(dimension)
+    quantized = {"scalar": points * dimension, "binary": points * dimension // 8}.get(quantization, 0)
+    # Level-0 links dominate: 2 * m neighbour ids of 4 bytes per point
+    graph = 0 if profile.hnsw_on_disk else points * profile.hnsw_m * 2 * 4
+    return vectors + quantized + graph
+
+
+def _wait_until_indexed(client: QdrantClient, collection: str, timeout: float = 600.0) -> float:
+    start = time.perf_counter()
+    while time.perf_counter() - start < timeout:
+        info = client.get_collection(collection)
+        if info.status == models.CollectionStatus.GREEN:
+            return time.perf_counter() - start
+        time.sleep(0.5)
+    raise TimeoutError(f"{collection} still indexing after {timeout:.0f}s")
+
+
+async def _run(profile: CollectionProfile, args, vectors, probes, client: QdrantClient):
+    bot_id = f"profile_{profile.name}"
+    store = QdrantVectorStore(url=args.qdrant_url)
+    collection = store._get_collection_name(bot_id)
+    try:
+        await store.delete_collection(bot_id)
+        await store.create_collection(bot_id, args.dimension)
+        for start in range(0, len(vectors), 5000):
+            batch = vectors[start:start + 5000]
+            await store.store_embeddings(
+                bot_id,
+                batch.tolist(),
+                [""] * len(batch),
+                [{"document_id": str(uuid.uuid4()), "chunk_index": 0} for _ in batch],
+                [str(uuid.uuid4()) for _ in batch],
+            )
+        _wait_until_indexed(client, collection)
+
+        applied = await store.apply_collection_profile(bot_id, profile)
+        reindex_time = _wait_until_indexed(client, collection)
+
+        bot_filter = models.Filter(must=[
+            models.FieldCondition(key="bot_id", match=models.MatchValue(value=bot_id))
+        ])
+        latencies = []
+        recalls = []
+        for probe in probes:
+            query = probe.tolist()
+            exact = client.query_points(
+                collection, query=query, limit=args.top_k, query_filter=bot_filter,
+                search_params=models.SearchParams(exact=True)
+            ).points
+            start = time.perf_counter()
+            results = await store.search_similar(bot_id, query, top_k=args.top_k)
+            latencies.append((time.perf_counter() - start) * 1000)
+            expected = {str(point.id) for point in exact}
+            recalls.append(len(expected & {result["id"] for result in results}) / len(expected))
+    finally:
+        await store.delete_collection(bot_id)
+        await store.close()
+
+    latencies.sort()
+    print(
+        f"{profile.name:>8}: recall@{args.top_k} {statistics.mean(recalls):.3f}, "
+        f"latency p50 {latencies[len(latencies) // 2]:.2f}ms / p95 {latencies[int(len(latencies) * 0.95)]:.2f}ms, "
+        f"est. RAM {_ram_bytes(profile, len(vectors), args.dimension) / 2**20:,.1f} MiB, "
+        f"re-index {reindex_time:.1f}s, applied {applied or 'nothing'}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--qdrant-url", default=os.getenv("BENCH_QDRANT_URL", "http://localhost:6333"))
+    parser.add_argument("--points", type=int, default=50000)
+    parser.add_argument("--dimension", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--profiles", nargs="+", default=list(COLLECTION_PROFILES), choices=list(COLLECTION_PROFILES))
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    vectors, probes = _dataset(args.points, args.queries, args.dimension, np.random.default_rng(7))
+    client = QdrantClient(url=args.qdrant_url)
+    for name in args.profiles:
+        asyncio.run(_run(COLLECTION_PROFILES[name], args, vectors, probes, client))
+
+
+if __name__ == "__main__":
+    main()
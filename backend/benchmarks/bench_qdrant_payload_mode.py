@@ -0,0 +1,164 @@
+"""
+Benchmark: full vs id-only Qdrant point payloads.
+
+Seeds the same chunks into one collection per payload mode through
+QdrantVectorStore, then reports for each mode the payload bytes Qdrant holds
+(the part of its memory the mode changes), the size of a top-k search
+response, and end-to-end retrieval latency through
+VectorService.search_relevant_chunks, including text hydration from the
+chunk text cache with a cold and a warm cache. The cache loader emulates the
+batched document_chunks query with a fixed round-trip.
+
+Runs against an embedded in-memory Qdrant unless --qdrant-url is given.
+
+Usage (from backend/):
+    SECRET_KEY=<32+ chars> python -m benchmarks.bench_qdrant_payload_mode --chunks 5000 --top-k 5
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import statistics
+import time
+import uuid
+
+from qdrant_client import QdrantClient, models
+
+from src.services.chunk_text_cache import ChunkTextCache
+from src.services.vector_store import AsyncQdrantConnectionPool, PAYLOAD_MODES, QdrantVectorStore, VectorService
+
+
+class _EmbeddedPool(AsyncQdrantConnectionPool):
+    """Pool handing out one shared embedded client instead of connecting."""
+
+    def __init__(self, client: QdrantClient):
+        super().__init__(":memory:", max_connections=1)
+        self._client = client
+
+    async def _create_connection(self) -> QdrantClient:
+        return self._client
+
+    def _close_connection(self, connection: QdrantClient):
+        # The embedded client outlives the store; main() owns it
+        pass
+
+
+def _make_store(mode: str, url: str, client: QdrantClient) -> QdrantVectorStore:
+    store = QdrantVectorStore(url=url if url != ":memory:" else None, payload_mode=mode)
+    if url == ":memory:":
+        store._connection_pool = _EmbeddedPool(client)
+    return store
+
+
+def _chunks(count: int, dimension: int, rng: random.Random):
+    words = ["retrieval", "vector", "document", "policy", "invoice", "customer", "support", "account"]
+    document_ids = [str(uuid.uuid4()) for _ in range(max(1, count // 50))]
+    chunks = []
+    for i in range(count):
+        text = " ".join(rng.choice(words) for _ in range(rng.randint(120, 220)))
+        chunks.append({
+            "id": str(uuid.uuid4()),
+            "embedding": [rng.uniform(-1, 1) for _ in range(dimension)],
+            "text": text,
+            "metadata": {
+                "document_id": document_ids[i % len(document_ids)],
+                "chunk_index": i // len(document_ids),
+                "start_offset": 0,
+                "end_offset": len(text),
+                "page_start": 1,
+                "page_end": 1,
+            },
+        })
+    return chunks
+
+
+def _payload_bytes(client: QdrantClient, collection: str) -> int:
+    total = 0
+    offset = None
+    while True:
+        points, offset = client.scroll(collection, limit=1000, offset=offset, with_payload=True)
+        total += sum(len(json.dumps(point.payload)) for point in points)
+        if offset is None:
+            return total
+
+
+async def _search(service: VectorService, bot_id: str, queries, top_k: int):
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        results = await service.search_relevant_chunks(bot_id, query, top_k=top_k)
+        latencies.append((time.perf_counter() - start) * 1000)
+        assert len(results) == top_k and all(result["text"] for result in results)
+    return latencies
+
+
+async def _run(mode: str, args, chunks, queries, client: QdrantClient):
+    texts = {chunk["id"]: chunk["text"] for chunk in chunks}
+
+    def load(chunk_ids):
+        time.sleep(args.lookup_latency_ms / 1000)
+        return {chunk_id: texts[chunk_id] for chunk_id in chunk_ids if chunk_id in texts}
+
+    bot_id = f"payload_{mode}"
+    store = _make_store(mode, args.qdrant_url, client)
+    cache = ChunkTextCache(loader=load)
+    service = VectorService(vector_store=store, chunk_texts=cache)
+    collection = store._get_collection_name(bot_id)
+    # Collection management uses unpooled clients; set up through ours
+    if client.collection_exists(collection):
+        client.delete_collection(collection)
+    client.create_collection(
+        collection, vectors_config=models.VectorParams(size=args.dimension, distance=models.Distance.COSINE)
+    )
+    try:
+        await store.store_embeddings(
+            bot_id,
+            [chunk["embedding"] for chunk in chunks],
+            [chunk["text"] for chunk in chunks],
+            [chunk["metadata"] for chunk in chunks],
+            [chunk["id"] for chunk in chunks],
+        )
+        payload_bytes = _payload_bytes(client, collection)
+
+        raw = await store.search_similar(bot_id, queries[0], top_k=args.top_k)
+        response_bytes = len(json.dumps(raw))
+
+        cold = await _search(service, bot_id, queries, args.top_k)
+        warm = await _search(service, bot_id, queries, args.top_k)
+    finally:
+        client.delete_collection(collection)
+        await store.close()
+
+    print(
+        f"{mode:>8}: payloads {payload_bytes / 1024:,.0f} KiB, "
+        f"search response {response_bytes:,} B, "
+        f"latency p50 cold {statistics.median(cold):.2f}ms / warm {statistics.median(warm):.2f}ms, "
+        f"text loads {cache.loads}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--qdrant-url", default=os.getenv("BENCH_QDRANT_URL", ":memory:"))
+    parser.add_argument("--chunks", type=int, default=5000)
+    parser.add_argument("--dimension", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument(
+        "--lookup-latency-ms", type=float, default=1.0, help="emulated document_chunks round-trip"
+    )
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    rng = random.Random(7)
+    chunks = _chunks(args.chunks, args.dimension, rng)
+    queries = [[rng.uniform(-1, 1) for _ in range(args.dimension)] for _ in range(args.queries)]
+    client = QdrantClient(location=args.qdrant_url) if args.qdrant_url == ":memory:" else QdrantClient(url=args.qdrant_url)
+    for mode in PAYLOAD_MODES:
+        asyncio.run(_run(mode, args, chunks, queries, client))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Benchmark: per-request ChatService construction vs. the process-wide ServiceContainer.
+
+Simulates N chat requests arriving at a worker, each binding a fresh database
+session, and reports p50/p99 setup latency together with the resources left
+open afterwards (file descriptors/sockets, threads, live asyncio tasks) and the
+number of httpx clients created. No external services are required: Redis/Qdrant
+connections fail fast and are only attempted by background initialization.
+
+Usage (from backend/):
+    SECRET_KEY=<32+ chars> python -m benchmarks.bench_service_container --requests 200
+"""
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import threading
+import time
+
+import httpx
+
+from src.core.database import SessionLocal
+from src.services.chat_service import ChatService
+from src.services.service_container import ServiceContainer
+
+
+def _open_descriptors():
+    """Return (fds, sockets) currently open by this process."""
+    fd_dir = "/proc/self/fd"
+    if not os.path.isdir(fd_dir):
+        return -1, -1
+    fds = sockets = 0
+    for fd in os.listdir(fd_dir):
+        fds += 1
+        try:
+            if os.readlink(os.path.join(fd_dir, fd)).startswith("socket:"):
+                sockets += 1
+        except OSError:
+            pass
+    return fds, sockets
+
+
+_http_clients_created = 0
+_original_client_init = httpx.AsyncClient.__init__
+
+
+def _counting_client_init(self, *args, **kwargs):
+    global _http_clients_created
+    _http_clients_created += 1
+    _original_client_init(self, *args, **kwargs)
+
+
+httpx.AsyncClient.__init__ = _counting_client_init
+
+
+def _percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def _run(mode: str, requests: int):
+    global _http_clients_created
+    _http_clients_created = 0
+    container = ServiceContainer() if mode == "container" else None
+    if container:
+        await container.startup()
+
+    latencies = []
+    for _ in range(requests):
+        db = SessionLocal()
+        start = time.perf_counter()
+        if container:
+            service = container.create_chat_service(db)
+        else:
+            service = ChatService(db)
+        latencies.append((time.perf_counter() - start) * 1000)
+        del service
+        db.close()
+        # Let scheduled background initialization run, as it would between requests
+        await asyncio.sleep(0)
+
+    await asyncio.sleep(0.2)
+    fds, sockets = _open_descriptors()
+    report = {
+        "mode": mode,
+        "requests": requests,
+        "p50_ms": statistics.median(latencies),
+        "p99_ms": _percentile(latencies, 99),
+        "open_fds": fds,
+        "open_sockets": sockets,
+        "threads": threading.active_count(),
+        "asyncio_tasks": len(asyncio.all_tasks()) - 1,
+        "http_clients_created": _http_clients_created,
+    }
+
+    if container:
+        await container.shutdown()
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    for mode in ("per_request", "container"):
+        report = asyncio.run(_run(mode, args.requests))
+        print(
+            f"{report['mode']:>12}: p50={report['p50_ms']:.2f}ms p99={report['p99_ms']:.2f}ms "
+            f"fds={report['open_fds']} sockets={report['open_sockets']} "
+            f"threads={report['threads']} tasks={report['asyncio_tasks']} "
+            f"http_clients_created={report['http_clients_created']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
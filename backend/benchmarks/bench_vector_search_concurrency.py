@@ -0,0 +1,74 @@
+"""
+Benchmark: concurrent vector searches against a local Qdrant stand-in.
+
+Compares the previous search path (a new synchronous QdrantClient per query,
+called directly on the event loop) with QdrantVectorStore.search_similar,
+which runs on pooled clients in an executor with per-operation timeouts.
+With a blocking path, N concurrent queries take ~N round-trips; with the
+pooled path they overlap up to the pool size.
+
+Usage (from backend/):
+    SECRET_KEY=<32+ chars> python -m benchmarks.bench_vector_search_concurrency --queries 20
+"""
+import argparse
+import asyncio
+import logging
+import time
+
+from qdrant_client import QdrantClient
+
+from src.services.vector_store import QdrantVectorStore
+from benchmarks.qdrant_standin import QdrantStandIn
+
+
+BOT_ID = "benchmark"
+
+
+async def _blocking_search(url: str, query):
+    client = QdrantClient(url=url)
+    return client.query_points(collection_name=f"bot_{BOT_ID}", query=query, limit=5).points
+
+
+async def _run(mode: str, url: str, queries: int, max_connections: int) -> float:
+    query = [0.1] * 8
+    store = QdrantVectorStore(url=url, max_connections=max_connections)
+    try:
+        if mode == "pooled":
+            # Warm the pool as a long-lived worker would be
+            await asyncio.gather(*[
+                store.search_similar(BOT_ID, query, top_k=5) for _ in range(max_connections)
+            ])
+        start = time.perf_counter()
+        if mode == "blocking":
+            results = await asyncio.gather(*[_blocking_search(url, query) for _ in range(queries)])
+        else:
+            results = await asyncio.gather(*[
+                store.search_similar(BOT_ID, query, top_k=5) for _ in range(queries)
+            ])
+        elapsed = time.perf_counter() - start
+        assert all(len(r) == 5 for r in results)
+        return elapsed
+    finally:
+        await store.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.05, help="stand-in round-trip in seconds")
+    parser.add_argument("--max-connections", type=int, default=10)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    with QdrantStandIn(latency=args.latency) as standin:
+        standin.collections.add(f"bot_{BOT_ID}")
+        for mode in ("blocking", "pooled"):
+            elapsed = asyncio.run(_run(mode, standin.url, args.queries, args.max_connections))
+            print(
+                f"{mode:>8}: {args.queries} concurrent queries in {elapsed:.3f}s "
+                f"({args.queries / elapsed:.1f} q/s, round-trip {args.latency * 1000:.0f}ms)"
+            )
+
+
+if __name__ == "__main__":
+    main()
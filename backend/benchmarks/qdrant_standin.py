@@ -0,0 +1,149 @@
+"""
+Minimal in-process stand-in for the Qdrant REST API used by benchmarks.
+
+Serves just enough of the API for QdrantClient to check collections, read
+collection info and run point queries, with a configurable per-request latency
+to emulate a network round-trip. Each request is handled on its own thread, so
+concurrent clients are not serialized by the stand-in itself.
+"""
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class QdrantStandIn:
+    """Threaded HTTP server emulating a handful of Qdrant endpoints."""
+
+    def __init__(self, latency: float = 0.05, dimension: int = 8, points: int = 5):
+        self.latency = latency
+        self.dimension = dimension
+        self.points = points
+        self.collections = set()
+        self.requests_served = 0
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handler_class(self):
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, result, code=200):
+                body = json.dumps({"result": result, "status": "ok", "time": 0.0}).encode()
+                self.send_response(code)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _not_found(self, name):
+                body = json.dumps({"status": {"error": f"Collection `{name}` doesn't exist!"}}).encode()
+                self.send_response(404)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _read_body(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                return json.loads(self.rfile.read(length) or b"{}")
+
+            def do_GET(self):
+                standin.requests_served += 1
+                if self.path == "/":
+                    return self._root()
+                time.sleep(standin.latency)
+                match = re.match(r"^/collections/([^/?]+)/exists", self.path)
+                if match:
+                    return self._reply({"exists": match.group(1) in standin.collections})
+                match = re.match(r"^/collections/([^/?]+)$", self.path.split("?")[0])
+                if match:
+                    name = match.group(1)
+                    if name not in standin.collections:
+                        return self._not_found(name)
+                    return self._reply(standin.collection_info())
+                self._reply(None, 404)
+
+            def _root(self):
+                body = json.dumps({"title": "qdrant stand-in", "version": "1.12.0"}).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self):
+                standin.requests_served += 1
+                time.sleep(standin.latency)
+                match = re.match(r"^/collections/([^/?]+)/points/query", self.path)
+                if match:
+                    name = match.group(1)
+                    if name not in standin.collections:
+                        return self._not_found(name)
+                    request = self._read_body()
+                    limit = request.get("limit", 10)
+                    return self._reply({"points": standin.points_for(limit)})
+                self._reply(None, 404)
+
+            def do_PUT(self):
+                standin.requests_served += 1
+                time.sleep(standin.latency)
+                match = re.match(r"^/collections/([^/?]+)(/points)?", self.path)
+                if match:
+                    standin.collections.add(match.group(1))
+                    return self._reply(
+                        True if not match.group(2)
+                        else {"operation_id": 0, "status": "completed"}
+                    )
+                self._reply(None, 404)
+
+        return Handler
+
+    def collection_info(self):
+        return {
+            "status": "green",
+            "optimizer_status": "ok",
+            "indexed_vectors_count": 0,
+            "points_count": self.points,
+            "segments_count": 1,
+            "config": {
+                "params": {"vectors": {"size": self.dimension, "distance": "Cosine"}},
+                "hnsw_config": {"m": 16, "ef_construct": 100, "full_scan_threshold": 10000},
+                "optimizer_config": {
+                    "deleted_threshold": 0.2, "vacuum_min_vector_number": 1000,
+                    "default_segment_number": 0, "flush_interval_sec": 5,
+                },
+                "wal_config": {"wal_capacity_mb": 32, "wal_segments_ahead": 0},
+            },
+            "payload_schema": {},
+        }
+
+    def points_for(self, limit: int):
+        return [
+            {
+                "id": f"00000000-0000-0000-0000-{i:012d}",
+                "version": 0,
+                "score": round(1.0 - i * 0.05 - random.random() * 0.01, 4),
+                "payload": {"text": f"chunk {i}", "document_id": "doc", "chunk_index": i},
+            }
+            for i in range(min(limit, self.points))
+        ]
@@ -1,17 +1,32 @@
 """
 Main FastAPI application entry point.
 """
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from src.core.config import settings
 from src.api import auth, users, bots, permissions, documents, conversations, websocket, analytics, ocr, embedding_validation, embedding_models, document_reprocessing, cache_management, widget
+from src.services.service_container import service_container
+from src.utils.ocr_workers import shutdown_ocr_pool
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start pooled services once per worker and close them (and OCR workers) on shutdown."""
+    await service_container.startup()
+    yield
+    await service_container.shutdown()
+    shutdown_ocr_pool()
+
 
 app = FastAPI(
     title="Multi-Bot RAG Platform",
     description="A comprehensive multi-bot assistant platform with RAG capabilities",
     version="1.0.0",
-    debug=settings.debug
+    debug=settings.debug,
+    lifespan=lifespan
 )
 
 # Add CORS middleware with WebSocket support
@@ -370,6 +370,62 @@ async def get_provider_performance_breakdown(
         )
 
 
+@router.get("/permissions/stats")
+async def get_permission_cache_statistics(
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Get bot role cache statistics.
+    
+    Returns hit/miss counters of the in-process cache used for permission checks.
+    """
+    from ..services.permission_cache import get_permission_cache
+    
+    return get_permission_cache().get_stats()
+
+
+@router.get("/api-keys/stats")
+async def get_api_key_cache_statistics(
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Get decrypted API key cache statistics.
+    
+    Returns hit/miss counters of the in-process cache used for provider key lookups.
+    """
+    from ..services.api_key_cache import get_api_key_cache
+    
+    return get_api_key_cache().get_stats()
+
+
+@router.get("/retrieval-profiles/stats")
+async def get_retrieval_profile_cache_statistics(
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Get bot retrieval profile cache statistics.
+    
+    Returns hit/miss counters of the in-process cache of per-bot retrieval readiness.
+    """
+    from ..services.bot_retrieval_profile import get_retrieval_profile_cache
+    
+    return get_retrieval_profile_cache().get_stats()
+
+
+@router.get("/semantic-responses/stats")
+async def get_semantic_response_cache_statistics(
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Get semantic response cache statistics.
+    
+    Returns hit/miss counters and size of the in-process per-bot cache of answers to similar questions.
+    """
+    from ..services.semantic_response_cache import get_semantic_response_cache
+    
+    return get_semantic_response_cache().get_stats()
+
+
 @router.get("/health")
 async def get_cache_health():
     """
@@ -406,4 +462,17 @@ async def get_cache_health():
         return {
             "status": "unhealthy",
             "error": str(e)
-        }
\ No newline at end of file
+        }
+
+@router.get("/chunk-texts/stats")
+async def get_chunk_text_cache_statistics(
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Get chunk text cache statistics.
+    
+    Returns hit/miss counters, batched loads and size of the in-process cache that hydrates id-only vector search results.
+    """
+    from ..services.chunk_text_cache import get_chunk_text_cache
+    
+    return get_chunk_text_cache().get_stats()
@@ -1,8 +1,12 @@
 """
 Conversation and session management API endpoints.
 """
-from typing import List, Optional, Dict, Any
+import json
+import zlib
+from datetime import datetime
+from typing import Iterator, List, Optional, Dict, Any
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 import uuid
 
@@ -17,12 +21,22 @@ from ..schemas.conversation import (
     ChatRequest,
     ChatResponse
 )
-from ..services.conversation_service import ConversationService
+from ..services.conversation_service import (
+    ConversationService,
+    decode_search_cursor,
+    encode_search_cursor
+)
 from ..services.chat_service import ChatService
+from ..services.service_container import get_service_container
 
 router = APIRouter(prefix="/conversations", tags=["conversations"])
 
 
+def get_chat_service(db: Session = Depends(get_db)) -> ChatService:
+    """Get a chat service bound to the request session, sharing pooled components."""
+    return get_service_container().create_chat_service(db)
+
+
 @router.post("/sessions", response_model=ConversationSessionResponse)
 async def create_session(
     session_data: ConversationSessionCreate,
@@ -174,19 +188,33 @@ async def search_conversations(
     q: str = Query(..., min_length=1, description="Search query"),
     bot_id: Optional[uuid.UUID] = Query(None, description="Filter by bot ID"),
     limit: int = Query(50, ge=1, le=100, description="Number of results to return"),
-    offset: int = Query(0, ge=0, description="Number of results to skip"),
+    offset: int = Query(0, ge=0, description="Number of results to skip (ignored with cursor)"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Search conversations across user's accessible bots."""
+    try:
+        page_after = decode_search_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
     conversation_service = ConversationService(db)
     results = conversation_service.search_conversations(
-        current_user.id, q, bot_id, limit, offset
+        current_user.id, q, bot_id, limit, offset, page_after
     )
+    next_cursor = None
+    if len(results) == limit:
+        last = results[-1]
+        next_cursor = encode_search_cursor(last["created_at"], uuid.UUID(last["message_id"]))
     return {
         "query": q,
         "results": results,
-        "total": len(results)
+        "total": len(results),
+        "next_cursor": next_cursor
     }
 
 
@@ -194,16 +222,43 @@ async def search_conversations(
 async def export_conversations(
     bot_id: Optional[uuid.UUID] = Query(None, description="Filter by bot ID"),
     session_id: Optional[uuid.UUID] = Query(None, description="Export specific session"),
-    format_type: str = Query("json", description="Export format"),
+    format_type: str = Query("json", description="Export format: json or ndjson"),
+    start: Optional[datetime] = Query(None, description="Only messages created at or after this time"),
+    end: Optional[datetime] = Query(None, description="Only messages created before this time"),
+    compress: bool = Query(False, description="Gzip the response body"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Export conversations for backup and analysis."""
+    """Export conversations for backup and analysis, streamed as it is read."""
     conversation_service = ConversationService(db)
-    export_data = conversation_service.export_conversations(
-        current_user.id, bot_id, session_id, format_type
-    )
-    return export_data
+    try:
+        chunks = conversation_service.export_conversations(
+            current_user.id, bot_id, session_id, format_type, start, end
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    body = (chunk.encode() for chunk in chunks)
+    headers = {}
+    if compress:
+        body = _gzip_stream(body)
+        headers["Content-Encoding"] = "gzip"
+    
+    media_type = "application/x-ndjson" if format_type == "ndjson" else "application/json"
+    return StreamingResponse(body, media_type=media_type, headers=headers)
+
+
+def _gzip_stream(chunks: Iterator[bytes]) -> Iterator[bytes]:
+    """Gzip a byte stream incrementally."""
+    compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
 
 
 @router.get("/analytics")
@@ -225,11 +280,10 @@ async def chat_with_bot(
     bot_id: uuid.UUID,
     chat_request: ChatRequest,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    chat_service: ChatService = Depends(get_chat_service)
 ):
     """Send a message to a bot and get a response through the RAG pipeline."""
     try:
-        chat_service = ChatService(db)
         response = await chat_service.process_message(
             bot_id=bot_id,
             user_id=current_user.id,
@@ -245,16 +299,63 @@ async def chat_with_bot(
         )
 
 
+@router.post("/bots/{bot_id}/chat/stream")
+async def stream_chat_with_bot(
+    bot_id: uuid.UUID,
+    chat_request: ChatRequest,
+    current_user: User = Depends(get_current_user),
+    chat_service: ChatService = Depends(get_chat_service)
+):
+    """
+    Send a message to a bot and stream the response as server-sent events.
+    
+    Emits a "start" event with the session and user message ids, a "token"
+    event per response delta, then "done" with the full ChatResponse payload
+    (or "error" if generation fails after the stream has started).
+    """
+    events = chat_service.stream_message(
+        bot_id=bot_id,
+        user_id=current_user.id,
+        chat_request=chat_request
+    )
+    
+    # Run the pipeline up to the first event here, so permission and
+    # validation failures still return a regular HTTP error response
+    try:
+        first_event = await anext(events)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to process chat message: {str(e)}"
+        )
+    
+    async def event_stream():
+        event = first_event
+        while True:
+            yield f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+            try:
+                event = await anext(events)
+            except StopAsyncIteration:
+                break
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.post("/bots/{bot_id}/sessions", response_model=ConversationSessionResponse)
 async def create_bot_session(
     bot_id: uuid.UUID,
     title: Optional[str] = None,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    chat_service: ChatService = Depends(get_chat_service)
 ):
     """Create a new conversation session for a specific bot."""
     try:
-        chat_service = ChatService(db)
         session = await chat_service.create_session(
             bot_id=bot_id,
             user_id=current_user.id,
@@ -274,7 +375,7 @@ async def create_bot_session(
 async def diagnose_bot_embedding_issues(
     bot_id: uuid.UUID,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    chat_service: ChatService = Depends(get_chat_service)
 ):
     """
     Diagnose embedding and RAG retrieval issues for a bot.
@@ -283,7 +384,6 @@ async def diagnose_bot_embedding_issues(
     is not working properly, especially when LLM and embedding providers differ.
     """
     try:
-        chat_service = ChatService(db)
         diagnosis = await chat_service.diagnose_embedding_issues(
             bot_id=bot_id,
             user_id=current_user.id
@@ -303,6 +403,7 @@ async def test_rag_retrieval(
     bot_id: uuid.UUID,
     test_query: str = "test query about documents",
     current_user: User = Depends(get_current_user),
+    chat_service: ChatService = Depends(get_chat_service),
     db: Session = Depends(get_db)
 ):
     """
@@ -312,8 +413,6 @@ async def test_rag_retrieval(
     detailed debugging information about each step.
     """
     try:
-        chat_service = ChatService(db)
-        
         # Get bot configuration
         from ..models.bot import Bot
         bot = db.query(Bot).filter(Bot.id == bot_id).first()
@@ -84,6 +84,15 @@ async def websocket_chat_endpoint(
                         is_typing=is_typing
                     )
                 
+                elif message_type == "chat_message":
+                    # Generate a response and stream it back token by token
+                    await websocket_service.stream_chat_response(
+                        websocket=websocket,
+                        user=user,
+                        bot_id=bot_id,
+                        message_data=message.get("data", {})
+                    )
+                
                 elif message_type == "ping":
                     # Handle ping/pong for connection health
                     await websocket.send_text(json.dumps({
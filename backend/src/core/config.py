@@ -18,6 +18,21 @@ class Settings(BaseSettings):
     
     # Vector Store
     qdrant_url: str = "http://localhost:6333"
+    # "full" stores chunk text in point payloads; "id_only" stores only the
+    # filterable fields and reads text from Postgres on search
+    qdrant_payload_mode: str = "full"
+    # "dedicated" gives every new bot its own collection; "shared" puts new
+    # bots in a collection per vector dimension, partitioned by bot_id, and
+    # moves a bot to its own collection once it reaches the threshold
+    qdrant_collection_layout: str = "dedicated"
+    qdrant_shared_promotion_threshold: int = 20000
+    
+    # Semantic response cache: cosine similarity a question needs to an earlier
+    # one to reuse its answer, and how long answers are reused. Invalidation is
+    # per process, so the TTL bounds staleness in other workers
+    semantic_cache_enabled: bool = True
+    semantic_cache_similarity_threshold: float = 0.95
+    semantic_cache_ttl: int = 300
     
     # Security
     secret_key: str = os.getenv("SECRET_KEY", "")
@@ -47,7 +47,9 @@ class OCRSettings(BaseSettings):
     
     # Performance settings
     ocr_max_image_size: int = 4096  # Max width/height for OCR processing
-    ocr_timeout: int = 30  # Timeout in seconds for OCR processing
+    ocr_timeout: int = 30  # Timeout in seconds for OCR processing of one page
+    ocr_max_workers: int = 0  # OCR worker processes (0 = CPU count)
+    ocr_max_pending_pages: int = 0  # Rendered pages queued for OCR at once (0 = 2x workers)
     
     class Config:
         env_prefix = "OCR_"
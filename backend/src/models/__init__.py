@@ -10,6 +10,7 @@ from .activity import ActivityLog
 
 from .collection_metadata import CollectionMetadata, EmbeddingConfigurationHistory, DimensionCompatibilityCache
 from .threshold_performance import ThresholdPerformanceLog
+from .usage_rollup import BotUsageDaily, UsageRollupState
 
 __all__ = [
     "User",
@@ -26,4 +27,6 @@ __all__ = [
     "EmbeddingConfigurationHistory",
     "DimensionCompatibilityCache",
     "ThresholdPerformanceLog",
+    "BotUsageDaily",
+    "UsageRollupState",
 ]
\ No newline at end of file
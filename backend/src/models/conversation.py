@@ -1,15 +1,21 @@
 """
 Conversation-related database models.
 """
-from sqlalchemy import Column, String, Boolean, DateTime, Text, ForeignKey, JSON
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, Boolean, DateTime, Text, ForeignKey, JSON, Index
+from sqlalchemy.dialects.postgresql import UUID, TSVECTOR
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy.sql import func
 import uuid
 
 from ..core.database import Base
 
 
+# Text search configuration of messages.search_vector. The trigger created in
+# migration d9f2b6c4e1a7 builds the vector with it, and queries must parse
+# search terms with the same configuration to match.
+MESSAGE_SEARCH_CONFIG = "english"
+
+
 class ConversationSession(Base):
     """Conversation session model for organizing chat messages."""
     
@@ -33,6 +39,10 @@ class Message(Base):
     """Message model for individual chat messages."""
     
     __tablename__ = "messages"
+    __table_args__ = (
+        Index("ix_messages_search_vector", "search_vector", postgresql_using="gin"),
+        Index("ix_messages_created_at_id", "created_at", "id"),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     session_id = Column(UUID(as_uuid=True), ForeignKey("conversation_sessions.id", ondelete="CASCADE"), nullable=False)
@@ -42,6 +52,9 @@ class Message(Base):
     content = Column(Text, nullable=False)
     message_metadata = Column(JSON)  # store additional data like tokens used, response time, etc.
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Full-text search document of content, maintained by a database trigger;
+    # deferred so ordinary message loads don't fetch it
+    search_vector = deferred(Column(TSVECTOR))
     
     # Relationships
     session = relationship("ConversationSession", back_populates="messages")
@@ -1,14 +1,41 @@
 """
 Document-related database models.
 """
-from sqlalchemy import Column, String, DateTime, Text, ForeignKey, BigInteger, Integer
+from sqlalchemy import Column, String, DateTime, Text, ForeignKey, BigInteger, Integer, Index, LargeBinary
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy.sql import func
+import hashlib
 import uuid
+from typing import Any, Dict
 
 from ..core.database import Base
+from ..utils.minhash import compute_minhash_signature
+
+
+# Metadata describing a whole document. It is stored once, in
+# Document.document_metadata, and never copied into DocumentChunk.chunk_metadata
+# or vector payloads, which hold only chunk-local fields (offsets, page range,
+# section) plus the document_id/bot_id references.
+DOCUMENT_LEVEL_METADATA_KEYS = (
+    "document_id",
+    "bot_id",
+    "uploaded_by",
+    "filename",
+    "mime_type",
+    "file_size",
+    "text_length",
+    "extraction_metadata",
+    "chunking_metrics",
+    "optimization_report",
+    "chunking_config",
+)
+
+
+def chunk_local_metadata(metadata: Dict[str, Any]) -> Dict[str, Any]:
+    """Drop document-level keys from chunk metadata."""
+    return {key: value for key, value in metadata.items() if key not in DOCUMENT_LEVEL_METADATA_KEYS}
 
 
 class Document(Base):
@@ -24,6 +51,9 @@ class Document(Base):
     file_size = Column(BigInteger)
     mime_type = Column(String(100))
     chunk_count = Column(Integer, default=0)
+    # Extraction and chunking results (page table, OCR pages, text length);
+    # deferred so document listings don't fetch it
+    document_metadata = deferred(Column(JSONB))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     # Relationships
@@ -32,18 +62,39 @@ class Document(Base):
     chunks = relationship("DocumentChunk", back_populates="document", cascade="all, delete-orphan")
 
 
+def compute_content_hash(content: str) -> str:
+    """SHA-256 hex digest of chunk content, as stored in DocumentChunk.content_hash."""
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+def _default_content_hash(context) -> str:
+    """Fill content_hash at insert time when the caller did not provide it."""
+    return compute_content_hash(context.get_current_parameters().get('content') or '')
+
+
+def _default_minhash_signature(context) -> bytes:
+    """Fill minhash_signature at insert time when the caller did not provide it."""
+    return compute_minhash_signature(context.get_current_parameters().get('content') or '')
+
+
 class DocumentChunk(Base):
     """Document chunk model for processed text chunks with embeddings."""
     
     __tablename__ = "document_chunks"
+    __table_args__ = (
+        Index("ix_document_chunks_bot_id_content_hash", "bot_id", "content_hash"),
+        Index("ix_document_chunks_document_id_chunk_index", "document_id", "chunk_index"),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     document_id = Column(UUID(as_uuid=True), ForeignKey("documents.id", ondelete="CASCADE"), nullable=False)
     bot_id = Column(UUID(as_uuid=True), ForeignKey("bots.id", ondelete="CASCADE"), nullable=False)
     chunk_index = Column(Integer, nullable=False)
     content = Column(Text, nullable=False)
+    content_hash = Column(String(64), default=_default_content_hash)  # sha256 of content, for deduplication
+    minhash_signature = Column(LargeBinary, default=_default_minhash_signature)  # near-duplicate detection
     embedding_id = Column(Text)  # reference to vector store
-    chunk_metadata = Column(JSONB)  # page number, section, etc.
+    chunk_metadata = Column(JSONB)  # chunk-local only: offsets, page range, section, etc.
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     # Relationships
@@ -0,0 +1,39 @@
+"""
+Daily message usage rollup models for analytics.
+"""
+from sqlalchemy import Column, String, Date, DateTime, Integer, BigInteger, Float, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+
+from ..core.database import Base
+
+
+class BotUsageDaily(Base):
+    """Message counts, token usage and latency per bot, UTC day, user and role."""
+
+    __tablename__ = "bot_usage_daily"
+    __table_args__ = (
+        Index("ix_bot_usage_daily_day", "day"),
+        Index("ix_bot_usage_daily_user_id_day", "user_id", "day"),
+    )
+
+    bot_id = Column(UUID(as_uuid=True), ForeignKey("bots.id", ondelete="CASCADE"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    role = Column(String(20), primary_key=True)
+    message_count = Column(Integer, nullable=False, default=0)
+    # Sums of the numeric tokens_used / response_time message metadata values
+    tokens_sum = Column(BigInteger, nullable=False, default=0)
+    latency_sum = Column(Float, nullable=False, default=0.0)
+    latency_count = Column(Integer, nullable=False, default=0)
+
+
+class UsageRollupState(Base):
+    """Single-row compaction watermark for bot_usage_daily."""
+
+    __tablename__ = "usage_rollup_state"
+
+    id = Column(Integer, primary_key=True, default=1)
+    # Days before this one are fully rolled up; later messages are read raw
+    rolled_up_until = Column(Date, nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
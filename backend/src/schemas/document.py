@@ -43,6 +43,7 @@ class DocumentChunkInfo(BaseModel):
 
 class DocumentDetailResponse(DocumentResponse):
     """Schema for detailed document response."""
+    document_metadata: Optional[Dict[str, Any]] = None
     chunks: List[DocumentChunkInfo]
 
 
@@ -1,24 +1,45 @@
 """
 Analytics service for bot usage metrics and activity tracking.
 """
-from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from datetime import date, datetime, timedelta, timezone
+from typing import List, Dict, Any, Optional, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc, and_, or_
-from sqlalchemy.sql import text
+from sqlalchemy import func, desc, and_, or_, case
 
 from ..models.bot import Bot, BotPermission
 from ..models.conversation import ConversationSession, Message
 from ..models.activity import ActivityLog
 from ..models.user import User
 from ..models.document import Document
+from .usage_rollup_service import UsageRollupService, day_start
 
 
 class AnalyticsService:
     """Service for analytics and reporting functionality."""
     
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, rollups: UsageRollupService = None):
         self.db = db
+        self.rollups = rollups or UsageRollupService(db)
+    
+    def _period_start(self, days: int) -> Tuple[date, datetime]:
+        """
+        Roll up any completed days, then get the start of a reporting period.
+        
+        Periods cover whole UTC days, the oldest one included.
+        
+        Args:
+            days: Period length in days
+            
+        Returns:
+            Tuple of (first day, start of that day)
+        """
+        self.rollups.compact_pending()
+        start_day = (datetime.now(timezone.utc) - timedelta(days=days)).date()
+        return start_day, day_start(start_day)
+    
+    def _sum_for_role(self, usage, role: str, column):
+        """Sum a usage column over the rows of one message role."""
+        return func.sum(case((usage.c.role == role, column), else_=0))
     
     def get_bot_usage_analytics(
         self, 
@@ -36,7 +57,7 @@ class AnalyticsService:
         if not permission:
             raise ValueError("User does not have access to this bot")
         
-        start_date = datetime.utcnow() - timedelta(days=days)
+        start_day, start_date = self._period_start(days)
         
         # Basic metrics
         total_conversations = self.db.query(ConversationSession).filter(
@@ -44,84 +65,51 @@ class AnalyticsService:
             ConversationSession.created_at >= start_date
         ).count()
         
-        total_messages = self.db.query(Message).filter(
-            Message.bot_id == bot_id,
-            Message.created_at >= start_date
-        ).count()
-        
-        user_messages = self.db.query(Message).filter(
-            Message.bot_id == bot_id,
-            Message.role == "user",
-            Message.created_at >= start_date
-        ).count()
-        
-        assistant_messages = self.db.query(Message).filter(
-            Message.bot_id == bot_id,
-            Message.role == "assistant",
-            Message.created_at >= start_date
-        ).count()
-        
-        # Unique users
-        unique_users = self.db.query(func.count(func.distinct(Message.user_id))).filter(
-            Message.bot_id == bot_id,
-            Message.created_at >= start_date
-        ).scalar()
+        # Message metrics come from the daily rollups plus today's raw messages
+        usage = self.rollups.usage(start_day, bot_ids=[bot_id])
+        totals = self.db.query(
+            func.sum(usage.c.message_count).label('total_messages'),
+            self._sum_for_role(usage, "user", usage.c.message_count).label('user_messages'),
+            self._sum_for_role(usage, "assistant", usage.c.message_count).label('assistant_messages'),
+            func.count(func.distinct(usage.c.user_id)).label('unique_users'),
+            self._sum_for_role(usage, "assistant", usage.c.tokens_sum).label('total_tokens'),
+            self._sum_for_role(usage, "assistant", usage.c.latency_sum).label('latency_sum'),
+            self._sum_for_role(usage, "assistant", usage.c.latency_count).label('latency_count')
+        ).one()
         
         # Documents count
         documents_count = self.db.query(Document).filter(
             Document.bot_id == bot_id
         ).count()
         
-        # Daily message counts for the last 30 days
+        # Daily message counts for the period
         daily_messages = self.db.query(
-            func.date(Message.created_at).label('date'),
-            func.count(Message.id).label('count')
-        ).filter(
-            Message.bot_id == bot_id,
-            Message.created_at >= start_date
-        ).group_by(func.date(Message.created_at)).order_by('date').all()
+            usage.c.day.label('date'),
+            func.sum(usage.c.message_count).label('count')
+        ).group_by(usage.c.day).order_by(usage.c.day).all()
         
         # Top users by message count
+        top_user_counts = self.db.query(
+            usage.c.user_id,
+            func.sum(usage.c.message_count).label('message_count')
+        ).group_by(usage.c.user_id).order_by(desc('message_count')).limit(10).subquery()
         top_users = self.db.query(
             User.username,
             User.full_name,
-            func.count(Message.id).label('message_count')
-        ).join(Message, User.id == Message.user_id).filter(
-            Message.bot_id == bot_id,
-            Message.created_at >= start_date
-        ).group_by(User.id, User.username, User.full_name).order_by(
-            desc('message_count')
-        ).limit(10).all()
-        
-        # Average response time (if metadata contains response_time)
-        avg_response_time = self.db.query(
-            func.avg(
-                func.cast(
-                    func.json_extract_path_text(Message.message_metadata, 'response_time'),
-                    text('FLOAT')
-                )
-            )
-        ).filter(
-            Message.bot_id == bot_id,
-            Message.role == "assistant",
-            Message.created_at >= start_date,
-            Message.message_metadata.op('?')('response_time')
-        ).scalar()
+            top_user_counts.c.message_count
+        ).join(top_user_counts, User.id == top_user_counts.c.user_id).order_by(
+            desc(top_user_counts.c.message_count)
+        ).all()
         
-        # Token usage (if metadata contains tokens_used)
-        total_tokens = self.db.query(
-            func.sum(
-                func.cast(
-                    func.json_extract_path_text(Message.message_metadata, 'tokens_used'),
-                    text('INTEGER')
-                )
-            )
-        ).filter(
-            Message.bot_id == bot_id,
-            Message.role == "assistant",
-            Message.created_at >= start_date,
-            Message.message_metadata.op('?')('tokens_used')
-        ).scalar()
+        # Average response time and token usage (if metadata contains them)
+        avg_response_time = (
+            totals.latency_sum / totals.latency_count if totals.latency_count else None
+        )
+        total_tokens = totals.total_tokens
+        total_messages = int(totals.total_messages or 0)
+        user_messages = int(totals.user_messages or 0)
+        assistant_messages = int(totals.assistant_messages or 0)
+        unique_users = totals.unique_users
         
         return {
             "bot_id": bot_id,
@@ -139,7 +127,7 @@ class AnalyticsService:
             "daily_activity": [
                 {
                     "date": str(day.date),
-                    "message_count": day.count
+                    "message_count": int(day.count)
                 }
                 for day in daily_messages
             ],
@@ -147,7 +135,7 @@ class AnalyticsService:
                 {
                     "username": user.username,
                     "full_name": user.full_name,
-                    "message_count": user.message_count
+                    "message_count": int(user.message_count)
                 }
                 for user in top_users
             ]
@@ -155,7 +143,7 @@ class AnalyticsService:
     
     def get_user_dashboard_analytics(self, user_id: str, days: int = 30) -> Dict[str, Any]:
         """Get dashboard analytics for a user across all their accessible bots."""
-        start_date = datetime.utcnow() - timedelta(days=days)
+        start_day, start_date = self._period_start(days)
         
         # Get all bots user has access to
         accessible_bots = self.db.query(Bot).join(BotPermission).filter(
@@ -190,37 +178,49 @@ class AnalyticsService:
             ConversationSession.created_at >= start_date
         ).count()
         
-        messages_sent = self.db.query(Message).filter(
-            Message.bot_id.in_(bot_ids),
-            Message.user_id == user_id,
-            Message.role == "user",
-            Message.created_at >= start_date
-        ).count()
-        
-        messages_received = self.db.query(Message).filter(
-            Message.bot_id.in_(bot_ids),
-            Message.user_id == user_id,
-            Message.role == "assistant",
-            Message.created_at >= start_date
-        ).count()
-        
+        # Message metrics come from the daily rollups plus today's raw messages
+        usage = self.rollups.usage(start_day, bot_ids=bot_ids, user_id=user_id)
+        message_counts = self.db.query(
+            usage.c.bot_id,
+            func.sum(usage.c.message_count).label('message_count'),
+            self._sum_for_role(usage, "user", usage.c.message_count).label('messages_sent'),
+            self._sum_for_role(usage, "assistant", usage.c.message_count).label('messages_received')
+        ).group_by(usage.c.bot_id).all()
+        
+        messages_sent = int(sum(row.messages_sent for row in message_counts))
+        messages_received = int(sum(row.messages_received for row in message_counts))
         total_messages = messages_sent + messages_received
         
-        # Bot activity breakdown
-        bot_activity = self.db.query(
-            Bot.name,
-            Bot.id,
-            func.count(Message.id).label('message_count'),
-            func.count(func.distinct(ConversationSession.id)).label('conversation_count')
-        ).join(Message, Bot.id == Message.bot_id).join(
-            ConversationSession, Message.session_id == ConversationSession.id
+        # Bot activity breakdown; conversations are the user's sessions with
+        # activity in the period
+        conversation_counts = dict(self.db.query(
+            ConversationSession.bot_id,
+            func.count(ConversationSession.id)
         ).filter(
-            Bot.id.in_(bot_ids),
-            Message.user_id == user_id,
-            Message.created_at >= start_date
-        ).group_by(Bot.id, Bot.name).order_by(desc('message_count')).all()
+            ConversationSession.bot_id.in_(bot_ids),
+            ConversationSession.user_id == user_id,
+            ConversationSession.updated_at >= start_date
+        ).group_by(ConversationSession.bot_id).all())
+        bot_names = {bot.id: bot.name for bot in accessible_bots}
+        bot_activity = sorted(
+            (
+                {
+                    "bot_id": str(row.bot_id),
+                    "bot_name": bot_names.get(row.bot_id),
+                    "message_count": int(row.message_count),
+                    "conversation_count": conversation_counts.get(row.bot_id, 0)
+                }
+                for row in message_counts
+            ),
+            key=lambda activity: activity["message_count"],
+            reverse=True
+        )
         
-        # Recent conversations
+        # Recent conversations; messages are only counted for the ten shown
+        recent_sessions = self.db.query(ConversationSession.id).filter(
+            ConversationSession.bot_id.in_(bot_ids),
+            ConversationSession.user_id == user_id
+        ).order_by(desc(ConversationSession.updated_at)).limit(10).subquery()
         recent_conversations = self.db.query(
             ConversationSession.id,
             ConversationSession.title,
@@ -228,18 +228,17 @@ class AnalyticsService:
             ConversationSession.updated_at,
             Bot.name.label('bot_name'),
             func.count(Message.id).label('message_count')
+        ).join(
+            recent_sessions, ConversationSession.id == recent_sessions.c.id
         ).join(Bot, ConversationSession.bot_id == Bot.id).outerjoin(
             Message, ConversationSession.id == Message.session_id
-        ).filter(
-            ConversationSession.bot_id.in_(bot_ids),
-            ConversationSession.user_id == user_id
         ).group_by(
             ConversationSession.id,
             ConversationSession.title,
             ConversationSession.created_at,
             ConversationSession.updated_at,
             Bot.name
-        ).order_by(desc(ConversationSession.updated_at)).limit(10).all()
+        ).order_by(desc(ConversationSession.updated_at)).all()
         
         return {
             "user_id": user_id,
@@ -252,15 +251,7 @@ class AnalyticsService:
                 "messages_sent": messages_sent,
                 "messages_received": messages_received
             },
-            "bot_activity": [
-                {
-                    "bot_id": str(activity.id),
-                    "bot_name": activity.name,
-                    "message_count": activity.message_count,
-                    "conversation_count": activity.conversation_count
-                }
-                for activity in bot_activity
-            ],
+            "bot_activity": bot_activity,
             "recent_conversations": [
                 {
                     "session_id": str(conv.id),
@@ -326,7 +317,7 @@ class AnalyticsService:
             raise ValueError("User not found")
         
         # For now, allow any user to see system stats (in production, add proper admin check)
-        start_date = datetime.utcnow() - timedelta(days=days)
+        start_day, start_date = self._period_start(days)
         
         # System-wide metrics
         total_users = self.db.query(User).count()
@@ -334,34 +325,37 @@ class AnalyticsService:
         total_conversations = self.db.query(ConversationSession).filter(
             ConversationSession.created_at >= start_date
         ).count()
-        total_messages = self.db.query(Message).filter(
-            Message.created_at >= start_date
-        ).count()
         total_documents = self.db.query(Document).count()
         
+        # Message metrics come from the daily rollups plus today's raw messages
+        usage = self.rollups.usage(start_day)
+        total_messages = self.db.query(func.sum(usage.c.message_count)).scalar()
+        total_messages = int(total_messages or 0)
+        
         # Active users (users who sent messages in the period)
-        active_users = self.db.query(func.count(func.distinct(Message.user_id))).filter(
-            Message.created_at >= start_date,
-            Message.role == "user"
+        active_users = self.db.query(func.count(func.distinct(usage.c.user_id))).filter(
+            usage.c.role == "user"
         ).scalar()
         
         # Most active bots
+        bot_counts = self.db.query(
+            usage.c.bot_id,
+            func.sum(usage.c.message_count).label('message_count')
+        ).group_by(usage.c.bot_id).order_by(desc('message_count')).limit(10).subquery()
         most_active_bots = self.db.query(
             Bot.name,
             Bot.id,
-            func.count(Message.id).label('message_count')
-        ).join(Message, Bot.id == Message.bot_id).filter(
-            Message.created_at >= start_date
-        ).group_by(Bot.id, Bot.name).order_by(desc('message_count')).limit(10).all()
+            bot_counts.c.message_count
+        ).join(bot_counts, Bot.id == bot_counts.c.bot_id).order_by(
+            desc(bot_counts.c.message_count)
+        ).all()
         
         # Daily activity
         daily_activity = self.db.query(
-            func.date(Message.created_at).label('date'),
-            func.count(Message.id).label('message_count'),
-            func.count(func.distinct(Message.user_id)).label('active_users')
-        ).filter(
-            Message.created_at >= start_date
-        ).group_by(func.date(Message.created_at)).order_by('date').all()
+            usage.c.day.label('date'),
+            func.sum(usage.c.message_count).label('message_count'),
+            func.count(func.distinct(usage.c.user_id)).label('active_users')
+        ).group_by(usage.c.day).order_by(usage.c.day).all()
         
         return {
             "period_days": days,
@@ -377,14 +371,14 @@ class AnalyticsService:
                 {
                     "bot_id": str(bot.id),
                     "bot_name": bot.name,
-                    "message_count": bot.message_count
+                    "message_count": int(bot.message_count)
                 }
                 for bot in most_active_bots
             ],
             "daily_activity": [
                 {
                     "date": str(day.date),
-                    "message_count": day.message_count,
+                    "message_count": int(day.message_count),
                     "active_users": day.active_users
                 }
                 for day in daily_activity
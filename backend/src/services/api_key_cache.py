@@ -0,0 +1,77 @@
+"""
+In-process cache of decrypted provider API keys.
+
+Chat turns and ingestion jobs resolve the bot owner's (and sometimes the
+requesting user's) provider key on every call. Decrypted keys are cached per
+(user, provider) for a bounded TTL, including "no active key" results, so a
+steady-state chat turn makes no key lookup queries. UserService invalidates
+entries when a key is added, updated or deleted; the TTL bounds how long
+another worker process can keep using a key changed elsewhere. Keys are only
+held in memory and never logged.
+"""
+import uuid
+from typing import Optional, Tuple
+
+from ..utils.ttl_cache import TTLCache
+
+
+class APIKeyCache(TTLCache):
+    """TTL cache of decrypted API keys keyed by (user_id, provider)."""
+
+    def __init__(self, ttl: float = 300.0, max_entries: int = 10000):
+        """
+        Initialize the cache.
+
+        Args:
+            ttl: Seconds a decrypted key stays cached
+            max_entries: Entries kept before the oldest are evicted
+        """
+        super().__init__(ttl, max_entries)
+
+    def get_key(self, user_id: uuid.UUID, provider: str) -> Tuple[bool, Optional[str]]:
+        """
+        Look up a cached key.
+
+        Args:
+            user_id: User ID
+            provider: Provider name
+
+        Returns:
+            Tuple of (found, api_key); api_key is None when the user is cached
+            as having no usable key for the provider
+        """
+        return self.get((user_id, provider))
+
+    def set_key(self, user_id: uuid.UUID, provider: str, api_key: Optional[str]):
+        """
+        Cache a resolved key.
+
+        Args:
+            user_id: User ID
+            provider: Provider name
+            api_key: Decrypted key, or None if the user has none
+        """
+        self.set((user_id, provider), api_key)
+
+    def invalidate_key(self, user_id: uuid.UUID, provider: str):
+        """Drop the cached key of one user for one provider."""
+        self.invalidate((user_id, provider))
+
+
+# Global cache instance, shared by every UserService in the process
+_api_key_cache: Optional[APIKeyCache] = None
+
+
+def get_api_key_cache() -> APIKeyCache:
+    """
+    Get the global API key cache instance.
+
+    Returns:
+        API key cache
+    """
+    global _api_key_cache
+
+    if _api_key_cache is None:
+        _api_key_cache = APIKeyCache()
+
+    return _api_key_cache
@@ -0,0 +1,102 @@
+"""
+Cached per-bot retrieval readiness.
+
+Before searching, the chat path needs to know whether a bot has documents,
+whether its vector collection exists, which dimension the stored vectors have
+and which embedding model and score threshold to query with. Each of those is
+a database or Qdrant round trip, and none of them changes between chat turns,
+so ChatService builds a BotRetrievalProfile once per bot and caches it here.
+
+Entries are invalidated when documents are uploaded or deleted, when the bot
+is updated or deleted, and when the bot's collection is created or deleted
+(which covers collection migrations and reprocessing). The TTL bounds how
+long another worker process can use a profile made stale elsewhere.
+"""
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Optional, Union
+
+from ..utils.ttl_cache import TTLCache
+
+
+@dataclass(frozen=True)
+class BotRetrievalProfile:
+    """What the chat path needs to know to search a bot's documents."""
+    bot_id: uuid.UUID
+    document_count: int
+    collection_name: str
+    collection_exists: bool
+    stored_dimension: Optional[int]
+    embedding_provider: str
+    embedding_model: Optional[str]
+    expected_dimension: Optional[int]
+    score_threshold: float
+    built_at: float = field(default_factory=time.time)
+
+    @property
+    def has_documents(self) -> bool:
+        return self.document_count > 0
+
+    @property
+    def dimension_mismatch(self) -> bool:
+        """True if the stored vectors cannot be searched with the configured model."""
+        return bool(
+            self.stored_dimension
+            and self.expected_dimension
+            and self.stored_dimension != self.expected_dimension
+        )
+
+
+class BotRetrievalProfileCache(TTLCache):
+    """TTL cache of BotRetrievalProfile keyed by bot ID."""
+
+    def __init__(self, ttl: float = 300.0, max_entries: int = 10000):
+        """
+        Initialize the cache.
+
+        Args:
+            ttl: Seconds a profile stays valid
+            max_entries: Entries kept before the oldest are evicted
+        """
+        super().__init__(ttl, max_entries)
+
+    def get_profile(self, bot_id: Union[str, uuid.UUID]) -> Optional[BotRetrievalProfile]:
+        """
+        Look up a bot's cached profile.
+
+        Args:
+            bot_id: Bot identifier
+
+        Returns:
+            Profile, or None if not cached
+        """
+        _, profile = self.get(str(bot_id))
+        return profile
+
+    def set_profile(self, profile: BotRetrievalProfile):
+        """Cache a freshly built profile."""
+        self.set(str(profile.bot_id), profile)
+
+    def invalidate_bot(self, bot_id: Union[str, uuid.UUID]):
+        """Drop a bot's cached profile."""
+        self.invalidate(str(bot_id))
+
+
+# Global cache instance, shared by every service in the process
+_profile_cache: Optional[BotRetrievalProfileCache] = None
+
+
+def get_retrieval_profile_cache() -> BotRetrievalProfileCache:
+    """
+    Get the global bot retrieval profile cache instance.
+
+    Returns:
+        Bot retrieval profile cache
+    """
+    global _profile_cache
+
+    if _profile_cache is None:
+        _profile_cache = BotRetrievalProfileCache()
+
+    return _profile_cache
@@ -17,6 +17,8 @@ from ..schemas.bot import BotCreate, BotUpdate
 from .permission_service import PermissionService
 from .vector_collection_manager import VectorCollectionManager
 from .embedding_service import EmbeddingProviderService
+from .bot_retrieval_profile import get_retrieval_profile_cache
+from .semantic_response_cache import get_semantic_response_cache
 
 
 logger = logging.getLogger(__name__)
@@ -304,6 +306,9 @@ class BotService:
         
         self.db.commit()
         self.db.refresh(bot)
+        get_retrieval_profile_cache().invalidate_bot(bot_id)
+        # Prompt or model changes make cached answers stale
+        get_semantic_response_cache().invalidate_bot(bot_id)
         
         return bot
     
@@ -349,6 +354,9 @@ class BotService:
         # Delete bot (cascade will handle related records)
         self.db.delete(bot)
         self.db.commit()
+        self.permission_service.cache.invalidate_bot(bot_id)
+        get_retrieval_profile_cache().invalidate_bot(bot_id)
+        get_semantic_response_cache().invalidate_bot(bot_id)
         
         return True
     
@@ -278,16 +278,10 @@ class CacheManagementService:
         try:
             logger.info(f"Invalidating cache for document {document_id} update")
             
-            # Generate cache keys for affected texts
-            invalidated_count = 0
-            for text in affected_texts:
-                cache_key = self.cache_service._generate_cache_key(text, provider, model)
-                
-                # Check if entry exists and delete it
-                exists = await self.redis_client.exists(cache_key)
-                if exists:
-                    await self.redis_client.delete(cache_key)
-                    invalidated_count += 1
+            # Drop the affected entries together with their cache index members
+            invalidated_count = await self.cache_service.invalidate_texts(
+                affected_texts, provider, model
+            )
             
             # Log the invalidation
             await self._log_cache_invalidation(
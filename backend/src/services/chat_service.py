@@ -4,11 +4,14 @@ Chat service with RAG integration for processing messages and generating respons
 import asyncio
 import logging
 import time
-from typing import Dict, List, Optional, Any, Tuple
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import AsyncIterator, Dict, List, Optional, Any, Tuple
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 import uuid
 
+from ..core.config import settings
 from ..models.bot import Bot
 from ..models.conversation import ConversationSession, Message
 from ..models.user import User
@@ -16,6 +19,11 @@ from ..schemas.conversation import ChatRequest, ChatResponse
 from .conversation_service import ConversationService
 from .permission_service import PermissionService
 from .llm_service import LLMProviderService
+from .providers.base import ChatMessage
+from .prompt_budget import PromptAssembly, PromptBudgeter
+from .bot_retrieval_profile import BotRetrievalProfile, get_retrieval_profile_cache
+from .semantic_response_cache import CachedAnswer, get_semantic_response_cache
+from .session_history_cache import HistoryEntry
 from .embedding_service import EmbeddingProviderService
 from .vector_store import VectorService
 from .user_service import UserService
@@ -43,25 +51,63 @@ def get_websocket_service():
     return WebSocketService
 
 
+@dataclass
+class ChatTurn:
+    """State of one chat turn between prompt assembly and storing the response."""
+    bot: Bot
+    session: ConversationSession
+    user_message: Message
+    relevant_chunks: List[Dict[str, Any]]
+    rag_metadata: Dict[str, Any]
+    prompt: PromptAssembly
+    max_tokens: int
+    start_time: float
+    # Answer reused from the semantic response cache; no LLM call is made
+    cached_answer: Optional[CachedAnswer] = None
+    # Embedding to cache the answer under; None if the turn is not cacheable
+    query_embedding: Optional[List[float]] = None
+
+
 class ChatService:
     """Service for processing chat messages with hybrid RAG integration."""
     
-    def __init__(self, db: Session):
+    def __init__(
+        self,
+        db: Session,
+        llm_service: Optional[LLMProviderService] = None,
+        embedding_service: Optional[EmbeddingProviderService] = None,
+        vector_service: Optional[VectorService] = None,
+        error_recovery: Optional[RAGErrorRecovery] = None,
+        cache_manager: Optional[ContextAwareCacheManager] = None,
+        performance_monitor: Optional[HybridPerformanceMonitor] = None
+    ):
         """
         Initialize chat service with hybrid retrieval system.
-        
+
+        Pooled components (provider clients, vector store, caches, monitor) can be
+        injected from the process-wide ServiceContainer so that only the
+        request-scoped database session is bound per call. Components that are not
+        injected are created and owned by this instance.
+
         Args:
             db: Database session
+            llm_service: Shared LLM provider service
+            embedding_service: Shared embedding provider service
+            vector_service: Shared vector service
+            error_recovery: Shared RAG error recovery (circuit breakers)
+            cache_manager: Shared, already initialized context-aware cache manager
+            performance_monitor: Shared, already initialized performance monitor
         """
         self.db = db
+        self._owns_shared_components = llm_service is None
         self.conversation_service = ConversationService(db)
         self.permission_service = PermissionService(db)
-        self.llm_service = LLMProviderService()
-        self.embedding_service = EmbeddingProviderService()
-        self.vector_service = VectorService()
+        self.llm_service = llm_service or LLMProviderService()
+        self.embedding_service = embedding_service or EmbeddingProviderService()
+        self.vector_service = vector_service or VectorService()
         self.user_service = UserService(db)
-        self.api_key_service = EnhancedAPIKeyService(db)
-        self.error_recovery = RAGErrorRecovery()
+        self.api_key_service = EnhancedAPIKeyService(db, embedding_service=self.embedding_service)
+        self.error_recovery = error_recovery or RAGErrorRecovery()
         
         # Initialize comprehensive error handler
         error_config = ErrorHandlingConfig(
@@ -85,29 +131,42 @@ class ChatService:
             "anthropic": {"claude-3-haiku": 0.25},
         }
         self.default_similarity_threshold = 0.3
-        self.max_prompt_length = 8000
+        self.prompt_budgeter = PromptBudgeter(max_input_tokens=6000)
         self.enable_graceful_degradation = True
+        self.retrieval_profiles = get_retrieval_profile_cache()
+        self.semantic_cache = get_semantic_response_cache()
         
         # Initialize hybrid retrieval components
-        self._initialize_hybrid_components()
+        self._initialize_hybrid_components(cache_manager, performance_monitor)
         logger.info("Hybrid retrieval system initialized successfully")
-        
-        # Initialize async components in background
-        asyncio.create_task(self._init_hybrid_async_components())
-    
-    def _initialize_hybrid_components(self):
+
+        # Initialize async components in background (shared ones are started by the container)
+        if cache_manager is None or performance_monitor is None:
+            asyncio.create_task(self._init_hybrid_async_components())
+
+    def _initialize_hybrid_components(
+        self,
+        cache_manager: Optional[ContextAwareCacheManager] = None,
+        performance_monitor: Optional[HybridPerformanceMonitor] = None
+    ):
         """Initialize hybrid retrieval components."""
-        # Initialize config
-        self.hybrid_config = HybridRetrievalConfig()
-        
-        # Initialize orchestrator
+        # Initialize orchestrator (cheap, bound to the request-scoped session)
         self.hybrid_orchestrator = HybridRetrievalOrchestrator(
             db=self.db,
             vector_service=self.vector_service,
             llm_service=self.llm_service,
             embedding_service=self.embedding_service
         )
-        
+
+        if cache_manager is not None and performance_monitor is not None:
+            self.cache_manager = cache_manager
+            self.performance_monitor = performance_monitor
+            self.hybrid_config = performance_monitor.config
+            return
+
+        # Initialize config
+        self.hybrid_config = HybridRetrievalConfig()
+
         # Initialize cache manager
         try:
             import redis.asyncio as redis
@@ -164,150 +223,402 @@ class ChatService:
         start_time = time.time()
         
         try:
-            # Step 1: Permission validation
-            if not self.permission_service.check_bot_permission(
-                user_id, bot_id, "view_conversations"
-            ):
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail="User does not have permission to chat with this bot"
-                )
+            turn = await self._prepare_turn(bot_id, user_id, chat_request, start_time)
             
-            # Step 2: Get bot configuration
-            bot = self.db.query(Bot).filter(Bot.id == bot_id).first()
-            if not bot:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="Bot not found"
+            # Step 9: Generate response using configured LLM
+            if turn.cached_answer is not None:
+                response_text = turn.cached_answer.response
+                response_metadata = self._get_cached_response_metadata(turn.cached_answer)
+            else:
+                response_text, response_metadata = await self._generate_response(
+                    turn.bot, user_id, turn.prompt, turn.max_tokens
                 )
             
-            # Step 3: Get or create conversation session
-            session = await self._get_or_create_session(
-                bot_id, user_id, chat_request.session_id
+            return await self._complete_turn(
+                bot_id, user_id, turn, response_text, response_metadata
             )
             
-            # Step 4: Store user message
-            user_message = await self._store_user_message(
-                session.id, bot_id, user_id, chat_request.message
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error(f"Chat processing failed for bot {bot_id}: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to process chat message: {str(e)}"
             )
+    
+    async def stream_message(
+        self,
+        bot_id: uuid.UUID,
+        user_id: uuid.UUID,
+        chat_request: ChatRequest
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Process a chat message like process_message, streaming the response.
+        
+        Yields a "start" event once the user message is stored and the prompt
+        is built, a "token" event per response delta, and a "done" event with
+        the same payload process_message returns once the assistant message is
+        persisted. Errors before "start" are raised; errors after it are
+        yielded as an "error" event, since the response has already begun.
+        
+        Args:
+            bot_id: Bot identifier
+            user_id: User identifier
+            chat_request: Chat request with message and optional session_id
             
-            # Step 5: Smart retrieval decision using hybrid system
-            conversation_history_for_classifier = await self._get_conversation_history_for_classifier(
-                session.id, user_id, exclude_current_message=chat_request.message
-            )
+        Yields:
+            Event dicts with a "type" key ("start", "token", "done" or "error")
             
-            # Use hybrid retrieval decision system
-            retrieval_decision = await self._get_hybrid_retrieval_decision(
-                chat_request.message,
-                conversation_history_for_classifier,
-                bot,
-                user_id
+        Raises:
+            HTTPException: If permission denied or the turn cannot be prepared
+        """
+        start_time = time.time()
+        
+        try:
+            turn = await self._prepare_turn(bot_id, user_id, chat_request, start_time)
+            if turn.cached_answer is None:
+                api_key, llm_config = await self._prepare_llm_call(
+                    turn.bot, user_id, turn.prompt, turn.max_tokens
+                )
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error(f"Chat processing failed for bot {bot_id}: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to process chat message: {str(e)}"
             )
+        
+        yield {
+            "type": "start",
+            "session_id": str(turn.session.id),
+            "user_message_id": str(turn.user_message.id)
+        }
+        
+        try:
+            if turn.cached_answer is not None:
+                # A cached answer arrives as a single delta
+                yield {"type": "token", "content": turn.cached_answer.response}
+                response_metadata = self._get_cached_response_metadata(turn.cached_answer)
+                response_metadata["streamed"] = True
+                response = await self._complete_turn(
+                    bot_id, user_id, turn, turn.cached_answer.response, response_metadata
+                )
+                yield {"type": "done", **response.model_dump(mode="json")}
+                return
             
-            logger.info(f"Hybrid retrieval decision for bot {bot.id}: {retrieval_decision.reasoning}")
-            
-            # Initialize RAG metadata with hybrid decision info
-            rag_metadata = {
-                "retrieval_decision_made": True,
-                "should_retrieve": retrieval_decision.should_retrieve,
-                "query_type": retrieval_decision.query_type.value,
-                "decision_confidence": retrieval_decision.confidence,
-                "decision_reasoning": retrieval_decision.reasoning,
-                "rag_enabled": retrieval_decision.should_retrieve,
-                "fallback_used": not retrieval_decision.should_retrieve,
-                "degradation_reason": None if retrieval_decision.should_retrieve else "smart_decision_skip",
-                "hybrid_mode": retrieval_decision.metadata.get("hybrid_mode") if hasattr(retrieval_decision, "metadata") else None
-            }
-            
-            # Step 6: Retrieve relevant document chunks if decision says we should
-            relevant_chunks = []
-            if retrieval_decision.should_retrieve:
-                try:
-                    relevant_chunks, retrieval_metadata = await self._retrieve_relevant_chunks_with_recovery(
-                        bot, chat_request.message, user_id
-                    )
-                    # Merge retrieval metadata
-                    rag_metadata.update(retrieval_metadata)
-                except Exception as e:
-                    logger.error(f"Retrieval failed even though decision was to retrieve: {e}")
-                    # Update metadata to reflect the failure
-                    rag_metadata.update({
-                        "retrieval_failed_after_decision": True,
-                        "retrieval_error": str(e),
-                        "rag_enabled": False,
-                        "fallback_used": True,
-                        "degradation_reason": "retrieval_failed_post_decision"
-                    })
-            
-            # Step 7: Get conversation history (excluding current message)
-            conversation_history = await self._get_conversation_history(
-                session.id, user_id, exclude_current_message=chat_request.message
+            # Step 9: Stream response from the configured LLM
+            deltas: List[str] = []
+            first_token_time = None
+            async for delta in self.llm_service.stream_response(
+                provider=turn.bot.llm_provider,
+                model=turn.bot.llm_model,
+                messages=turn.prompt.messages,
+                api_key=api_key,
+                config=llm_config
+            ):
+                if first_token_time is None:
+                    first_token_time = time.time() - start_time
+                deltas.append(delta)
+                yield {"type": "token", "content": delta}
+            
+            response_text = "".join(deltas)
+            response_metadata = self._get_response_metadata(
+                turn.bot, llm_config, turn.prompt, response_text
             )
+            response_metadata["streamed"] = True
+            response_metadata["time_to_first_token"] = first_token_time
             
-            # Step 8: Build prompt with context
-            prompt = await self._build_prompt(
-                bot, conversation_history, relevant_chunks, chat_request.message
+            response = await self._complete_turn(
+                bot_id, user_id, turn, response_text, response_metadata
             )
+            yield {"type": "done", **response.model_dump(mode="json")}
             
-            # Step 9: Generate response using configured LLM
-            response_text, response_metadata = await self._generate_response(
-                bot, user_id, prompt
-            )
+        except Exception as e:
+            logger.error(f"Chat streaming failed for bot {bot_id}: {e}")
+            detail = e.detail if isinstance(e, HTTPException) else str(e)
+            yield {"type": "error", "detail": f"Failed to generate response: {detail}"}
+    
+    async def stream_reply(
+        self,
+        bot: Bot,
+        user_id: uuid.UUID,
+        history: List[HistoryEntry],
+        user_input: str
+    ) -> AsyncIterator[str]:
+        """
+        Stream a response to a message whose history is kept by the caller.
+        
+        Runs the same retrieval decision, retrieval and prompt budgeting as
+        stream_message, but neither stores messages nor consults the
+        semantic response cache; channels with their own message storage,
+        like the widget WebSocket, persist the turn themselves.
+        
+        Args:
+            bot: Bot answering the message
+            user_id: User whose permissions and API key apply
+            history: Previous messages (anything with role and content), oldest first
+            user_input: Message being answered
             
-            # Step 9: Store assistant response
-            assistant_message = await self._store_assistant_message(
-                session.id, bot_id, user_id, response_text, {
-                    **response_metadata,
-                    "chunks_used": [chunk["id"] for chunk in relevant_chunks],
-                    "chunks_count": len(relevant_chunks),
-                    "prompt_length": len(prompt),
-                    **rag_metadata  # Include RAG error recovery metadata
-                }
+        Yields:
+            Response text deltas
+        """
+        relevant_chunks, rag_metadata = await self._retrieve_context(bot, user_input, history, user_id)
+        logger.info(
+            f"Streaming reply for bot {bot.id} with {len(relevant_chunks)} chunks "
+            f"(rag_enabled={rag_metadata.get('rag_enabled')})"
+        )
+        
+        max_tokens = self._get_max_output_tokens(bot)
+        prompt = await self._build_prompt(bot, history, relevant_chunks, user_input, max_tokens)
+        api_key, llm_config = await self._prepare_llm_call(bot, user_id, prompt, max_tokens)
+        
+        async for delta in self.llm_service.stream_response(
+            provider=bot.llm_provider,
+            model=bot.llm_model,
+            messages=prompt.messages,
+            api_key=api_key,
+            config=llm_config
+        ):
+            yield delta
+    
+    async def _prepare_turn(
+        self,
+        bot_id: uuid.UUID,
+        user_id: uuid.UUID,
+        chat_request: ChatRequest,
+        start_time: float
+    ) -> ChatTurn:
+        """Validate access, store the user message, retrieve context and build the prompt."""
+        # Step 1: Permission validation
+        if not self.permission_service.check_bot_permission(
+            user_id, bot_id, "view_conversations"
+        ):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="User does not have permission to chat with this bot"
             )
-            
-            processing_time = time.time() - start_time
-            
-            # Step 10: Log conversation metadata
-            await self._log_conversation_metadata(
-                bot_id, user_id, session.id, user_message.id, assistant_message.id,
-                processing_time, relevant_chunks, response_metadata
+        
+        # Step 2: Get bot configuration
+        bot = self.db.query(Bot).filter(Bot.id == bot_id).first()
+        if not bot:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Bot not found"
             )
-            
-            # Step 11: Send real-time WebSocket notifications
-            await self._send_chat_notifications(
-                bot_id, user_id, user_message, assistant_message, session.id
+        
+        # Step 3: Get or create conversation session
+        session = await self._get_or_create_session(
+            bot_id, user_id, chat_request.session_id
+        )
+        
+        # Step 4: Store user message
+        user_message = await self._store_user_message(
+            session.id, bot_id, user_id, chat_request.message
+        )
+        
+        # Step 5: Load conversation history (excluding current message) once for the
+        # classifier and the prompt
+        conversation_history = await self._get_conversation_history(
+            session.id, user_id, exclude_message_id=user_message.id
+        )
+        
+        # Step 6: Smart retrieval decision using hybrid system
+        retrieval_decision = await self._get_hybrid_retrieval_decision(
+            chat_request.message,
+            self._format_history_for_classifier(conversation_history),
+            bot,
+            user_id
+        )
+        
+        # Step 6b: Reuse the answer to a near-identical earlier question. Only
+        # standalone questions qualify, since history changes what an answer
+        # means, and only ones retrieval will embed anyway
+        query_embedding = None
+        if (
+            retrieval_decision.should_retrieve
+            and not conversation_history
+            and settings.semantic_cache_enabled
+        ):
+            query_embedding = await self._embed_query(bot, chat_request.message)
+        if query_embedding is not None:
+            match = self.semantic_cache.lookup(
+                bot.id, (bot.embedding_provider, bot.embedding_model), query_embedding
             )
-            
-            # Step 12: Send user notification if RAG fallback was used
-            if rag_metadata.get("fallback_used") and rag_metadata.get("fallback_message"):
-                await self._send_rag_fallback_notification(
-                    bot_id, user_id, session.id, rag_metadata
+            if match is not None:
+                cached_answer, similarity = match
+                logger.info(f"Semantic cache hit for bot {bot.id} (similarity {similarity:.3f})")
+                return ChatTurn(
+                    bot=bot,
+                    session=session,
+                    user_message=user_message,
+                    relevant_chunks=list(cached_answer.chunks),
+                    rag_metadata={
+                        "retrieval_decision_made": True,
+                        "should_retrieve": True,
+                        "rag_enabled": bool(cached_answer.chunks),
+                        "fallback_used": False,
+                        "degradation_reason": None,
+                        "semantic_cache_hit": True,
+                        "semantic_cache_similarity": round(similarity, 4)
+                    },
+                    prompt=PromptAssembly(messages=[], token_budget=0, estimated_tokens=0),
+                    max_tokens=0,
+                    start_time=start_time,
+                    cached_answer=cached_answer
                 )
-            
-            return ChatResponse(
-                message=response_text,
-                session_id=session.id,
-                chunks_used=[chunk["text"][:100] + "..." if len(chunk["text"]) > 100 else chunk["text"] for chunk in relevant_chunks],
-                processing_time=processing_time,
-                metadata={
-                    "user_message_id": str(user_message.id),
-                    "assistant_message_id": str(assistant_message.id),
-                    "chunks_count": len(relevant_chunks),
-                    "llm_provider": bot.llm_provider,
-                    "llm_model": bot.llm_model,
-                    **response_metadata,
-                    **rag_metadata  # Include RAG error recovery metadata
-                }
+        
+        # Step 7: Retrieve relevant document chunks if decision says we should
+        relevant_chunks, rag_metadata = await self._retrieve_context(
+            bot, chat_request.message, conversation_history, user_id,
+            query_embedding=query_embedding, retrieval_decision=retrieval_decision
+        )
+        if query_embedding is not None:
+            rag_metadata["semantic_cache_hit"] = False
+        
+        # Step 8: Build the token-budgeted message list
+        max_tokens = self._get_max_output_tokens(bot)
+        prompt = await self._build_prompt(
+            bot, conversation_history, relevant_chunks, chat_request.message, max_tokens
+        )
+        relevant_chunks = [relevant_chunks[i] for i in prompt.chunk_indices]
+        
+        return ChatTurn(
+            bot=bot,
+            session=session,
+            user_message=user_message,
+            relevant_chunks=relevant_chunks,
+            rag_metadata=rag_metadata,
+            prompt=prompt,
+            max_tokens=max_tokens,
+            start_time=start_time,
+            query_embedding=query_embedding
+        )
+    
+    async def _retrieve_context(
+        self,
+        bot: Bot,
+        query: str,
+        history: List[HistoryEntry],
+        user_id: uuid.UUID,
+        query_embedding: Optional[List[float]] = None,
+        retrieval_decision=None
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """Decide whether the query needs document context, unless already decided, and retrieve it if so."""
+        if retrieval_decision is None:
+            retrieval_decision = await self._get_hybrid_retrieval_decision(
+                query,
+                self._format_history_for_classifier(history),
+                bot,
+                user_id
             )
-            
-        except HTTPException:
-            raise
-        except Exception as e:
-            logger.error(f"Chat processing failed for bot {bot_id}: {e}")
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Failed to process chat message: {str(e)}"
+        
+        logger.info(f"Hybrid retrieval decision for bot {bot.id}: {retrieval_decision.reasoning}")
+        
+        # Initialize RAG metadata with hybrid decision info
+        rag_metadata = {
+            "retrieval_decision_made": True,
+            "should_retrieve": retrieval_decision.should_retrieve,
+            "query_type": retrieval_decision.query_type.value,
+            "decision_confidence": retrieval_decision.confidence,
+            "decision_reasoning": retrieval_decision.reasoning,
+            "rag_enabled": retrieval_decision.should_retrieve,
+            "fallback_used": not retrieval_decision.should_retrieve,
+            "degradation_reason": None if retrieval_decision.should_retrieve else "smart_decision_skip",
+            "hybrid_mode": retrieval_decision.metadata.get("hybrid_mode") if hasattr(retrieval_decision, "metadata") else None
+        }
+        
+        relevant_chunks = []
+        if retrieval_decision.should_retrieve:
+            try:
+                relevant_chunks, retrieval_metadata = await self._retrieve_relevant_chunks_with_recovery(
+                    bot, query, user_id, query_embedding=query_embedding
+                )
+                # Merge retrieval metadata
+                rag_metadata.update(retrieval_metadata)
+            except Exception as e:
+                logger.error(f"Retrieval failed even though decision was to retrieve: {e}")
+                # Update metadata to reflect the failure
+                rag_metadata.update({
+                    "retrieval_failed_after_decision": True,
+                    "retrieval_error": str(e),
+                    "rag_enabled": False,
+                    "fallback_used": True,
+                    "degradation_reason": "retrieval_failed_post_decision"
+                })
+        
+        return relevant_chunks, rag_metadata
+    
+    async def _complete_turn(
+        self,
+        bot_id: uuid.UUID,
+        user_id: uuid.UUID,
+        turn: ChatTurn,
+        response_text: str,
+        response_metadata: Dict[str, Any]
+    ) -> ChatResponse:
+        """Store the assistant response, log and notify, and build the ChatResponse."""
+        # Step 10: Store assistant response
+        assistant_message = await self._store_assistant_message(
+            turn.session.id, bot_id, user_id, response_text, {
+                **response_metadata,
+                "chunks_used": [chunk["id"] for chunk in turn.relevant_chunks],
+                "chunks_count": len(turn.relevant_chunks),
+                "prompt_length": sum(len(m.content) for m in turn.prompt.messages),
+                **turn.rag_metadata  # Include RAG error recovery metadata
+            }
+        )
+        
+        # Answers produced by a degraded pipeline are not worth reusing
+        if (
+            turn.query_embedding is not None
+            and response_text
+            and turn.rag_metadata.get("degradation_reason") is None
+        ):
+            self.semantic_cache.store(
+                turn.bot.id,
+                (turn.bot.embedding_provider, turn.bot.embedding_model),
+                turn.query_embedding,
+                turn.user_message.content,
+                response_text,
+                turn.relevant_chunks
+            )
+        
+        processing_time = time.time() - turn.start_time
+        
+        # Step 11: Log conversation metadata
+        await self._log_conversation_metadata(
+            bot_id, user_id, turn.session.id, turn.user_message.id, assistant_message.id,
+            processing_time, turn.relevant_chunks, response_metadata
+        )
+        
+        # Step 12: Send real-time WebSocket notifications
+        await self._send_chat_notifications(
+            bot_id, user_id, turn.user_message, assistant_message, turn.session.id
+        )
+        
+        # Step 13: Send user notification if RAG fallback was used
+        if turn.rag_metadata.get("fallback_used") and turn.rag_metadata.get("fallback_message"):
+            await self._send_rag_fallback_notification(
+                bot_id, user_id, turn.session.id, turn.rag_metadata
             )
+        
+        return ChatResponse(
+            message=response_text,
+            session_id=turn.session.id,
+            chunks_used=[chunk["text"][:100] + "..." if len(chunk["text"]) > 100 else chunk["text"] for chunk in turn.relevant_chunks],
+            processing_time=processing_time,
+            metadata={
+                "user_message_id": str(turn.user_message.id),
+                "assistant_message_id": str(assistant_message.id),
+                "chunks_count": len(turn.relevant_chunks),
+                "llm_provider": turn.bot.llm_provider,
+                "llm_model": turn.bot.llm_model,
+                **response_metadata,
+                **turn.rag_metadata  # Include RAG error recovery metadata
+            }
+        )
     
     async def _send_rag_fallback_notification(
         self,
@@ -464,7 +775,7 @@ class ChatService:
         router = AdaptiveRoutingStrategy()
         decision = router.determine_retrieval_strategy(
             characteristics=characteristics,
-            available_documents=await self._get_document_count(bot.id),
+            available_documents=(await self._get_retrieval_profile(bot)).document_count,
             system_load=0.5  # Could be dynamically determined
         )
         
@@ -482,23 +793,97 @@ class ChatService:
             }
         )
     
-    async def _get_document_count(self, bot_id: uuid.UUID) -> int:
-        """Get count of documents for a bot."""
+    async def _get_retrieval_profile(self, bot: Bot) -> BotRetrievalProfile:
+        """
+        Get the bot's cached retrieval profile, building it on a miss.
+        
+        Building runs the document count, collection checks and embedding model
+        validation that retrieval needs; afterwards a chat turn goes straight
+        to embedding the query and searching.
+        """
+        profile = self.retrieval_profiles.get_profile(bot.id)
+        if profile is not None:
+            return profile
+        
+        from ..models.document import Document
         try:
-            from ..models.document import Document
-            return self.db.query(Document).filter(Document.bot_id == bot_id).count()
-        except Exception:
-            return 0
+            document_count = self.db.query(Document).filter(Document.bot_id == bot.id).count()
+        except Exception as e:
+            logger.error(f"Failed to check documents for bot {bot.id}: {e}")
+            document_count = 0
+        
+        collection_name = str(bot.id)
+        collection_exists = False
+        stored_dimension = None
+        inspected = True
+        if document_count:
+            try:
+                collection_exists = await self.vector_service.vector_store.collection_exists(collection_name)
+                if collection_exists:
+                    collection_info = await self.vector_service.get_bot_collection_stats(collection_name)
+                    stored_dimension = collection_info.get('config', {}).get('vector_size') or None
+            except Exception as e:
+                logger.warning(f"Could not inspect vector collection for bot {bot.id}: {e}")
+                inspected = False
+        
+        # Validate embedding model compatibility once per profile
+        embedding_model = bot.embedding_model
+        expected_dimension = None
+        if not self.embedding_service.validate_model_for_provider(bot.embedding_provider, embedding_model):
+            logger.warning(f"Model {embedding_model} not valid for provider {bot.embedding_provider}, using default")
+            # Get default model for provider
+            available_models = self.embedding_service.get_available_models(bot.embedding_provider)
+            if available_models:
+                embedding_model = available_models[0]
+                logger.info(f"Using default model {embedding_model} for provider {bot.embedding_provider}")
+                
+                # Update bot's embedding model in database for future use
+                bot.embedding_model = embedding_model
+                self.db.commit()
+            else:
+                logger.error(f"No available models for provider {bot.embedding_provider}")
+                embedding_model = None
+        if embedding_model:
+            expected_dimension = self.embedding_service.get_embedding_dimension(bot.embedding_provider, embedding_model)
+        
+        # Determine threshold for current provider/model
+        score_threshold = self.similarity_thresholds.get(bot.embedding_provider, {}).get(
+            embedding_model,
+            self.default_similarity_threshold,
+        )
+        
+        profile = BotRetrievalProfile(
+            bot_id=bot.id,
+            document_count=document_count,
+            collection_name=collection_name,
+            collection_exists=collection_exists,
+            stored_dimension=stored_dimension,
+            embedding_provider=bot.embedding_provider,
+            embedding_model=embedding_model,
+            expected_dimension=expected_dimension,
+            score_threshold=score_threshold
+        )
+        # Don't pin a transient vector store failure for the whole TTL
+        if inspected:
+            self.retrieval_profiles.set_profile(profile)
+        return profile
     
     async def _retrieve_relevant_chunks_with_recovery(
         self,
         bot: Bot,
         query: str,
-        user_id: uuid.UUID
+        user_id: uuid.UUID,
+        query_embedding: Optional[List[float]] = None
     ) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
         """
         Retrieve relevant document chunks using hybrid retrieval system.
         
+        Args:
+            bot: Bot to search
+            query: User query
+            user_id: User identifier
+            query_embedding: Query embedding already generated this turn, if any
+        
         Returns:
             Tuple of (chunks, metadata) where metadata includes retrieval information
         """
@@ -516,7 +901,7 @@ class ChatService:
         }
         
         try:
-            chunks = await self._retrieve_relevant_chunks(bot, query)
+            chunks = await self._retrieve_relevant_chunks(bot, query, query_embedding)
             return chunks, recovery_metadata
             
         except Exception as e:
@@ -727,125 +1112,47 @@ class ChatService:
     async def _retrieve_relevant_chunks(
         self,
         bot: Bot,
-        query: str
+        query: str,
+        query_embedding: Optional[List[float]] = None
     ) -> List[Dict[str, Any]]:
         """Retrieve relevant document chunks using semantic search."""
         try:
             logger.info(f"Starting RAG retrieval for bot {bot.id} with query: '{query[:50]}...' using embedding provider {bot.embedding_provider}")
             
+            profile = await self._get_retrieval_profile(bot)
+            
             # Check if bot has documents uploaded
-            if not await self._bot_has_documents(bot.id):
+            if not profile.has_documents:
                 logger.info(f"Bot {bot.id} has no documents uploaded, skipping RAG retrieval")
                 return []
             
             # Check if vector collection exists first
-            if not await self.vector_service.vector_store.collection_exists(str(bot.id)):
+            if not profile.collection_exists:
                 logger.warning(f"Vector collection for bot {bot.id} does not exist, skipping RAG retrieval")
                 return []
             
-            # Generate query embedding with comprehensive error handling
-            try:
-                # Get API key from bot owner
-                user_api_key = self.user_service.get_user_api_key(bot.owner_id, bot.embedding_provider)
-                logger.info(f"Retrieved API key for embedding provider {bot.embedding_provider} from bot owner")
-                
-                # FIXED: Validate embedding model compatibility and dimensions
-                embedding_model = bot.embedding_model
-                if not self.embedding_service.validate_model_for_provider(bot.embedding_provider, embedding_model):
-                    logger.warning(f"Model {embedding_model} not valid for provider {bot.embedding_provider}, using default")
-                    # Get default model for provider
-                    available_models = self.embedding_service.get_available_models(bot.embedding_provider)
-                    if available_models:
-                        embedding_model = available_models[0]
-                        logger.info(f"Using default model {embedding_model} for provider {bot.embedding_provider}")
-                        
-                        # Update bot's embedding model in database for future use
-                        bot.embedding_model = embedding_model
-                        self.db.commit()
-                    else:
-                        logger.error(f"No available models for provider {bot.embedding_provider}")
-                        return []
-                
-                # FIXED: Verify embedding dimensions match stored embeddings
-                expected_dimension = self.embedding_service.get_embedding_dimension(bot.embedding_provider, embedding_model)
-                logger.info(f"Expected embedding dimension: {expected_dimension}")
-                
-                # Get collection info to verify dimensions match
-                try:
-                    collection_info = await self.vector_service.get_bot_collection_stats(str(bot.id))
-                    stored_dimension = collection_info.get('config', {}).get('vector_size', 0)
-                    
-                    if stored_dimension != expected_dimension:
-                        logger.error(
-                            f"Dimension mismatch: stored={stored_dimension}, expected={expected_dimension}"
-                        )
-                        error_msg = (
-                            "Embedding dimension mismatch detected. Documents were processed with "
-                            f"{stored_dimension}D embeddings, but current model expects {expected_dimension}D. "
-                            "Please reprocess documents or change embedding model."
-                        )
-                        raise HTTPException(
-                            status_code=status.HTTP_409_CONFLICT,
-                            detail={
-                                "error": "dimension_mismatch",
-                                "message": error_msg,
-                                "stored_dimension": stored_dimension,
-                                "expected_dimension": expected_dimension,
-                                "remediation": [
-                                    "Reprocess all documents with current embedding model",
-                                    "Or change bot's embedding model to match stored embeddings",
-                                ],
-                            },
-                        )
-                    
-                    logger.info(f"Embedding dimensions match: {expected_dimension}")
-                    
-                except Exception as dim_error:
-                    logger.warning(f"Could not verify embedding dimensions: {dim_error}")
-                    # Continue anyway, but log the issue
-                
-                # Generate embedding with retry logic
-                logger.info(f"Generating embedding for query using {bot.embedding_provider}/{embedding_model}")
-                query_embedding = await self.embedding_service.generate_single_embedding(
-                    provider=bot.embedding_provider,
-                    text=query,
-                    model=embedding_model,
-                    api_key=user_api_key
+            if not profile.embedding_model:
+                return []
+            
+            # Stored vectors of another size cannot be searched with this model
+            if profile.dimension_mismatch:
+                logger.error(
+                    f"Dimension mismatch for bot {bot.id}: stored={profile.stored_dimension}, "
+                    f"expected={profile.expected_dimension}. Reprocess documents or change embedding model."
                 )
-                
-                if not query_embedding:
-                    logger.error(f"Empty embedding generated for bot {bot.id}")
-                    return []
-                
-                logger.info(f"Generated query embedding with {len(query_embedding)} dimensions using {bot.embedding_provider}/{embedding_model}")
-                
-                # FIXED: Verify query embedding dimension matches expected
-                if len(query_embedding) != expected_dimension:
-                    logger.error(f"Query embedding dimension mismatch: got {len(query_embedding)}, expected {expected_dimension}")
-                    return []
-                
-            except HTTPException as http_error:
-                logger.error(f"HTTP error generating embedding for bot {bot.id}: {http_error.detail}")
-                # FIXED: Provide more specific error information
-                if "API key" in str(http_error.detail):
-                    logger.error(f"Bot owner needs to configure API key for embedding provider: {bot.embedding_provider}")
                 return []
-            except Exception as embedding_error:
-                logger.error(f"Failed to generate embedding for bot {bot.id}: {embedding_error}")
-                import traceback
-                logger.error(f"Embedding error traceback: {traceback.format_exc()}")
+            
+            # Reuse the embedding generated for the semantic cache lookup
+            if query_embedding is None:
+                query_embedding = await self._embed_query(bot, query, profile)
+            if query_embedding is None:
                 return []
             
             # Search for relevant chunks with improved error handling
             try:
                 logger.info(f"Searching vector store for bot {bot.id} with {len(query_embedding)} dimensional embedding")
-                # Determine threshold for current provider/model
-                provider_thresholds = self.similarity_thresholds.get(bot.embedding_provider, {})
-                score_threshold = provider_thresholds.get(
-                    embedding_model,
-                    self.default_similarity_threshold,
-                )
-
+                score_threshold = profile.score_threshold
+                
                 relevant_chunks = await self.vector_service.search_relevant_chunks(
                     bot_id=str(bot.id),
                     query_embedding=query_embedding,
@@ -862,30 +1169,9 @@ class ChatService:
                         logger.info(f"Chunk {i+1} (score: {chunk.get('score', 'N/A')}): {preview}")
                 else:
                     logger.info(f"No relevant chunks found for bot {bot.id} with similarity threshold {score_threshold}")
-                    # FIXED: Lower similarity threshold temporarily to see if there are any matches
-                    logger.info(f"Trying with lower similarity threshold (0.5) to debug...")
-                    debug_chunks = await self.vector_service.search_relevant_chunks(
-                        bot_id=str(bot.id),
-                        query_embedding=query_embedding,
-                        top_k=self.max_retrieved_chunks,
-                        score_threshold=0.5
-                    )
-                    if debug_chunks:
-                        logger.info(f"Found {len(debug_chunks)} chunks with lower threshold. Top score: {debug_chunks[0].get('score', 'N/A')}")
-                    else:
-                        logger.info("No chunks found even with lower threshold - trying without threshold...")
-                        # Try without any threshold to see if there are ANY chunks
-                        no_threshold_chunks = await self.vector_service.search_relevant_chunks(
-                            bot_id=str(bot.id),
-                            query_embedding=query_embedding,
-                            top_k=self.max_retrieved_chunks,
-                            score_threshold=None
-                        )
-                        if no_threshold_chunks:
-                            logger.info(f"Found {len(no_threshold_chunks)} chunks without threshold. Top score: {no_threshold_chunks[0].get('score', 'N/A')}")
-                            logger.warning(f"Similarity scores are very low. Consider lowering similarity_threshold from {self.similarity_threshold}")
-                        else:
-                            logger.error("No chunks found at all - possible embedding/indexing issue or empty collection")
+                    # Probing lower thresholds costs extra searches, so only do it when debugging
+                    if logger.isEnabledFor(logging.DEBUG):
+                        await self._log_low_score_matches(bot, query_embedding)
                 
                 return relevant_chunks
                 
@@ -905,6 +1191,76 @@ class ChatService:
             # Return empty list if retrieval fails - bot can still respond without RAG
             return []
     
+    async def _embed_query(
+        self,
+        bot: Bot,
+        query: str,
+        profile: Optional[BotRetrievalProfile] = None
+    ) -> Optional[List[float]]:
+        """
+        Embed a query with the bot's embedding model.
+        
+        Args:
+            bot: Bot whose documents the query will be searched against
+            query: User query
+            profile: Bot's retrieval profile, loaded if not given
+            
+        Returns:
+            Query embedding, or None if the bot's documents cannot be searched
+            or embedding failed
+        """
+        if profile is None:
+            profile = await self._get_retrieval_profile(bot)
+        if (
+            not profile.has_documents
+            or not profile.collection_exists
+            or not profile.embedding_model
+            or profile.dimension_mismatch
+        ):
+            return None
+        
+        embedding_model = profile.embedding_model
+        expected_dimension = profile.expected_dimension
+        
+        # Generate query embedding with comprehensive error handling
+        try:
+            # Get API key from bot owner
+            user_api_key = self.user_service.get_user_api_key(bot.owner_id, bot.embedding_provider)
+            
+            # Generate embedding with retry logic
+            logger.info(f"Generating embedding for query using {bot.embedding_provider}/{embedding_model}")
+            query_embedding = await self.embedding_service.generate_single_embedding(
+                provider=bot.embedding_provider,
+                text=query,
+                model=embedding_model,
+                api_key=user_api_key
+            )
+            
+            if not query_embedding:
+                logger.error(f"Empty embedding generated for bot {bot.id}")
+                return None
+            
+            logger.info(f"Generated query embedding with {len(query_embedding)} dimensions using {bot.embedding_provider}/{embedding_model}")
+            
+            # FIXED: Verify query embedding dimension matches expected
+            if len(query_embedding) != expected_dimension:
+                logger.error(f"Query embedding dimension mismatch: got {len(query_embedding)}, expected {expected_dimension}")
+                return None
+            
+        except HTTPException as http_error:
+            logger.error(f"HTTP error generating embedding for bot {bot.id}: {http_error.detail}")
+            # FIXED: Provide more specific error information
+            if "API key" in str(http_error.detail):
+                logger.error(f"Bot owner needs to configure API key for embedding provider: {bot.embedding_provider}")
+            return None
+        except Exception as embedding_error:
+            logger.error(f"Failed to generate embedding for bot {bot.id}: {embedding_error}")
+            import traceback
+            logger.error(f"Embedding error traceback: {traceback.format_exc()}")
+            return None
+        
+        return query_embedding
+    
     async def _bot_has_documents(self, bot_id: uuid.UUID) -> bool:
         """Check if bot has any documents uploaded."""
         try:
@@ -915,28 +1271,50 @@ class ChatService:
             logger.error(f"Failed to check documents for bot {bot_id}: {e}")
             return False
     
+    async def _log_low_score_matches(self, bot: Bot, query_embedding: List[float]):
+        """Log what lower similarity thresholds would have matched."""
+        logger.debug(f"Trying with lower similarity threshold (0.5) to debug...")
+        debug_chunks = await self.vector_service.search_relevant_chunks(
+            bot_id=str(bot.id),
+            query_embedding=query_embedding,
+            top_k=self.max_retrieved_chunks,
+            score_threshold=0.5
+        )
+        if debug_chunks:
+            logger.debug(f"Found {len(debug_chunks)} chunks with lower threshold. Top score: {debug_chunks[0].get('score', 'N/A')}")
+            return
+        
+        logger.debug("No chunks found even with lower threshold - trying without threshold...")
+        # Try without any threshold to see if there are ANY chunks
+        no_threshold_chunks = await self.vector_service.search_relevant_chunks(
+            bot_id=str(bot.id),
+            query_embedding=query_embedding,
+            top_k=self.max_retrieved_chunks,
+            score_threshold=None
+        )
+        if no_threshold_chunks:
+            logger.debug(f"Found {len(no_threshold_chunks)} chunks without threshold. Top score: {no_threshold_chunks[0].get('score', 'N/A')}")
+            logger.warning(f"Similarity scores are very low. Consider lowering similarity_threshold from {self.default_similarity_threshold}")
+        else:
+            logger.error("No chunks found at all - possible embedding/indexing issue or empty collection")
+    
     async def _get_conversation_history(
         self,
         session_id: uuid.UUID,
         user_id: uuid.UUID,
-        exclude_current_message: Optional[str] = None
-    ) -> List[Message]:
-        """Get recent conversation history for context."""
+        exclude_message_id: Optional[uuid.UUID] = None
+    ) -> List[HistoryEntry]:
+        """Get recent conversation history for context, oldest first."""
         try:
-            # Get more messages than needed to account for filtering
-            messages = self.conversation_service.get_session_messages(
-                session_id, user_id, limit=self.max_history_messages * 2
+            # The session was resolved for this user when the turn started
+            messages = self.conversation_service.get_recent_history(
+                session_id, limit=self.max_history_messages + 1
             )
             
-            # Filter out the current user message if provided
-            if exclude_current_message:
-                messages = [msg for msg in messages if msg.content != exclude_current_message or msg.role != "user"]
-            
-            # Sort messages in chronological order (oldest first)
-            sorted_messages = sorted(messages, key=lambda m: m.created_at)
-            
-            # Take the most recent messages up to the limit (excluding the very last one which might be the current message)
-            recent_messages = sorted_messages[-self.max_history_messages:] if len(sorted_messages) > self.max_history_messages else sorted_messages
+            # Leave out the current user message if provided
+            if exclude_message_id:
+                messages = [msg for msg in messages if msg.id != exclude_message_id]
+            recent_messages = messages[-self.max_history_messages:]
             
             logger.info(f"Retrieved {len(recent_messages)} messages from conversation history for session {session_id}")
             
@@ -946,155 +1324,68 @@ class ChatService:
             logger.error(f"Failed to get conversation history for session {session_id}: {e}")
             return []
     
-    async def _get_conversation_history_for_classifier(
-        self,
-        session_id: uuid.UUID,
-        user_id: uuid.UUID,
-        exclude_current_message: Optional[str] = None
-    ) -> List[Dict[str, str]]:
-        """Get conversation history formatted for the query classifier."""
+    def _format_history_for_classifier(self, history: List[HistoryEntry]) -> List[Dict[str, str]]:
+        """Format the last few history messages as the role/content dicts the classifier expects."""
+        return [{"role": msg.role, "content": msg.content} for msg in history[-5:]]
+    
+    def _get_model_limits(self, bot: Bot) -> Tuple[Optional[int], int]:
+        """Get the model's default max output tokens (None if unknown) and context window."""
         try:
-            # Get messages for classifier (fewer messages needed)
-            messages = await self._get_conversation_history(
-                session_id, user_id, exclude_current_message
+            provider_instance = self.llm_service.factory.get_provider(bot.llm_provider)
+            return (
+                provider_instance.get_model_max_tokens(bot.llm_model),
+                provider_instance.get_model_context_window(bot.llm_model)
             )
-            
-            # Format for classifier - it expects a list of dicts with 'role' and 'content'
-            formatted_history = []
-            for msg in messages[-5:]:  # Only last 5 messages for context
-                formatted_history.append({
-                    "role": msg.role,
-                    "content": msg.content
-                })
-            
-            return formatted_history
-            
         except Exception as e:
-            logger.error(f"Failed to get conversation history for classifier: {e}")
-            return []
+            logger.warning(f"Failed to get model-specific token limits: {e}")
+            return None, 8192
+    
+    def _get_max_output_tokens(self, bot: Bot) -> int:
+        """Tokens to reserve for the response: the bot setting, or the model default."""
+        max_tokens = bot.max_tokens
+        if max_tokens == 1000:  # Default value, use model-specific
+            model_max_tokens, _ = self._get_model_limits(bot)
+            if model_max_tokens:
+                max_tokens = model_max_tokens
+        return max_tokens
     
     async def _build_prompt(
         self,
         bot: Bot,
-        history: List[Message],
+        history: List[HistoryEntry],
         chunks: List[Dict[str, Any]],
-        user_input: str
-    ) -> str:
-        """Build the complete prompt with system prompt, context, history, and user input."""
-        prompt_parts = []
-        
-        # System prompt
-        prompt_parts.append(f"System: {bot.system_prompt}")
-        
-        # Add retrieved document context if available
-        if chunks:
-            context_text = "\n\n".join([
-                f"Document Context {i+1}:\n{chunk['text']}"
-                for i, chunk in enumerate(chunks)
-            ])
-            prompt_parts.append(f"\nRelevant Context:\n{context_text}")
-        
-        # Add conversation history - FIXED: Ensure we get the full history excluding current message
-        if history:
-            # Filter out the current user message if it's already in history
-            filtered_history = [msg for msg in history if msg.content != user_input or msg.role != "user"]
-            
-            # Take the most recent messages for context
-            recent_history = filtered_history[-self.max_history_messages:] if len(filtered_history) > self.max_history_messages else filtered_history
-            
-            if recent_history:
-                history_text = "\n".join([
-                    f"{msg.role.title()}: {msg.content}"
-                    for msg in recent_history
-                ])
-                prompt_parts.append(f"\nConversation History:\n{history_text}")
-        
-        # Add current user input
-        prompt_parts.append(f"\nUser: {user_input}")
-        prompt_parts.append("\nAssistant:")
-        
-        # Join and truncate if necessary
-        full_prompt = "\n".join(prompt_parts)
-        
-        # Improved prompt length management
-        if len(full_prompt) > self.max_prompt_length:
-            logger.warning(f"Prompt length {len(full_prompt)} exceeds maximum {self.max_prompt_length}, truncating...")
-            
-            # Priority order: System prompt > Current user input > Document context > History
-            system_part = prompt_parts[0]
-            user_part = f"\nUser: {user_input}\nAssistant:"
-            
-            # Calculate base length
-            base_length = len(system_part) + len(user_part) + 50  # Extra buffer
-            remaining_length = self.max_prompt_length - base_length
-            
-            context_part = ""
-            history_part = ""
-            
-            # Add context if there's space
-            if chunks and remaining_length > 200:
-                context_text = "\n\n".join([
-                    f"Document Context {i+1}:\n{chunk['text']}"
-                    for i, chunk in enumerate(chunks)
-                ])
-                full_context = f"\nRelevant Context:\n{context_text}"
-                
-                if len(full_context) <= remaining_length // 2:  # Use up to half remaining space for context
-                    context_part = full_context
-                    remaining_length -= len(context_part)
-                else:
-                    # Truncate context to fit
-                    available_context = remaining_length // 2
-                    truncated_context = context_text[:available_context-50] + "...\n[Context truncated]"
-                    context_part = f"\nRelevant Context:\n{truncated_context}"
-                    remaining_length -= len(context_part)
-            
-            # Add history if there's remaining space
-            if history and remaining_length > 100:
-                filtered_history = [msg for msg in history if msg.content != user_input or msg.role != "user"]
-                recent_history = filtered_history[-self.max_history_messages:] if len(filtered_history) > self.max_history_messages else filtered_history
-                
-                if recent_history:
-                    history_text = "\n".join([
-                        f"{msg.role.title()}: {msg.content}"
-                        for msg in recent_history
-                    ])
-                    full_history = f"\nConversation History:\n{history_text}"
-                    
-                    if len(full_history) <= remaining_length:
-                        history_part = full_history
-                    else:
-                        # Truncate history to fit, keeping most recent messages
-                        available_history = remaining_length - 50
-                        truncated_history = history_text[:available_history] + "...\n[History truncated]"
-                        history_part = f"\nConversation History:\n{truncated_history}"
-            
-            # Rebuild prompt with available parts
-            full_prompt = system_part + context_part + history_part + user_part
-            
-            logger.info(f"Truncated prompt to length {len(full_prompt)} (context: {len(context_part)}, history: {len(history_part)})")
+        user_input: str,
+        max_tokens: int
+    ) -> PromptAssembly:
+        """Build the message list with system prompt, context, history, and user input within the model's token budget."""
+        _, context_window = self._get_model_limits(bot)
+        budget = self.prompt_budgeter.input_budget(context_window, max_tokens)
         
-        return full_prompt
+        return self.prompt_budgeter.assemble(
+            system_prompt=bot.system_prompt,
+            chunks=[chunk['text'] for chunk in chunks],
+            history=[
+                ChatMessage(role=msg.role, content=msg.content)
+                for msg in history[-self.max_history_messages:]
+            ],
+            user_input=user_input,
+            budget=budget
+        )
     
-    async def _generate_response(
+    async def _prepare_llm_call(
         self,
         bot: Bot,
         user_id: uuid.UUID,
-        prompt: str
+        prompt: PromptAssembly,
+        max_tokens: int
     ) -> Tuple[str, Dict[str, Any]]:
-        """Generate response using the configured LLM provider."""
+        """Resolve the API key and generation config for a prompt."""
         # Get API key using unified strategy with fallback
         user_api_key = await self._get_unified_api_key(bot.id, user_id, bot.llm_provider)
         
-        # Get model-specific max tokens if bot's max_tokens is default
-        max_tokens = bot.max_tokens
-        if max_tokens == 1000:  # Default value, use model-specific
-            try:
-                provider_instance = self.llm_service.factory.get_provider(bot.llm_provider)
-                max_tokens = provider_instance.get_model_max_tokens(bot.llm_model)
-            except Exception as e:
-                logger.warning(f"Failed to get model-specific max tokens: {e}")
-                max_tokens = bot.max_tokens  # Fall back to bot setting
+        # Never ask for more output than the context window has left after the prompt
+        _, context_window = self._get_model_limits(bot)
+        max_tokens = max(1, min(max_tokens, context_window - prompt.estimated_tokens))
         
         # Prepare LLM configuration
         llm_config = {
@@ -1105,24 +1396,51 @@ class ChatService:
             "presence_penalty": bot.presence_penalty
         }
         
+        return user_api_key, llm_config
+    
+    def _get_response_metadata(
+        self,
+        bot: Bot,
+        llm_config: Dict[str, Any],
+        prompt: PromptAssembly,
+        response_text: str
+    ) -> Dict[str, Any]:
+        """Describe a generated response for message metadata."""
+        return {
+            "llm_provider": bot.llm_provider,
+            "llm_model": bot.llm_model,
+            "llm_config": llm_config,
+            "response_length": len(response_text),
+            **prompt.to_metadata()
+        }
+    
+    def _get_cached_response_metadata(self, cached_answer: CachedAnswer) -> Dict[str, Any]:
+        """Describe a response reused from the semantic cache for message metadata."""
+        return {
+            "response_length": len(cached_answer.response),
+            "semantic_cache_answered_at": datetime.fromtimestamp(cached_answer.created_at, timezone.utc).isoformat()
+        }
+    
+    async def _generate_response(
+        self,
+        bot: Bot,
+        user_id: uuid.UUID,
+        prompt: PromptAssembly,
+        max_tokens: int
+    ) -> Tuple[str, Dict[str, Any]]:
+        """Generate response using the configured LLM provider."""
+        user_api_key, llm_config = await self._prepare_llm_call(bot, user_id, prompt, max_tokens)
+        
         # Generate response
         response_text = await self.llm_service.generate_response(
             provider=bot.llm_provider,
             model=bot.llm_model,
-            prompt=prompt,
+            messages=prompt.messages,
             api_key=user_api_key,
             config=llm_config
         )
         
-        # Prepare metadata
-        metadata = {
-            "llm_provider": bot.llm_provider,
-            "llm_model": bot.llm_model,
-            "llm_config": llm_config,
-            "response_length": len(response_text)
-        }
-        
-        return response_text, metadata
+        return response_text, self._get_response_metadata(bot, llm_config, prompt, response_text)
     
     async def _get_unified_api_key(
         self,
@@ -1289,11 +1607,12 @@ class ChatService:
         query: str,
         bot_id: Optional[uuid.UUID] = None,
         limit: int = 50,
-        offset: int = 0
+        offset: int = 0,
+        cursor: Optional[Tuple[datetime, uuid.UUID]] = None
     ) -> List[Dict[str, Any]]:
         """Search conversations across user's accessible bots."""
         return self.conversation_service.search_conversations(
-            user_id, query, bot_id, limit, offset
+            user_id, query, bot_id, limit, offset, cursor
         )
     
     async def _send_chat_notifications(
@@ -1465,6 +1784,10 @@ class ChatService:
     
     async def close(self):
         """Close all service connections and clean up resources."""
+        if not self._owns_shared_components:
+            # Pooled components belong to the ServiceContainer and outlive this request
+            return
+
         try:
             # Close hybrid components
             await self.cache_manager.close()
@@ -21,9 +21,16 @@ from ..core.database import get_db
 from ..models.document import Document, DocumentChunk
 from ..models.bot import Bot
 from ..services.vector_store import VectorService
+from ..utils.minhash import build_lsh_index, compute_minhash_signature, decode_signature
 
 logger = logging.getLogger(__name__)
 
+# Chunks signed per batch when backfilling missing MinHash signatures
+SIGNATURE_BACKFILL_BATCH_SIZE = 500
+
+# Chunks loaded per IN query when fetching candidate pairs for exact scoring
+CANDIDATE_LOAD_BATCH_SIZE = 1000
+
 
 @dataclass
 class ChunkSimilarity:
@@ -189,6 +196,9 @@ class ChunkDeduplicationService:
         """
         Detect similarities between chunks based on content analysis.
         
+        Candidate pairs come from an LSH index over the chunks' MinHash
+        signatures; only those pairs are scored exactly.
+        
         Args:
             bot_id: Bot identifier
             chunk_ids: Optional list of specific chunk IDs to analyze
@@ -200,26 +210,54 @@ class ChunkDeduplicationService:
         try:
             threshold = similarity_threshold or self.config.low_similarity_threshold
             
-            # Query chunks to analyze
-            query = self.db.query(DocumentChunk).filter(DocumentChunk.bot_id == bot_id)
+            # Query chunk signatures; content is only loaded for candidate pairs
+            query = self.db.query(
+                DocumentChunk.id, DocumentChunk.minhash_signature
+            ).filter(DocumentChunk.bot_id == bot_id)
             
             if chunk_ids:
                 query = query.filter(DocumentChunk.id.in_(chunk_ids))
             
-            chunks = query.all()
+            rows = query.all()
             
-            if len(chunks) < 2:
+            if len(rows) < 2:
                 return []
             
+            signatures = {}
+            unsigned_ids = []
+            for chunk_id, raw_signature in rows:
+                signature = decode_signature(raw_signature)
+                if signature is None:
+                    unsigned_ids.append(chunk_id)
+                else:
+                    signatures[chunk_id] = signature
+            
+            if unsigned_ids:
+                signatures.update(await self._backfill_signatures(unsigned_ids))
+            
+            # Only chunks sharing an LSH band are compared, instead of every pair
+            loop = asyncio.get_running_loop()
+            candidate_pairs = await loop.run_in_executor(
+                None, lambda: build_lsh_index(signatures.items()).candidate_pairs()
+            )
+            
+            chunks = self._load_chunks({
+                chunk_id for pair in candidate_pairs for chunk_id in pair
+            })
+            
             similarities = []
             
-            # Compare each pair of chunks
-            for i, chunk1 in enumerate(chunks):
-                for chunk2 in chunks[i + 1:]:
-                    similarity = await self._analyze_chunk_pair(chunk1, chunk2)
-                    
-                    if similarity.similarity_score >= threshold:
-                        similarities.append(similarity)
+            # Score each candidate pair exactly
+            for chunk1_id, chunk2_id in candidate_pairs:
+                similarity = await self._analyze_chunk_pair(chunks[chunk1_id], chunks[chunk2_id])
+                
+                if similarity.similarity_score >= threshold:
+                    similarities.append(similarity)
+            
+            logger.debug(
+                f"Scored {len(candidate_pairs)} LSH candidate pairs out of "
+                f"{len(rows) * (len(rows) - 1) // 2} chunk pairs for bot {bot_id}"
+            )
             
             # Sort by similarity score (highest first)
             similarities.sort(key=lambda x: x.similarity_score, reverse=True)
@@ -235,6 +273,61 @@ class ChunkDeduplicationService:
             logger.error(f"Error detecting chunk similarities for bot {bot_id}: {e}")
             return []
     
+    async def _backfill_signatures(self, chunk_ids: List[UUID]) -> Dict[UUID, Any]:
+        """
+        Compute and store MinHash signatures for chunks created before they existed.
+        
+        Args:
+            chunk_ids: Chunks without a stored signature
+            
+        Returns:
+            Dictionary mapping chunk ID to its decoded signature
+        """
+        loop = asyncio.get_running_loop()
+        signatures = {}
+        
+        for i in range(0, len(chunk_ids), SIGNATURE_BACKFILL_BATCH_SIZE):
+            rows = self.db.query(DocumentChunk.id, DocumentChunk.content).filter(
+                DocumentChunk.id.in_(chunk_ids[i:i + SIGNATURE_BACKFILL_BATCH_SIZE])
+            ).all()
+            
+            raw_signatures = await loop.run_in_executor(
+                None, lambda: [compute_minhash_signature(content) for _, content in rows]
+            )
+            
+            self.db.bulk_update_mappings(DocumentChunk, [
+                {'id': chunk_id, 'minhash_signature': raw_signature}
+                for (chunk_id, _), raw_signature in zip(rows, raw_signatures)
+            ])
+            self.db.commit()
+            
+            for (chunk_id, _), raw_signature in zip(rows, raw_signatures):
+                signatures[chunk_id] = decode_signature(raw_signature)
+        
+        logger.info(f"Backfilled MinHash signatures for {len(signatures)} chunks")
+        return signatures
+    
+    def _load_chunks(self, chunk_ids: Set[UUID]) -> Dict[UUID, DocumentChunk]:
+        """
+        Load chunks by ID in bounded IN queries.
+        
+        Args:
+            chunk_ids: Chunks to load
+            
+        Returns:
+            Dictionary mapping chunk ID to chunk
+        """
+        ids = list(chunk_ids)
+        chunks = {}
+        
+        for i in range(0, len(ids), CANDIDATE_LOAD_BATCH_SIZE):
+            for chunk in self.db.query(DocumentChunk).filter(
+                DocumentChunk.id.in_(ids[i:i + CANDIDATE_LOAD_BATCH_SIZE])
+            ):
+                chunks[chunk.id] = chunk
+        
+        return chunks
+    
     async def _analyze_chunk_pair(
         self, 
         chunk1: DocumentChunk, 
@@ -250,11 +343,16 @@ class ChunkDeduplicationService:
         Returns:
             ChunkSimilarity object with analysis results
         """
-        # Calculate text similarity
-        text_similarity = self._calculate_text_similarity(chunk1.content, chunk2.content)
-        
-        # Calculate content overlap
-        content_overlap = self._calculate_content_overlap(chunk1.content, chunk2.content)
+        # Byte-identical chunks share a stored content hash; skip the text diff
+        if chunk1.content_hash and chunk1.content_hash == chunk2.content_hash:
+            text_similarity = 1.0
+            content_overlap = 1.0
+        else:
+            # Calculate text similarity
+            text_similarity = self._calculate_text_similarity(chunk1.content, chunk2.content)
+            
+            # Calculate content overlap
+            content_overlap = self._calculate_content_overlap(chunk1.content, chunk2.content)
         
         # Assess metadata compatibility
         metadata1 = chunk1.chunk_metadata or {}
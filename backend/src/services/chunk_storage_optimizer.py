@@ -428,13 +428,13 @@ class ChunkStorageOptimizer:
             # Find duplicate chunks by content hash
             duplicate_query = text("""
                 SELECT 
-                    encode(digest(content, 'sha256'), 'hex') as content_hash,
+                    content_hash,
                     array_agg(id ORDER BY created_at) as chunk_ids,
                     count(*) as count,
                     sum(length(content)) as total_size
                 FROM document_chunks 
-                WHERE bot_id = :bot_id
-                GROUP BY encode(digest(content, 'sha256'), 'hex')
+                WHERE bot_id = :bot_id AND content_hash IS NOT NULL
+                GROUP BY content_hash
                 HAVING count(*) > 1
             """)
             
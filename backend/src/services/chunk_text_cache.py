@@ -0,0 +1,133 @@
+"""
+In-process LRU cache of chunk text for id-only vector payloads.
+
+With QDRANT_PAYLOAD_MODE=id_only, Qdrant points carry only the fields search
+filters on, and the chunk text lives solely in document_chunks.content.
+VectorService hydrates search results through this cache: the top-k point
+IDs are looked up here and every miss is loaded in one batched query.
+
+Point IDs are DocumentChunk IDs, and a chunk's text never changes under the
+same ID (reprocessing writes new chunks), so entries only need a size bound.
+Deleted chunks are dropped by VectorService.delete_document_chunks.
+"""
+import asyncio
+import uuid
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+from sqlalchemy import select
+
+from ..core.database import SessionLocal
+from ..models.document import DocumentChunk
+from ..utils.ttl_cache import TTLCache
+
+
+def load_chunk_texts(chunk_ids: Sequence[str]) -> Dict[str, str]:
+    """Load chunk text by ID from document_chunks in one query."""
+    ids = []
+    for chunk_id in chunk_ids:
+        try:
+            ids.append(uuid.UUID(chunk_id))
+        except ValueError:
+            continue
+    if not ids:
+        return {}
+
+    db = SessionLocal()
+    try:
+        rows = db.execute(
+            select(DocumentChunk.id, DocumentChunk.content).where(DocumentChunk.id.in_(ids))
+        ).all()
+        return {str(row.id): row.content for row in rows}
+    finally:
+        db.close()
+
+
+class ChunkTextCache(TTLCache):
+    """LRU cache of chunk text keyed by chunk ID, filled in batches."""
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        ttl: float = 86400.0,
+        loader: Optional[Callable[[Sequence[str]], Dict[str, str]]] = None
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Texts kept before the least recently used are evicted
+            ttl: Seconds a text stays cached
+            loader: Loads texts for a list of chunk IDs (document_chunks by default)
+        """
+        super().__init__(ttl, max_entries)
+        self.loader = loader or load_chunk_texts
+        self.loads = 0
+
+    def _get_cached(self, chunk_ids: Iterable[str]) -> Dict[str, str]:
+        """Get the cached texts among chunk_ids, marking them recently used."""
+        found = {}
+        with self._lock:
+            for chunk_id in chunk_ids:
+                entry = self._entries.get(chunk_id)
+                if entry is None or chunk_id in found:
+                    continue
+                self._entries.move_to_end(chunk_id)
+                found[chunk_id] = entry[0]
+            self.hits += len(found)
+        return found
+
+    async def get_texts(self, chunk_ids: List[str]) -> Dict[str, str]:
+        """
+        Get the text of several chunks, loading misses in one batch.
+
+        Args:
+            chunk_ids: Chunk (vector point) IDs
+
+        Returns:
+            Mapping of chunk ID to text; IDs without a chunk row are left out
+        """
+        texts = self._get_cached(chunk_ids)
+        missing = list(dict.fromkeys(chunk_id for chunk_id in chunk_ids if chunk_id not in texts))
+        if not missing:
+            return texts
+
+        self.misses += len(missing)
+        self.loads += 1
+        loaded = await asyncio.get_running_loop().run_in_executor(None, self.loader, missing)
+        for chunk_id, text in loaded.items():
+            self.set(chunk_id, text)
+        texts.update(loaded)
+        return texts
+
+    def invalidate_many(self, chunk_ids: Iterable[str]):
+        """Drop the cached text of deleted chunks."""
+        for chunk_id in chunk_ids:
+            self.invalidate(str(chunk_id))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache counters.
+
+        Returns:
+            Dictionary with hits, misses, hit rate, batched loads and size
+        """
+        return {**super().get_stats(), "batched_loads": self.loads, "max_entries": self.max_entries}
+
+
+# Global cache instance, shared by every service in the process
+_chunk_text_cache: Optional[ChunkTextCache] = None
+
+
+def get_chunk_text_cache() -> ChunkTextCache:
+    """
+    Get the global chunk text cache instance.
+
+    Returns:
+        Chunk text cache
+    """
+    global _chunk_text_cache
+
+    if _chunk_text_cache is None:
+        _chunk_text_cache = ChunkTextCache()
+
+    return _chunk_text_cache
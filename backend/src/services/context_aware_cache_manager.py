@@ -20,6 +20,8 @@ import pickle
 
 from sqlalchemy.orm import Session
 
+from .semantic_response_cache import get_semantic_response_cache
+
 logger = logging.getLogger(__name__)
 
 
@@ -572,9 +574,12 @@ class ContextAwareCacheManager:
         logger.debug(f"Invalidated cache entry: {key} (reason: {reason.value})")
     
     async def invalidate_bot_cache(self, bot_id: str):
-        """Invalidate all cache entries for a bot."""
+        """Invalidate all cache entries for a bot, including its semantic response cache."""
         pattern = f"hybrid_cache:{bot_id}:*"
         
+        # Cached answers may quote documents or settings that just changed
+        get_semantic_response_cache().invalidate_bot(bot_id)
+        
         # Clear from local cache
         keys_to_remove = [k for k in self.local_cache.keys() if k.startswith(f"hybrid_cache:{bot_id}:")]
         for key in keys_to_remove:
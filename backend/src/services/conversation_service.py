@@ -1,13 +1,16 @@
 """
 Conversation and session management service.
 """
-from typing import List, Optional, Dict, Any
+from typing import Iterator, List, Optional, Dict, Any, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, desc, func
+from sqlalchemy import and_, or_, desc, func, cast, literal, tuple_
+from sqlalchemy.dialects.postgresql import REGCONFIG
 from datetime import datetime
+import base64
+import json
 import uuid
 
-from ..models.conversation import ConversationSession, Message
+from ..models.conversation import ConversationSession, Message, MESSAGE_SEARCH_CONFIG
 from ..models.bot import Bot
 from ..schemas.conversation import (
     ConversationSessionCreate,
@@ -17,14 +20,41 @@ from ..schemas.conversation import (
 )
 
 from .permission_service import PermissionService
+from .session_history_cache import HistoryEntry, SessionHistoryCache, get_session_history_cache
+
+
+# Supported export formats and rows fetched per server-side cursor batch
+EXPORT_FORMATS = ("json", "ndjson")
+EXPORT_BATCH_SIZE = 1000
+
+
+def encode_search_cursor(created_at: datetime, message_id: uuid.UUID) -> str:
+    """Encode the (created_at, id) of a search result as an opaque page cursor."""
+    raw = f"{created_at.isoformat()}|{message_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_search_cursor(cursor: str) -> Tuple[datetime, uuid.UUID]:
+    """
+    Decode a page cursor made by encode_search_cursor.
+    
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        created_at, message_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), uuid.UUID(message_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid search cursor: {cursor}") from e
 
 
 class ConversationService:
     """Service for managing conversations and sessions."""
     
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, history_cache: SessionHistoryCache = None):
         self.db = db
         self.permission_service = PermissionService(db)
+        self.history_cache = history_cache or get_session_history_cache()
     
     def create_session(
         self,
@@ -152,6 +182,7 @@ class ConversationService:
         
         self.db.delete(session)
         self.db.commit()
+        self.history_cache.invalidate_session(session_id)
         return True
     
     def add_message(
@@ -182,6 +213,7 @@ class ConversationService:
         
         self.db.commit()
         self.db.refresh(message)
+        self.history_cache.append(message.session_id, HistoryEntry.from_message(message))
         
         return message
     
@@ -207,46 +239,108 @@ class ConversationService:
         
         return messages
     
+    def get_recent_history(
+        self,
+        session_id: uuid.UUID,
+        limit: int
+    ) -> List[HistoryEntry]:
+        """
+        Get a session's newest messages, served from the session window cache.
+        
+        Unlike get_session_messages this does not check access; callers must
+        have resolved the session for the user already.
+        
+        Args:
+            session_id: Conversation session ID
+            limit: Maximum number of messages, at most the cache window size
+            
+        Returns:
+            Newest messages, oldest first
+        """
+        window = self.history_cache.get_window(session_id)
+        if window is None:
+            rows = self.db.query(Message)\
+                          .filter(Message.session_id == session_id)\
+                          .order_by(desc(Message.created_at))\
+                          .limit(self.history_cache.window_size)\
+                          .all()
+            window = [HistoryEntry.from_message(message) for message in reversed(rows)]
+            self.history_cache.set_window(session_id, window)
+        
+        return window[-limit:] if limit > 0 else []
+    
     def search_conversations(
         self,
         user_id: uuid.UUID,
         query: str,
         bot_id: Optional[uuid.UUID] = None,
         limit: int = 50,
-        offset: int = 0
+        offset: int = 0,
+        cursor: Optional[Tuple[datetime, uuid.UUID]] = None
     ) -> List[Dict[str, Any]]:
-        """Search conversations across user's accessible bots."""
+        """
+        Search conversations across user's accessible bots.
+        
+        Messages are matched with Postgres full-text search on the GIN-indexed
+        search_vector column (web search syntax: quoted phrases, OR, -word) and
+        returned newest first with their ts_rank relevance.
+        
+        Args:
+            user_id: Searching user
+            query: Search terms
+            bot_id: Optional bot to restrict the search to
+            limit: Maximum number of results
+            offset: Results to skip; only used without a cursor
+            cursor: (created_at, id) of the last result of the previous page
+            
+        Returns:
+            Matching messages with session and bot details
+        """
         # Get all bots the user has access to
         accessible_bot_ids = self.permission_service.get_user_accessible_bot_ids(user_id)
         
         if not accessible_bot_ids:
             return []
         
+        ts_query = func.websearch_to_tsquery(cast(MESSAGE_SEARCH_CONFIG, REGCONFIG), query)
+        
         # Build the search query
         search_query = self.db.query(
             Message,
             ConversationSession.title,
-            Bot.name.label('bot_name')
+            Bot.name.label('bot_name'),
+            func.ts_rank(Message.search_vector, ts_query).label('rank')
         ).join(
             ConversationSession, Message.session_id == ConversationSession.id
         ).join(
             Bot, Message.bot_id == Bot.id
         ).filter(
             Message.bot_id.in_(accessible_bot_ids),
-            Message.content.ilike(f"%{query}%")
+            Message.search_vector.op('@@')(ts_query)
         )
         
         if bot_id and bot_id in accessible_bot_ids:
             search_query = search_query.filter(Message.bot_id == bot_id)
         
-        results = search_query.order_by(desc(Message.created_at))\
-                             .offset(offset)\
+        # Keyset pagination: continue strictly after the previous page's last row
+        if cursor:
+            cursor_created_at, cursor_id = cursor
+            search_query = search_query.filter(
+                tuple_(Message.created_at, Message.id) < tuple_(
+                    literal(cursor_created_at, Message.created_at.type),
+                    literal(cursor_id, Message.id.type)
+                )
+            )
+        elif offset:
+            search_query = search_query.offset(offset)
+        
+        results = search_query.order_by(desc(Message.created_at), desc(Message.id))\
                              .limit(limit)\
                              .all()
         
         # Format results
         formatted_results = []
-        for message, session_title, bot_name in results:
+        for message, session_title, bot_name, rank in results:
             formatted_results.append({
                 "message_id": str(message.id),
                 "session_id": str(message.session_id),
@@ -256,6 +350,7 @@ class ConversationService:
                 "role": message.role,
                 "content": message.content,
                 "created_at": message.created_at,
+                "rank": rank,
                 "metadata": message.message_metadata
             })
         
@@ -266,17 +361,77 @@ class ConversationService:
         user_id: uuid.UUID,
         bot_id: Optional[uuid.UUID] = None,
         session_id: Optional[uuid.UUID] = None,
-        format_type: str = "json"
-    ) -> Dict[str, Any]:
-        """Export conversations for backup and analysis."""
+        format_type: str = "json",
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> Iterator[str]:
+        """
+        Export conversations for backup and analysis as a stream of text chunks.
+        
+        Access is checked before this returns, so callers can still report
+        errors before they start sending the stream. Rows are then read by a
+        single ordered query through a server-side cursor and each session is
+        emitted as soon as its last message has been read, so memory use does
+        not grow with the size of the export.
+        
+        Args:
+            user_id: Exporting user
+            bot_id: Optional bot to restrict the export to
+            session_id: Optional single session to export
+            format_type: "json" for one document shaped {"conversations": [...],
+                "metadata": {...}}, or "ndjson" for one session per line followed
+                by a {"metadata": {...}} line
+            start: Only export messages created at or after this time
+            end: Only export messages created before this time
+            
+        Returns:
+            Iterator of encoded text chunks
+            
+        Raises:
+            ValueError: If the format is not supported
+        """
+        if format_type not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported export format: {format_type}")
+        
         # Get accessible bots
         accessible_bot_ids = self.permission_service.get_user_accessible_bot_ids(user_id)
         
-        if not accessible_bot_ids:
-            return {"conversations": [], "metadata": {"total_sessions": 0, "total_messages": 0}}
+        if session_id and not self.get_session(session_id, user_id):
+            accessible_bot_ids = []
         
-        # Build query based on filters
-        query = self.db.query(ConversationSession).filter(
+        sessions = self._iter_export_sessions(accessible_bot_ids, bot_id, session_id, start, end)
+        return self._encode_export(sessions, format_type)
+    
+    def _iter_export_sessions(
+        self,
+        accessible_bot_ids: List[uuid.UUID],
+        bot_id: Optional[uuid.UUID],
+        session_id: Optional[uuid.UUID],
+        start: Optional[datetime],
+        end: Optional[datetime]
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield exported sessions, newest first, each with its messages in order."""
+        if not accessible_bot_ids:
+            return
+        
+        # Plain columns rather than entities keep streamed rows out of the
+        # identity map; sessions without messages still come back once
+        query = self.db.query(
+            ConversationSession.id.label("session_id"),
+            ConversationSession.bot_id,
+            ConversationSession.user_id,
+            ConversationSession.title,
+            ConversationSession.is_shared,
+            ConversationSession.created_at.label("session_created_at"),
+            ConversationSession.updated_at.label("session_updated_at"),
+            Message.id.label("message_id"),
+            Message.role,
+            Message.content,
+            Message.message_metadata,
+            Message.created_at.label("message_created_at")
+        ).outerjoin(
+            Message, Message.session_id == ConversationSession.id
+        ).filter(
             ConversationSession.bot_id.in_(accessible_bot_ids)
         )
         
@@ -284,57 +439,77 @@ class ConversationService:
             query = query.filter(ConversationSession.bot_id == bot_id)
         
         if session_id:
-            # Verify session access
-            session = self.get_session(session_id, user_id)
-            if not session:
-                return {"conversations": [], "metadata": {"total_sessions": 0, "total_messages": 0}}
             query = query.filter(ConversationSession.id == session_id)
         
-        sessions = query.order_by(desc(ConversationSession.created_at)).all()
-        
-        # Export data
-        exported_conversations = []
+        # A time range exports only sessions with messages inside it
+        if start:
+            query = query.filter(Message.created_at >= start)
+        if end:
+            query = query.filter(Message.created_at < end)
+        
+        rows = query.order_by(
+            desc(ConversationSession.created_at),
+            ConversationSession.id,
+            Message.created_at,
+            Message.id
+        ).yield_per(EXPORT_BATCH_SIZE)
+        
+        current = None
+        for row in rows:
+            if current is None or current["session_id"] != str(row.session_id):
+                if current is not None:
+                    yield current
+                current = {
+                    "session_id": str(row.session_id),
+                    "bot_id": str(row.bot_id),
+                    "user_id": str(row.user_id),
+                    "title": row.title,
+                    "is_shared": row.is_shared,
+                    "created_at": row.session_created_at.isoformat(),
+                    "updated_at": row.session_updated_at.isoformat(),
+                    "messages": []
+                }
+            if row.message_id is not None:
+                current["messages"].append({
+                    "message_id": str(row.message_id),
+                    "role": row.role,
+                    "content": row.content,
+                    "metadata": row.message_metadata,
+                    "created_at": row.message_created_at.isoformat()
+                })
+        if current is not None:
+            yield current
+    
+    def _encode_export(
+        self,
+        sessions: Iterator[Dict[str, Any]],
+        format_type: str
+    ) -> Iterator[str]:
+        """Encode exported sessions incrementally, ending with export metadata."""
+        total_sessions = 0
         total_messages = 0
         
-        for session in sessions:
-            messages = self.db.query(Message)\
-                             .filter(Message.session_id == session.id)\
-                             .order_by(Message.created_at)\
-                             .all()
-            
-            total_messages += len(messages)
-            
-            session_data = {
-                "session_id": str(session.id),
-                "bot_id": str(session.bot_id),
-                "user_id": str(session.user_id),
-                "title": session.title,
-                "is_shared": session.is_shared,
-                "created_at": session.created_at.isoformat(),
-                "updated_at": session.updated_at.isoformat(),
-                "messages": [
-                    {
-                        "message_id": str(msg.id),
-                        "role": msg.role,
-                        "content": msg.content,
-                        "metadata": msg.message_metadata,
-                        "created_at": msg.created_at.isoformat()
-                    }
-                    for msg in messages
-                ]
-            }
-            
-            exported_conversations.append(session_data)
-        
-        return {
-            "conversations": exported_conversations,
-            "metadata": {
-                "total_sessions": len(sessions),
-                "total_messages": total_messages,
-                "export_timestamp": datetime.utcnow().isoformat(),
-                "format": format_type
-            }
-        }
+        if format_type == "json":
+            yield '{"conversations": ['
+        for session_data in sessions:
+            encoded = json.dumps(session_data, default=str)
+            if format_type == "ndjson":
+                yield encoded + "\n"
+            else:
+                yield ("," if total_sessions else "") + encoded
+            total_sessions += 1
+            total_messages += len(session_data["messages"])
+        
+        metadata = json.dumps({
+            "total_sessions": total_sessions,
+            "total_messages": total_messages,
+            "export_timestamp": datetime.utcnow().isoformat(),
+            "format": format_type
+        })
+        if format_type == "ndjson":
+            yield f'{{"metadata": {metadata}}}\n'
+        else:
+            yield f'], "metadata": {metadata}}}'
     
     def get_conversation_analytics(
         self,
@@ -552,7 +552,7 @@ class DataIntegrityService:
                 
                 # Check vector store dimension configuration
                 try:
-                    collection_info = await self.vector_service.get_bot_collection_info(str(bot_id))
+                    collection_info = await self.vector_service.get_bot_collection_stats(str(bot_id))
                     stored_dimension = collection_info.get('config', {}).get('vector_size', 0)
                     
                     if stored_dimension != collection_metadata.embedding_dimension:
@@ -727,7 +727,7 @@ class DataIntegrityService:
             else:
                 # Check collection health
                 try:
-                    collection_info = await self.vector_service.get_bot_collection_info(str(bot_id))
+                    collection_info = await self.vector_service.get_bot_collection_stats(str(bot_id))
                     
                     # Check if collection is properly configured
                     if not collection_info.get('config'):
@@ -739,6 +739,8 @@ class DataIntegrityService:
                             suggested_fix="Recreate collection with proper configuration"
                         ))
                     
+                    issues.extend(await self._check_collection_layout(bot_id, collection_info))
+                    
                 except Exception as e:
                     issues.append(IntegrityIssue(
                         check_type=IntegrityCheckType.COLLECTION_HEALTH,
@@ -758,6 +760,47 @@ class DataIntegrityService:
         
         return issues
     
+    async def _check_collection_layout(
+        self,
+        bot_id: UUID,
+        collection_info: Dict[str, Any]
+    ) -> List[IntegrityIssue]:
+        """Check that a bot's points are in exactly one collection of the right kind."""
+        issues = []
+        vector_store = self.vector_service.vector_store
+        points_count = collection_info.get('points_count') or 0
+        
+        if collection_info.get('layout') == "shared":
+            if points_count >= vector_store.promotion_threshold:
+                issues.append(IntegrityIssue(
+                    check_type=IntegrityCheckType.COLLECTION_HEALTH,
+                    level=IntegrityIssueLevel.WARNING,
+                    description="Bot has outgrown its shared vector collection",
+                    affected_entities=[str(bot_id)],
+                    suggested_fix="Optimize the collection to promote the bot to a dedicated collection",
+                    metadata={
+                        "collection_name": collection_info.get('name'),
+                        "points_count": points_count,
+                        "promotion_threshold": vector_store.promotion_threshold
+                    }
+                ))
+            return issues
+        
+        # Writes from a worker that had not yet seen a promotion land in the
+        # shared collection, where searches no longer look
+        shared_counts = await vector_store.count_shared_points(str(bot_id))
+        if shared_counts:
+            issues.append(IntegrityIssue(
+                check_type=IntegrityCheckType.COLLECTION_HEALTH,
+                level=IntegrityIssueLevel.CRITICAL,
+                description="Bot has points in shared collections as well as its dedicated collection",
+                affected_entities=[str(bot_id)],
+                suggested_fix="Promote the bot again to move the remaining points",
+                metadata={"shared_points": shared_counts}
+            ))
+        
+        return issues
+    
     async def create_rollback_plan(
         self,
         snapshot_id: str,
@@ -731,8 +731,9 @@ class DocumentReprocessingService:
                     if not storage_result.success:
                         raise Exception(f"Failed to store chunks: {storage_result.error}")
                     
-                    # Update document chunk count
+                    # Update document chunk count and document-level metadata
                     document.chunk_count = storage_result.stored_chunks
+                    document.document_metadata = doc_metadata
                     self.db.commit()
                     
                     processing_time = time.time() - start_time
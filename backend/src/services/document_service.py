@@ -6,9 +6,10 @@ import logging
 import os
 import shutil
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional
 from uuid import UUID
 import uuid
+from dataclasses import dataclass, field
 
 from fastapi import HTTPException, status, UploadFile
 from sqlalchemy.orm import Session
@@ -16,7 +17,7 @@ from sqlalchemy import and_
 
 from ..core.config import settings
 from ..core.database import get_db
-from ..models.document import Document, DocumentChunk
+from ..models.document import Document, DocumentChunk, compute_content_hash
 from ..models.bot import Bot
 from ..services.permission_service import PermissionService
 from ..services.embedding_service import EmbeddingProviderService
@@ -24,15 +25,74 @@ from ..services.vector_store import VectorService
 from ..services.vector_collection_manager import VectorCollectionManager
 from ..services.optimized_chunk_storage import OptimizedChunkStorage
 from ..services.chunk_metadata_cache import ChunkMetadataCache
+from ..services.bot_retrieval_profile import get_retrieval_profile_cache
+from ..services.semantic_response_cache import get_semantic_response_cache
+from ..services.service_container import get_service_container
+from ..services.embedding_cache_service import EmbeddingCacheService, get_embedding_cache_service
 from ..models.collection_metadata import CollectionMetadata
-from ..utils.text_processing import DocumentProcessor, TextChunk
+from ..utils.text_processing import DocumentProcessor, PdfExtractionError, TextChunk
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class UniqueChunkEmbeddings:
+    """Chunks of one document that still need storing, with their embeddings."""
+    chunks: List[TextChunk] = field(default_factory=list)
+    embeddings: List[List[float]] = field(default_factory=list)
+    embedded: int = 0
+    cache_hits: int = 0
+    skipped: int = 0
+
+
+@dataclass
+class IngestionStats:
+    """Counters for one document's pass through the ingestion pipeline."""
+    chunks_seen: int = 0
+    stored: int = 0
+    deduplicated: int = 0
+    embedded: int = 0
+    cache_hits: int = 0
+    skipped: int = 0
+    total_characters: int = 0
+    total_words: int = 0
+    min_chunk_size: Optional[int] = None
+    max_chunk_size: int = 0
+    vector_ids: List[str] = field(default_factory=list)
+    
+    def add_chunk(self, chunk: TextChunk):
+        """Account for a chunk produced by the chunker."""
+        size = len(chunk.content)
+        self.chunks_seen += 1
+        self.total_characters += size
+        self.total_words += len(chunk.content.split())
+        self.min_chunk_size = size if self.min_chunk_size is None else min(self.min_chunk_size, size)
+        self.max_chunk_size = max(self.max_chunk_size, size)
+    
+    def processing_stats(self) -> Dict[str, Any]:
+        """Chunk statistics in the shape of DocumentProcessor.get_processing_stats."""
+        if not self.chunks_seen:
+            return {"total_chunks": 0}
+        return {
+            "total_chunks": self.chunks_seen,
+            "avg_chunk_size": self.total_characters / self.chunks_seen,
+            "min_chunk_size": self.min_chunk_size,
+            "max_chunk_size": self.max_chunk_size,
+            "avg_word_count": self.total_words / self.chunks_seen,
+            "total_words": self.total_words,
+            "total_characters": self.total_characters
+        }
+
+
+# Marks the end of a pipeline stage's output
+_PIPELINE_END = object()
+
+
 class DocumentService:
     """Service for document management and processing with RAG integration."""
     
+    UPLOAD_BLOCK_SIZE = 1024 * 1024  # Bytes read from an upload per write
+    
     def __init__(
         self,
         db: Session,
@@ -41,7 +101,8 @@ class DocumentService:
         vector_service: VectorService = None,
         collection_manager: VectorCollectionManager = None,
         optimized_storage: OptimizedChunkStorage = None,
-        metadata_cache: ChunkMetadataCache = None
+        metadata_cache: ChunkMetadataCache = None,
+        embedding_cache: EmbeddingCacheService = None
     ):
         """
         Initialize document service.
@@ -54,6 +115,7 @@ class DocumentService:
             collection_manager: Vector collection manager instance
             optimized_storage: Optimized chunk storage service
             metadata_cache: Chunk metadata cache service
+            embedding_cache: Embedding cache service (global instance used if None)
         """
         self.db = db
         self.permission_service = permission_service or PermissionService(db)
@@ -61,6 +123,8 @@ class DocumentService:
         self.collection_manager = collection_manager or VectorCollectionManager(db)
         self.optimized_storage = optimized_storage or OptimizedChunkStorage(db)
         self.metadata_cache = metadata_cache or ChunkMetadataCache(db)
+        self.embedding_cache = embedding_cache
+        self._embedding_cache_resolved = embedding_cache is not None
         
         # Initialize vector service
         self.vector_service = vector_service or VectorService()
@@ -141,10 +205,9 @@ class DocumentService:
                 detail="Bot not found"
             )
         
+        max_file_size = getattr(settings, 'max_file_size', 50 * 1024 * 1024)
+        
         try:
-            # Read file content
-            file_content = await file.read()
-            
             # Generate unique document ID and file path
             document_id = uuid.uuid4()
             file_extension = Path(file.filename).suffix
@@ -154,9 +217,20 @@ class DocumentService:
             # Create bot directory if it doesn't exist
             file_path.parent.mkdir(parents=True, exist_ok=True)
             
-            # Save file to disk
+            # Stream the upload to disk in blocks instead of reading it into memory
+            file_size = 0
             with open(file_path, 'wb') as f:
-                f.write(file_content)
+                while True:
+                    block = await file.read(self.UPLOAD_BLOCK_SIZE)
+                    if not block:
+                        break
+                    file_size += len(block)
+                    if file_size > max_file_size:
+                        raise HTTPException(
+                            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                            detail=f"File size exceeds maximum allowed size of {max_file_size} bytes"
+                        )
+                    f.write(block)
             
             # Create document record
             document = Document(
@@ -165,13 +239,14 @@ class DocumentService:
                 uploaded_by=user_id,
                 filename=file.filename,
                 file_path=str(file_path),
-                file_size=len(file_content),
+                file_size=file_size,
                 mime_type=file.content_type
             )
             
             self.db.add(document)
             self.db.commit()
             self.db.refresh(document)
+            await self._invalidate_document_caches(bot_id, document_id)
             
             logger.info(f"Document {file.filename} uploaded for bot {bot_id}")
             
@@ -187,6 +262,8 @@ class DocumentService:
             if 'file_path' in locals() and file_path.exists():
                 file_path.unlink()
             
+            if isinstance(e, HTTPException):
+                raise
             logger.error(f"Error uploading document {file.filename}: {e}")
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -225,7 +302,7 @@ class DocumentService:
             )
         
         try:
-            # Read file content
+            # The pipeline reads the file from disk as it goes
             file_path = Path(document.file_path)
             if not file_path.exists():
                 raise HTTPException(
@@ -233,132 +310,72 @@ class DocumentService:
                     detail="Document file not found on disk"
                 )
             
-            with open(file_path, 'rb') as f:
-                file_content = f.read()
-            
-            # Process document through pipeline with retry logic
-            chunks, doc_metadata = await self._process_document_with_retry(
-                file_content=file_content,
-                filename=document.filename,
-                document_id=str(document_id),
-                additional_metadata={
-                    "bot_id": str(document.bot_id),
-                    "uploaded_by": str(document.uploaded_by) if document.uploaded_by else None
-                }
-            )
-            
             # Get bot's embedding configuration
             bot = self.db.query(Bot).filter(Bot.id == document.bot_id).first()
             embedding_provider = bot.embedding_provider
             embedding_model = bot.embedding_model
             
-            # Generate embeddings for chunks
-            chunk_texts = [chunk.content for chunk in chunks]
-            
             # Get user's API key for the embedding provider
             from ..services.user_service import UserService
             user_service = UserService(self.db)
             api_key = user_service.get_user_api_key(document.uploaded_by, embedding_provider)
             
-            embeddings = await self.embedding_service.generate_embeddings(
-                provider=embedding_provider,
-                texts=chunk_texts,
-                model=embedding_model,
-                api_key=api_key
-            )
-            
-            # Prepare chunks for optimized storage
-            chunk_data = []
-            for chunk in chunks:
-                chunk_info = {
-                    'content': chunk.content,
-                    'metadata': {
-                        'chunk_index': chunk.chunk_index,
-                        'start_char': chunk.start_char,
-                        'end_char': chunk.end_char,
-                        **chunk.metadata
-                    }
-                }
-                chunk_data.append(chunk_info)
-            
-            # Ensure vector collection exists for this bot with proper validation
-            if self.vector_service and embeddings:
-                # Get embedding dimension from the first embedding
-                embedding_dimension = len(embeddings[0]) if embeddings else 768
-                
-                # Prepare embedding configuration
-                embedding_config = {
-                    "provider": embedding_provider,
-                    "model": embedding_model,
-                    "dimension": embedding_dimension
-                }
-                
-                # Ensure collection exists with proper configuration
-                collection_result = await self.collection_manager.ensure_collection_exists(
-                    document.bot_id, embedding_config
-                )
-                
-                if not collection_result.success:
-                    logger.error(f"Failed to ensure collection exists for bot {document.bot_id}: {collection_result.error}")
-                    raise HTTPException(
-                        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                        detail=f"Failed to initialize vector collection: {collection_result.error}"
+            processor = self.processor
+            while True:
+                ingestion = IngestionStats()
+                try:
+                    doc_metadata = await self._run_ingestion_pipeline(
+                        document=document,
+                        processor=processor,
+                        file_path=file_path,
+                        provider=embedding_provider,
+                        model=embedding_model,
+                        api_key=api_key,
+                        stats=ingestion
                     )
-                
-                # Update or create collection metadata if needed
-                collection_metadata = self.db.query(CollectionMetadata).filter(
-                    CollectionMetadata.bot_id == document.bot_id
-                ).first()
-                
-                if not collection_metadata:
-                    collection_metadata = CollectionMetadata(
-                        bot_id=document.bot_id,
-                        collection_name=str(document.bot_id),
-                        embedding_provider=embedding_provider,
-                        embedding_model=embedding_model,
-                        embedding_dimension=embedding_dimension,
-                        status="active",
-                        points_count=0
+                    break
+                except Exception as e:
+                    await self._discard_partial_ingestion(document, ingestion)
+                    # PDF extraction failures get one more attempt with OCR disabled;
+                    # other failures (no text, unsupported content) would recur
+                    if not isinstance(e, PdfExtractionError) or not processor.extractor.enable_ocr:
+                        raise
+                    logger.warning(f"Extraction failed for {document.filename}, retrying with OCR disabled: {e}")
+                    processor = DocumentProcessor(
+                        chunk_size=getattr(settings, 'chunk_size', 1000),
+                        chunk_overlap=getattr(settings, 'chunk_overlap', 200),
+                        max_file_size=getattr(settings, 'max_file_size', 50 * 1024 * 1024),
+                        enable_ocr=False
                     )
-                    self.db.add(collection_metadata)
-                    logger.info(f"Created collection metadata for bot {document.bot_id}")
-                else:
-                    # Update points count (will be updated after successful storage)
-                    logger.debug(f"Collection metadata already exists for bot {document.bot_id}")
-            
-            # Use optimized storage for efficient chunk storage with deduplication
-            storage_result = await self.optimized_storage.store_chunks_efficiently(
-                bot_id=document.bot_id,
-                document_id=document_id,
-                chunks=chunk_data,
-                embeddings=embeddings,
-                enable_deduplication=True,
-                batch_size=100
-            )
             
-            if not storage_result.success:
-                raise Exception(f"Failed to store chunks: {storage_result.error}")
+            # Each stored batch commits its own chunk count; record the document
+            # total and the document-level metadata, kept once on the document
+            document.chunk_count = ingestion.stored
+            document.document_metadata = doc_metadata
+            self.db.commit()
+            await self._invalidate_document_caches(document.bot_id, document_id)
             
             # Cache metadata for frequently accessed chunks
             await self.metadata_cache.cache_bot_chunks(document.bot_id)
             
-            stored_ids = storage_result.vector_ids
-            
-            # Get processing statistics
-            processing_stats = self.processor.get_processing_stats(chunks)
-            
             result = {
                 "document_id": str(document_id),
                 "filename": document.filename,
-                "chunks_created": storage_result.stored_chunks,
-                "chunks_deduplicated": storage_result.deduplicated_chunks,
-                "embeddings_stored": len(stored_ids),
-                "processing_stats": processing_stats,
+                "chunks_created": ingestion.stored,
+                "chunks_deduplicated": ingestion.skipped + ingestion.deduplicated,
+                "chunks_embedded": ingestion.embedded,
+                "chunks_embedding_cache_hits": ingestion.cache_hits,
+                "chunks_skipped": ingestion.skipped,
+                "embeddings_stored": len(ingestion.vector_ids),
+                "processing_stats": ingestion.processing_stats(),
                 "document_metadata": doc_metadata,
                 "storage_optimized": True
             }
             
-            logger.info(f"Document {document.filename} processed successfully: {len(chunks)} chunks")
+            logger.info(
+                f"Document {document.filename} processed successfully: {ingestion.chunks_seen} chunks "
+                f"({ingestion.embedded} embedded, {ingestion.cache_hits} cache hits, {ingestion.skipped} skipped)"
+            )
             return result
             
         except HTTPException:
@@ -373,6 +390,351 @@ class DocumentService:
                 detail=f"Document processing failed: {str(e)}"
             )
     
+    async def _run_ingestion_pipeline(
+        self,
+        document: Document,
+        processor: DocumentProcessor,
+        file_path: Path,
+        provider: str,
+        model: str,
+        api_key: Optional[str],
+        stats: IngestionStats
+    ) -> Dict[str, Any]:
+        """
+        Stream a document through extract -> chunk -> embed -> store.
+        
+        Each stage runs as its own task connected by bounded queues, so memory
+        does not grow with document size and earlier batches are committed
+        (and searchable) while later pages are still being extracted.
+        Extraction and chunking run in the default executor one chunk at a
+        time; embedding uses provider-sized batches of unique chunks.
+        
+        Args:
+            document: Document being processed
+            processor: Document processor used for extraction and chunking
+            file_path: Path to the stored document file
+            provider: Embedding provider
+            model: Embedding model
+            api_key: API key for the provider
+            stats: Counters updated as the pipeline runs
+            
+        Returns:
+            Document metadata from the processor
+        """
+        loop = asyncio.get_running_loop()
+        batch_size = self.embedding_service.max_batch_size
+        chunk_queue: asyncio.Queue = asyncio.Queue(maxsize=batch_size * 2)
+        store_queue: asyncio.Queue = asyncio.Queue(maxsize=2)
+        # Hashes already sent to the store stage, so later batches skip them too
+        seen_hashes = set()
+        # The embed and store stages share self.db; the store stage awaits the
+        # vector store between flushing and committing a batch, so each stage
+        # holds this lock for its DB work
+        db_lock = asyncio.Lock()
+        
+        chunk_iter, doc_metadata = processor.stream_document_chunks(
+            file_path=file_path,
+            filename=document.filename,
+            document_id=str(document.id)
+        )
+        
+        async def extract_stage():
+            while True:
+                chunk = await loop.run_in_executor(None, next, chunk_iter, _PIPELINE_END)
+                if chunk is _PIPELINE_END:
+                    break
+                await chunk_queue.put(chunk)
+            await chunk_queue.put(_PIPELINE_END)
+        
+        async def embed_stage():
+            batch = []
+            while True:
+                chunk = await chunk_queue.get()
+                if chunk is not _PIPELINE_END:
+                    stats.add_chunk(chunk)
+                    batch.append(chunk)
+                
+                if batch and (chunk is _PIPELINE_END or len(batch) >= batch_size):
+                    unique = await self._embed_unique_chunks(
+                        bot_id=document.bot_id,
+                        chunks=batch,
+                        provider=provider,
+                        model=model,
+                        api_key=api_key,
+                        db_lock=db_lock,
+                        seen_hashes=seen_hashes
+                    )
+                    stats.embedded += unique.embedded
+                    stats.cache_hits += unique.cache_hits
+                    stats.skipped += unique.skipped
+                    if unique.chunks:
+                        await store_queue.put(unique)
+                    batch = []
+                
+                if chunk is _PIPELINE_END:
+                    break
+            await store_queue.put(_PIPELINE_END)
+        
+        async def store_stage():
+            collection_ready = False
+            while True:
+                unique = await store_queue.get()
+                if unique is _PIPELINE_END:
+                    break
+                
+                async with db_lock:
+                    if not collection_ready:
+                        await self._ensure_bot_collection(
+                            document.bot_id, provider, model, len(unique.embeddings[0])
+                        )
+                        collection_ready = True
+                    
+                    # Use optimized storage for efficient chunk storage with deduplication
+                    storage_result = await self.optimized_storage.store_chunks_efficiently(
+                        bot_id=document.bot_id,
+                        document_id=document.id,
+                        chunks=[
+                            {
+                                'chunk_index': chunk.chunk_index,
+                                'content': chunk.content,
+                                'metadata': {
+                                    'chunk_index': chunk.chunk_index,
+                                    'start_char': chunk.start_char,
+                                    'end_char': chunk.end_char,
+                                    **chunk.metadata
+                                }
+                            }
+                            for chunk in unique.chunks
+                        ],
+                        embeddings=unique.embeddings,
+                        enable_deduplication=True,
+                        batch_size=len(unique.chunks)
+                    )
+                
+                if not storage_result.success:
+                    raise Exception(f"Failed to store chunks: {storage_result.error}")
+                
+                stats.stored += storage_result.stored_chunks
+                stats.deduplicated += storage_result.deduplicated_chunks
+                stats.vector_ids.extend(storage_result.vector_ids)
+        
+        tasks = [
+            asyncio.create_task(extract_stage()),
+            asyncio.create_task(embed_stage()),
+            asyncio.create_task(store_stage())
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            try:
+                chunk_iter.close()
+            except ValueError:
+                # Still running in the executor; it is released once that call returns
+                pass
+            raise
+        
+        return doc_metadata
+    
+    async def _ensure_bot_collection(
+        self,
+        bot_id: UUID,
+        embedding_provider: str,
+        embedding_model: str,
+        embedding_dimension: int
+    ):
+        """
+        Ensure the bot's vector collection and collection metadata exist.
+        
+        Args:
+            bot_id: Bot identifier
+            embedding_provider: Embedding provider
+            embedding_model: Embedding model
+            embedding_dimension: Dimension of the embeddings being stored
+            
+        Raises:
+            HTTPException: If the collection cannot be initialized
+        """
+        # Prepare embedding configuration
+        embedding_config = {
+            "provider": embedding_provider,
+            "model": embedding_model,
+            "dimension": embedding_dimension
+        }
+        
+        # Ensure collection exists with proper configuration
+        collection_result = await self.collection_manager.ensure_collection_exists(
+            bot_id, embedding_config
+        )
+        
+        if not collection_result.success:
+            logger.error(f"Failed to ensure collection exists for bot {bot_id}: {collection_result.error}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to initialize vector collection: {collection_result.error}"
+            )
+        
+        # Update or create collection metadata if needed
+        collection_metadata = self.db.query(CollectionMetadata).filter(
+            CollectionMetadata.bot_id == bot_id
+        ).first()
+        
+        if not collection_metadata:
+            collection_metadata = CollectionMetadata(
+                bot_id=bot_id,
+                collection_name=str(bot_id),
+                embedding_provider=embedding_provider,
+                embedding_model=embedding_model,
+                embedding_dimension=embedding_dimension,
+                status="active",
+                points_count=0
+            )
+            self.db.add(collection_metadata)
+            logger.info(f"Created collection metadata for bot {bot_id}")
+        else:
+            # Update points count (will be updated after successful storage)
+            logger.debug(f"Collection metadata already exists for bot {bot_id}")
+    
+    async def _discard_partial_ingestion(self, document: Document, stats: IngestionStats):
+        """
+        Remove chunks a failed pipeline run already committed for a document.
+        
+        Args:
+            document: Document being processed
+            stats: Counters of the failed run
+        """
+        self.db.rollback()
+        if not stats.vector_ids:
+            return
+        
+        try:
+            await self.vector_service.delete_document_chunks(str(document.bot_id), stats.vector_ids)
+            self.db.query(DocumentChunk).filter(DocumentChunk.document_id == document.id).delete()
+            document.chunk_count = 0
+            self.db.commit()
+            logger.info(f"Discarded {len(stats.vector_ids)} partially stored chunks of {document.filename}")
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"Failed to discard partial ingestion of document {document.id}: {e}")
+    
+    async def _invalidate_document_caches(self, bot_id: UUID, document_id: UUID):
+        """Drop cached retrieval state and answers of a bot whose documents changed."""
+        get_retrieval_profile_cache().invalidate_bot(bot_id)
+        cache_manager = get_service_container().cache_manager
+        if cache_manager is None:
+            # Outside the application the shared cache manager is never built
+            get_semantic_response_cache().invalidate_bot(bot_id)
+            return
+        try:
+            await cache_manager.invalidate_document_cache(str(bot_id), str(document_id))
+        except Exception as e:
+            get_semantic_response_cache().invalidate_bot(bot_id)
+            logger.warning(f"Failed to invalidate response cache for bot {bot_id}: {e}")
+    
+    async def _get_embedding_cache(self) -> Optional[EmbeddingCacheService]:
+        """
+        Resolve the embedding cache once; ingestion proceeds without it if Redis is unavailable.
+        
+        Returns:
+            Embedding cache service or None
+        """
+        if not self._embedding_cache_resolved:
+            self._embedding_cache_resolved = True
+            try:
+                self.embedding_cache = await get_embedding_cache_service()
+            except Exception as e:
+                logger.warning(f"Embedding cache unavailable, embedding without it: {e}")
+                self.embedding_cache = None
+        return self.embedding_cache
+    
+    async def _embed_unique_chunks(
+        self,
+        bot_id: UUID,
+        chunks: List[TextChunk],
+        provider: str,
+        model: str,
+        api_key: Optional[str],
+        db_lock: asyncio.Lock,
+        seen_hashes: Optional[set] = None
+    ) -> UniqueChunkEmbeddings:
+        """
+        Embed only the chunks that will actually be stored.
+        
+        Chunks are hashed first; texts repeated within the document or already
+        stored for the bot are skipped, cached embeddings are reused, and the
+        provider is called once for the remaining misses.
+        
+        Args:
+            bot_id: Bot identifier
+            chunks: Chunks produced for the document, in order
+            provider: Embedding provider
+            model: Embedding model
+            api_key: API key for the provider
+            db_lock: Lock held while querying self.db, shared with concurrent writers
+            seen_hashes: Hashes of chunks already handled for this document;
+                updated with the hashes of the chunks returned
+            
+        Returns:
+            UniqueChunkEmbeddings with the chunks to store and per-document counters
+        """
+        result = UniqueChunkEmbeddings()
+        
+        # Collapse identical texts within the document, keeping the first occurrence
+        unique_chunks: Dict[str, TextChunk] = {}
+        for chunk in chunks:
+            content_hash = compute_content_hash(chunk.content)
+            if seen_hashes is None or content_hash not in seen_hashes:
+                unique_chunks.setdefault(content_hash, chunk)
+        
+        # Drop texts this bot already has stored
+        if unique_chunks:
+            async with db_lock:
+                existing_rows = self.db.query(DocumentChunk.content_hash).filter(
+                    and_(
+                        DocumentChunk.bot_id == bot_id,
+                        DocumentChunk.content_hash.in_(list(unique_chunks.keys()))
+                    )
+                ).all()
+            for row in existing_rows:
+                unique_chunks.pop(row.content_hash, None)
+        
+        result.chunks = list(unique_chunks.values())
+        result.skipped = len(chunks) - len(result.chunks)
+        if seen_hashes is not None:
+            seen_hashes.update(unique_chunks.keys())
+        if not result.chunks:
+            return result
+        
+        texts = [chunk.content for chunk in result.chunks]
+        embeddings: List[Optional[List[float]]] = [None] * len(texts)
+        missing_indices = list(range(len(texts)))
+        
+        cache = await self._get_embedding_cache()
+        if cache:
+            embeddings, missing_indices = await cache.get_cached_embeddings_batch(
+                texts, provider, model
+            )
+        
+        if missing_indices:
+            missing_texts = [texts[i] for i in missing_indices]
+            new_embeddings = await self.embedding_service.generate_embeddings(
+                provider=provider,
+                texts=missing_texts,
+                model=model,
+                api_key=api_key
+            )
+            for index, embedding in zip(missing_indices, new_embeddings):
+                embeddings[index] = embedding
+            if cache:
+                await cache.cache_embeddings_batch(missing_texts, provider, model, new_embeddings)
+        
+        result.embeddings = embeddings
+        result.embedded = len(missing_indices)
+        result.cache_hits = len(texts) - len(missing_indices)
+        return result
+    
     async def delete_document(self, document_id: UUID, user_id: UUID) -> bool:
         """
         Delete a document and all associated data.
@@ -426,6 +788,7 @@ class DocumentService:
             # Delete from database (chunks will be deleted by cascade)
             self.db.delete(document)
             self.db.commit()
+            await self._invalidate_document_caches(document.bot_id, document_id)
             
             logger.info(f"Document {document.filename} deleted successfully")
             return True
@@ -559,6 +922,7 @@ class DocumentService:
                 "chunk_count": document.chunk_count,
                 "uploaded_by": str(document.uploaded_by) if document.uploaded_by else None,
                 "created_at": document.created_at.isoformat(),
+                "document_metadata": document.document_metadata,
                 "chunks": chunk_info,
                 "processing_status": "processed" if document.chunk_count > 0 else "pending"
             }
@@ -848,76 +1212,3 @@ class DocumentService:
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Failed to get document statistics: {str(e)}"
             )
-    
-    async def _process_document_with_retry(
-        self,
-        file_content: bytes,
-        filename: str,
-        document_id: str,
-        additional_metadata: Optional[Dict[str, Any]] = None,
-        max_retries: int = 3
-    ) -> Tuple[List, Dict[str, Any]]:
-        """
-        Process document with retry logic for better reliability.
-        
-        Args:
-            file_content: File content as bytes
-            filename: Original filename
-            document_id: Unique document identifier
-            additional_metadata: Additional metadata to include
-            max_retries: Maximum number of retry attempts
-            
-        Returns:
-            Tuple of (chunks, document_metadata)
-        """
-        last_error = None
-        
-        for attempt in range(max_retries):
-            try:
-                logger.info(f"Processing document {filename}, attempt {attempt + 1}/{max_retries}")
-                
-                # Try processing with current processor
-                chunks, doc_metadata = self.processor.process_document(
-                    file_content=file_content,
-                    filename=filename,
-                    document_id=document_id,
-                    additional_metadata=additional_metadata
-                )
-                
-                logger.info(f"Successfully processed {filename} on attempt {attempt + 1}")
-                return chunks, doc_metadata
-                
-            except Exception as e:
-                last_error = e
-                logger.warning(f"Document processing attempt {attempt + 1} failed for {filename}: {e}")
-                
-                # If this is not the last attempt, try with different settings
-                if attempt < max_retries - 1:
-                    try:
-                        # Try with OCR disabled for the retry
-                        from ..utils.text_processing import DocumentProcessor
-                        fallback_processor = DocumentProcessor(
-                            chunk_size=getattr(settings, 'chunk_size', 1000),
-                            chunk_overlap=getattr(settings, 'chunk_overlap', 200),
-                            max_file_size=getattr(settings, 'max_file_size', 50 * 1024 * 1024),
-                            enable_ocr=False  # Disable OCR for retry
-                        )
-                        
-                        logger.info(f"Retrying {filename} with OCR disabled")
-                        chunks, doc_metadata = fallback_processor.process_document(
-                            file_content=file_content,
-                            filename=filename,
-                            document_id=document_id,
-                            additional_metadata=additional_metadata
-                        )
-                        
-                        logger.info(f"Successfully processed {filename} with fallback processor")
-                        return chunks, doc_metadata
-                        
-                    except Exception as fallback_error:
-                        logger.warning(f"Fallback processing also failed for {filename}: {fallback_error}")
-                        continue
-        
-        # If all retries failed, raise the last error
-        logger.error(f"All processing attempts failed for {filename}")
-        raise last_error
\ No newline at end of file
@@ -7,13 +7,79 @@ import json
 import logging
 import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Optional, Any, Tuple, Union
+import numpy as np
 import redis.asyncio as redis
 from dataclasses import dataclass, asdict
 from ..core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Format tags stored alongside each embedding. Entries without a tag predate
+# binary storage and hold the vector as a JSON list.
+EMBEDDING_FORMAT_JSON = "json"
+EMBEDDING_FORMAT_FLOAT32 = "f32le:1"
+EMBEDDING_FORMAT_FLOAT16 = "f16le:1"
+
+_FORMAT_DTYPES = {
+    EMBEDDING_FORMAT_FLOAT32: np.dtype("<f4"),
+    EMBEDDING_FORMAT_FLOAT16: np.dtype("<f2"),
+}
+_DTYPE_FORMATS = {
+    "float32": EMBEDDING_FORMAT_FLOAT32,
+    "float16": EMBEDDING_FORMAT_FLOAT16,
+}
+
+
+def encode_embedding(embedding: List[float], dtype: str = "float32") -> Tuple[bytes, str]:
+    """
+    Encode an embedding as raw little-endian floats.
+    
+    Args:
+        embedding: Embedding vector
+        dtype: "float32" or "float16"
+        
+    Returns:
+        Tuple of (encoded bytes, format tag)
+    """
+    fmt = _DTYPE_FORMATS.get(dtype)
+    if fmt is None:
+        raise ValueError(f"Unsupported embedding dtype: {dtype}")
+    return np.asarray(embedding, dtype=_FORMAT_DTYPES[fmt]).tobytes(), fmt
+
+
+def decode_embedding(raw: Union[bytes, str], fmt: Optional[str] = None) -> np.ndarray:
+    """
+    Decode a stored embedding.
+    
+    Binary formats are decoded without copying: the returned array is a
+    read-only view over ``raw``. Untagged entries are parsed as legacy JSON.
+    
+    Args:
+        raw: Stored embedding value
+        fmt: Format tag stored with the entry, None for legacy entries
+        
+    Returns:
+        Embedding as a NumPy array
+    """
+    if not fmt or fmt == EMBEDDING_FORMAT_JSON:
+        return np.asarray(json.loads(raw), dtype=np.float64)
+    dtype = _FORMAT_DTYPES.get(fmt)
+    if dtype is None:
+        raise ValueError(f"Unknown embedding format: {fmt}")
+    return np.frombuffer(raw, dtype=dtype)
+
+
+def _decode_fields(data: Dict[bytes, bytes]) -> Dict[str, Any]:
+    """Decode a Redis hash read in binary mode, leaving the embedding as bytes."""
+    decoded = {}
+    for key, value in data.items():
+        name = key.decode() if isinstance(key, bytes) else key
+        if name != 'embedding' and isinstance(value, bytes):
+            value = value.decode()
+        decoded[name] = value
+    return decoded
+
 
 @dataclass
 class EmbeddingCacheEntry:
@@ -61,22 +127,32 @@ class EmbeddingCacheService:
     Intelligent embedding cache service with content-based hashing and LRU eviction.
     """
     
-    def __init__(self, redis_url: Optional[str] = None):
+    def __init__(self, redis_url: Optional[str] = None, embedding_dtype: str = "float32"):
         """
         Initialize the embedding cache service.
         
         Args:
             redis_url: Redis connection URL. Uses settings default if None.
+            embedding_dtype: Storage precision for new entries ("float32" or "float16")
         """
+        if embedding_dtype not in _DTYPE_FORMATS:
+            raise ValueError(f"Unsupported embedding dtype: {embedding_dtype}")
+
         self.redis_url = redis_url or settings.redis_url
         self.redis_client: Optional[redis.Redis] = None
         
         # Cache configuration
         self.cache_prefix = "embedding_cache:"
         self.stats_key = "embedding_cache:stats"
+        # Sorted set of entry keys scored by when they expire; ZCARD is the
+        # cache size. Hits refresh the TTL, so the order is also LRU order
+        self.expiry_key = "embedding_cache_index:expiry"
         self.max_cache_size = 10000  # Maximum number of cached embeddings
+        self.eviction_batch_ratio = 0.1  # Evict 10% of max size at once when full
+        self.scan_batch_size = 500
         self.default_ttl = 86400 * 7  # 7 days in seconds
         self.cleanup_interval = 3600  # 1 hour in seconds
+        self.embedding_dtype = embedding_dtype
         
         # Performance tracking
         self.stats = CacheStats()
@@ -89,10 +165,11 @@ class EmbeddingCacheService:
     async def initialize(self):
         """Initialize Redis connection and load stats."""
         try:
+            # Binary mode: embeddings are stored as raw bytes, other fields
+            # are decoded by _decode_fields
             self.redis_client = redis.from_url(
                 self.redis_url,
-                encoding="utf-8",
-                decode_responses=True,
+                decode_responses=False,
                 socket_connect_timeout=5,
                 socket_timeout=5
             )
@@ -199,7 +276,7 @@ class EmbeddingCacheService:
             cache_key = self._generate_cache_key(text, provider, model)
             
             # Get cached entry
-            cached_data = await self.redis_client.hgetall(cache_key)
+            cached_data = _decode_fields(await self.redis_client.hgetall(cache_key))
             
             if not cached_data:
                 self.stats.cache_misses += 1
@@ -211,7 +288,9 @@ class EmbeddingCacheService:
                 'text_hash': cached_data['text_hash'],
                 'provider': cached_data['provider'],
                 'model': cached_data['model'],
-                'embedding': json.loads(cached_data['embedding']),
+                'embedding': decode_embedding(
+                    cached_data['embedding'], cached_data.get('embedding_format')
+                ).tolist(),
                 'created_at': float(cached_data['created_at']),
                 'access_count': int(cached_data['access_count']),
                 'last_accessed': float(cached_data['last_accessed']),
@@ -222,14 +301,19 @@ class EmbeddingCacheService:
             entry.access_count += 1
             entry.last_accessed = time.time()
             
-            # Update cache entry with new access stats
-            await self.redis_client.hset(
+            # Update access stats and extend the entry's TTL and index score
+            # together, so the index never outlives the key
+            pipe = self.redis_client.pipeline()
+            pipe.hset(
                 cache_key,
                 mapping={
                     'access_count': entry.access_count,
                     'last_accessed': entry.last_accessed
                 }
             )
+            pipe.expire(cache_key, self.default_ttl)
+            pipe.zadd(self.expiry_key, {cache_key: entry.last_accessed + self.default_ttl})
+            await pipe.execute()
             
             # Update performance stats
             self.stats.cache_hits += 1
@@ -291,13 +375,17 @@ class EmbeddingCacheService:
             # Store in Redis with TTL
             cache_ttl = ttl or self.default_ttl
             
-            await self.redis_client.hset(
+            encoded, embedding_format = encode_embedding(entry.embedding, self.embedding_dtype)
+            
+            pipe = self.redis_client.pipeline()
+            pipe.hset(
                 cache_key,
                 mapping={
                     'text_hash': entry.text_hash,
                     'provider': entry.provider,
                     'model': entry.model,
-                    'embedding': json.dumps(entry.embedding),
+                    'embedding': encoded,
+                    'embedding_format': embedding_format,
                     'created_at': entry.created_at,
                     'access_count': entry.access_count,
                     'last_accessed': entry.last_accessed,
@@ -305,8 +393,10 @@ class EmbeddingCacheService:
                 }
             )
             
-            # Set TTL
-            await self.redis_client.expire(cache_key, cache_ttl)
+            # Set TTL and record the expiry in the index
+            pipe.expire(cache_key, cache_ttl)
+            pipe.zadd(self.expiry_key, {cache_key: entry.last_accessed + cache_ttl})
+            await pipe.execute()
             
             logger.debug(f"Cached embedding for {provider}/{model}, text length: {len(text)}")
             
@@ -360,13 +450,17 @@ class EmbeddingCacheService:
             
             # Process results
             update_pipe = self.redis_client.pipeline()
+            expiry_updates = {}
             
             for (text_idx, cache_key), cached_data in zip(cache_keys, results):
                 if cached_data:
                     try:
                         # Parse cached entry
-                        embedding = json.loads(cached_data['embedding'])
-                        embeddings[text_idx] = embedding
+                        cached_data = _decode_fields(cached_data)
+                        embedding = decode_embedding(
+                            cached_data['embedding'], cached_data.get('embedding_format')
+                        )
+                        embeddings[text_idx] = embedding.tolist()
                         
                         # Update access stats
                         access_count = int(cached_data['access_count']) + 1
@@ -379,10 +473,12 @@ class EmbeddingCacheService:
                                 'last_accessed': last_accessed
                             }
                         )
+                        update_pipe.expire(cache_key, self.default_ttl)
+                        expiry_updates[cache_key] = last_accessed + self.default_ttl
                         
                         self.stats.cache_hits += 1
                         
-                    except (json.JSONDecodeError, KeyError) as e:
+                    except (json.JSONDecodeError, KeyError, ValueError) as e:
                         logger.warning(f"Invalid cache entry format: {e}")
                         missing_indices.append(text_idx)
                         self.stats.cache_misses += 1
@@ -391,6 +487,8 @@ class EmbeddingCacheService:
                     self.stats.cache_misses += 1
             
             # Execute access count updates
+            if expiry_updates:
+                update_pipe.zadd(self.expiry_key, expiry_updates)
             if update_pipe.command_stack:
                 await update_pipe.execute()
             
@@ -435,7 +533,7 @@ class EmbeddingCacheService:
         
         try:
             # Check if we need to evict entries first
-            await self._ensure_cache_space()
+            await self._ensure_cache_space(incoming=len(texts))
             
             # Create pipeline for batch operations
             pipe = self.redis_client.pipeline()
@@ -443,6 +541,7 @@ class EmbeddingCacheService:
             cached_count = 0
             
             current_time = time.time()
+            expiry_updates = {}
             
             for text, embedding in zip(texts, embeddings):
                 if not text.strip() or not embedding:
@@ -450,13 +549,15 @@ class EmbeddingCacheService:
                 
                 cache_key = self._generate_cache_key(text, provider, model)
                 text_hash = self._generate_text_hash(text)
+                encoded, embedding_format = encode_embedding(embedding, self.embedding_dtype)
                 
                 # Create cache entry
                 entry_data = {
                     'text_hash': text_hash,
                     'provider': provider,
                     'model': model,
-                    'embedding': json.dumps(embedding),
+                    'embedding': encoded,
+                    'embedding_format': embedding_format,
                     'created_at': current_time,
                     'access_count': 1,
                     'last_accessed': current_time,
@@ -465,9 +566,12 @@ class EmbeddingCacheService:
                 
                 pipe.hset(cache_key, mapping=entry_data)
                 pipe.expire(cache_key, cache_ttl)
+                expiry_updates[cache_key] = current_time + cache_ttl
                 cached_count += 1
             
             # Execute batch operations
+            if expiry_updates:
+                pipe.zadd(self.expiry_key, expiry_updates)
             if pipe.command_stack:
                 await pipe.execute()
             
@@ -479,42 +583,34 @@ class EmbeddingCacheService:
             logger.error(f"Error in batch cache storage: {e}")
             return 0
     
-    async def _ensure_cache_space(self):
-        """Ensure cache doesn't exceed maximum size using LRU eviction."""
+    async def _ensure_cache_space(self, incoming: int = 1):
+        """
+        Ensure cache doesn't exceed maximum size using LRU eviction.
+        
+        The expiry index keeps entry keys ordered by when they expire, which
+        hits push back, so the size check is a ZCARD and eviction pops the
+        least recently used batch with ZPOPMIN. Members whose entry already
+        expired sort first and are dropped by the same pop.
+        
+        Args:
+            incoming: Number of entries about to be written
+        """
         try:
-            # Get current cache size
-            cache_keys = await self.redis_client.keys(f"{self.cache_prefix}*")
-            current_size = len(cache_keys)
-            
-            if current_size >= self.max_cache_size:
-                # Calculate how many entries to evict (10% of max size)
-                evict_count = max(1, int(self.max_cache_size * 0.1))
-                
-                # Get entries with their last access times
-                entries_with_access = []
-                pipe = self.redis_client.pipeline()
-                
-                for key in cache_keys:
-                    pipe.hget(key, 'last_accessed')
-                
-                access_times = await pipe.execute()
+            current_size = await self.redis_client.zcard(self.expiry_key)
+            
+            if current_size + incoming > self.max_cache_size:
+                # Evict in batches so eviction runs once per batch of writes, not per write
+                evict_count = max(
+                    int(self.max_cache_size * self.eviction_batch_ratio),
+                    current_size + incoming - self.max_cache_size,
+                    1
+                )
                 
-                for key, access_time in zip(cache_keys, access_times):
-                    if access_time:
-                        try:
-                            entries_with_access.append((key, float(access_time)))
-                        except (ValueError, TypeError):
-                            # Invalid access time, mark for eviction
-                            entries_with_access.append((key, 0.0))
-                
-                # Sort by last accessed time (oldest first)
-                entries_with_access.sort(key=lambda x: x[1])
-                
-                # Evict oldest entries
-                evict_keys = [key for key, _ in entries_with_access[:evict_count]]
+                oldest = await self.redis_client.zpopmin(self.expiry_key, evict_count)
+                evict_keys = [key for key, _ in oldest]
                 
                 if evict_keys:
-                    await self.redis_client.delete(*evict_keys)
+                    await self.redis_client.unlink(*evict_keys)
                     self.stats.evictions += len(evict_keys)
                     
                     logger.info(f"Evicted {len(evict_keys)} old cache entries")
@@ -522,10 +618,31 @@ class EmbeddingCacheService:
         except Exception as e:
             logger.error(f"Error during cache eviction: {e}")
     
+    async def _scan_entry_keys(self):
+        """
+        Iterate cache entry keys in batches with SCAN.
+        
+        Yields:
+            Lists of entry keys, at most scan_batch_size each
+        """
+        stats_key = self.stats_key.encode()
+        batch = []
+        async for key in self.redis_client.scan_iter(
+            match=f"{self.cache_prefix}*", count=self.scan_batch_size
+        ):
+            if key == stats_key:
+                continue
+            batch.append(key)
+            if len(batch) >= self.scan_batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+    
     async def _load_stats(self):
         """Load cache statistics from Redis."""
         try:
-            stats_data = await self.redis_client.hgetall(self.stats_key)
+            stats_data = _decode_fields(await self.redis_client.hgetall(self.stats_key))
             
             if stats_data:
                 self.stats.total_requests = int(stats_data.get('total_requests', 0))
@@ -564,25 +681,22 @@ class EmbeddingCacheService:
             Current cache statistics
         """
         try:
-            # Update total entries count
-            cache_keys = await self.redis_client.keys(f"{self.cache_prefix}*")
-            self.stats.total_entries = len(cache_keys)
+            # Update total entries count from the expiry index
+            self.stats.total_entries = await self.redis_client.zcard(self.expiry_key)
             
             # Estimate memory usage (rough calculation)
-            if cache_keys:
-                # Sample a few entries to estimate average size
-                sample_size = min(10, len(cache_keys))
-                sample_keys = cache_keys[:sample_size]
+            if self.stats.total_entries:
+                # Sample the most recently used entries to estimate average size
+                sample_keys = await self.redis_client.zrange(self.expiry_key, -10, -1)
                 
-                total_sample_memory = 0
+                pipe = self.redis_client.pipeline()
                 for key in sample_keys:
-                    memory_usage = await self.redis_client.memory_usage(key)
-                    if memory_usage:
-                        total_sample_memory += memory_usage
+                    pipe.memory_usage(key)
+                sample_usage = [usage for usage in await pipe.execute() if usage]
                 
-                if sample_size > 0:
-                    avg_entry_size = total_sample_memory / sample_size
-                    total_memory_bytes = avg_entry_size * len(cache_keys)
+                if sample_usage:
+                    avg_entry_size = sum(sample_usage) / len(sample_usage)
+                    total_memory_bytes = avg_entry_size * self.stats.total_entries
                     self.stats.memory_usage_mb = total_memory_bytes / (1024 * 1024)
             
             self.stats.calculate_hit_rate()
@@ -595,6 +709,41 @@ class EmbeddingCacheService:
         
         return self.stats
     
+    async def invalidate_texts(self, texts: List[str], provider: str, model: str) -> int:
+        """
+        Drop the cached embeddings of specific texts.
+        
+        Entries and their expiry index members are removed in one pipeline,
+        so the index never counts deleted entries.
+        
+        Args:
+            texts: Texts whose embeddings are stale
+            provider: Embedding provider
+            model: Embedding model
+            
+        Returns:
+            Number of cache entries removed
+        """
+        if not self.redis_client:
+            return 0
+        
+        cache_keys = list(dict.fromkeys(
+            self._generate_cache_key(text, provider, model) for text in texts if text.strip()
+        ))
+        if not cache_keys:
+            return 0
+        
+        try:
+            pipe = self.redis_client.pipeline()
+            pipe.unlink(*cache_keys)
+            pipe.zrem(self.expiry_key, *cache_keys)
+            removed, _ = await pipe.execute()
+            return removed
+            
+        except Exception as e:
+            logger.error(f"Error invalidating cached embeddings: {e}")
+            return 0
+    
     async def clear_cache(self, provider: Optional[str] = None, model: Optional[str] = None):
         """
         Clear cache entries, optionally filtered by provider/model.
@@ -604,46 +753,54 @@ class EmbeddingCacheService:
             model: Optional model filter
         """
         try:
-            if provider is None and model is None:
-                # Clear all cache entries
-                cache_keys = await self.redis_client.keys(f"{self.cache_prefix}*")
-                if cache_keys:
-                    await self.redis_client.delete(*cache_keys)
-                    logger.info(f"Cleared {len(cache_keys)} cache entries")
-            else:
-                # Filter by provider/model
-                cache_keys = await self.redis_client.keys(f"{self.cache_prefix}*")
-                keys_to_delete = []
-                
-                for key in cache_keys:
-                    entry_data = await self.redis_client.hgetall(key)
-                    if entry_data:
-                        entry_provider = entry_data.get('provider')
-                        entry_model = entry_data.get('model')
-                        
-                        should_delete = True
-                        if provider and entry_provider != provider:
-                            should_delete = False
-                        if model and entry_model != model:
-                            should_delete = False
-                        
-                        if should_delete:
-                            keys_to_delete.append(key)
+            cleared_count = 0
+            
+            async for keys in self._scan_entry_keys():
+                if provider is not None or model is not None:
+                    # Filter by provider/model
+                    pipe = self.redis_client.pipeline()
+                    for key in keys:
+                        pipe.hmget(key, 'provider', 'model')
+                    
+                    matching = []
+                    for key, (entry_provider, entry_model) in zip(keys, await pipe.execute()):
+                        if entry_provider is None:
+                            continue
+                        if provider and entry_provider.decode() != provider:
+                            continue
+                        if model and entry_model.decode() != model:
+                            continue
+                        matching.append(key)
+                    keys = matching
                 
-                if keys_to_delete:
-                    await self.redis_client.delete(*keys_to_delete)
-                    logger.info(f"Cleared {len(keys_to_delete)} cache entries for {provider}/{model}")
-            
-            # Reset stats if clearing all
+                if keys:
+                    pipe = self.redis_client.pipeline()
+                    pipe.unlink(*keys)
+                    pipe.zrem(self.expiry_key, *keys)
+                    await pipe.execute()
+                    cleared_count += len(keys)
+            
+            # Reset index and stats if clearing all
             if provider is None and model is None:
+                await self.redis_client.delete(self.expiry_key)
+                logger.info(f"Cleared {cleared_count} cache entries")
                 self.stats = CacheStats()
                 await self._save_stats()
+            elif cleared_count:
+                logger.info(f"Cleared {cleared_count} cache entries for {provider}/{model}")
                 
         except Exception as e:
             logger.error(f"Error clearing cache: {e}")
     
     async def cleanup_expired_entries(self):
-        """Clean up expired or invalid cache entries."""
+        """
+        Clean up expired or invalid cache entries.
+        
+        Drops index members whose entry has expired, then walks the keyspace
+        with SCAN, validating each batch with one pipelined round trip. Entries
+        missing from the expiry index (e.g. written before it existed) are
+        added with the expiry their remaining TTL gives.
+        """
         try:
             current_time = time.time()
             
@@ -651,39 +808,50 @@ class EmbeddingCacheService:
             if current_time - self._last_cleanup < self.cleanup_interval:
                 return
             
-            cache_keys = await self.redis_client.keys(f"{self.cache_prefix}*")
+            # Entries past their expiry are gone from Redis
+            await self.redis_client.zremrangebyscore(self.expiry_key, '-inf', current_time)
+            
             cleaned_count = 0
             
-            for key in cache_keys:
-                try:
-                    # Check if key still exists (might have expired)
-                    exists = await self.redis_client.exists(key)
-                    if not exists:
-                        cleaned_count += 1
-                        continue
-                    
-                    # Validate entry format
-                    entry_data = await self.redis_client.hgetall(key)
-                    if not entry_data or 'embedding' not in entry_data:
-                        await self.redis_client.delete(key)
-                        cleaned_count += 1
+            async for keys in self._scan_entry_keys():
+                pipe = self.redis_client.pipeline()
+                for key in keys:
+                    pipe.hmget(key, 'embedding', 'embedding_format', 'last_accessed')
+                    pipe.ttl(key)
+                results = await pipe.execute()
+                
+                invalid_keys = []
+                untracked = {}
+                for key, (embedding, embedding_format, last_accessed), remaining_ttl in zip(
+                    keys, results[::2], results[1::2]
+                ):
+                    # Expired between SCAN and HMGET
+                    if embedding is None and last_accessed is None:
                         continue
                     
-                    # Validate JSON format of embedding
+                    # Validate the stored embedding decodes in its tagged format
                     try:
-                        json.loads(entry_data['embedding'])
-                    except json.JSONDecodeError:
-                        await self.redis_client.delete(key)
-                        cleaned_count += 1
-                        
-                except Exception as e:
-                    logger.warning(f"Error validating cache entry {key}: {e}")
-                    # Delete problematic entries
-                    try:
-                        await self.redis_client.delete(key)
-                        cleaned_count += 1
-                    except:
-                        pass
+                        if embedding is None:
+                            raise ValueError("missing embedding")
+                        decode_embedding(
+                            embedding, embedding_format.decode() if embedding_format else None
+                        )
+                        if remaining_ttl >= 0:
+                            untracked[key] = current_time + remaining_ttl
+                        else:
+                            untracked[key] = float(last_accessed or current_time) + self.default_ttl
+                    except (json.JSONDecodeError, ValueError, UnicodeDecodeError):
+                        invalid_keys.append(key)
+                
+                pipe = self.redis_client.pipeline()
+                if invalid_keys:
+                    pipe.unlink(*invalid_keys)
+                    pipe.zrem(self.expiry_key, *invalid_keys)
+                    cleaned_count += len(invalid_keys)
+                if untracked:
+                    pipe.zadd(self.expiry_key, untracked, nx=True)
+                if pipe.command_stack:
+                    await pipe.execute()
             
             self._last_cleanup = current_time
             
@@ -24,6 +24,7 @@ from fastapi import HTTPException, status
 
 from ..models.bot import Bot
 from ..models.document import Document, DocumentChunk
+from .bot_retrieval_profile import get_retrieval_profile_cache
 from .embedding_service import EmbeddingProviderService
 from .vector_store import VectorService
 from .user_service import UserService
@@ -691,6 +692,9 @@ class EmbeddingMigrationSystem:
                 bot.embedding_provider = config.to_provider
                 bot.embedding_model = config.to_model
                 self.db.commit()
+                # A profile cached since the collection was recreated pairs the
+                # old model with the new dimension
+                get_retrieval_profile_cache().invalidate_bot(bot.id)
                 
                 logger.info(f"Updated bot {config.bot_id} configuration: {config.to_provider}/{config.to_model}")
             
@@ -730,6 +734,7 @@ class EmbeddingMigrationSystem:
                 bot.embedding_provider = original_config["embedding_provider"]
                 bot.embedding_model = original_config["embedding_model"]
                 self.db.commit()
+                get_retrieval_profile_cache().invalidate_bot(bot.id)
                 
                 logger.info(f"Restored bot {rollback_info.bot_id} configuration")
             
@@ -0,0 +1,218 @@
+"""
+Rate-limit-aware scheduling of embedding provider calls.
+
+Batches for the same provider run concurrently up to a per-provider limit, and
+every call first takes a token from a bucket kept per (provider, API key), so
+all services embedding with one key share its request budget. A 429 halves the
+bucket's rate and holds it for the provider's Retry-After; successful calls
+recover the rate gradually (additive increase, multiplicative decrease).
+"""
+import asyncio
+import hashlib
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from fastapi import HTTPException, status
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ProviderLimits:
+    """Concurrency and request-rate limits for one embedding provider."""
+    max_concurrency: int = 4
+    requests_per_second: float = 10.0
+    burst: int = 10
+
+
+DEFAULT_PROVIDER_LIMITS: Dict[str, ProviderLimits] = {
+    "openai": ProviderLimits(max_concurrency=8, requests_per_second=50.0, burst=50),
+    "gemini": ProviderLimits(max_concurrency=4, requests_per_second=20.0, burst=20),
+    "openrouter": ProviderLimits(max_concurrency=4, requests_per_second=20.0, burst=20),
+}
+
+
+def get_retry_after(exc: HTTPException) -> Optional[float]:
+    """
+    Read the Retry-After seconds carried by a provider rate-limit error.
+
+    Args:
+        exc: HTTP exception raised by a provider
+
+    Returns:
+        Seconds to wait, or None if the provider did not say
+    """
+    value = (exc.headers or {}).get("Retry-After")
+    try:
+        return max(0.0, float(value)) if value is not None else None
+    except ValueError:
+        return None
+
+
+class TokenBucket:
+    """Token bucket whose refill rate adapts to provider rate limiting."""
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: int,
+        min_rate_ratio: float = 0.05,
+        recovery_ratio: float = 0.05
+    ):
+        """
+        Initialize the bucket full.
+
+        Args:
+            rate: Nominal requests per second
+            capacity: Maximum burst size
+            min_rate_ratio: Floor for the adapted rate, as a fraction of the nominal rate
+            recovery_ratio: Fraction of the nominal rate regained per successful call
+        """
+        self.max_rate = rate
+        self.rate = rate
+        self.capacity = capacity
+        self.min_rate = rate * min_rate_ratio
+        self.recovery_step = rate * recovery_ratio
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self):
+        """Wait until a request may be sent."""
+        while True:
+            now = time.monotonic()
+            if now < self.blocked_until:
+                await asyncio.sleep(self.blocked_until - now)
+                continue
+
+            # Reserve a token; a negative balance is the queue of waiting callers
+            self._refill(now)
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return
+            await asyncio.sleep(-self.tokens / self.rate)
+
+            # A rate limit hit while we slept voids the reservation
+            if time.monotonic() >= self.blocked_until:
+                return
+
+    def record_success(self):
+        """Additively recover the rate after a successful call."""
+        if self.rate < self.max_rate:
+            self.rate = min(self.max_rate, self.rate + self.recovery_step)
+
+    def record_rate_limited(self, retry_after: Optional[float] = None):
+        """
+        Back off after the provider answered 429.
+
+        Args:
+            retry_after: Seconds the provider asked us to wait, if given
+        """
+        now = time.monotonic()
+        self.rate = max(self.min_rate, self.rate / 2)
+        self.tokens = 0.0
+        self.updated = now
+        delay = retry_after if retry_after is not None else 1.0 / self.rate
+        self.blocked_until = max(self.blocked_until, now + delay)
+
+
+class _ProviderLimiter:
+    """Concurrency slots and token bucket for one (provider, API key)."""
+
+    def __init__(self, limits: ProviderLimits):
+        self.semaphore = asyncio.Semaphore(limits.max_concurrency)
+        self.bucket = TokenBucket(limits.requests_per_second, limits.burst)
+
+
+class EmbeddingScheduler:
+    """Schedules embedding provider calls under per-provider and per-key limits."""
+
+    def __init__(self, provider_limits: Optional[Dict[str, ProviderLimits]] = None):
+        """
+        Initialize the scheduler.
+
+        Args:
+            provider_limits: Limits per provider name (uses DEFAULT_PROVIDER_LIMITS if None)
+        """
+        self.provider_limits = provider_limits or DEFAULT_PROVIDER_LIMITS
+        self.default_limits = ProviderLimits()
+        self._limiters: Dict[Tuple[str, str], _ProviderLimiter] = {}
+        self.rate_limited_count = 0
+
+    def _get_limiter(self, provider: str, api_key: Optional[str]) -> _ProviderLimiter:
+        # Keys are hashed so plaintext API keys are never held as dict keys
+        key_id = hashlib.sha256((api_key or "").encode()).hexdigest()[:16]
+        limiter = self._limiters.get((provider, key_id))
+        if limiter is None:
+            limits = self.provider_limits.get(provider, self.default_limits)
+            limiter = _ProviderLimiter(limits)
+            self._limiters[(provider, key_id)] = limiter
+        return limiter
+
+    async def run(
+        self,
+        provider: str,
+        api_key: Optional[str],
+        operation: Callable[..., Awaitable[Any]],
+        *args,
+        **kwargs
+    ) -> Any:
+        """
+        Run one provider call once a concurrency slot and a token are free.
+
+        Args:
+            provider: Provider name
+            api_key: API key the call is made with
+            operation: The async provider call
+            *args: Arguments to pass to the operation
+            **kwargs: Keyword arguments to pass to the operation
+
+        Returns:
+            Result of the operation
+
+        Raises:
+            HTTPException: Re-raised from the operation; 429s also slow down the key's bucket
+        """
+        limiter = self._get_limiter(provider, api_key)
+
+        async with limiter.semaphore:
+            await limiter.bucket.acquire()
+            try:
+                result = await operation(*args, **kwargs)
+            except HTTPException as e:
+                if e.status_code == status.HTTP_429_TOO_MANY_REQUESTS:
+                    self.rate_limited_count += 1
+                    limiter.bucket.record_rate_limited(get_retry_after(e))
+                    logger.warning(
+                        f"{provider} rate limited; request rate lowered to "
+                        f"{limiter.bucket.rate:.2f}/s"
+                    )
+                raise
+            limiter.bucket.record_success()
+            return result
+
+
+# Global scheduler instance, shared so limits apply across all services
+_scheduler: Optional[EmbeddingScheduler] = None
+
+
+def get_embedding_scheduler() -> EmbeddingScheduler:
+    """
+    Get the global embedding scheduler instance.
+
+    Returns:
+        Embedding scheduler
+    """
+    global _scheduler
+
+    if _scheduler is None:
+        _scheduler = EmbeddingScheduler()
+
+    return _scheduler
@@ -9,6 +9,7 @@ from fastapi import HTTPException, status
 
 from ..core.config import settings
 from .embedding_factory import EmbeddingClientFactory
+from .embedding_scheduler import EmbeddingScheduler, get_embedding_scheduler, get_retry_after
 
 
 logger = logging.getLogger(__name__)
@@ -17,15 +18,22 @@ logger = logging.getLogger(__name__)
 class EmbeddingProviderService:
     """Service for managing multiple embedding providers and generating embeddings."""
     
-    def __init__(self, client: Optional[httpx.AsyncClient] = None):
+    def __init__(
+        self,
+        client: Optional[httpx.AsyncClient] = None,
+        scheduler: EmbeddingScheduler = None
+    ):
         """
         Initialize the embedding provider service.
         
         Args:
             client: Optional HTTP client to use. If None, creates a new one.
+            scheduler: Scheduler for provider calls (uses the shared one if None)
         """
         self.factory = EmbeddingClientFactory(client)
+        self.scheduler = scheduler or get_embedding_scheduler()
         self.max_retries = 3
+        self.max_rate_limit_retries = 5
         self.retry_delay = 1.0  # seconds
         self.max_batch_size = 100  # Maximum texts per batch
     
@@ -45,24 +53,40 @@ class EmbeddingProviderService:
             The last exception if all retries fail
         """
         last_exception = None
+        attempt = 0
+        rate_limited = 0
         
-        for attempt in range(self.max_retries):
+        while attempt < self.max_retries:
             try:
                 return await operation(*args, **kwargs)
             except (httpx.TimeoutException, httpx.ConnectError, httpx.NetworkError) as e:
                 last_exception = e
-                if attempt < self.max_retries - 1:
-                    delay = self.retry_delay * (2 ** attempt)  # Exponential backoff
+                attempt += 1
+                if attempt < self.max_retries:
+                    delay = self.retry_delay * (2 ** (attempt - 1))  # Exponential backoff
                     logger.warning(
-                        f"Attempt {attempt + 1} failed for {operation.__name__}: {e}. "
+                        f"Attempt {attempt} failed for {operation.__name__}: {e}. "
                         f"Retrying in {delay} seconds..."
                     )
                     await asyncio.sleep(delay)
                 else:
                     logger.error(f"All {self.max_retries} attempts failed for {operation.__name__}")
-            except HTTPException:
-                # Don't retry HTTP exceptions (auth errors, etc.)
-                raise
+            except HTTPException as e:
+                # Don't retry HTTP exceptions (auth errors, etc.) other than rate limits
+                if (
+                    e.status_code != status.HTTP_429_TOO_MANY_REQUESTS
+                    or rate_limited >= self.max_rate_limit_retries
+                ):
+                    raise
+                rate_limited += 1
+                delay = get_retry_after(e)
+                if delay is None:
+                    delay = self.retry_delay * (2 ** (rate_limited - 1))
+                logger.warning(
+                    f"Rate limited in {operation.__name__} ({rate_limited}/"
+                    f"{self.max_rate_limit_retries}). Retrying in {delay} seconds..."
+                )
+                await asyncio.sleep(delay)
             except Exception as e:
                 # Don't retry other exceptions
                 last_exception = e
@@ -202,6 +226,38 @@ class EmbeddingProviderService:
         
         return batches
     
+    async def _embed_batch(
+        self,
+        provider: str,
+        texts: List[str],
+        model: str,
+        api_key: Optional[str] = None,
+        config: Optional[Dict[str, Any]] = None
+    ) -> List[List[float]]:
+        """
+        Embed one batch through the scheduler.
+        
+        Args:
+            provider: Provider name
+            texts: Texts of the batch
+            model: Model name
+            api_key: API key for the provider
+            config: Optional configuration parameters
+            
+        Returns:
+            Embedding vectors for the batch
+        """
+        return await self.scheduler.run(
+            provider,
+            api_key,
+            self.factory.generate_embeddings,
+            provider,
+            texts,
+            model,
+            api_key,
+            config
+        )
+    
     async def generate_embeddings(
         self,
         provider: str,
@@ -239,33 +295,21 @@ class EmbeddingProviderService:
             )
         
         try:
-            # Process in batches if needed
-            if len(texts) > (batch_size or self.max_batch_size):
-                batches = self._batch_texts(texts, batch_size)
-                all_embeddings = []
-                
-                for batch in batches:
-                    batch_embeddings = await self._retry_operation(
-                        self.factory.generate_embeddings,
-                        provider,
-                        batch,
-                        model,
-                        api_key,
-                        config
-                    )
-                    all_embeddings.extend(batch_embeddings)
-                
-                return all_embeddings
-            else:
-                # Process all texts in one batch
-                return await self._retry_operation(
-                    self.factory.generate_embeddings,
+            # Batches run concurrently under the scheduler's limits; gather keeps input order
+            batches = self._batch_texts(texts, batch_size)
+            batch_embeddings = await asyncio.gather(*[
+                self._retry_operation(
+                    self._embed_batch,
                     provider,
-                    texts,
+                    batch,
                     model,
                     api_key,
                     config
                 )
+                for batch in batches
+            ])
+            
+            return [embedding for batch in batch_embeddings for embedding in batch]
         
         except HTTPException:
             raise
@@ -70,17 +70,18 @@ class EnhancedAPIKeyService:
     detailed error categorization, and specific remediation guidance.
     """
     
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, embedding_service: Optional[EmbeddingProviderService] = None):
         """
         Initialize the enhanced API key service.
         
         Args:
             db: Database session
+            embedding_service: Optional shared embedding service (creates one if None)
         """
         self.db = db
-        self.unified_manager = UnifiedAPIKeyManager(db)
+        self.embedding_service = embedding_service or EmbeddingProviderService()
+        self.unified_manager = UnifiedAPIKeyManager(db, embedding_service=self.embedding_service)
         self.user_service = UserService(db)
-        self.embedding_service = EmbeddingProviderService()
         
         # Configuration
         self.max_fallback_attempts = 3
@@ -91,7 +91,8 @@ class HybridChatService(ChatService):
         self,
         bot: Any,
         query: str,
-        user_id: uuid.UUID
+        user_id: uuid.UUID,
+        query_embedding: Optional[List[float]] = None
     ) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
         """
         Override parent method to use hybrid retrieval when enabled.
@@ -100,7 +101,9 @@ class HybridChatService(ChatService):
         """
         if not self.enable_hybrid:
             # Fall back to original implementation
-            return await super()._retrieve_relevant_chunks_with_recovery(bot, query, user_id)
+            return await super()._retrieve_relevant_chunks_with_recovery(
+                bot, query, user_id, query_embedding
+            )
         
         try:
             # Check cache first
@@ -175,7 +178,9 @@ class HybridChatService(ChatService):
         except Exception as e:
             logger.error(f"Hybrid retrieval failed, falling back to original: {e}")
             # Fall back to original implementation
-            return await super()._retrieve_relevant_chunks_with_recovery(bot, query, user_id)
+            return await super()._retrieve_relevant_chunks_with_recovery(
+                bot, query, user_id, query_embedding
+            )
     
     def _convert_hybrid_response_to_chunks(self, response: HybridResponse) -> List[Dict[str, Any]]:
         """Convert hybrid response to chunks format for backward compatibility."""
@@ -343,7 +348,7 @@ async def migrate_to_hybrid_service(existing_service: ChatService, db: Session)
     hybrid_service.max_retrieved_chunks = existing_service.max_retrieved_chunks
     hybrid_service.similarity_thresholds = existing_service.similarity_thresholds
     hybrid_service.default_similarity_threshold = existing_service.default_similarity_threshold
-    hybrid_service.max_prompt_length = existing_service.max_prompt_length
+    hybrid_service.prompt_budgeter = existing_service.prompt_budgeter
     hybrid_service.enable_graceful_degradation = existing_service.enable_graceful_degradation
     
     logger.info("Successfully migrated to hybrid chat service")
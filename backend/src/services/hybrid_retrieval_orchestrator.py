@@ -18,6 +18,8 @@ from collections import deque
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 
+from .bot_retrieval_profile import get_retrieval_profile_cache
+
 logger = logging.getLogger(__name__)
 
 
@@ -1319,6 +1321,11 @@ class HybridRetrievalOrchestrator:
     
     async def _get_available_documents(self, bot_id: uuid.UUID) -> int:
         """Get count of available documents for bot."""
+        # The chat path has usually built the bot's retrieval profile already
+        profile = get_retrieval_profile_cache().get_profile(bot_id)
+        if profile is not None:
+            return profile.document_count
+        
         try:
             from ..models.document import Document
             count = self.db.query(Document).filter(Document.bot_id == bot_id).count()
@@ -1,12 +1,13 @@
 """
 LLM client factory for dynamic provider selection.
 """
-from typing import Dict, Optional
+from typing import AsyncIterator, Dict, Optional
 import httpx
 from fastapi import HTTPException, status
 
 from .providers import (
     BaseLLMProvider,
+    PromptInput,
     OpenAIProvider,
     AnthropicProvider,
     OpenRouterProvider,
@@ -98,7 +99,7 @@ class LLMClientFactory:
         self,
         provider_name: str,
         model: str,
-        prompt: str,
+        messages: PromptInput,
         api_key: str,
         config: Optional[Dict] = None
     ) -> str:
@@ -108,7 +109,7 @@ class LLMClientFactory:
         Args:
             provider_name: Name of the provider
             model: Model name
-            prompt: Input prompt
+            messages: Chat messages (a plain string is sent as one user message)
             api_key: API key for the provider
             config: Optional configuration parameters
             
@@ -119,7 +120,34 @@ class LLMClientFactory:
             HTTPException: If provider is not supported or generation fails
         """
         provider = self.get_provider(provider_name)
-        return await provider.generate_response(model, prompt, api_key, config)
+        return await provider.generate_response(model, messages, api_key, config)
+    
+    def stream_response(
+        self,
+        provider_name: str,
+        model: str,
+        messages: PromptInput,
+        api_key: str,
+        config: Optional[Dict] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream a response from the specified provider as text deltas.
+        
+        Args:
+            provider_name: Name of the provider
+            model: Model name
+            messages: Chat messages (a plain string is sent as one user message)
+            api_key: API key for the provider
+            config: Optional configuration parameters
+            
+        Returns:
+            Async iterator of response text deltas
+            
+        Raises:
+            HTTPException: If provider is not supported or generation fails
+        """
+        provider = self.get_provider(provider_name)
+        return provider.stream_response(model, messages, api_key, config)
     
     def get_available_models(self, provider_name: str) -> list[str]:
         """
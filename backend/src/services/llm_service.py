@@ -3,12 +3,13 @@ Multi-LLM provider service for API key validation and response generation.
 """
 import asyncio
 import logging
-from typing import Dict, List, Optional, Any
+from typing import AsyncIterator, Dict, List, Optional, Any
 import httpx
 from fastapi import HTTPException, status
 
 from ..core.config import settings
 from .llm_factory import LLMClientFactory
+from .providers import PromptInput
 
 
 logger = logging.getLogger(__name__)
@@ -151,7 +152,7 @@ class LLMProviderService:
         self,
         provider: str,
         model: str,
-        prompt: str,
+        messages: PromptInput,
         api_key: str,
         config: Optional[Dict[str, Any]] = None
     ) -> str:
@@ -161,7 +162,7 @@ class LLMProviderService:
         Args:
             provider: Provider name
             model: Model name
-            prompt: Input prompt
+            messages: Chat messages (a plain string is sent as one user message)
             api_key: API key for the provider
             config: Optional configuration parameters
             
@@ -175,11 +176,67 @@ class LLMProviderService:
             self.factory.generate_response,
             provider,
             model,
-            prompt,
+            messages,
             api_key,
             config
         )
     
+    async def stream_response(
+        self,
+        provider: str,
+        model: str,
+        messages: PromptInput,
+        api_key: str,
+        config: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream a response as text deltas, retrying connection failures.
+        
+        Connection errors are retried with exponential backoff only until the
+        first delta arrives; after that a retry would repeat text the caller
+        has already forwarded, so the error is raised instead.
+        
+        Args:
+            provider: Provider name
+            model: Model name
+            messages: Chat messages (a plain string is sent as one user message)
+            api_key: API key for the provider
+            config: Optional configuration parameters
+            
+        Yields:
+            Response text deltas
+            
+        Raises:
+            HTTPException: If provider not supported or API call fails
+        """
+        for attempt in range(self.max_retries):
+            started = False
+            try:
+                async for delta in self.factory.stream_response(provider, model, messages, api_key, config):
+                    started = True
+                    yield delta
+                return
+            except httpx.TransportError as e:
+                if started:
+                    logger.error(f"{provider} stream interrupted: {e}")
+                    raise HTTPException(
+                        status_code=status.HTTP_502_BAD_GATEWAY,
+                        detail=f"{provider} response stream interrupted"
+                    )
+                if attempt < self.max_retries - 1:
+                    delay = self.retry_delay * (2 ** attempt)  # Exponential backoff
+                    logger.warning(
+                        f"Attempt {attempt + 1} failed for stream_response: {e}. "
+                        f"Retrying in {delay} seconds..."
+                    )
+                    await asyncio.sleep(delay)
+                else:
+                    logger.error(f"All {self.max_retries} attempts failed for stream_response")
+                    raise HTTPException(
+                        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                        detail=f"Failed to connect to {provider}: {str(e)}"
+                    )
+    
     def validate_model_for_provider(self, provider: str, model: str) -> bool:
         """
         Validate that a model is available for a specific provider.
@@ -4,7 +4,6 @@ Implements requirements 6.1, 6.2, 6.4 for task 7.1.
 """
 import asyncio
 import logging
-import hashlib
 from typing import List, Dict, Any, Optional, Tuple, AsyncGenerator
 from uuid import UUID
 import uuid
@@ -16,7 +15,7 @@ from sqlalchemy import and_, or_, select, func, text
 from sqlalchemy.dialects.postgresql import insert
 
 from ..core.database import get_db
-from ..models.document import Document, DocumentChunk
+from ..models.document import Document, DocumentChunk, chunk_local_metadata, compute_content_hash
 from ..models.bot import Bot
 from ..services.vector_store import VectorService
 
@@ -78,7 +77,7 @@ class OptimizedChunkStorage:
         Returns:
             Content hash string
         """
-        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+        return compute_content_hash(content)
     
     async def store_chunks_efficiently(
         self,
@@ -194,8 +193,9 @@ class OptimizedChunkStorage:
             chunk_info = {
                 'content': content,
                 'content_hash': content_hash,
-                'metadata': chunk.get('metadata', {}),
-                'chunk_index': batch_offset + i,
+                # Document-level fields live on the document row, not per chunk
+                'metadata': chunk_local_metadata(chunk.get('metadata', {})),
+                'chunk_index': chunk.get('chunk_index', batch_offset + i),
                 'embedding': embedding
             }
             chunk_data.append(chunk_info)
@@ -205,18 +205,15 @@ class OptimizedChunkStorage:
         if enable_deduplication:
             content_hashes = [chunk['content_hash'] for chunk in chunk_data]
             
-            # Query existing chunks by content hash within the same bot
-            existing_chunks = self.db.query(DocumentChunk).filter(
+            # Look up existing hashes within the same bot via the (bot_id, content_hash) index
+            existing_rows = self.db.query(DocumentChunk.content_hash).filter(
                 and_(
                     DocumentChunk.bot_id == bot_id,
-                    func.encode(func.digest(DocumentChunk.content, 'sha256'), 'hex').in_(content_hashes)
+                    DocumentChunk.content_hash.in_(content_hashes)
                 )
             ).all()
             
-            existing_hashes = {
-                hashlib.sha256(chunk.content.encode('utf-8')).hexdigest()
-                for chunk in existing_chunks
-            }
+            existing_hashes = {row.content_hash for row in existing_rows}
         
         # Prepare database chunks and vector chunks
         db_chunks = []
@@ -231,6 +228,8 @@ class OptimizedChunkStorage:
                 logger.debug(f"Skipping duplicate chunk with hash {content_hash[:8]}...")
                 continue
             
+            # Identical chunks later in the same batch are duplicates of this one
+            existing_hashes.add(content_hash)
             chunk_id = str(uuid.uuid4())
             
             # Prepare database chunk with minimal metadata duplication
@@ -240,6 +239,7 @@ class OptimizedChunkStorage:
                 bot_id=bot_id,
                 chunk_index=chunk_info['chunk_index'],
                 content=chunk_info['content'],
+                content_hash=content_hash,
                 embedding_id=chunk_id,
                 chunk_metadata=chunk_info['metadata']
             )
@@ -368,7 +368,7 @@ class OptimizedChunkStorage:
                         content=chunk.content,
                         metadata=chunk.chunk_metadata or {},
                         embedding_id=chunk.embedding_id,
-                        content_hash=self._calculate_content_hash(chunk.content)
+                        content_hash=chunk.content_hash or self._calculate_content_hash(chunk.content)
                     )
                     streaming_chunks.append(streaming_chunk)
                 
@@ -477,10 +477,10 @@ class OptimizedChunkStorage:
             
             # Calculate potential duplicates by content hash
             duplicate_query = self.db.query(
-                func.encode(func.digest(DocumentChunk.content, 'sha256'), 'hex').label('content_hash'),
+                DocumentChunk.content_hash,
                 func.count().label('count')
             ).filter(DocumentChunk.bot_id == bot_id).group_by(
-                func.encode(func.digest(DocumentChunk.content, 'sha256'), 'hex')
+                DocumentChunk.content_hash
             ).having(func.count() > 1)
             
             duplicates = duplicate_query.all()
@@ -0,0 +1,80 @@
+"""
+In-process cache of resolved bot roles.
+
+PermissionService resolves a user's role on a bot at the start of nearly every
+request and once per subscriber on WebSocket broadcasts. Roles change rarely,
+so resolved roles (including "no access") are cached per (user, bot) for a
+short TTL. PermissionService invalidates entries when it grants, revokes or
+transfers access; the TTL bounds how long another worker process can serve a
+role that was changed elsewhere.
+"""
+import uuid
+from typing import Optional, Tuple
+
+from ..utils.ttl_cache import TTLCache
+
+
+class PermissionCache(TTLCache):
+    """TTL cache of bot roles keyed by (user_id, bot_id)."""
+
+    def __init__(self, ttl: float = 30.0, max_entries: int = 50000):
+        """
+        Initialize the cache.
+
+        Args:
+            ttl: Seconds a resolved role stays valid
+            max_entries: Entries kept before the oldest are evicted
+        """
+        super().__init__(ttl, max_entries)
+
+    def get_role(self, user_id: uuid.UUID, bot_id: uuid.UUID) -> Tuple[bool, Optional[str]]:
+        """
+        Look up a cached role.
+
+        Args:
+            user_id: User ID
+            bot_id: Bot ID
+
+        Returns:
+            Tuple of (found, role); role is None when the user is cached as
+            having no access
+        """
+        return self.get((user_id, bot_id))
+
+    def set_role(self, user_id: uuid.UUID, bot_id: uuid.UUID, role: Optional[str]):
+        """
+        Cache a resolved role.
+
+        Args:
+            user_id: User ID
+            bot_id: Bot ID
+            role: Role, or None for no access
+        """
+        self.set((user_id, bot_id), role)
+
+    def invalidate_role(self, user_id: uuid.UUID, bot_id: uuid.UUID):
+        """Drop the cached role of one user on one bot."""
+        self.invalidate((user_id, bot_id))
+
+    def invalidate_bot(self, bot_id: uuid.UUID):
+        """Drop every cached role on a bot."""
+        self.invalidate_where(lambda key: key[1] == bot_id)
+
+
+# Global cache instance, shared by every PermissionService in the process
+_permission_cache: Optional[PermissionCache] = None
+
+
+def get_permission_cache() -> PermissionCache:
+    """
+    Get the global permission cache instance.
+
+    Returns:
+        Permission cache
+    """
+    global _permission_cache
+
+    if _permission_cache is None:
+        _permission_cache = PermissionCache()
+
+    return _permission_cache
@@ -12,6 +12,7 @@ from ..models.bot import Bot, BotPermission
 from ..models.user import User
 from ..models.activity import ActivityLog
 from ..schemas.bot import BotPermissionCreate, BotPermissionUpdate
+from .permission_cache import PermissionCache, get_permission_cache
 
 
 class PermissionService:
@@ -35,8 +36,9 @@ class PermissionService:
                  "edit_bot", "delete_documents", "manage_collaborators", "delete_bot", "transfer_ownership"]
     }
     
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, cache: PermissionCache = None):
         self.db = db
+        self.cache = cache or get_permission_cache()
     
     def check_bot_permission(self, user_id: uuid.UUID, bot_id: uuid.UUID, required_permission: str) -> bool:
         """
@@ -50,11 +52,23 @@ class PermissionService:
         Returns:
             True if user has permission, False otherwise
         """
-        user_role = self.get_user_bot_role(user_id, bot_id)
-        if not user_role:
+        return self.role_has_permission(self.get_user_bot_role(user_id, bot_id), required_permission)
+    
+    def role_has_permission(self, role: Optional[str], required_permission: str) -> bool:
+        """
+        Check if a role grants a permission.
+        
+        Args:
+            role: Role string, or None for no access
+            required_permission: Permission to check (e.g., 'edit_bot', 'chat')
+            
+        Returns:
+            True if the role grants the permission, False otherwise
+        """
+        if not role:
             return False
             
-        return required_permission in self.ROLE_PERMISSIONS.get(user_role, [])
+        return required_permission in self.ROLE_PERMISSIONS.get(role, [])
     
     def check_bot_role(self, user_id: uuid.UUID, bot_id: uuid.UUID, required_role: str) -> bool:
         """
@@ -88,14 +102,67 @@ class PermissionService:
         Returns:
             User's role string or None if no permission
         """
-        permission = self.db.query(BotPermission).filter(
+        found, role = self.cache.get_role(user_id, bot_id)
+        if found:
+            return role
+        
+        permission = self.db.query(BotPermission.role).filter(
             and_(
                 BotPermission.user_id == user_id,
                 BotPermission.bot_id == bot_id
             )
         ).first()
         
-        return permission.role if permission else None
+        role = permission.role if permission else None
+        self.cache.set_role(user_id, bot_id, role)
+        return role
+    
+    def get_roles_for_users(
+        self,
+        bot_id: uuid.UUID,
+        user_ids: List[uuid.UUID]
+    ) -> Dict[uuid.UUID, Optional[str]]:
+        """
+        Get the roles of many users on one bot, with at most one query.
+        
+        Args:
+            bot_id: Bot ID
+            user_ids: User IDs to resolve
+            
+        Returns:
+            Mapping of each user ID to its role, or None if no permission
+        """
+        roles: Dict[uuid.UUID, Optional[str]] = {}
+        uncached = []
+        for user_id in user_ids:
+            found, role = self.cache.get_role(user_id, bot_id)
+            if found:
+                roles[user_id] = role
+            else:
+                uncached.append(user_id)
+        
+        if uncached:
+            permissions = self.db.query(BotPermission.user_id, BotPermission.role).filter(
+                and_(
+                    BotPermission.bot_id == bot_id,
+                    BotPermission.user_id.in_(uncached)
+                )
+            ).all()
+            resolved = {permission.user_id: permission.role for permission in permissions}
+            for user_id in uncached:
+                roles[user_id] = resolved.get(user_id)
+                self.cache.set_role(user_id, bot_id, roles[user_id])
+        
+        return roles
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """
+        Get role cache hit/miss counters.
+        
+        Returns:
+            Dictionary of cache statistics
+        """
+        return self.cache.get_stats()
     
     def grant_permission(
         self, 
@@ -186,6 +253,7 @@ class PermissionService:
             
             self.db.commit()
             self.db.refresh(existing_permission)
+            self.cache.invalidate_role(user_id, bot_id)
             
             # Send WebSocket notification
             self._send_permission_notification(
@@ -222,6 +290,7 @@ class PermissionService:
             
             self.db.commit()
             self.db.refresh(permission)
+            self.cache.invalidate_role(user_id, bot_id)
             
             # Send WebSocket notification
             self._send_permission_notification(
@@ -291,6 +360,7 @@ class PermissionService:
         # Delete permission
         self.db.delete(permission)
         self.db.commit()
+        self.cache.invalidate_role(user_id, bot_id)
         
         # Send WebSocket notification
         self._send_permission_notification(
@@ -426,6 +496,8 @@ class PermissionService:
         )
         
         self.db.commit()
+        self.cache.invalidate_role(current_owner, bot_id)
+        self.cache.invalidate_role(new_owner, bot_id)
         return True
     
     def get_user_accessible_bots(self, user_id: uuid.UUID) -> List[Dict[str, Any]]:
@@ -0,0 +1,213 @@
+"""
+Token-budgeted prompt assembly for chat generation.
+
+Builds the typed message list sent to LLM providers from the bot's system
+prompt, retrieved document context, conversation history and the user input.
+The input budget comes from the model's context window minus the tokens
+reserved for the response (BaseLLMProvider.get_model_max_tokens), capped by a
+configurable maximum. Context chunks and history messages are admitted whole,
+in priority order, and dropped whole when they do not fit.
+"""
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Sequence
+
+from .providers.base import ChatMessage
+
+
+logger = logging.getLogger(__name__)
+
+# Rough tokens-per-character ratio of English text for BPE tokenizers
+CHARS_PER_TOKEN = 4
+
+# Per-message framing tokens (role markers, separators) charged by chat APIs
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the token count of a text without a model-specific tokenizer.
+
+    Args:
+        text: Text to measure
+
+    Returns:
+        Estimated number of tokens
+    """
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def estimate_message_tokens(message: ChatMessage) -> int:
+    """
+    Estimate the tokens a message costs, including its framing.
+
+    Args:
+        message: Chat message
+
+    Returns:
+        Estimated number of tokens
+    """
+    return estimate_tokens(message.content) + MESSAGE_OVERHEAD_TOKENS
+
+
+# Document context is sent as one system message with this heading
+CONTEXT_HEADER = "Relevant Context:"
+CONTEXT_HEADER_TOKENS = estimate_tokens(CONTEXT_HEADER) + MESSAGE_OVERHEAD_TOKENS
+
+
+@dataclass
+class PromptAssembly:
+    """Messages chosen for one generation call and what the budget left out."""
+    messages: List[ChatMessage]
+    token_budget: int
+    estimated_tokens: int
+    chunk_indices: List[int] = field(default_factory=list)
+    chunks_dropped: int = 0
+    history_used: int = 0
+    history_dropped: int = 0
+
+    def to_metadata(self) -> Dict[str, Any]:
+        """Summarize the assembly for response metadata."""
+        return {
+            "prompt_token_budget": self.token_budget,
+            "prompt_tokens_estimated": self.estimated_tokens,
+            "prompt_chunks_dropped": self.chunks_dropped,
+            "prompt_history_used": self.history_used,
+            "prompt_history_dropped": self.history_dropped
+        }
+
+
+class PromptBudgeter:
+    """Allocates a model's input token budget across prompt sections."""
+
+    def __init__(self, max_input_tokens: int = 6000, context_share: float = 0.6):
+        """
+        Initialize the budgeter.
+
+        Args:
+            max_input_tokens: Upper bound on prompt tokens regardless of model window
+            context_share: Share of the optional budget offered to document context
+                before history; history's unused share flows back to context
+        """
+        self.max_input_tokens = max_input_tokens
+        self.context_share = context_share
+
+    def input_budget(self, context_window: int, max_output_tokens: int) -> int:
+        """
+        Compute the prompt token budget for a model.
+
+        Args:
+            context_window: Model context window in tokens
+            max_output_tokens: Tokens reserved for the response
+
+        Returns:
+            Tokens available for the prompt
+        """
+        available = context_window - max_output_tokens
+        if available <= 0:
+            # Output reservation covers the whole window; keep a usable prompt
+            # and let the caller shrink max_tokens to what is left
+            available = context_window // 2
+        return min(self.max_input_tokens, available)
+
+    def _select_chunks(
+        self,
+        costs: List[int],
+        allowance: int,
+        taken: List[int],
+        spent: int
+    ) -> int:
+        """Add whole chunks that still fit the allowance to taken; return tokens spent."""
+        for i, cost in enumerate(costs):
+            if i in taken:
+                continue
+            # The first chunk also pays for the context message itself
+            if not taken:
+                cost += CONTEXT_HEADER_TOKENS
+            if spent + cost <= allowance:
+                taken.append(i)
+                spent += cost
+        return spent
+
+    def assemble(
+        self,
+        system_prompt: str,
+        chunks: Sequence[str],
+        history: Sequence[ChatMessage],
+        user_input: str,
+        budget: int
+    ) -> PromptAssembly:
+        """
+        Build the message list within a token budget.
+
+        The system prompt and user input are always sent. Context chunks are
+        taken in retrieval order, skipping any chunk too large for what is left;
+        history is taken newest first and stops at the first message that does
+        not fit, so the kept history is a contiguous recent window.
+
+        Args:
+            system_prompt: Bot system prompt
+            chunks: Retrieved chunk texts, most relevant first
+            history: Prior conversation messages, oldest first
+            user_input: Current user message
+            budget: Prompt token budget
+
+        Returns:
+            PromptAssembly with the messages and budget accounting
+        """
+        system_message = ChatMessage(role="system", content=system_prompt)
+        user_message = ChatMessage(role="user", content=user_input)
+        required = estimate_message_tokens(system_message) + estimate_message_tokens(user_message)
+        remaining = max(0, budget - required)
+
+        chunk_costs = [estimate_tokens(f"Document Context 0:\n{chunk}\n\n") for chunk in chunks]
+
+        chunk_indices: List[int] = []
+        context_spent = self._select_chunks(
+            chunk_costs, int(remaining * self.context_share), chunk_indices, 0
+        )
+        remaining -= context_spent
+
+        kept_history: List[ChatMessage] = []
+        for message in reversed(history):
+            cost = estimate_message_tokens(message)
+            if cost > remaining:
+                break
+            kept_history.append(message)
+            remaining -= cost
+        kept_history.reverse()
+
+        # Context may also use whatever history left over
+        if len(chunk_indices) < len(chunks):
+            spent = self._select_chunks(
+                chunk_costs, context_spent + remaining, chunk_indices, context_spent
+            )
+            remaining -= spent - context_spent
+        chunk_indices.sort()
+
+        messages = [system_message]
+        if chunk_indices:
+            context_text = "\n\n".join(
+                f"Document Context {n + 1}:\n{chunks[i]}" for n, i in enumerate(chunk_indices)
+            )
+            messages.append(ChatMessage(role="system", content=f"{CONTEXT_HEADER}\n{context_text}"))
+        messages.extend(kept_history)
+        messages.append(user_message)
+
+        assembly = PromptAssembly(
+            messages=messages,
+            token_budget=budget,
+            estimated_tokens=sum(estimate_message_tokens(m) for m in messages),
+            chunk_indices=chunk_indices,
+            chunks_dropped=len(chunks) - len(chunk_indices),
+            history_used=len(kept_history),
+            history_dropped=len(history) - len(kept_history)
+        )
+
+        if assembly.chunks_dropped or assembly.history_dropped:
+            logger.info(
+                f"Prompt budget {budget} tokens: dropped {assembly.chunks_dropped} context chunks "
+                f"and {assembly.history_dropped} history messages"
+            )
+
+        return assembly
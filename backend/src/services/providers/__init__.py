@@ -2,7 +2,7 @@
 LLM and embedding provider implementations.
 """
 # LLM providers
-from .base import BaseLLMProvider
+from .base import BaseLLMProvider, ChatMessage, PromptInput
 from .openai_provider import OpenAIProvider
 from .anthropic_provider import AnthropicProvider
 from .openrouter_provider import OpenRouterProvider
@@ -16,6 +16,8 @@ from .gemini_embedding_provider import GeminiEmbeddingProvider
 __all__ = [
     # LLM providers
     "BaseLLMProvider",
+    "ChatMessage",
+    "PromptInput",
     "OpenAIProvider", 
     "AnthropicProvider",
     "OpenRouterProvider",
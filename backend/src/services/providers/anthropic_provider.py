@@ -1,11 +1,12 @@
 """
 Anthropic provider implementation.
 """
-from typing import Dict, List, Optional, Any
+import json
+from typing import AsyncIterator, Dict, List, Optional, Any
 import httpx
 from fastapi import HTTPException, status
 
-from .base import BaseLLMProvider
+from .base import BaseLLMProvider, PromptInput, iter_sse_data, split_system_messages, to_messages
 
 
 class AnthropicProvider(BaseLLMProvider):
@@ -45,30 +46,26 @@ class AnthropicProvider(BaseLLMProvider):
         except Exception:
             return False
     
-    async def generate_response(
+    def _build_payload(
         self,
         model: str,
-        prompt: str,
-        api_key: str,
+        messages: PromptInput,
         config: Optional[Dict[str, Any]] = None
-    ) -> str:
-        """Generate response using Anthropic API."""
-        url = f"{self.base_url}/v1/messages"
-        headers = self.get_headers(api_key)
-        
+    ) -> Dict[str, Any]:
+        """Build the messages API request body."""
         # Merge default config with provided config
         default_config = self.get_default_config()
         if config:
             default_config.update(config)
         
-        # Parse the prompt to extract system message and conversation context
-        system_message, messages = self._parse_prompt_to_messages(prompt)
+        # Anthropic takes the system prompt separately from the turns
+        system_message, turns = split_system_messages(to_messages(messages))
         
         payload = {
             "model": model,
             "max_tokens": default_config.get("max_tokens", 1000),
             "temperature": default_config.get("temperature", 0.7),
-            "messages": messages
+            "messages": [{"role": m.role, "content": m.content} for m in turns]
         }
         
         # Add system message if present
@@ -79,6 +76,38 @@ class AnthropicProvider(BaseLLMProvider):
         if "top_p" in default_config:
             payload["top_p"] = default_config["top_p"]
         
+        return payload
+    
+    def _http_error(self, e: httpx.HTTPStatusError) -> HTTPException:
+        """Map an Anthropic API error response to an HTTPException."""
+        if e.response.status_code == 401:
+            return HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid Anthropic API key"
+            )
+        elif e.response.status_code == 429:
+            return HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Anthropic API rate limit exceeded"
+            )
+        else:
+            return HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Anthropic API error: {e.response.status_code}"
+            )
+    
+    async def generate_response(
+        self,
+        model: str,
+        messages: PromptInput,
+        api_key: str,
+        config: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """Generate response using Anthropic API."""
+        url = f"{self.base_url}/v1/messages"
+        headers = self.get_headers(api_key)
+        payload = self._build_payload(model, messages, config)
+        
         try:
             response = await self.client.post(url, headers=headers, json=payload)
             response.raise_for_status()
@@ -86,86 +115,56 @@ class AnthropicProvider(BaseLLMProvider):
             data = response.json()
             return data["content"][0]["text"]
         except httpx.HTTPStatusError as e:
-            if e.response.status_code == 401:
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Invalid Anthropic API key"
-                )
-            elif e.response.status_code == 429:
-                raise HTTPException(
-                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                    detail="Anthropic API rate limit exceeded"
-                )
-            else:
-                raise HTTPException(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail=f"Anthropic API error: {e.response.status_code}"
-                )
+            raise self._http_error(e)
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Failed to generate Anthropic response: {str(e)}"
             )
     
-    def _parse_prompt_to_messages(self, prompt: str) -> tuple[str, List[Dict[str, str]]]:
-        """Parse a formatted prompt into Anthropic messages format with system message."""
-        system_message = ""
-        messages = []
-        
-        # Split prompt into sections
-        sections = prompt.split('\n\n')
-        current_content = []
-        
-        for section in sections:
-            if section.startswith('System:'):
-                if current_content:
-                    messages.append({"role": "user", "content": '\n\n'.join(current_content)})
-                    current_content = []
-                system_message = section[7:].strip()  # Remove 'System:' prefix
-            elif section.startswith('Conversation History:'):
-                if current_content:
-                    messages.append({"role": "user", "content": '\n\n'.join(current_content)})
-                    current_content = []
-                # Parse conversation history
-                history_content = section[21:].strip()  # Remove 'Conversation History:' prefix
-                history_messages = self._parse_conversation_history(history_content)
-                messages.extend(history_messages)
-            elif section.startswith('User:'):
-                if current_content:
-                    messages.append({"role": "user", "content": '\n\n'.join(current_content)})
-                    current_content = []
-                user_content = section[5:].strip()  # Remove 'User:' prefix
-                messages.append({"role": "user", "content": user_content})
-            elif section.startswith('Assistant:'):
-                # This is just a prompt continuation, ignore
-                continue
-            else:
-                # Add to current content (context, etc.)
-                current_content.append(section)
-        
-        # Add any remaining content as user message
-        if current_content:
-            messages.append({"role": "user", "content": '\n\n'.join(current_content)})
-        
-        # Ensure we have at least one message
-        if not messages:
-            messages.append({"role": "user", "content": prompt})
-        
-        return system_message, messages
-    
-    def _parse_conversation_history(self, history_content: str) -> List[Dict[str, str]]:
-        """Parse conversation history into messages."""
-        messages = []
-        lines = history_content.split('\n')
-        
-        for line in lines:
-            line = line.strip()
-            if line.startswith('User:'):
-                messages.append({"role": "user", "content": line[5:].strip()})
-            elif line.startswith('Assistant:'):
-                messages.append({"role": "assistant", "content": line[10:].strip()})
+    async def stream_response(
+        self,
+        model: str,
+        messages: PromptInput,
+        api_key: str,
+        config: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[str]:
+        """Stream text deltas from the Anthropic messages SSE API."""
+        url = f"{self.base_url}/v1/messages"
+        headers = self.get_headers(api_key)
+        payload = {**self._build_payload(model, messages, config), "stream": True}
         
-        return messages
+        try:
+            async with self.client.stream("POST", url, headers=headers, json=payload) as response:
+                if response.is_error:
+                    await response.aread()
+                    response.raise_for_status()
+                
+                async for data in iter_sse_data(response):
+                    event = json.loads(data)
+                    event_type = event.get("type")
+                    if event_type == "content_block_delta":
+                        text = event.get("delta", {}).get("text")
+                        if text:
+                            yield text
+                    elif event_type == "message_stop":
+                        break
+                    elif event_type == "error":
+                        # e.g. overloaded_error, sent after the 200 status line
+                        raise HTTPException(
+                            status_code=status.HTTP_502_BAD_GATEWAY,
+                            detail=f"Anthropic stream error: {event.get('error', {}).get('message', 'unknown')}"
+                        )
+        except httpx.HTTPStatusError as e:
+            raise self._http_error(e)
+        except (HTTPException, httpx.TransportError):
+            # Transport errors are left to the caller, which may retry
+            raise
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to stream Anthropic response: {str(e)}"
+            )
     
     def get_available_models(self) -> List[str]:
         """Get list of available Anthropic models (static fallback)."""
@@ -190,6 +189,18 @@ class AnthropicProvider(BaseLLMProvider):
         }
         return model_limits.get(model, 4096)  # Default to 4096 if model not found
     
+    def get_model_context_window(self, model: str) -> int:
+        """Get the context window for a specific model."""
+        context_windows = {
+            "claude-3-opus-20240229": 200000,
+            "claude-3-sonnet-20240229": 200000,
+            "claude-3-haiku-20240307": 200000,
+            "claude-2.1": 200000,
+            "claude-2.0": 100000,
+            "claude-instant-1.2": 100000
+        }
+        return context_windows.get(model, 100000)  # Default to 100000 if model not found
+    
     def get_default_config(self) -> Dict[str, Any]:
         """Get default configuration for Anthropic provider."""
         return {
@@ -2,10 +2,80 @@
 Base abstract class for LLM providers.
 """
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional, Any
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, List, Optional, Any, Tuple, Union
 import httpx
 
 
+@dataclass(frozen=True)
+class ChatMessage:
+    """One message of a chat prompt; role is 'system', 'user' or 'assistant'."""
+    role: str
+    content: str
+
+
+# Providers accept a message list, or a bare string sent as one user message
+PromptInput = Union[str, List[ChatMessage]]
+
+
+def to_messages(prompt: PromptInput) -> List[ChatMessage]:
+    """
+    Normalize provider input to a message list.
+    
+    Args:
+        prompt: Message list, or plain text for a single user turn
+        
+    Returns:
+        List of chat messages
+    """
+    if isinstance(prompt, str):
+        return [ChatMessage(role="user", content=prompt)]
+    return list(prompt)
+
+
+def split_system_messages(messages: List[ChatMessage]) -> Tuple[str, List[ChatMessage]]:
+    """
+    Separate system messages for APIs that take the system prompt on its own.
+    
+    Args:
+        messages: Chat messages
+        
+    Returns:
+        Tuple of (system messages joined by blank lines, remaining messages)
+    """
+    system_parts = [m.content for m in messages if m.role == "system"]
+    return "\n\n".join(system_parts), [m for m in messages if m.role != "system"]
+
+
+async def iter_sse_data(response: httpx.Response) -> AsyncIterator[str]:
+    """
+    Yield the data payload of each server-sent event in a streamed response.
+    
+    Args:
+        response: Streaming HTTP response with an event-stream body
+        
+    Yields:
+        Event data, with multi-line data fields joined by newlines
+    """
+    data_lines = []
+    async for line in response.aiter_lines():
+        if not line:
+            # A blank line ends the event
+            if data_lines:
+                yield "\n".join(data_lines)
+                data_lines = []
+            continue
+        if line.startswith(":"):
+            # Comment / keep-alive
+            continue
+        field, _, value = line.partition(":")
+        if field == "data":
+            data_lines.append(value[1:] if value.startswith(" ") else value)
+    
+    if data_lines:
+        yield "\n".join(data_lines)
+
+
 class BaseLLMProvider(ABC):
     """Abstract base class for LLM providers."""
     
@@ -41,7 +111,7 @@ class BaseLLMProvider(ABC):
     async def generate_response(
         self,
         model: str,
-        prompt: str,
+        messages: PromptInput,
         api_key: str,
         config: Optional[Dict[str, Any]] = None
     ) -> str:
@@ -50,7 +120,7 @@ class BaseLLMProvider(ABC):
         
         Args:
             model: Model name
-            prompt: Input prompt
+            messages: Chat messages (a plain string is sent as one user message)
             api_key: API key for the provider
             config: Optional configuration parameters
             
@@ -59,6 +129,28 @@ class BaseLLMProvider(ABC):
         """
         pass
     
+    async def stream_response(
+        self,
+        model: str,
+        messages: PromptInput,
+        api_key: str,
+        config: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream a response as text deltas. Override in subclasses with the
+        provider's streaming API; the default yields the whole completion once.
+        
+        Args:
+            model: Model name
+            messages: Chat messages (a plain string is sent as one user message)
+            api_key: API key for the provider
+            config: Optional configuration parameters
+            
+        Yields:
+            Generated text, in order
+        """
+        yield await self.generate_response(model, messages, api_key, config)
+    
     @abstractmethod
     def get_available_models(self) -> List[str]:
         """
@@ -139,4 +231,17 @@ class BaseLLMProvider(ABC):
         Returns:
             Default max tokens for the model
         """
-        return 1000  # Default fallback
\ No newline at end of file
+        return 1000  # Default fallback
+    
+    def get_model_context_window(self, model: str) -> int:
+        """
+        Get the context window (input plus output tokens) of a specific model.
+        Override in subclasses for model-specific limits.
+        
+        Args:
+            model: Model name
+            
+        Returns:
+            Context window in tokens
+        """
+        return 8192  # Default fallback
\ No newline at end of file
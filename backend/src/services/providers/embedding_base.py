@@ -4,6 +4,7 @@ Base abstract class for embedding providers.
 from abc import ABC, abstractmethod
 from typing import List, Optional, Dict, Any
 import httpx
+from fastapi import HTTPException, status
 
 
 class BaseEmbeddingProvider(ABC):
@@ -107,6 +108,26 @@ class BaseEmbeddingProvider(ABC):
         """
         return {"Content-Type": "application/json"}
     
+    def rate_limit_error(self, response: httpx.Response) -> HTTPException:
+        """
+        Build the exception raised when the provider answers 429.
+        
+        The provider's Retry-After header is passed through so the embedding
+        scheduler can hold the API key's bucket for as long as asked.
+        
+        Args:
+            response: Rate-limited provider response
+            
+        Returns:
+            HTTP 429 exception carrying Retry-After when the provider sent one
+        """
+        retry_after = response.headers.get("retry-after")
+        return HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=f"{self.provider_name} API rate limit exceeded",
+            headers={"Retry-After": retry_after} if retry_after else None
+        )
+    
     def get_default_config(self) -> Dict[str, Any]:
         """
         Get default configuration for this provider.
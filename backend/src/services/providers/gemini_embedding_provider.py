@@ -11,6 +11,9 @@ from .embedding_base import BaseEmbeddingProvider
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of requests Gemini accepts in one batchEmbedContents call
+BATCH_EMBED_LIMIT = 100
+
 
 class GeminiEmbeddingProvider(BaseEmbeddingProvider):
     """Google Gemini embedding provider implementation."""
@@ -65,25 +68,31 @@ class GeminiEmbeddingProvider(BaseEmbeddingProvider):
         try:
             embeddings = []
             
-            # Gemini API processes one text at a time
-            for text in texts:
-                payload = {
-                    "model": f"models/{model}",
-                    "content": {
-                        "parts": [{"text": text}]
+            # batchEmbedContents embeds up to BATCH_EMBED_LIMIT texts per call
+            for i in range(0, len(texts), BATCH_EMBED_LIMIT):
+                requests = []
+                for text in texts[i:i + BATCH_EMBED_LIMIT]:
+                    request = {
+                        "model": f"models/{model}",
+                        "content": {
+                            "parts": [{"text": text}]
+                        }
                     }
-                }
-                
-                # Add any additional config parameters
-                if config:
-                    payload.update(config)
+                    
+                    # Add any additional config parameters
+                    if config:
+                        request.update(config)
+                    requests.append(request)
                 
                 response = await self.client.post(
-                    f"{self.base_url}/models/{model}:embedContent",
+                    f"{self.base_url}/models/{model}:batchEmbedContents",
                     params={"key": api_key},
-                    json=payload
+                    json={"requests": requests}
                 )
                 
+                if response.status_code == 429:
+                    raise self.rate_limit_error(response)
+                
                 if response.status_code != 200:
                     error_detail = f"Gemini API error: {response.status_code}"
                     try:
@@ -99,13 +108,15 @@ class GeminiEmbeddingProvider(BaseEmbeddingProvider):
                     )
                 
                 result = response.json()
-                if "embedding" in result and "values" in result["embedding"]:
-                    embeddings.append(result["embedding"]["values"])
-                else:
+                batch_embeddings = [
+                    item.get("values") for item in result.get("embeddings", [])
+                ]
+                if len(batch_embeddings) != len(requests) or not all(batch_embeddings):
                     raise HTTPException(
                         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                         detail="Invalid response format from Gemini API"
                     )
+                embeddings.extend(batch_embeddings)
             
             return embeddings
             
@@ -1,11 +1,12 @@
 """
 Gemini provider implementation.
 """
-from typing import Dict, List, Optional, Any
+import json
+from typing import AsyncIterator, Dict, List, Optional, Any
 import httpx
 from fastapi import HTTPException, status
 
-from .base import BaseLLMProvider
+from .base import BaseLLMProvider, PromptInput, iter_sse_data, split_system_messages, to_messages
 
 
 class GeminiProvider(BaseLLMProvider):
@@ -36,24 +37,23 @@ class GeminiProvider(BaseLLMProvider):
         except Exception:
             return False
     
-    async def generate_response(
+    def _build_payload(
         self,
-        model: str,
-        prompt: str,
-        api_key: str,
+        messages: PromptInput,
         config: Optional[Dict[str, Any]] = None
-    ) -> str:
-        """Generate response using Gemini API."""
-        url = f"{self.base_url}/models/{model}:generateContent?key={api_key}"
-        headers = self.get_headers(api_key)
-        
+    ) -> Dict[str, Any]:
+        """Build the generateContent request body."""
         # Merge default config with provided config
         default_config = self.get_default_config()
         if config:
             default_config.update(config)
         
-        # Parse the prompt to extract conversation context if available
-        system_instruction, contents = self._parse_prompt_to_contents(prompt)
+        # Gemini takes the system prompt as systemInstruction and calls the assistant "model"
+        system_instruction, turns = split_system_messages(to_messages(messages))
+        contents = [
+            {"role": "model" if m.role == "assistant" else "user", "parts": [{"text": m.content}]}
+            for m in turns
+        ]
         
         payload = {
             "contents": contents,
@@ -88,6 +88,51 @@ class GeminiProvider(BaseLLMProvider):
             }
         ]
         
+        return payload
+    
+    def _http_error(self, e: httpx.HTTPStatusError) -> HTTPException:
+        """Map a Gemini API error response to an HTTPException."""
+        if e.response.status_code == 400:
+            # Try to get more specific error from response
+            try:
+                error_message = e.response.json().get("error", {}).get("message", "Bad request")
+            except Exception:
+                return HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Invalid request to Gemini API"
+                )
+            return HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Gemini API error: {error_message}"
+            )
+        elif e.response.status_code == 403:
+            return HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid Gemini API key or insufficient permissions"
+            )
+        elif e.response.status_code == 429:
+            return HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Gemini API rate limit exceeded"
+            )
+        else:
+            return HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Gemini API error: {e.response.status_code}"
+            )
+    
+    async def generate_response(
+        self,
+        model: str,
+        messages: PromptInput,
+        api_key: str,
+        config: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """Generate response using Gemini API."""
+        url = f"{self.base_url}/models/{model}:generateContent?key={api_key}"
+        headers = self.get_headers(api_key)
+        payload = self._build_payload(messages, config)
+        
         try:
             response = await self.client.post(url, headers=headers, json=payload)
             response.raise_for_status()
@@ -110,100 +155,55 @@ class GeminiProvider(BaseLLMProvider):
             
             return candidate["content"]["parts"][0]["text"]
         except httpx.HTTPStatusError as e:
-            if e.response.status_code == 400:
-                # Try to get more specific error from response
-                try:
-                    error_data = e.response.json()
-                    error_message = error_data.get("error", {}).get("message", "Bad request")
-                    raise HTTPException(
-                        status_code=status.HTTP_400_BAD_REQUEST,
-                        detail=f"Gemini API error: {error_message}"
-                    )
-                except:
-                    raise HTTPException(
-                        status_code=status.HTTP_400_BAD_REQUEST,
-                        detail="Invalid request to Gemini API"
-                    )
-            elif e.response.status_code == 403:
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Invalid Gemini API key or insufficient permissions"
-                )
-            elif e.response.status_code == 429:
-                raise HTTPException(
-                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                    detail="Gemini API rate limit exceeded"
-                )
-            else:
-                raise HTTPException(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail=f"Gemini API error: {e.response.status_code}"
-                )
+            raise self._http_error(e)
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Failed to generate Gemini response: {str(e)}"
             )
     
-    def _parse_prompt_to_contents(self, prompt: str) -> tuple[str, List[Dict[str, Any]]]:
-        """Parse a formatted prompt into Gemini contents format with system instruction."""
-        system_instruction = ""
-        contents = []
-        
-        # Split prompt into sections
-        sections = prompt.split('\n\n')
-        current_content = []
-        
-        for section in sections:
-            if section.startswith('System:'):
-                if current_content:
-                    contents.append({"role": "user", "parts": [{"text": '\n\n'.join(current_content)}]})
-                    current_content = []
-                system_instruction = section[7:].strip()  # Remove 'System:' prefix
-            elif section.startswith('Conversation History:'):
-                if current_content:
-                    contents.append({"role": "user", "parts": [{"text": '\n\n'.join(current_content)}]})
-                    current_content = []
-                # Parse conversation history
-                history_content = section[21:].strip()  # Remove 'Conversation History:' prefix
-                history_contents = self._parse_conversation_history(history_content)
-                contents.extend(history_contents)
-            elif section.startswith('User:'):
-                if current_content:
-                    contents.append({"role": "user", "parts": [{"text": '\n\n'.join(current_content)}]})
-                    current_content = []
-                user_content = section[5:].strip()  # Remove 'User:' prefix
-                contents.append({"role": "user", "parts": [{"text": user_content}]})
-            elif section.startswith('Assistant:'):
-                # This is just a prompt continuation, ignore
-                continue
-            else:
-                # Add to current content (context, etc.)
-                current_content.append(section)
-        
-        # Add any remaining content as user message
-        if current_content:
-            contents.append({"role": "user", "parts": [{"text": '\n\n'.join(current_content)}]})
-        
-        # Ensure we have at least one content
-        if not contents:
-            contents.append({"role": "user", "parts": [{"text": prompt}]})
-        
-        return system_instruction, contents
-    
-    def _parse_conversation_history(self, history_content: str) -> List[Dict[str, Any]]:
-        """Parse conversation history into Gemini contents."""
-        contents = []
-        lines = history_content.split('\n')
-        
-        for line in lines:
-            line = line.strip()
-            if line.startswith('User:'):
-                contents.append({"role": "user", "parts": [{"text": line[5:].strip()}]})
-            elif line.startswith('Assistant:'):
-                contents.append({"role": "model", "parts": [{"text": line[10:].strip()}]})
+    async def stream_response(
+        self,
+        model: str,
+        messages: PromptInput,
+        api_key: str,
+        config: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[str]:
+        """Stream text deltas from the Gemini streamGenerateContent SSE API."""
+        url = f"{self.base_url}/models/{model}:streamGenerateContent?alt=sse&key={api_key}"
+        headers = self.get_headers(api_key)
+        payload = self._build_payload(messages, config)
         
-        return contents
+        try:
+            async with self.client.stream("POST", url, headers=headers, json=payload) as response:
+                if response.is_error:
+                    await response.aread()
+                    response.raise_for_status()
+                
+                async for data in iter_sse_data(response):
+                    event = json.loads(data)
+                    candidates = event.get("candidates") or []
+                    if not candidates:
+                        # A prompt rejected by safety filters yields only promptFeedback
+                        if event.get("promptFeedback", {}).get("blockReason"):
+                            raise HTTPException(
+                                status_code=status.HTTP_400_BAD_REQUEST,
+                                detail="Response blocked by Gemini safety filters"
+                            )
+                        continue
+                    for part in candidates[0].get("content", {}).get("parts", []):
+                        if part.get("text"):
+                            yield part["text"]
+        except httpx.HTTPStatusError as e:
+            raise self._http_error(e)
+        except (HTTPException, httpx.TransportError):
+            # Transport errors are left to the caller, which may retry
+            raise
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to stream Gemini response: {str(e)}"
+            )
     
     def get_available_models(self) -> List[str]:
         """Get list of available Gemini models (static fallback)."""
@@ -226,6 +226,17 @@ class GeminiProvider(BaseLLMProvider):
         }
         return model_limits.get(model, 2048)  # Default to 2048 if model not found
     
+    def get_model_context_window(self, model: str) -> int:
+        """Get the context window for a specific model."""
+        context_windows = {
+            "gemini-pro": 32760,
+            "gemini-pro-vision": 16384,
+            "gemini-1.5-pro": 2097152,
+            "gemini-1.5-flash": 1048576,
+            "gemini-1.0-pro": 32760
+        }
+        return context_windows.get(model, 32760)  # Default to 32760 if model not found
+    
     def get_default_config(self) -> Dict[str, Any]:
         """Get default configuration for Gemini provider."""
         return {
@@ -81,6 +81,9 @@ class OpenAIEmbeddingProvider(BaseEmbeddingProvider):
                 json=payload
             )
             
+            if response.status_code == 429:
+                raise self.rate_limit_error(response)
+            
             if response.status_code != 200:
                 error_detail = f"OpenAI API error: {response.status_code}"
                 try:
@@ -1,11 +1,12 @@
 """
 OpenAI provider implementation.
 """
-from typing import Dict, List, Optional, Any
+import json
+from typing import AsyncIterator, Dict, List, Optional, Any
 import httpx
 from fastapi import HTTPException, status
 
-from .base import BaseLLMProvider
+from .base import BaseLLMProvider, PromptInput, iter_sse_data, to_messages
 
 
 class OpenAIProvider(BaseLLMProvider):
@@ -37,34 +38,59 @@ class OpenAIProvider(BaseLLMProvider):
         except Exception:
             return False
     
-    async def generate_response(
+    def _build_payload(
         self,
         model: str,
-        prompt: str,
-        api_key: str,
+        messages: PromptInput,
         config: Optional[Dict[str, Any]] = None
-    ) -> str:
-        """Generate response using OpenAI API."""
-        url = f"{self.base_url}/chat/completions"
-        headers = self.get_headers(api_key)
-        
+    ) -> Dict[str, Any]:
+        """Build the chat completions request body."""
         # Merge default config with provided config
         default_config = self.get_default_config()
         if config:
             default_config.update(config)
         
-        # Parse the prompt to extract conversation context if available
-        messages = self._parse_prompt_to_messages(prompt)
-        
-        payload = {
+        return {
             "model": model,
-            "messages": messages,
+            "messages": [
+                {"role": m.role, "content": m.content} for m in to_messages(messages)
+            ],
             "temperature": default_config.get("temperature", 0.7),
             "max_tokens": default_config.get("max_tokens", 1000),
             "top_p": default_config.get("top_p", 1.0),
             "frequency_penalty": default_config.get("frequency_penalty", 0.0),
             "presence_penalty": default_config.get("presence_penalty", 0.0)
         }
+    
+    def _http_error(self, e: httpx.HTTPStatusError) -> HTTPException:
+        """Map an OpenAI API error response to an HTTPException."""
+        if e.response.status_code == 401:
+            return HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid OpenAI API key"
+            )
+        elif e.response.status_code == 429:
+            return HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="OpenAI API rate limit exceeded"
+            )
+        else:
+            return HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"OpenAI API error: {e.response.status_code}"
+            )
+    
+    async def generate_response(
+        self,
+        model: str,
+        messages: PromptInput,
+        api_key: str,
+        config: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """Generate response using OpenAI API."""
+        url = f"{self.base_url}/chat/completions"
+        headers = self.get_headers(api_key)
+        payload = self._build_payload(model, messages, config)
         
         try:
             response = await self.client.post(url, headers=headers, json=payload)
@@ -73,86 +99,55 @@ class OpenAIProvider(BaseLLMProvider):
             data = response.json()
             return data["choices"][0]["message"]["content"]
         except httpx.HTTPStatusError as e:
-            if e.response.status_code == 401:
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Invalid OpenAI API key"
-                )
-            elif e.response.status_code == 429:
-                raise HTTPException(
-                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                    detail="OpenAI API rate limit exceeded"
-                )
-            else:
-                raise HTTPException(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail=f"OpenAI API error: {e.response.status_code}"
-                )
+            raise self._http_error(e)
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Failed to generate OpenAI response: {str(e)}"
             )
     
-    def _parse_prompt_to_messages(self, prompt: str) -> List[Dict[str, str]]:
-        """Parse a formatted prompt into OpenAI messages format."""
-        messages = []
-        
-        # Split prompt into sections
-        sections = prompt.split('\n\n')
-        current_content = []
-        
-        for section in sections:
-            if section.startswith('System:'):
-                if current_content:
-                    messages.append({"role": "user", "content": '\n\n'.join(current_content)})
-                    current_content = []
-                system_content = section[7:].strip()  # Remove 'System:' prefix
-                messages.append({"role": "system", "content": system_content})
-            elif section.startswith('Conversation History:'):
-                if current_content:
-                    messages.append({"role": "user", "content": '\n\n'.join(current_content)})
-                    current_content = []
-                # Parse conversation history
-                history_content = section[21:].strip()  # Remove 'Conversation History:' prefix
-                history_messages = self._parse_conversation_history(history_content)
-                messages.extend(history_messages)
-            elif section.startswith('User:'):
-                if current_content:
-                    messages.append({"role": "user", "content": '\n\n'.join(current_content)})
-                    current_content = []
-                user_content = section[5:].strip()  # Remove 'User:' prefix
-                messages.append({"role": "user", "content": user_content})
-            elif section.startswith('Assistant:'):
-                # This is just a prompt continuation, ignore
-                continue
-            else:
-                # Add to current content (context, etc.)
-                current_content.append(section)
-        
-        # Add any remaining content as user message
-        if current_content:
-            messages.append({"role": "user", "content": '\n\n'.join(current_content)})
-        
-        # Ensure we have at least one message
-        if not messages:
-            messages.append({"role": "user", "content": prompt})
-        
-        return messages
-    
-    def _parse_conversation_history(self, history_content: str) -> List[Dict[str, str]]:
-        """Parse conversation history into messages."""
-        messages = []
-        lines = history_content.split('\n')
-        
-        for line in lines:
-            line = line.strip()
-            if line.startswith('User:'):
-                messages.append({"role": "user", "content": line[5:].strip()})
-            elif line.startswith('Assistant:'):
-                messages.append({"role": "assistant", "content": line[10:].strip()})
+    async def stream_response(
+        self,
+        model: str,
+        messages: PromptInput,
+        api_key: str,
+        config: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[str]:
+        """Stream response deltas from the OpenAI chat completions SSE API."""
+        url = f"{self.base_url}/chat/completions"
+        headers = self.get_headers(api_key)
+        payload = {**self._build_payload(model, messages, config), "stream": True}
         
-        return messages
+        try:
+            async with self.client.stream("POST", url, headers=headers, json=payload) as response:
+                if response.is_error:
+                    await response.aread()
+                    response.raise_for_status()
+                
+                async for data in iter_sse_data(response):
+                    if data == "[DONE]":
+                        break
+                    event = json.loads(data)
+                    if event.get("error"):
+                        # Errors after the stream started arrive as an event, not a status
+                        raise HTTPException(
+                            status_code=status.HTTP_502_BAD_GATEWAY,
+                            detail=f"OpenAI stream error: {event['error'].get('message', 'unknown')}"
+                        )
+                    choices = event.get("choices") or []
+                    delta = choices[0].get("delta", {}).get("content") if choices else None
+                    if delta:
+                        yield delta
+        except httpx.HTTPStatusError as e:
+            raise self._http_error(e)
+        except (HTTPException, httpx.TransportError):
+            # Transport errors are left to the caller, which may retry
+            raise
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to stream OpenAI response: {str(e)}"
+            )
     
     def get_available_models(self) -> List[str]:
         """Get list of available OpenAI models (static fallback)."""
@@ -183,6 +178,21 @@ class OpenAIProvider(BaseLLMProvider):
         }
         return model_limits.get(model, 4096)  # Default to 4096 if model not found
     
+    def get_model_context_window(self, model: str) -> int:
+        """Get the context window for a specific model."""
+        context_windows = {
+            "gpt-4o": 128000,
+            "gpt-4o-mini": 128000,
+            "gpt-4-turbo": 128000,
+            "gpt-4": 8192,
+            "gpt-4-0125-preview": 128000,
+            "gpt-4-1106-preview": 128000,
+            "gpt-3.5-turbo": 16385,
+            "gpt-3.5-turbo-0125": 16385,
+            "gpt-3.5-turbo-1106": 16385
+        }
+        return context_windows.get(model, 16385)  # Default to 16385 if model not found
+    
     def get_default_config(self) -> Dict[str, Any]:
         """Get default configuration for OpenAI provider."""
         return {
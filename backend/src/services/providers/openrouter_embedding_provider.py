@@ -77,10 +77,7 @@ class OpenRouterEmbeddingProvider(BaseEmbeddingProvider):
                     detail="Invalid OpenRouter API key"
                 )
             elif e.response.status_code == 429:
-                raise HTTPException(
-                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                    detail="OpenRouter API rate limit exceeded"
-                )
+                raise self.rate_limit_error(e.response)
             else:
                 raise HTTPException(
                     status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
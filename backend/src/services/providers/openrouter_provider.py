@@ -1,11 +1,12 @@
 """
 OpenRouter provider implementation.
 """
-from typing import Dict, List, Optional, Any
+import json
+from typing import AsyncIterator, Dict, List, Optional, Any
 import httpx
 from fastapi import HTTPException, status
 
-from .base import BaseLLMProvider
+from .base import BaseLLMProvider, PromptInput, iter_sse_data, to_messages
 
 
 class OpenRouterProvider(BaseLLMProvider):
@@ -39,28 +40,23 @@ class OpenRouterProvider(BaseLLMProvider):
         except Exception:
             return False
     
-    async def generate_response(
+    def _build_payload(
         self,
         model: str,
-        prompt: str,
-        api_key: str,
+        messages: PromptInput,
         config: Optional[Dict[str, Any]] = None
-    ) -> str:
-        """Generate response using OpenRouter API."""
-        url = f"{self.base_url}/chat/completions"
-        headers = self.get_headers(api_key)
-        
+    ) -> Dict[str, Any]:
+        """Build the chat completions request body."""
         # Merge default config with provided config
         default_config = self.get_default_config()
         if config:
             default_config.update(config)
         
-        # Parse the prompt to extract conversation context if available
-        messages = self._parse_prompt_to_messages(prompt)
-        
         payload = {
             "model": model,
-            "messages": messages,
+            "messages": [
+                {"role": m.role, "content": m.content} for m in to_messages(messages)
+            ],
             "temperature": default_config.get("temperature", 0.7),
             "max_tokens": default_config.get("max_tokens", 1000),
             "top_p": default_config.get("top_p", 1.0)
@@ -72,6 +68,38 @@ class OpenRouterProvider(BaseLLMProvider):
         if "presence_penalty" in default_config:
             payload["presence_penalty"] = default_config["presence_penalty"]
         
+        return payload
+    
+    def _http_error(self, e: httpx.HTTPStatusError) -> HTTPException:
+        """Map an OpenRouter API error response to an HTTPException."""
+        if e.response.status_code == 401:
+            return HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid OpenRouter API key"
+            )
+        elif e.response.status_code == 429:
+            return HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="OpenRouter API rate limit exceeded"
+            )
+        else:
+            return HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"OpenRouter API error: {e.response.status_code}"
+            )
+    
+    async def generate_response(
+        self,
+        model: str,
+        messages: PromptInput,
+        api_key: str,
+        config: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """Generate response using OpenRouter API."""
+        url = f"{self.base_url}/chat/completions"
+        headers = self.get_headers(api_key)
+        payload = self._build_payload(model, messages, config)
+        
         try:
             response = await self.client.post(url, headers=headers, json=payload)
             response.raise_for_status()
@@ -79,86 +107,55 @@ class OpenRouterProvider(BaseLLMProvider):
             data = response.json()
             return data["choices"][0]["message"]["content"]
         except httpx.HTTPStatusError as e:
-            if e.response.status_code == 401:
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Invalid OpenRouter API key"
-                )
-            elif e.response.status_code == 429:
-                raise HTTPException(
-                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                    detail="OpenRouter API rate limit exceeded"
-                )
-            else:
-                raise HTTPException(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail=f"OpenRouter API error: {e.response.status_code}"
-                )
+            raise self._http_error(e)
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Failed to generate OpenRouter response: {str(e)}"
             )
     
-    def _parse_prompt_to_messages(self, prompt: str) -> List[Dict[str, str]]:
-        """Parse a formatted prompt into OpenRouter messages format."""
-        messages = []
-        
-        # Split prompt into sections
-        sections = prompt.split('\n\n')
-        current_content = []
-        
-        for section in sections:
-            if section.startswith('System:'):
-                if current_content:
-                    messages.append({"role": "user", "content": '\n\n'.join(current_content)})
-                    current_content = []
-                system_content = section[7:].strip()  # Remove 'System:' prefix
-                messages.append({"role": "system", "content": system_content})
-            elif section.startswith('Conversation History:'):
-                if current_content:
-                    messages.append({"role": "user", "content": '\n\n'.join(current_content)})
-                    current_content = []
-                # Parse conversation history
-                history_content = section[21:].strip()  # Remove 'Conversation History:' prefix
-                history_messages = self._parse_conversation_history(history_content)
-                messages.extend(history_messages)
-            elif section.startswith('User:'):
-                if current_content:
-                    messages.append({"role": "user", "content": '\n\n'.join(current_content)})
-                    current_content = []
-                user_content = section[5:].strip()  # Remove 'User:' prefix
-                messages.append({"role": "user", "content": user_content})
-            elif section.startswith('Assistant:'):
-                # This is just a prompt continuation, ignore
-                continue
-            else:
-                # Add to current content (context, etc.)
-                current_content.append(section)
-        
-        # Add any remaining content as user message
-        if current_content:
-            messages.append({"role": "user", "content": '\n\n'.join(current_content)})
-        
-        # Ensure we have at least one message
-        if not messages:
-            messages.append({"role": "user", "content": prompt})
-        
-        return messages
-    
-    def _parse_conversation_history(self, history_content: str) -> List[Dict[str, str]]:
-        """Parse conversation history into messages."""
-        messages = []
-        lines = history_content.split('\n')
-        
-        for line in lines:
-            line = line.strip()
-            if line.startswith('User:'):
-                messages.append({"role": "user", "content": line[5:].strip()})
-            elif line.startswith('Assistant:'):
-                messages.append({"role": "assistant", "content": line[10:].strip()})
+    async def stream_response(
+        self,
+        model: str,
+        messages: PromptInput,
+        api_key: str,
+        config: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[str]:
+        """Stream response deltas from the OpenRouter chat completions SSE API."""
+        url = f"{self.base_url}/chat/completions"
+        headers = self.get_headers(api_key)
+        payload = {**self._build_payload(model, messages, config), "stream": True}
         
-        return messages
+        try:
+            async with self.client.stream("POST", url, headers=headers, json=payload) as response:
+                if response.is_error:
+                    await response.aread()
+                    response.raise_for_status()
+                
+                async for data in iter_sse_data(response):
+                    if data == "[DONE]":
+                        break
+                    event = json.loads(data)
+                    if event.get("error"):
+                        # Errors after the stream started arrive as an event, not a status
+                        raise HTTPException(
+                            status_code=status.HTTP_502_BAD_GATEWAY,
+                            detail=f"OpenRouter stream error: {event['error'].get('message', 'unknown')}"
+                        )
+                    choices = event.get("choices") or []
+                    delta = choices[0].get("delta", {}).get("content") if choices else None
+                    if delta:
+                        yield delta
+        except httpx.HTTPStatusError as e:
+            raise self._http_error(e)
+        except (HTTPException, httpx.TransportError):
+            # Transport errors are left to the caller, which may retry
+            raise
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to stream OpenRouter response: {str(e)}"
+            )
     
     def get_available_models(self) -> List[str]:
         """Get list of available OpenRouter models (static fallback)."""
@@ -207,6 +204,30 @@ class OpenRouterProvider(BaseLLMProvider):
         }
         return model_limits.get(model, 2048)  # Default to 2048 if model not found
     
+    def get_model_context_window(self, model: str) -> int:
+        """Get the context window for a specific model."""
+        context_windows = {
+            "openai/gpt-4o": 128000,
+            "openai/gpt-4o-mini": 128000,
+            "openai/gpt-4-turbo": 128000,
+            "openai/gpt-4": 8192,
+            "openai/gpt-3.5-turbo": 16385,
+            "anthropic/claude-3-opus": 200000,
+            "anthropic/claude-3-sonnet": 200000,
+            "anthropic/claude-3-haiku": 200000,
+            "anthropic/claude-2": 100000,
+            "anthropic/claude-instant-1": 100000,
+            "meta-llama/llama-2-70b-chat": 4096,
+            "meta-llama/llama-2-13b-chat": 4096,
+            "mistralai/mixtral-8x7b-instruct": 32768,
+            "mistralai/mistral-7b-instruct": 32768,
+            "google/gemini-pro": 32768,
+            "google/palm-2-chat-bison": 8192,
+            "cohere/command": 4096,
+            "cohere/command-light": 4096
+        }
+        return context_windows.get(model, 8192)  # Default to 8192 if model not found
+    
     def get_default_config(self) -> Dict[str, Any]:
         """Get default configuration for OpenRouter provider."""
         return {
@@ -0,0 +1,212 @@
+"""
+Qdrant collection profiles sized to a bot's point count.
+
+Every bot collection used to be created with default HNSW settings,
+full-precision vectors in RAM and no payload indexes, although every search
+filters on bot_id and optionally document_id. A profile bundles the storage
+and index settings that suit a collection of a given size:
+
+- small: everything in RAM, default-sized graph; exact enough and cheapest
+  to build for the typical bot.
+- large: int8 scalar quantization kept in RAM with the original vectors on
+  disk, and a denser graph to hold recall as the collection grows.
+- archival: the largest collections keep vectors and graph on disk; binary
+  quantization (scalar below BINARY_QUANTIZATION_MIN_DIMENSION,
+  where binary codes lose too much recall) is the only thing in RAM.
+
+All profiles index the filtered payload keys and keep payloads on disk
+(Qdrant's default), so filtering reads the index rather than payloads. Quantized searches rescore an
+oversampled candidate set against the original vectors.
+VectorCollectionManager.optimize_collection picks the profile for the
+current point count and applies it in place with update_collection; Qdrant
+rebuilds indexes and quantized data in the background while the collection
+keeps serving.
+
+SHARED_COLLECTION_PROFILE configures the collections small bots share
+(QDRANT_COLLECTION_LAYOUT=shared): bot_id is a tenant index, so Qdrant keeps
+each bot's points together on disk, and instead of one global HNSW graph
+(m=0) it builds a graph per bot (payload_m), which is what bot-filtered
+searches walk.
+"""
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from qdrant_client.http import models
+
+
+# Payload keys searches filter on
+INDEXED_PAYLOAD_KEYS = ("bot_id", "document_id")
+
+# Binary codes only keep enough signal for high-dimensional embeddings
+BINARY_QUANTIZATION_MIN_DIMENSION = 1024
+
+# Candidates fetched per requested hit from quantized vectors before rescoring;
+# Qdrant ignores quantization search params on unquantized collections
+QUANTIZED_SEARCH_OVERSAMPLING = 3.0
+
+
+@dataclass(frozen=True)
+class CollectionProfile:
+    """Storage and index settings for collections up to max_points points."""
+    name: str
+    max_points: Optional[int]
+    hnsw_m: int
+    hnsw_ef_construct: int
+    quantization: Optional[str] = None  # None, "scalar" or "binary"
+    vectors_on_disk: bool = False
+    hnsw_on_disk: bool = False
+    payload_on_disk: bool = True
+    hnsw_payload_m: Optional[int] = None
+    # Payload key indexed as a tenant key, for collections shared by bots
+    tenant_key: Optional[str] = None
+
+    def quantization_type(self, dimension: int) -> Optional[str]:
+        """Quantization actually used for vectors of this dimension."""
+        if self.quantization == "binary" and dimension < BINARY_QUANTIZATION_MIN_DIMENSION:
+            return "scalar"
+        return self.quantization
+
+    def vector_params(self, dimension: int) -> models.VectorParams:
+        return models.VectorParams(
+            size=dimension,
+            distance=models.Distance.COSINE,
+            on_disk=self.vectors_on_disk
+        )
+
+    def hnsw_config(self) -> models.HnswConfigDiff:
+        return models.HnswConfigDiff(
+            m=self.hnsw_m,
+            ef_construct=self.hnsw_ef_construct,
+            on_disk=self.hnsw_on_disk,
+            payload_m=self.hnsw_payload_m
+        )
+
+    def payload_index_schema(self, key: str):
+        """Keyword index schema for a filtered payload key."""
+        if key == self.tenant_key:
+            return models.KeywordIndexParams(type=models.KeywordIndexType.KEYWORD, is_tenant=True)
+        return models.PayloadSchemaType.KEYWORD
+
+    def quantization_config(self, dimension: int):
+        """Quantization config for create_collection, or None for full precision."""
+        quantization = self.quantization_type(dimension)
+        if quantization == "scalar":
+            return models.ScalarQuantization(
+                scalar=models.ScalarQuantizationConfig(
+                    type=models.ScalarType.INT8,
+                    quantile=0.99,
+                    always_ram=True
+                )
+            )
+        if quantization == "binary":
+            return models.BinaryQuantization(
+                binary=models.BinaryQuantizationConfig(always_ram=True)
+            )
+        return None
+
+
+COLLECTION_PROFILES: Dict[str, CollectionProfile] = {
+    profile.name: profile
+    for profile in (
+        CollectionProfile("small", max_points=20_000, hnsw_m=16, hnsw_ef_construct=100),
+        CollectionProfile(
+            "large", max_points=1_000_000, hnsw_m=32, hnsw_ef_construct=200,
+            quantization="scalar", vectors_on_disk=True
+        ),
+        CollectionProfile(
+            "archival", max_points=None, hnsw_m=16, hnsw_ef_construct=128,
+            quantization="binary", vectors_on_disk=True, hnsw_on_disk=True
+        ),
+    )
+}
+
+DEFAULT_COLLECTION_PROFILE = COLLECTION_PROFILES["small"]
+
+# Not selected by size; shared collections hold many bots below the promotion
+# threshold, so they get the large profile's storage with per-bot graphs
+SHARED_COLLECTION_PROFILE = CollectionProfile(
+    "shared", max_points=None, hnsw_m=0, hnsw_ef_construct=100, hnsw_payload_m=16,
+    quantization="scalar", vectors_on_disk=True, tenant_key="bot_id"
+)
+
+
+def select_collection_profile(points_count: int) -> CollectionProfile:
+    """
+    Pick the profile for a collection of the given size.
+
+    Args:
+        points_count: Points stored in the collection
+
+    Returns:
+        The first profile whose max_points the collection fits under
+    """
+    for profile in COLLECTION_PROFILES.values():
+        if profile.max_points is None or points_count < profile.max_points:
+            return profile
+    return COLLECTION_PROFILES["archival"]
+
+
+def quantized_search_params() -> models.SearchParams:
+    """Search params that rescore oversampled quantized candidates."""
+    return models.SearchParams(
+        quantization=models.QuantizationSearchParams(
+            rescore=True,
+            oversampling=QUANTIZED_SEARCH_OVERSAMPLING
+        )
+    )
+
+
+def _quantization_type(config) -> Optional[str]:
+    if isinstance(config, models.ScalarQuantization):
+        return "scalar"
+    if isinstance(config, models.BinaryQuantization):
+        return "binary"
+    if config is not None:
+        return "other"
+    return None
+
+
+def profile_changes(info: models.CollectionInfo, profile: CollectionProfile) -> Dict[str, Any]:
+    """
+    Compare a collection's current configuration with a profile.
+
+    Args:
+        info: Collection info from get_collection
+        profile: Target profile
+
+    Returns:
+        update_collection keyword arguments for the settings that differ, plus
+        "payload_indexes" listing the filtered keys without an index
+    """
+    config = info.config
+    vectors = config.params.vectors
+    dimension = vectors.size
+    changes: Dict[str, Any] = {}
+
+    if bool(config.params.on_disk_payload) != profile.payload_on_disk:
+        changes["collection_params"] = models.CollectionParamsDiff(on_disk_payload=profile.payload_on_disk)
+
+    if bool(vectors.on_disk) != profile.vectors_on_disk:
+        changes["vectors_config"] = {"": models.VectorParamsDiff(on_disk=profile.vectors_on_disk)}
+
+    hnsw = config.hnsw_config
+    if (
+        hnsw.m != profile.hnsw_m
+        or hnsw.ef_construct != profile.hnsw_ef_construct
+        or bool(hnsw.on_disk) != profile.hnsw_on_disk
+        or (profile.hnsw_payload_m is not None and hnsw.payload_m != profile.hnsw_payload_m)
+    ):
+        changes["hnsw_config"] = profile.hnsw_config()
+
+    if _quantization_type(config.quantization_config) != profile.quantization_type(dimension):
+        changes["quantization_config"] = (
+            profile.quantization_config(dimension) or models.Disabled.DISABLED
+        )
+
+    missing_indexes: List[str] = [
+        key for key in INDEXED_PAYLOAD_KEYS if key not in (info.payload_schema or {})
+    ]
+    if missing_indexes:
+        changes["payload_indexes"] = missing_indexes
+
+    return changes
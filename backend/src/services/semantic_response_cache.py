@@ -0,0 +1,272 @@
+"""
+Per-bot semantic cache of chat answers.
+
+ContextAwareCacheManager keys entries by an exact hash of the query, so
+paraphrases of the same question ("how do I reset my password" and "password
+reset steps") never share an entry. This cache keeps, per bot, the embeddings
+of recently answered standalone questions as rows of an L2-normalized float32
+matrix. A new question is answered from the most similar row when its cosine
+similarity reaches the threshold, skipping retrieval and the LLM call.
+
+An index only holds embeddings of one embedding model and dimension; a bot
+whose model changes starts over. Entries expire after a TTL, the oldest are
+overwritten once a bot's index is full, and a bot's whole index is dropped
+whenever its documents or configuration change, through
+ContextAwareCacheManager.invalidate_bot_cache / invalidate_document_cache.
+Invalidation only reaches the process it runs in, so the TTL bounds how long
+another worker can serve an answer built from replaced documents or an old
+system prompt.
+"""
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from ..core.config import settings
+
+
+# Length of the chunk text previews kept with an answer, as shown in chunks_used
+CHUNK_PREVIEW_LENGTH = 100
+
+
+def chunk_preview(text: str) -> str:
+    """Shorten chunk text the way chat responses report it."""
+    return text[:CHUNK_PREVIEW_LENGTH] + "..." if len(text) > CHUNK_PREVIEW_LENGTH else text
+
+
+@dataclass(frozen=True)
+class CachedAnswer:
+    """A stored answer and the chunks it was generated from."""
+    query: str
+    response: str
+    # {"id": ..., "text": preview} per chunk, in prompt order
+    chunks: Tuple[Dict[str, Any], ...]
+    created_at: float = field(default_factory=time.time)
+
+
+class _BotIndex:
+    """Ring buffer of normalized query embeddings and their answers for one bot."""
+
+    def __init__(self, model_key: Tuple[str, str], dimension: int, capacity: int):
+        self.model_key = model_key
+        self.dimension = dimension
+        self.capacity = capacity
+        # Grown on demand up to capacity; most bots never fill it
+        self.matrix = np.empty((min(capacity, 16), dimension), dtype=np.float32)
+        self.expires = np.empty(self.matrix.shape[0], dtype=np.float64)
+        self.answers: List[CachedAnswer] = []
+        self.next_slot = 0
+
+    def __len__(self) -> int:
+        return len(self.answers)
+
+    def search(self, vector: np.ndarray, now: float) -> Tuple[int, float]:
+        """Get the slot and cosine similarity of the closest live entry, or (-1, -1.0)."""
+        size = len(self.answers)
+        if not size:
+            return -1, -1.0
+        scores = self.matrix[:size] @ vector
+        scores[self.expires[:size] <= now] = -1.0
+        slot = int(np.argmax(scores))
+        return slot, float(scores[slot])
+
+    def add(self, vector: np.ndarray, answer: CachedAnswer, expires: float):
+        """Store an entry, overwriting the oldest one when full."""
+        size = len(self.answers)
+        if size < self.capacity:
+            if size == self.matrix.shape[0]:
+                rows = min(self.capacity, size * 2)
+                self.matrix = np.resize(self.matrix, (rows, self.dimension))
+                self.expires = np.resize(self.expires, rows)
+            slot = size
+            self.answers.append(answer)
+        else:
+            slot = self.next_slot
+            self.answers[slot] = answer
+            self.next_slot = (slot + 1) % self.capacity
+        self.matrix[slot] = vector
+        self.expires[slot] = expires
+
+
+class SemanticResponseCache:
+    """Top-1 cosine lookup of cached answers, one in-memory index per bot."""
+
+    def __init__(
+        self,
+        similarity_threshold: float = 0.95,
+        ttl: float = 300.0,
+        max_entries_per_bot: int = 128,
+        max_bots: int = 256
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            similarity_threshold: Minimum cosine similarity for a hit
+            ttl: Seconds an answer stays valid
+            max_entries_per_bot: Answers kept per bot before the oldest is overwritten
+            max_bots: Bot indexes kept before the least recently used is dropped
+        """
+        self.similarity_threshold = similarity_threshold
+        self.ttl = ttl
+        self.max_entries_per_bot = max_entries_per_bot
+        self.max_bots = max_bots
+        self._indexes: "OrderedDict[str, _BotIndex]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def _normalize(embedding: Sequence[float]) -> Optional[np.ndarray]:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = float(np.linalg.norm(vector))
+        if vector.ndim != 1 or not norm:
+            return None
+        return vector / norm
+
+    def lookup(
+        self,
+        bot_id: Union[str, uuid.UUID],
+        model_key: Tuple[str, str],
+        embedding: Sequence[float]
+    ) -> Optional[Tuple[CachedAnswer, float]]:
+        """
+        Find the cached answer to the most similar earlier question.
+
+        Args:
+            bot_id: Bot identifier
+            model_key: (provider, model) the embedding was generated with
+            embedding: Query embedding
+
+        Returns:
+            Tuple of (answer, similarity), or None below the threshold
+        """
+        vector = self._normalize(embedding)
+        with self._lock:
+            index = self._indexes.get(str(bot_id))
+            if (
+                vector is None
+                or index is None
+                or index.model_key != model_key
+                or index.dimension != vector.shape[0]
+            ):
+                self.misses += 1
+                return None
+
+            self._indexes.move_to_end(str(bot_id))
+            slot, similarity = index.search(vector, time.monotonic())
+            if slot < 0 or similarity < self.similarity_threshold:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            return index.answers[slot], similarity
+
+    def store(
+        self,
+        bot_id: Union[str, uuid.UUID],
+        model_key: Tuple[str, str],
+        embedding: Sequence[float],
+        query: str,
+        response: str,
+        chunks: Sequence[Dict[str, Any]]
+    ):
+        """
+        Cache an answer under its query embedding.
+
+        Args:
+            bot_id: Bot identifier
+            model_key: (provider, model) the embedding was generated with
+            embedding: Query embedding
+            query: Question that was answered
+            response: Final answer text
+            chunks: Chunks the answer was generated from, with "id" and "text"
+        """
+        vector = self._normalize(embedding)
+        if vector is None:
+            return
+
+        answer = CachedAnswer(
+            query=query,
+            response=response,
+            chunks=tuple(
+                {"id": chunk["id"], "text": chunk_preview(chunk.get("text", ""))}
+                for chunk in chunks
+            )
+        )
+        key = str(bot_id)
+        with self._lock:
+            index = self._indexes.get(key)
+            # A new embedding model makes the old vectors incomparable
+            if index is None or index.model_key != model_key or index.dimension != vector.shape[0]:
+                index = _BotIndex(model_key, vector.shape[0], self.max_entries_per_bot)
+                self._indexes[key] = index
+            self._indexes.move_to_end(key)
+            index.add(vector, answer, time.monotonic() + self.ttl)
+            self.stores += 1
+            while len(self._indexes) > self.max_bots:
+                self._indexes.popitem(last=False)
+
+    def invalidate_bot(self, bot_id: Union[str, uuid.UUID]):
+        """Drop every cached answer of a bot."""
+        with self._lock:
+            index = self._indexes.pop(str(bot_id), None)
+            if index is not None:
+                self.invalidations += len(index)
+
+    def clear(self):
+        """Drop all cached answers."""
+        with self._lock:
+            self.invalidations += sum(len(index) for index in self._indexes.values())
+            self._indexes.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache counters.
+
+        Returns:
+            Dictionary with hits, misses, hit rate, stores, invalidations and size
+        """
+        total = self.hits + self.misses
+        with self._lock:
+            entries = sum(len(index) for index in self._indexes.values())
+            bots = len(self._indexes)
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "stores": self.stores,
+            "invalidations": self.invalidations,
+            "bots": bots,
+            "entries": entries,
+            "similarity_threshold": self.similarity_threshold,
+            "ttl_seconds": self.ttl
+        }
+
+
+# Global cache instance, shared by every service in the process
+_semantic_cache: Optional[SemanticResponseCache] = None
+
+
+def get_semantic_response_cache() -> SemanticResponseCache:
+    """
+    Get the global semantic response cache instance.
+
+    Returns:
+        Semantic response cache configured from settings
+    """
+    global _semantic_cache
+
+    if _semantic_cache is None:
+        _semantic_cache = SemanticResponseCache(
+            similarity_threshold=settings.semantic_cache_similarity_threshold,
+            ttl=settings.semantic_cache_ttl
+        )
+
+    return _semantic_cache
@@ -0,0 +1,180 @@
+"""
+Process-wide service container for pooled, stateless chat components.
+
+Building a ChatService used to create fresh provider HTTP clients, a Qdrant
+connection pool with its own thread pool, a Redis client and background tasks
+on every request. The container owns those components once per worker and
+binds only the request-scoped database session when a ChatService is needed.
+"""
+import asyncio
+import logging
+from typing import Any, Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..core.database import SessionLocal
+from .llm_service import LLMProviderService
+from .embedding_service import EmbeddingProviderService
+from .vector_store import VectorService
+from .rag_error_recovery import RAGErrorRecovery
+from .context_aware_cache_manager import ContextAwareCacheManager, CacheStrategy
+from .hybrid_performance_monitor import HybridPerformanceMonitor, HybridRetrievalConfig
+
+
+logger = logging.getLogger(__name__)
+
+
+class ServiceContainer:
+    """Holds pooled chat components for the lifetime of the application."""
+
+    def __init__(self):
+        """Create an empty container; components are built on startup or first use."""
+        self.llm_service: Optional[LLMProviderService] = None
+        self.embedding_service: Optional[EmbeddingProviderService] = None
+        self.vector_service: Optional[VectorService] = None
+        self.error_recovery: Optional[RAGErrorRecovery] = None
+        self.cache_manager: Optional[ContextAwareCacheManager] = None
+        self.performance_monitor: Optional[HybridPerformanceMonitor] = None
+
+        # The performance monitor persists metrics through its own session,
+        # never through a request-scoped one.
+        self._monitor_session: Optional[Session] = None
+        self._built = False
+        self._started = False
+        self._startup_lock = asyncio.Lock()
+        self._chat_services_created = 0
+
+    @property
+    def started(self) -> bool:
+        """Whether async components have been initialized."""
+        return self._started
+
+    def _build_components(self):
+        """Construct pooled components (synchronous, no network I/O)."""
+        if self._built:
+            return
+
+        self.llm_service = LLMProviderService()
+        self.embedding_service = EmbeddingProviderService()
+        self.vector_service = VectorService()
+        self.error_recovery = RAGErrorRecovery()
+
+        try:
+            import redis.asyncio as redis
+            redis_client = redis.from_url(
+                settings.redis_url,
+                encoding="utf-8",
+                decode_responses=False
+            )
+            self.cache_manager = ContextAwareCacheManager(
+                redis_client=redis_client,
+                strategy=CacheStrategy.ADAPTIVE
+            )
+        except Exception as e:
+            logger.warning(f"Redis not available, using local cache: {e}")
+            self.cache_manager = ContextAwareCacheManager(strategy=CacheStrategy.ADAPTIVE)
+
+        self._monitor_session = SessionLocal()
+        self.performance_monitor = HybridPerformanceMonitor(
+            db_session=self._monitor_session,
+            config=HybridRetrievalConfig()
+        )
+
+        self._built = True
+        logger.info("Service container components built")
+
+    async def startup(self):
+        """Build components and start their background tasks exactly once."""
+        async with self._startup_lock:
+            if self._started:
+                return
+
+            self._build_components()
+
+            try:
+                await self.cache_manager.initialize()
+            except Exception as e:
+                logger.warning(f"Cache manager initialization failed, continuing: {e}")
+
+            try:
+                await self.performance_monitor.initialize()
+            except Exception as e:
+                logger.warning(f"Performance monitor initialization failed, continuing: {e}")
+
+            self._started = True
+            logger.info("Service container started")
+
+    async def shutdown(self):
+        """Stop background tasks and close pooled clients."""
+        async with self._startup_lock:
+            if not self._built:
+                return
+
+            for name, close in (
+                ("cache_manager", self.cache_manager.close),
+                ("performance_monitor", self.performance_monitor.close),
+                ("llm_service", self.llm_service.close),
+                ("embedding_service", self.embedding_service.close),
+                ("vector_service", self.vector_service.close),
+            ):
+                try:
+                    await close()
+                except Exception as e:
+                    logger.error(f"Error closing {name}: {e}")
+
+            if self._monitor_session is not None:
+                self._monitor_session.close()
+                self._monitor_session = None
+
+            self._built = False
+            self._started = False
+            logger.info("Service container shut down")
+
+    def create_chat_service(self, db: Session):
+        """
+        Create a ChatService bound to a request-scoped session.
+
+        Args:
+            db: Request-scoped database session
+
+        Returns:
+            ChatService sharing this container's pooled components
+        """
+        from .chat_service import ChatService
+
+        if not self._built:
+            # Used outside the application lifespan (scripts, background jobs)
+            self._build_components()
+            try:
+                asyncio.get_running_loop().create_task(self.startup())
+            except RuntimeError:
+                pass
+
+        self._chat_services_created += 1
+        return ChatService(
+            db,
+            llm_service=self.llm_service,
+            embedding_service=self.embedding_service,
+            vector_service=self.vector_service,
+            error_recovery=self.error_recovery,
+            cache_manager=self.cache_manager,
+            performance_monitor=self.performance_monitor
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get container statistics for monitoring."""
+        return {
+            "built": self._built,
+            "started": self._started,
+            "chat_services_created": self._chat_services_created
+        }
+
+
+# Global service container instance (one per worker process)
+service_container = ServiceContainer()
+
+
+def get_service_container() -> ServiceContainer:
+    """Get the process-wide service container."""
+    return service_container
@@ -0,0 +1,113 @@
+"""
+In-process cache of each conversation session's most recent messages.
+
+Every chat turn needs the last few messages of its session as context for the
+query classifier and the prompt. ConversationService keeps a window of the
+newest messages per session here, appending each message it stores, so a long
+session is read from the messages table once rather than on every turn.
+
+Windows hold plain HistoryEntry values rather than ORM instances, which are
+bound to the request's database session. The TTL bounds how long a window can
+miss messages written to the same session by another worker process.
+"""
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional, Sequence
+
+from ..models.conversation import Message
+from ..utils.ttl_cache import TTLCache
+
+
+@dataclass(frozen=True)
+class HistoryEntry:
+    """A stored message as needed for conversation context."""
+    id: uuid.UUID
+    role: str
+    content: str
+    created_at: Optional[datetime]
+
+    @classmethod
+    def from_message(cls, message: Message) -> "HistoryEntry":
+        return cls(
+            id=message.id,
+            role=message.role,
+            content=message.content,
+            created_at=message.created_at
+        )
+
+
+class SessionHistoryCache(TTLCache):
+    """TTL cache of recent-message windows keyed by session ID."""
+
+    def __init__(self, window_size: int = 20, ttl: float = 600.0, max_entries: int = 5000):
+        """
+        Initialize the cache.
+
+        Args:
+            window_size: Newest messages kept per session
+            ttl: Seconds a window stays valid after it was last written
+            max_entries: Sessions kept before the oldest are evicted
+        """
+        super().__init__(ttl, max_entries)
+        self.window_size = window_size
+
+    def get_window(self, session_id: uuid.UUID) -> Optional[List[HistoryEntry]]:
+        """
+        Look up a session's cached window.
+
+        Args:
+            session_id: Conversation session ID
+
+        Returns:
+            Newest messages, oldest first, or None if not cached
+        """
+        found, window = self.get(session_id)
+        return list(window) if found else None
+
+    def set_window(self, session_id: uuid.UUID, entries: Sequence[HistoryEntry]):
+        """Cache a window freshly loaded from the database, oldest first."""
+        self.set(session_id, tuple(entries[-self.window_size:]))
+
+    def append(self, session_id: uuid.UUID, entry: HistoryEntry):
+        """
+        Add a newly stored message to a session's window.
+
+        Sessions without a cached window are left alone; their next read loads
+        the window, including this message, from the database.
+
+        Args:
+            session_id: Conversation session ID
+            entry: Stored message
+        """
+        with self._lock:
+            cached = self._entries.get(session_id)
+            if cached is None or cached[1] <= time.monotonic():
+                return
+            window = (cached[0] + (entry,))[-self.window_size:]
+            self._entries[session_id] = (window, time.monotonic() + self.ttl)
+            self._entries.move_to_end(session_id)
+
+    def invalidate_session(self, session_id: uuid.UUID):
+        """Drop a session's cached window."""
+        self.invalidate(session_id)
+
+
+# Global cache instance, shared by every ConversationService in the process
+_history_cache: Optional[SessionHistoryCache] = None
+
+
+def get_session_history_cache() -> SessionHistoryCache:
+    """
+    Get the global session history cache instance.
+
+    Returns:
+        Session history cache
+    """
+    global _history_cache
+
+    if _history_cache is None:
+        _history_cache = SessionHistoryCache()
+
+    return _history_cache
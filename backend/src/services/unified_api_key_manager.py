@@ -74,16 +74,17 @@ class UnifiedAPIKeyManager:
     with validation caching and comprehensive error handling.
     """
     
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, embedding_service: Optional[EmbeddingProviderService] = None):
         """
         Initialize the unified API key manager.
         
         Args:
             db: Database session
+            embedding_service: Optional shared embedding service (creates one if None)
         """
         self.db = db
         self.user_service = UserService(db)
-        self.embedding_service = EmbeddingProviderService()
+        self.embedding_service = embedding_service or EmbeddingProviderService()
         
         # Validation cache with TTL
         self._validation_cache: Dict[str, Tuple[bool, datetime]] = {}
@@ -0,0 +1,188 @@
+"""
+Daily usage rollups for bot analytics.
+
+Analytics used to aggregate the whole messages table on every dashboard load.
+Completed UTC days are instead compacted into bot_usage_daily, one row per
+(bot, day, user, role), and readers combine those rows with a raw aggregate of
+only the messages written since the compaction watermark, normally today's.
+
+Compaction runs lazily: readers call compact_pending() first, which rolls up
+any completed days past the watermark in one short transaction per batch of
+days, on a session of its own so the reader's session is left untouched. The watermark row is locked with SKIP LOCKED, so concurrent readers never
+wait on each other; the one that loses the race simply reads a larger raw
+delta this time.
+"""
+import logging
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Optional, Sequence
+
+from sqlalchemy import Date, Numeric, case, cast, delete, func, insert, select, union_all
+from sqlalchemy.orm import Session
+
+from ..core.database import SessionLocal
+from ..models.conversation import Message
+from ..models.usage_rollup import BotUsageDaily, UsageRollupState
+
+
+logger = logging.getLogger(__name__)
+
+# Metadata values are only summed when they look like numbers
+NUMBER_PATTERN = r'^-?[0-9]+(\.[0-9]+)?([eE][-+]?[0-9]+)?$'
+
+# Messages of a day may still be committing shortly after midnight
+COMPACTION_GRACE = timedelta(minutes=10)
+
+# Days rolled up per transaction
+COMPACTION_BATCH_DAYS = 31
+
+USAGE_COLUMNS = (
+    "bot_id", "day", "user_id", "role",
+    "message_count", "tokens_sum", "latency_sum", "latency_count"
+)
+
+
+def day_start(day: date) -> datetime:
+    """Start of a UTC day as an aware datetime."""
+    return datetime.combine(day, time.min, tzinfo=timezone.utc)
+
+
+def _metadata_number(key: str):
+    value = func.json_extract_path_text(Message.message_metadata, key)
+    return case((value.op('~')(NUMBER_PATTERN), cast(value, Numeric)))
+
+
+class UsageRollupService:
+    """Maintains and reads the daily bot usage rollups."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _aggregate_messages(
+        self,
+        start: datetime,
+        end: Optional[datetime] = None,
+        bot_ids: Optional[Sequence] = None,
+        user_id=None
+    ):
+        """Select raw messages in [start, end) aggregated to rollup rows."""
+        day = cast(func.timezone('UTC', Message.created_at), Date)
+        tokens = _metadata_number('tokens_used')
+        latency = _metadata_number('response_time')
+
+        query = select(
+            Message.bot_id.label("bot_id"),
+            day.label("day"),
+            Message.user_id.label("user_id"),
+            Message.role.label("role"),
+            func.count().label("message_count"),
+            func.coalesce(func.sum(tokens), 0).label("tokens_sum"),
+            func.coalesce(func.sum(latency), 0).label("latency_sum"),
+            func.count(latency).label("latency_count")
+        ).where(Message.created_at >= start)
+
+        if end is not None:
+            query = query.where(Message.created_at < end)
+        if bot_ids is not None:
+            query = query.where(Message.bot_id.in_(bot_ids))
+        if user_id is not None:
+            query = query.where(Message.user_id == user_id)
+
+        return query.group_by(Message.bot_id, day, Message.user_id, Message.role)
+
+    def get_watermark(self) -> Optional[date]:
+        """
+        Get the first day that is not rolled up yet.
+
+        Returns:
+            Watermark day, or None if nothing has been rolled up
+        """
+        return self.db.query(UsageRollupState.rolled_up_until).filter(
+            UsageRollupState.id == 1
+        ).scalar()
+
+    def compact_pending(self) -> int:
+        """
+        Roll up completed days past the watermark.
+
+        Returns:
+            Number of days rolled up; 0 if there was nothing to do or another
+            process is compacting
+        """
+        until = (datetime.now(timezone.utc) - COMPACTION_GRACE).date()
+        compacted = 0
+
+        # Commits and rollbacks here must not touch the caller's session
+        db = SessionLocal()
+        try:
+            while True:
+                state = db.query(UsageRollupState).filter(
+                    UsageRollupState.id == 1
+                ).with_for_update(skip_locked=True).first()
+                if state is None or state.rolled_up_until >= until:
+                    db.rollback()
+                    return compacted
+
+                batch_end = min(until, state.rolled_up_until + timedelta(days=COMPACTION_BATCH_DAYS))
+                try:
+                    self._roll_up(db, state.rolled_up_until, batch_end)
+                    compacted += (batch_end - state.rolled_up_until).days
+                    state.rolled_up_until = batch_end
+                    db.commit()
+                except Exception as e:
+                    db.rollback()
+                    logger.error(f"Usage rollup compaction failed: {e}")
+                    return compacted
+
+                logger.info(f"Rolled up bot usage through {batch_end - timedelta(days=1)}")
+        finally:
+            db.close()
+
+    def _roll_up(self, db: Session, first_day: date, end_day: date):
+        """Replace the rollup rows of days in [first_day, end_day) from raw messages."""
+        db.execute(delete(BotUsageDaily).where(
+            BotUsageDaily.day >= first_day,
+            BotUsageDaily.day < end_day
+        ))
+        db.execute(insert(BotUsageDaily).from_select(
+            list(USAGE_COLUMNS),
+            self._aggregate_messages(day_start(first_day), day_start(end_day))
+        ))
+
+    def usage(
+        self,
+        start_day: date,
+        bot_ids: Optional[Sequence] = None,
+        user_id=None
+    ):
+        """
+        Get usage rows from start_day on: rollups up to the watermark, raw
+        message aggregates after it.
+
+        Args:
+            start_day: First UTC day to include
+            bot_ids: Optional bots to restrict to
+            user_id: Optional user to restrict to
+
+        Returns:
+            Subquery with bot_id, day, user_id, role, message_count,
+            tokens_sum, latency_sum and latency_count columns
+        """
+        watermark = self.get_watermark()
+        raw_start = day_start(max(start_day, watermark) if watermark else start_day)
+        raw = self._aggregate_messages(raw_start, bot_ids=bot_ids, user_id=user_id)
+
+        if watermark is None or watermark <= start_day:
+            return raw.subquery("usage")
+
+        rolled_up = select(
+            *[getattr(BotUsageDaily, column).label(column) for column in USAGE_COLUMNS]
+        ).where(
+            BotUsageDaily.day >= start_day,
+            BotUsageDaily.day < watermark
+        )
+        if bot_ids is not None:
+            rolled_up = rolled_up.where(BotUsageDaily.bot_id.in_(bot_ids))
+        if user_id is not None:
+            rolled_up = rolled_up.where(BotUsageDaily.user_id == user_id)
+
+        return union_all(rolled_up, raw).subquery("usage")
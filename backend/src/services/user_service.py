@@ -20,13 +20,15 @@ from ..schemas.user import (
     BotUsageStats, ConversationAnalytics, UserAnalytics
 )
 from ..utils.encryption import encrypt_api_key, decrypt_api_key
+from .api_key_cache import APIKeyCache, get_api_key_cache
 
 
 class UserService:
     """Service class for user management operations."""
     
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, api_key_cache: APIKeyCache = None):
         self.db = db
+        self.api_key_cache = api_key_cache or get_api_key_cache()
     
     def get_user_profile(self, user_id: str) -> User:
         """
@@ -193,6 +195,7 @@ class UserService:
                 existing_key.is_active = True
                 self.db.commit()
                 self.db.refresh(existing_key)
+                self.api_key_cache.invalidate_key(user.id, api_key_data.provider)
                 return APIKeyResponse.model_validate(existing_key)
             else:
                 # Create new key
@@ -205,6 +208,7 @@ class UserService:
                 self.db.add(db_api_key)
                 self.db.commit()
                 self.db.refresh(db_api_key)
+                self.api_key_cache.invalidate_key(user.id, api_key_data.provider)
                 return APIKeyResponse.model_validate(db_api_key)
                 
         except Exception as e:
@@ -241,7 +245,11 @@ class UserService:
         Returns:
             Decrypted API key or None if not found
         """
-        api_key = self.db.query(UserAPIKey).filter(
+        found, cached_key = self.api_key_cache.get_key(user_id, provider)
+        if found:
+            return cached_key
+        
+        api_key = self.db.query(UserAPIKey.api_key_encrypted).filter(
             and_(
                 UserAPIKey.user_id == user_id,
                 UserAPIKey.provider == provider,
@@ -249,13 +257,15 @@ class UserService:
             )
         ).first()
         
-        if not api_key:
-            return None
+        decrypted_key = None
+        if api_key:
+            try:
+                decrypted_key = decrypt_api_key(api_key.api_key_encrypted)
+            except Exception:
+                decrypted_key = None
         
-        try:
-            return decrypt_api_key(api_key.api_key_encrypted)
-        except Exception:
-            return None
+        self.api_key_cache.set_key(user_id, provider, decrypted_key)
+        return decrypted_key
     
     def get_api_key(self, user: User, provider: str) -> Optional[str]:
         """
@@ -268,21 +278,7 @@ class UserService:
         Returns:
             Decrypted API key or None if not found
         """
-        api_key = self.db.query(UserAPIKey).filter(
-            and_(
-                UserAPIKey.user_id == user.id,
-                UserAPIKey.provider == provider,
-                UserAPIKey.is_active == True
-            )
-        ).first()
-        
-        if not api_key:
-            return None
-        
-        try:
-            return decrypt_api_key(api_key.api_key_encrypted)
-        except Exception:
-            return None
+        return self.get_user_api_key(user.id, provider)
     
     def update_api_key(self, user: User, provider: str, api_key_data: APIKeyUpdate) -> APIKeyResponse:
         """
@@ -324,6 +320,7 @@ class UserService:
             
             self.db.commit()
             self.db.refresh(api_key)
+            self.api_key_cache.invalidate_key(user.id, provider)
             return APIKeyResponse.model_validate(api_key)
             
         except Exception:
@@ -363,6 +360,7 @@ class UserService:
         try:
             self.db.delete(api_key)
             self.db.commit()
+            self.api_key_cache.invalidate_key(user.id, provider)
             return True
         except Exception:
             self.db.rollback()
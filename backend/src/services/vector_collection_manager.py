@@ -17,6 +17,7 @@ from fastapi import HTTPException, status
 from ..models.bot import Bot
 from ..models.document import Document
 from .vector_store import VectorService
+from .qdrant_collection_profiles import select_collection_profile
 from .embedding_service import EmbeddingProviderService
 
 
@@ -477,17 +478,25 @@ class VectorCollectionManager:
                 collection_info = await self.vector_service.get_bot_collection_stats(collection_name)
                 points_before = collection_info.get('points_count', 0)
                 
-                # Optimization 1: Check for duplicate embeddings (if supported by vector store)
-                # This is a placeholder for actual optimization logic
-                optimizations_applied.append("duplicate_check")
-                
-                # Optimization 2: Compact collection (if supported)
-                # This would depend on the vector store implementation
-                optimizations_applied.append("compaction")
-                
-                # Optimization 3: Update collection configuration for better performance
-                # This could include adjusting indexing parameters
-                optimizations_applied.append("index_optimization")
+                # A bot in a shared collection gets its own once it is big
+                # enough; until then it uses the shared collection's profile
+                shared = collection_info.get('layout') == "shared"
+                if shared and (points_before or 0) >= self.vector_service.vector_store.promotion_threshold:
+                    await self.vector_service.promote_bot_collection(collection_name)
+                    optimizations_applied.append("promoted_to_dedicated")
+                    shared = False
+                
+                # Move the collection to the profile for its size; settings it
+                # already has are left alone, so repeat runs are no-ops
+                profile_name = "shared"
+                if not shared:
+                    profile = select_collection_profile(points_before or 0)
+                    profile_name = profile.name
+                    optimizations_applied.extend(
+                        await self.vector_service.vector_store.apply_collection_profile(
+                            collection_name, profile
+                        )
+                    )
                 
                 # Get collection info after optimization
                 collection_info_after = await self.vector_service.get_bot_collection_stats(collection_name)
@@ -499,6 +508,7 @@ class VectorCollectionManager:
                 performance_improvement = max(0, (points_before - points_after) / max(points_before, 1) * 100)
                 
                 return {
+                    "profile": profile_name,
                     "optimizations_applied": optimizations_applied,
                     "performance_improvement": performance_improvement,
                     "optimization_time": optimization_time,
@@ -525,6 +535,7 @@ class VectorCollectionManager:
                     optimizations_applied=result["optimizations_applied"],
                     performance_improvement=result["performance_improvement"],
                     metadata={
+                        "profile": result["profile"],
                         "optimization_time": result["optimization_time"],
                         "points_before": result["points_before"],
                         "points_after": result["points_after"],
@@ -15,14 +15,37 @@ from enum import Enum
 
 from qdrant_client import QdrantClient
 from qdrant_client.http import models
-from qdrant_client.http.exceptions import ResponseHandlingException
+from qdrant_client.http.exceptions import ResponseHandlingException, UnexpectedResponse
 from fastapi import HTTPException, status
 
 from ..core.config import settings
+from ..utils.ttl_cache import TTLCache
+from .bot_retrieval_profile import get_retrieval_profile_cache
+from .chunk_text_cache import ChunkTextCache, get_chunk_text_cache
+from .qdrant_collection_profiles import (
+    DEFAULT_COLLECTION_PROFILE,
+    INDEXED_PAYLOAD_KEYS,
+    SHARED_COLLECTION_PROFILE,
+    CollectionProfile,
+    profile_changes,
+    quantized_search_params,
+    select_collection_profile,
+)
 
 
 logger = logging.getLogger(__name__)
 
+# "full" payloads carry the chunk text and all chunk metadata; "id_only"
+# payloads carry only the fields searches filter on, and VectorService
+# hydrates text from document_chunks
+PAYLOAD_MODES = ("full", "id_only")
+ID_ONLY_PAYLOAD_KEYS = ("bot_id", "document_id", "chunk_index")
+
+# A bot's points live either in its own "bot_<id>" collection or, in the
+# shared layout, in the "shared_<dimension>" collection for its vector size
+COLLECTION_LAYOUTS = ("dedicated", "shared")
+SHARED_COLLECTION_PREFIX = "shared_"
+
 
 class OperationStatus(Enum):
     """Enumeration of operation statuses."""
@@ -404,8 +427,11 @@ class AsyncQdrantConnectionPool:
         self._closed = False
     
     async def _create_connection(self) -> QdrantClient:
-        """Create a new Qdrant client connection."""
-        return QdrantClient(url=self.url)
+        """Create a new Qdrant client connection off the event loop."""
+        # Client construction may perform a blocking server version check
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, lambda: QdrantClient(url=self.url, timeout=int(self.timeout))
+        )
     
     @asynccontextmanager
     async def get_connection(self):
@@ -419,16 +445,24 @@ class AsyncQdrantConnectionPool:
             try:
                 connection = self._pool.get_nowait()
             except asyncio.QueueEmpty:
-                # Create new connection if pool is empty and under limit
+                # Reserve a slot under the lock, but connect outside it so that
+                # concurrent callers do not serialize on client construction
                 async with self._lock:
-                    if self._connections_created < self.max_connections:
-                        connection = await self._create_connection()
+                    can_create = self._connections_created < self.max_connections
+                    if can_create:
                         self._connections_created += 1
-                    else:
-                        # Wait for available connection
-                        connection = await asyncio.wait_for(
-                            self._pool.get(), timeout=self.timeout
-                        )
+
+                if can_create:
+                    try:
+                        connection = await self._create_connection()
+                    except Exception:
+                        self._connections_created -= 1
+                        raise
+                else:
+                    # Wait for available connection
+                    connection = await asyncio.wait_for(
+                        self._pool.get(), timeout=self.timeout
+                    )
             
             yield connection
             
@@ -648,6 +682,46 @@ class VectorStoreInterface(ABC):
         """
         pass
     
+    @abstractmethod
+    async def apply_collection_profile(self, bot_id: str, profile: CollectionProfile) -> List[str]:
+        """
+        Reconfigure an existing collection in place to match a profile.
+        
+        Args:
+            bot_id: Bot identifier
+            profile: Target collection profile
+            
+        Returns:
+            Names of the settings that were changed
+        """
+        pass
+    
+    @abstractmethod
+    async def count_shared_points(self, bot_id: str) -> Dict[str, int]:
+        """
+        Count a bot's points in collections shared with other bots.
+        
+        Args:
+            bot_id: Bot identifier
+            
+        Returns:
+            Point count per shared collection, for collections holding any
+        """
+        pass
+    
+    @abstractmethod
+    async def promote_to_dedicated(self, bot_id: str) -> int:
+        """
+        Move a bot's points from shared collections to its own collection.
+        
+        Args:
+            bot_id: Bot identifier
+            
+        Returns:
+            Number of points moved
+        """
+        pass
+    
     @abstractmethod
     async def close(self):
         """Close the vector store connection and clean up resources."""
@@ -663,7 +737,9 @@ class QdrantVectorStore(VectorStoreInterface):
         max_connections: int = 10, 
         timeout: float = 30.0,
         max_concurrent_operations: int = 5,
-        max_queue_size: int = 100
+        max_queue_size: int = 100,
+        payload_mode: Optional[str] = None,
+        collection_layout: Optional[str] = None
     ):
         """
         Initialize Qdrant vector store with connection pooling and operation queue.
@@ -674,7 +750,23 @@ class QdrantVectorStore(VectorStoreInterface):
             timeout: Default timeout for operations in seconds
             max_concurrent_operations: Maximum number of concurrent operations
             max_queue_size: Maximum number of queued operations
+            payload_mode: "full" or "id_only" (uses settings default if None)
+            collection_layout: "dedicated" or "shared" for new bots (uses settings default if None)
+            
+        Raises:
+            ValueError: If payload_mode or collection_layout is not supported
         """
+        self.payload_mode = payload_mode or settings.qdrant_payload_mode
+        if self.payload_mode not in PAYLOAD_MODES:
+            raise ValueError(f"Unsupported Qdrant payload mode: {self.payload_mode}")
+        self.collection_layout = collection_layout or settings.qdrant_collection_layout
+        if self.collection_layout not in COLLECTION_LAYOUTS:
+            raise ValueError(f"Unsupported Qdrant collection layout: {self.collection_layout}")
+        self.promotion_threshold = settings.qdrant_shared_promotion_threshold
+        # Collection each bot's points were last found in. Kept short: searches
+        # only see another worker's promotion once the entry expires (writes
+        # to a shared collection check for it)
+        self._bot_collections = TTLCache(ttl=60.0)
         self.url = url or settings.qdrant_url
         self.max_connections = max_connections
         self.timeout = timeout
@@ -685,6 +777,12 @@ class QdrantVectorStore(VectorStoreInterface):
             max_concurrent_operations, max_queue_size
         )
         self._collection_prefix = "bot_"
+        # Per-operation timeouts for read paths that run on the pooled clients
+        self.operation_timeouts = {
+            "collection_exists": min(timeout, 5.0),
+            "get_collection_info": min(timeout, 10.0),
+            "search": min(timeout, 10.0),
+        }
         self._queue_processor_task = None
         self._start_queue_processor()
     
@@ -692,6 +790,102 @@ class QdrantVectorStore(VectorStoreInterface):
         """Get collection name for a bot."""
         return f"{self._collection_prefix}{bot_id}"
     
+    @staticmethod
+    def _shared_collection_name(dimension: int) -> str:
+        """Get the name of the shared collection for vectors of a dimension."""
+        return f"{SHARED_COLLECTION_PREFIX}{dimension}"
+    
+    @staticmethod
+    def _bot_filter(bot_id: str) -> models.Filter:
+        return models.Filter(must=[
+            models.FieldCondition(key="bot_id", match=models.MatchValue(value=bot_id))
+        ])
+    
+    async def _call(self, operation: str, *args, **kwargs):
+        """Run a QdrantClient method on a pooled client."""
+        async with self._connection_pool.get_connection() as client:
+            return await self._connection_pool.execute_with_timeout(
+                getattr(client, operation), *args, **kwargs
+            )
+    
+    async def _count_bot_points(self, collection_name: str, bot_id: str) -> int:
+        result = await self._call(
+            "count", collection_name=collection_name, count_filter=self._bot_filter(bot_id), exact=True
+        )
+        return result.count
+    
+    async def count_shared_points(self, bot_id: str) -> Dict[str, int]:
+        """Count a bot's points in each shared collection holding any."""
+        response = await self._call("get_collections")
+        counts = {}
+        for collection in response.collections:
+            if collection.name.startswith(SHARED_COLLECTION_PREFIX):
+                count = await self._count_bot_points(collection.name, bot_id)
+                if count:
+                    counts[collection.name] = count
+        return counts
+    
+    async def locate_bot_collection(self, bot_id: str) -> Optional[str]:
+        """
+        Find the collection holding a bot's points.
+        
+        Args:
+            bot_id: Bot identifier
+            
+        Returns:
+            The bot's dedicated collection if it exists, else the shared
+            collection holding its points, else None
+        """
+        found, collection_name = self._bot_collections.get(bot_id)
+        if found:
+            return collection_name
+        
+        if await self._dedicated_collection_exists(bot_id):
+            collection_name = self._get_collection_name(bot_id)
+        else:
+            counts = await self.count_shared_points(bot_id)
+            collection_name = max(counts, key=counts.get) if counts else None
+        
+        if collection_name is not None:
+            self._bot_collections.set(bot_id, collection_name)
+        return collection_name
+    
+    async def _dedicated_collection_exists(self, bot_id: str) -> bool:
+        return await self._call(
+            "collection_exists",
+            self._get_collection_name(bot_id),
+            timeout=self.operation_timeouts["collection_exists"]
+        )
+    
+    async def _resolve_collection(self, bot_id: str, dimension: Optional[int]) -> str:
+        """Get the collection to read and write a bot's vectors of a dimension in."""
+        collection_name = await self.locate_bot_collection(bot_id)
+        if collection_name is not None:
+            return collection_name
+        if self.collection_layout == "shared" and dimension:
+            return self._shared_collection_name(dimension)
+        return self._get_collection_name(bot_id)
+    
+    def build_payload(self, bot_id: str, text: str, meta: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the point payload for a chunk in this store's payload mode."""
+        if self.payload_mode == "id_only":
+            payload = {key: meta[key] for key in ID_ONLY_PAYLOAD_KEYS if key in meta}
+            payload["bot_id"] = bot_id
+            return payload
+        # Add text to metadata for retrieval
+        return {**meta, "text": text, "bot_id": bot_id}
+    
+    @staticmethod
+    def format_hit(hit) -> Dict[str, Any]:
+        """Convert a scored point to a search result; text is None if the payload has none."""
+        payload = hit.payload or {}
+        return {
+            "id": str(hit.id),
+            "score": hit.score,
+            "text": payload.get("text"),
+            "metadata": {k: v for k, v in payload.items() if k not in ["text", "bot_id"]}
+        }
+    
     def _start_queue_processor(self):
         """Start the background queue processor."""
         try:
@@ -759,26 +953,34 @@ class QdrantVectorStore(VectorStoreInterface):
         return await self._operation_queue.execute_operation(operation_data)
     
     async def create_collection(self, bot_id: str, dimension: int, **kwargs) -> bool:
-        """Create a collection for a bot with proper configuration."""
+        """Create a collection for a bot with kwargs["profile"] (the small profile by default).
+        
+        In the shared layout, bots without a collection are instead assigned to
+        the shared collection for the dimension, unless a profile is given.
+        """
+        profile = kwargs.get("profile")
+        if profile is None and self.collection_layout == "shared":
+            return await self._assign_shared_collection(bot_id, dimension)
+        
         collection_name = self._get_collection_name(bot_id)
+        profile = profile or DEFAULT_COLLECTION_PROFILE
         
         try:
             # Check if collection already exists
-            if await self.collection_exists(bot_id):
+            if await self._call(
+                "collection_exists", collection_name, timeout=self.operation_timeouts["collection_exists"]
+            ):
                 logger.info(f"Collection {collection_name} already exists")
                 return True
             
-            # Create collection with vector configuration using synchronous client
-            client = QdrantClient(url=self.url)
-            client.create_collection(
-                collection_name=collection_name,
-                vectors_config=models.VectorParams(
-                    size=dimension,
-                    distance=models.Distance.COSINE
-                )
-            )
+            await self._create_qdrant_collection(collection_name, dimension, profile)
+            self._bot_collections.set(bot_id, collection_name)
+            get_retrieval_profile_cache().invalidate_bot(bot_id)
             
-            logger.info(f"Created collection {collection_name} with dimension {dimension}")
+            logger.info(
+                f"Created collection {collection_name} with dimension {dimension} "
+                f"and profile {profile.name}"
+            )
             return True
             
         except HTTPException:
@@ -791,20 +993,85 @@ class QdrantVectorStore(VectorStoreInterface):
             logger.error(f"Unexpected error creating collection {collection_name}: {e}")
             return False
     
+    async def _assign_shared_collection(self, bot_id: str, dimension: int) -> bool:
+        """Put a bot without a collection in the shared collection for its dimension."""
+        collection_name = self._shared_collection_name(dimension)
+        
+        try:
+            existing = await self.locate_bot_collection(bot_id)
+            if existing is not None:
+                logger.info(f"Bot {bot_id} already stored in collection {existing}")
+                return True
+            
+            if not await self._call(
+                "collection_exists", collection_name, timeout=self.operation_timeouts["collection_exists"]
+            ):
+                await self._create_qdrant_collection(collection_name, dimension, SHARED_COLLECTION_PROFILE)
+                logger.info(f"Created shared collection {collection_name}")
+            
+            self._bot_collections.set(bot_id, collection_name)
+            get_retrieval_profile_cache().invalidate_bot(bot_id)
+            
+            logger.info(f"Assigned bot {bot_id} to shared collection {collection_name}")
+            return True
+            
+        except HTTPException:
+            # Re-raise HTTP exceptions (timeouts, etc.)
+            raise
+        except UnexpectedResponse as e:
+            # Another worker may have created the shared collection first
+            if await self._call("collection_exists", collection_name):
+                self._bot_collections.set(bot_id, collection_name)
+                return True
+            logger.error(f"Failed to create shared collection {collection_name}: {e}")
+            return False
+        except Exception as e:
+            logger.error(f"Unexpected error assigning bot {bot_id} to {collection_name}: {e}")
+            return False
+    
+    async def _create_qdrant_collection(self, collection_name: str, dimension: int, profile: CollectionProfile):
+        """Create a collection configured by a profile, with its payload indexes."""
+        await self._call(
+            "create_collection",
+            collection_name=collection_name,
+            vectors_config=profile.vector_params(dimension),
+            hnsw_config=profile.hnsw_config(),
+            quantization_config=profile.quantization_config(dimension),
+            on_disk_payload=profile.payload_on_disk
+        )
+        for key in INDEXED_PAYLOAD_KEYS:
+            await self._call(
+                "create_payload_index",
+                collection_name=collection_name,
+                field_name=key,
+                field_schema=profile.payload_index_schema(key)
+            )
+    
     async def delete_collection(self, bot_id: str) -> bool:
-        """Delete a collection for a bot."""
+        """Delete a bot's collection, or its points in shared collections."""
         collection_name = self._get_collection_name(bot_id)
         
         try:
+            self._bot_collections.invalidate(bot_id)
             if not await self.collection_exists(bot_id):
                 logger.info(f"Collection {collection_name} does not exist")
                 return True
             
-            # Use synchronous client for now
-            client = QdrantClient(url=self.url)
-            client.delete_collection(collection_name)
+            if await self._call("collection_exists", collection_name):
+                await self._call("delete_collection", collection_name)
+                logger.info(f"Deleted collection {collection_name}")
             
-            logger.info(f"Deleted collection {collection_name}")
+            # Also covers points left behind in a shared collection by a promotion
+            for shared_name in await self.count_shared_points(bot_id):
+                await self._call(
+                    "delete",
+                    collection_name=shared_name,
+                    points_selector=models.FilterSelector(filter=self._bot_filter(bot_id))
+                )
+                logger.info(f"Deleted points of bot {bot_id} from shared collection {shared_name}")
+            
+            self._bot_collections.invalidate(bot_id)
+            get_retrieval_profile_cache().invalidate_bot(bot_id)
             return True
             
         except HTTPException:
@@ -818,20 +1085,14 @@ class QdrantVectorStore(VectorStoreInterface):
             return False
     
     async def collection_exists(self, bot_id: str) -> bool:
-        """Check if a collection exists for a bot."""
-        collection_name = self._get_collection_name(bot_id)
-        
+        """Check if a bot has a collection, dedicated or shared."""
         try:
-            # Use synchronous client for now until async connection pool is properly implemented
-            client = QdrantClient(url=self.url)
-            collections = client.get_collections()
-            collection_names = [col.name for col in collections.collections]
-            exists = collection_name in collection_names
-            logger.info(f"Collection {collection_name} exists: {exists}")
-            return exists
+            collection_name = await self.locate_bot_collection(bot_id)
+            logger.debug(f"Collection for bot {bot_id}: {collection_name}")
+            return collection_name is not None
             
         except Exception as e:
-            logger.error(f"Error checking collection existence {collection_name}: {e}")
+            logger.error(f"Error checking collection existence for bot {bot_id}: {e}")
             return False
     
     async def store_embeddings(
@@ -843,9 +1104,16 @@ class QdrantVectorStore(VectorStoreInterface):
         ids: Optional[List[str]] = None
     ) -> List[str]:
         """Store embeddings in Qdrant with bot isolation and async batch processing."""
-        collection_name = self._get_collection_name(bot_id)
-        
-        if not await self.collection_exists(bot_id):
+        collection_name = await self._resolve_collection(bot_id, len(embeddings[0]) if embeddings else None)
+        if collection_name.startswith(SHARED_COLLECTION_PREFIX) and await self._dedicated_collection_exists(bot_id):
+            # Another worker promoted the bot since this one cached its
+            # shared collection; points written there would not be searched
+            collection_name = self._get_collection_name(bot_id)
+            self._bot_collections.set(bot_id, collection_name)
+        
+        if not await self._call(
+            "collection_exists", collection_name, timeout=self.operation_timeouts["collection_exists"]
+        ):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Collection for bot {bot_id} does not exist"
@@ -870,14 +1138,11 @@ class QdrantVectorStore(VectorStoreInterface):
             # Prepare points for insertion
             points = []
             for i, (embedding, text, meta, point_id) in enumerate(zip(embeddings, texts, metadata, ids)):
-                # Add text to metadata for retrieval
-                full_metadata = {**meta, "text": text, "bot_id": bot_id}
-                
                 points.append(
                     models.PointStruct(
                         id=point_id,
                         vector=embedding,
-                        payload=full_metadata
+                        payload=self.build_payload(bot_id, text, meta)
                     )
                 )
             
@@ -906,6 +1171,9 @@ class QdrantVectorStore(VectorStoreInterface):
             ])
             
             logger.info(f"Stored {len(embeddings)} embeddings in collection {collection_name}")
+            
+            if collection_name.startswith(SHARED_COLLECTION_PREFIX):
+                await self._promote_if_needed(bot_id, collection_name)
             return ids
             
         except HTTPException:
@@ -933,13 +1201,7 @@ class QdrantVectorStore(VectorStoreInterface):
         metadata_filter: Optional[Dict[str, Any]] = None
     ) -> List[Dict[str, Any]]:
         """Search for similar embeddings in Qdrant with async operations."""
-        collection_name = self._get_collection_name(bot_id)
-        
-        if not await self.collection_exists(bot_id):
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Collection for bot {bot_id} does not exist"
-            )
+        collection_name = await self._resolve_collection(bot_id, len(query_embedding))
         
         try:
             # Build filter conditions
@@ -960,28 +1222,28 @@ class QdrantVectorStore(VectorStoreInterface):
                         )
                     )
             
-            # Perform search using synchronous client
-            client = QdrantClient(url=self.url)
-            search_result = client.search(
-                collection_name=collection_name,
-                query_vector=query_embedding,
-                limit=top_k,
-                score_threshold=score_threshold,
-                query_filter=models.Filter(
-                    must=filter_conditions
-                ) if filter_conditions else None
-            )
+            # Perform search on a pooled client in the executor so the event loop stays free
+            async with self._connection_pool.get_connection() as client:
+                search_result = await self._connection_pool.execute_with_timeout(
+                    client.query_points,
+                    collection_name=collection_name,
+                    query=query_embedding,
+                    limit=top_k,
+                    score_threshold=score_threshold,
+                    query_filter=models.Filter(
+                        must=filter_conditions
+                    ) if filter_conditions else None,
+                    # Points written before switching to id-only may still
+                    # carry text; don't ship it, VectorService hydrates it
+                    with_payload=True if self.payload_mode == "full" else models.PayloadSelectorExclude(
+                        exclude=["text"]
+                    ),
+                    search_params=quantized_search_params(),
+                    timeout=self.operation_timeouts["search"]
+                )
             
             # Format results
-            results = []
-            for hit in search_result:
-                result = {
-                    "id": str(hit.id),
-                    "score": hit.score,
-                    "text": hit.payload.get("text", ""),
-                    "metadata": {k: v for k, v in hit.payload.items() if k not in ["text", "bot_id"]}
-                }
-                results.append(result)
+            results = [self.format_hit(hit) for hit in search_result.points]
             
             logger.info(f"Found {len(results)} similar embeddings in collection {collection_name}")
             return results
@@ -989,6 +1251,17 @@ class QdrantVectorStore(VectorStoreInterface):
         except HTTPException:
             # Re-raise HTTP exceptions (timeouts, etc.)
             raise
+        except UnexpectedResponse as e:
+            if e.status_code == status.HTTP_404_NOT_FOUND:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Collection for bot {bot_id} does not exist"
+                )
+            logger.error(f"Failed to search in {collection_name}: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to search embeddings: {str(e)}"
+            )
         except ResponseHandlingException as e:
             logger.error(f"Failed to search in {collection_name}: {e}")
             raise HTTPException(
@@ -1004,19 +1277,22 @@ class QdrantVectorStore(VectorStoreInterface):
     
     async def delete_embeddings(self, bot_id: str, ids: List[str]) -> bool:
         """Delete specific embeddings by ID with async operations."""
-        collection_name = self._get_collection_name(bot_id)
+        collection_name = await self.locate_bot_collection(bot_id)
         
-        if not await self.collection_exists(bot_id):
-            logger.warning(f"Collection {collection_name} does not exist")
+        if collection_name is None:
+            logger.warning(f"Collection for bot {bot_id} does not exist")
             return True
         
         try:
-            # Use synchronous client for now
-            client = QdrantClient(url=self.url)
-            client.delete(
-                collection_name=collection_name,
-                points_selector=models.PointIdsList(points=ids)
-            )
+            if collection_name.startswith(SHARED_COLLECTION_PREFIX):
+                # Never touch another bot's points, whatever the ids
+                points_selector = models.FilterSelector(filter=models.Filter(must=[
+                    *self._bot_filter(bot_id).must,
+                    models.HasIdCondition(has_id=ids)
+                ]))
+            else:
+                points_selector = models.PointIdsList(points=ids)
+            await self._call("delete", collection_name=collection_name, points_selector=points_selector)
             
             logger.info(f"Deleted {len(ids)} embeddings from collection {collection_name}")
             return True
@@ -1032,38 +1308,67 @@ class QdrantVectorStore(VectorStoreInterface):
             return False
     
     async def get_collection_info(self, bot_id: str) -> Dict[str, Any]:
-        """Get information about a collection with async operations."""
-        collection_name = self._get_collection_name(bot_id)
+        """Get information about a bot's collection with async operations.
         
-        if not await self.collection_exists(bot_id):
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Collection for bot {bot_id} does not exist"
-            )
+        For a bot in a shared collection, counts are the bot's own points and
+        the rest describes the shared collection.
+        """
+        collection_name = self._get_collection_name(bot_id)
         
         try:
-            # Use synchronous client for now
-            client = QdrantClient(url=self.url)
-            info = client.get_collection(collection_name)
+            collection_name = await self.locate_bot_collection(bot_id) or collection_name
+            async with self._connection_pool.get_connection() as client:
+                info = await self._connection_pool.execute_with_timeout(
+                    client.get_collection,
+                    collection_name,
+                    timeout=self.operation_timeouts["get_collection_info"]
+                )
+            
+            shared = collection_name.startswith(SHARED_COLLECTION_PREFIX)
+            points_count = (
+                await self._count_bot_points(collection_name, bot_id) if shared else info.points_count
+            )
             
             return {
                 "name": collection_name,
                 "bot_id": bot_id,
-                "vectors_count": info.vectors_count,
+                "layout": "shared" if shared else "dedicated",
+                # Newer servers no longer report vectors_count separately
+                "vectors_count": points_count if shared else (
+                    getattr(info, "vectors_count", None) or info.points_count
+                ),
                 "indexed_vectors_count": info.indexed_vectors_count,
-                "points_count": info.points_count,
+                "points_count": points_count,
+                "collection_points_count": info.points_count,
                 "segments_count": info.segments_count,
                 "status": info.status,
                 "optimizer_status": info.optimizer_status,
                 "config": {
                     "vector_size": info.config.params.vectors.size,
-                    "distance": info.config.params.vectors.distance
+                    "distance": info.config.params.vectors.distance,
+                    "vectors_on_disk": bool(info.config.params.vectors.on_disk),
+                    "hnsw_m": info.config.hnsw_config.m,
+                    "hnsw_ef_construct": info.config.hnsw_config.ef_construct,
+                    "quantization": type(info.config.quantization_config).__name__
+                    if info.config.quantization_config else None,
+                    "payload_indexes": sorted(info.payload_schema or {})
                 }
             }
             
         except HTTPException:
             # Re-raise HTTP exceptions (timeouts, etc.)
             raise
+        except UnexpectedResponse as e:
+            if e.status_code == status.HTTP_404_NOT_FOUND:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Collection for bot {bot_id} does not exist"
+                )
+            logger.error(f"Failed to get collection info for {collection_name}: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to get collection info: {str(e)}"
+            )
         except ResponseHandlingException as e:
             logger.error(f"Failed to get collection info for {collection_name}: {e}")
             raise HTTPException(
@@ -1077,6 +1382,151 @@ class QdrantVectorStore(VectorStoreInterface):
                 detail=f"Failed to get collection info: {str(e)}"
             )
     
+    async def _promote_if_needed(self, bot_id: str, collection_name: str):
+        """
+        Promote a bot whose points in a shared collection reached the
+        threshold, or move points left there after the bot was promoted.
+        """
+        try:
+            if (
+                await self._dedicated_collection_exists(bot_id)
+                or await self._count_bot_points(collection_name, bot_id) >= self.promotion_threshold
+            ):
+                await self.promote_to_dedicated(bot_id)
+        except Exception as e:
+            # The points are stored; promotion is retried on the next write
+            logger.error(f"Failed to promote bot {bot_id} out of {collection_name}: {e}")
+    
+    async def promote_to_dedicated(self, bot_id: str) -> int:
+        """
+        Move a bot's points from shared collections to its own collection.
+        
+        The dedicated collection gets the profile for the bot's size. All of
+        the bot's points are copied before this process switches to it, and
+        only then are exactly the copied points deleted from the shared
+        collection, so searches keep seeing every point throughout, and a
+        point upserted there mid-promotion (e.g. by another worker that had
+        not noticed the promotion yet) is left in place rather than lost.
+        Writes landing in a shared collection next to an existing dedicated
+        one trigger another run, which moves them.
+        """
+        shared_counts = await self.count_shared_points(bot_id)
+        if not shared_counts:
+            return 0
+        
+        collection_name = self._get_collection_name(bot_id)
+        if not await self._call("collection_exists", collection_name):
+            source = max(shared_counts, key=shared_counts.get)
+            source_info = await self._call("get_collection", source)
+            profile = select_collection_profile(sum(shared_counts.values()))
+            # Not create_collection, which would switch this process to the
+            # still empty collection
+            await self._create_qdrant_collection(
+                collection_name, source_info.config.params.vectors.size, profile
+            )
+        
+        copied = {
+            shared_name: await self._copy_bot_points(shared_name, collection_name, bot_id)
+            for shared_name in shared_counts
+        }
+        self._bot_collections.set(bot_id, collection_name)
+        get_retrieval_profile_cache().invalidate_bot(bot_id)
+        
+        # Only what was copied; the bot filter would also match points
+        # upserted since the copy
+        for shared_name, point_ids in copied.items():
+            for start in range(0, len(point_ids), 256):
+                await self._call(
+                    "delete",
+                    collection_name=shared_name,
+                    points_selector=models.PointIdsList(points=point_ids[start:start + 256])
+                )
+        
+        moved = sum(len(point_ids) for point_ids in copied.values())
+        logger.info(f"Promoted bot {bot_id} to collection {collection_name}, moving {moved} points")
+        return moved
+    
+    async def _copy_bot_points(self, source: str, target: str, bot_id: str, batch_size: int = 256) -> List[Any]:
+        """Copy a bot's points, with vectors and payloads, between collections; returns the copied IDs."""
+        copied = []
+        offset = None
+        while True:
+            points, offset = await self._call(
+                "scroll",
+                collection_name=source,
+                scroll_filter=self._bot_filter(bot_id),
+                limit=batch_size,
+                offset=offset,
+                with_payload=True,
+                with_vectors=True
+            )
+            if points:
+                await self._call(
+                    "upsert",
+                    collection_name=target,
+                    points=[
+                        models.PointStruct(id=point.id, vector=point.vector, payload=point.payload)
+                        for point in points
+                    ]
+                )
+                copied.extend(point.id for point in points)
+            if offset is None:
+                return copied
+    
+    async def apply_collection_profile(self, bot_id: str, profile: CollectionProfile) -> List[str]:
+        """Reconfigure a collection in place; Qdrant rebuilds indexes in the background."""
+        collection_name = self._get_collection_name(bot_id)
+        
+        try:
+            async with self._connection_pool.get_connection() as client:
+                info = await self._connection_pool.execute_with_timeout(
+                    client.get_collection,
+                    collection_name,
+                    timeout=self.operation_timeouts["get_collection_info"]
+                )
+                changes = profile_changes(info, profile)
+                missing_indexes = changes.pop("payload_indexes", [])
+                
+                for key in missing_indexes:
+                    await self._connection_pool.execute_with_timeout(
+                        client.create_payload_index,
+                        collection_name=collection_name,
+                        field_name=key,
+                        field_schema=profile.payload_index_schema(key)
+                    )
+                if changes:
+                    await self._connection_pool.execute_with_timeout(
+                        client.update_collection,
+                        collection_name=collection_name,
+                        **changes
+                    )
+            
+            applied = [f"payload_index:{key}" for key in missing_indexes] + sorted(changes)
+            if applied:
+                logger.info(f"Applied collection profile {profile.name} to {collection_name}: {applied}")
+            return applied
+            
+        except HTTPException:
+            # Re-raise HTTP exceptions (timeouts, etc.)
+            raise
+        except UnexpectedResponse as e:
+            if e.status_code == status.HTTP_404_NOT_FOUND:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Collection for bot {bot_id} does not exist"
+                )
+            logger.error(f"Failed to apply collection profile to {collection_name}: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to apply collection profile: {str(e)}"
+            )
+        except Exception as e:
+            logger.error(f"Unexpected error applying collection profile to {collection_name}: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to apply collection profile: {str(e)}"
+            )
+    
     async def get_operation_status(self, operation_id: str) -> Optional[Dict[str, Any]]:
         """Get status of a specific operation."""
         return await self._operation_queue.get_operation_status(operation_id)
@@ -1112,7 +1562,9 @@ class VectorStoreFactory:
         max_connections: int = 10, 
         timeout: float = 30.0,
         max_concurrent_operations: int = 5,
-        max_queue_size: int = 100
+        max_queue_size: int = 100,
+        payload_mode: Optional[str] = None,
+        collection_layout: Optional[str] = None
     ) -> VectorStoreInterface:
         """
         Create a Qdrant vector store instance with async connection pooling and operation queue.
@@ -1123,6 +1575,8 @@ class VectorStoreFactory:
             timeout: Default timeout for operations in seconds
             max_concurrent_operations: Maximum number of concurrent operations
             max_queue_size: Maximum number of queued operations
+            payload_mode: "full" or "id_only" point payloads (uses settings default if None)
+            collection_layout: "dedicated" or "shared" collections for new bots (uses settings default if None)
             
         Returns:
             QdrantVectorStore instance with async capabilities and backpressure
@@ -1132,7 +1586,9 @@ class VectorStoreFactory:
             max_connections=max_connections, 
             timeout=timeout,
             max_concurrent_operations=max_concurrent_operations,
-            max_queue_size=max_queue_size
+            max_queue_size=max_queue_size,
+            payload_mode=payload_mode,
+            collection_layout=collection_layout
         )
     
     @staticmethod
@@ -1151,7 +1607,8 @@ class VectorService:
         max_connections: int = 10,
         timeout: float = 30.0,
         max_concurrent_operations: int = 5,
-        max_queue_size: int = 100
+        max_queue_size: int = 100,
+        chunk_texts: Optional[ChunkTextCache] = None
     ):
         """
         Initialize vector service with async capabilities and backpressure.
@@ -1162,6 +1619,7 @@ class VectorService:
             timeout: Default timeout for operations in seconds
             max_concurrent_operations: Maximum number of concurrent operations
             max_queue_size: Maximum number of queued operations
+            chunk_texts: Chunk text cache for id-only payloads (global instance used if None)
         """
         self.vector_store = vector_store or VectorStoreFactory.create_vector_store(
             max_connections=max_connections, 
@@ -1173,6 +1631,7 @@ class VectorService:
         self.timeout = timeout
         self.max_concurrent_operations = max_concurrent_operations
         self.max_queue_size = max_queue_size
+        self.chunk_texts = chunk_texts if chunk_texts is not None else get_chunk_text_cache()
     
     async def initialize_bot_collection(self, bot_id: str, dimension: int) -> bool:
         """
@@ -1255,9 +1714,45 @@ class VectorService:
         if document_filter:
             metadata_filter["document_id"] = document_filter
         
-        return await self.vector_store.search_similar(
+        results = await self.vector_store.search_similar(
             bot_id, query_embedding, top_k, score_threshold, metadata_filter
         )
+        return await self.hydrate_texts(results)
+    
+    async def hydrate_texts(self, results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Fill in the text of search results whose payload has none.
+        
+        Id-only payloads don't store chunk text; it is fetched for all such
+        results in one batched chunk text cache lookup. Results whose chunk
+        row is gone (e.g. deleted after the search) are dropped rather than
+        passed on with no text.
+        
+        Args:
+            results: Search results, updated in place
+            
+        Returns:
+            The results that have text, in their original order
+        """
+        missing = [result["id"] for result in results if result.get("text") is None]
+        if not missing:
+            return results
+        
+        try:
+            texts = await self.chunk_texts.get_texts(missing)
+        except Exception as e:
+            logger.error(f"Failed to load chunk text for {len(missing)} search results: {e}")
+            texts = {}
+        hydrated = []
+        for result in results:
+            if result.get("text") is None:
+                if result["id"] not in texts:
+                    continue
+                result["text"] = texts[result["id"]]
+            hydrated.append(result)
+        if len(hydrated) < len(results):
+            logger.warning(f"Dropped {len(results) - len(hydrated)} search results without chunk text")
+        return hydrated
     
     async def delete_document_chunks(self, bot_id: str, chunk_ids: List[str]) -> bool:
         """
@@ -1270,6 +1765,7 @@ class VectorService:
         Returns:
             True if chunks deleted successfully
         """
+        self.chunk_texts.invalidate_many(chunk_ids)
         return await self.vector_store.delete_embeddings(bot_id, chunk_ids)
     
     async def get_bot_collection_stats(self, bot_id: str) -> Dict[str, Any]:
@@ -1284,6 +1780,18 @@ class VectorService:
         """
         return await self.vector_store.get_collection_info(bot_id)
     
+    async def promote_bot_collection(self, bot_id: str) -> int:
+        """
+        Move a bot from shared collections to its own collection.
+        
+        Args:
+            bot_id: Bot identifier
+            
+        Returns:
+            Number of points moved; 0 if the bot has none in shared collections
+        """
+        return await self.vector_store.promote_to_dedicated(bot_id)
+    
     async def store_document_chunks_with_progress(
         self,
         bot_id: str,
@@ -167,18 +167,27 @@ class ConnectionManager:
         # If we have a database session, verify permissions
         if db:
             permission_service = PermissionService(db)
-            verified_users = []
+            subscriber_uuids = {}
             for user_id in subscribed_users:
                 try:
-                    user_uuid = uuid.UUID(user_id)
-                    bot_uuid = uuid.UUID(bot_id)
-                    if permission_service.check_bot_permission(user_uuid, bot_uuid, "view_bot"):
+                    subscriber_uuids[uuid.UUID(user_id)] = user_id
+                except ValueError as e:
+                    logger.error(f"Error verifying permission for user {user_id} on bot {bot_id}: {e}")
+            
+            verified_users = []
+            try:
+                # Resolve every subscriber's role with one query (or none, when cached)
+                roles = permission_service.get_roles_for_users(
+                    uuid.UUID(bot_id), list(subscriber_uuids)
+                )
+                for user_uuid, user_id in subscriber_uuids.items():
+                    if permission_service.role_has_permission(roles.get(user_uuid), "view_bot"):
                         verified_users.append(user_id)
                     else:
                         # Remove user from subscription if they no longer have permission
                         self.bot_subscriptions[bot_id].discard(user_id)
-                except (ValueError, Exception) as e:
-                    logger.error(f"Error verifying permission for user {user_id} on bot {bot_id}: {e}")
+            except Exception as e:
+                logger.error(f"Error verifying permissions for bot {bot_id}: {e}")
             subscribed_users = verified_users
         
         # Send to all subscribed users (except excluded)
@@ -341,6 +350,58 @@ class WebSocketService:
             db=self.db
         )
     
+    async def stream_chat_response(
+        self,
+        websocket: WebSocket,
+        user: User,
+        bot_id: str,
+        message_data: Dict[str, Any]
+    ):
+        """
+        Run a chat turn and stream the response over a WebSocket.
+        
+        Sends "chat_stream_start", then one "chat_token" frame per response
+        delta, then "chat_stream_end" with the stored response; failures are
+        sent as a "chat_stream_error" frame.
+        
+        Args:
+            websocket: WebSocket connection of the sender
+            user: Authenticated sender
+            bot_id: Bot ID
+            message_data: Chat request fields (message and optional session_id)
+        """
+        # Imported here to avoid a circular import through the chat service
+        from ..schemas.conversation import ChatRequest
+        from .service_container import get_service_container
+        
+        try:
+            chat_request = ChatRequest(**message_data)
+            chat_service = get_service_container().create_chat_service(self.db)
+            
+            async for event in chat_service.stream_message(uuid.UUID(bot_id), user.id, chat_request):
+                event_type = event.pop("type")
+                frame_type = {
+                    "start": "chat_stream_start",
+                    "token": "chat_token",
+                    "done": "chat_stream_end",
+                    "error": "chat_stream_error"
+                }[event_type]
+                await websocket.send_text(json.dumps({
+                    "type": frame_type,
+                    "bot_id": bot_id,
+                    "data": event
+                }))
+        except WebSocketDisconnect:
+            raise
+        except Exception as e:
+            logger.error(f"WebSocket chat streaming failed for bot {bot_id}: {e}")
+            detail = getattr(e, "detail", None) or str(e)
+            await websocket.send_text(json.dumps({
+                "type": "chat_stream_error",
+                "bot_id": bot_id,
+                "data": {"detail": detail}
+            }))
+    
     async def handle_typing_indicator(
         self, 
         bot_id: str, 
@@ -353,11 +353,11 @@ class WidgetService:
         
         try:
             # Try to use the full chat service
-            from ..services.chat_service import ChatService
+            from ..services.service_container import get_service_container
             from ..schemas.conversation import ChatRequest
             
-            # Create chat service and process message
-            chat_service = ChatService(self.db)
+            # Bind the shared chat components to this request's session
+            chat_service = get_service_container().create_chat_service(self.db)
             
             # Handle session continuity
             session_uuid = None
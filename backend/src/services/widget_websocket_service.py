@@ -4,14 +4,14 @@ WebSocket service for widget chat sessions.
 import json
 import logging
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from fastapi import WebSocket, WebSocketDisconnect
 from sqlalchemy.orm import Session
 
 from ..core.security import verify_token
 from ..services.widget_service import WidgetService
-from ..services.chat_service import ChatService
-from ..models.widget import WidgetSession
+from ..services.service_container import get_service_container
+from ..models.widget import WidgetMessage, WidgetSession
 
 logger = logging.getLogger(__name__)
 
@@ -22,7 +22,7 @@ class WidgetWebSocketService:
     def __init__(self, db: Session):
         self.db = db
         self.widget_service = WidgetService(db)
-        self.chat_service = ChatService(db)
+        self.chat_service = get_service_container().create_chat_service(db)
     
     async def authenticate_widget_session(self, websocket: WebSocket, session_token: str) -> Optional[WidgetSession]:
         """
@@ -218,18 +218,15 @@ class WidgetWebSocketService:
             
             # Get bot response
             try:
-                # Get conversation history for context
-                messages = self.widget_service.get_session_messages(session)
-                conversation_history = [
-                    {"role": msg.role, "content": msg.content}
-                    for msg in messages
-                ]
+                # Get conversation history for context, without the message just saved
+                conversation_history = self.widget_service.get_session_messages(session)[:-1]
                 
-                # Generate bot response using the chat service
-                bot_response = await self.generate_bot_response(
+                # Generate bot response, streaming tokens to the widget as they arrive
+                bot_response = await self.stream_bot_response(
+                    websocket,
                     session.widget_config.bot,
                     conversation_history,
-                    session.widget_config.bot.system_prompt
+                    content
                 )
                 
                 # Save bot message
@@ -269,30 +266,35 @@ class WidgetWebSocketService:
                 "message": "Error processing your message"
             }))
     
-    async def generate_bot_response(self, bot, conversation_history, system_prompt: str) -> str:
+    async def stream_bot_response(
+        self,
+        websocket: WebSocket,
+        bot,
+        conversation_history: List[WidgetMessage],
+        user_input: str
+    ) -> str:
         """
-        Generate bot response using the chat service.
+        Generate bot response, sending each delta to the widget as a "bot_token" frame.
         
         Args:
+            websocket: WebSocket connection
             bot: Bot configuration
-            conversation_history: List of previous messages
-            system_prompt: System prompt for the bot
+            conversation_history: Previous messages of the session, oldest first
+            user_input: Message being answered
             
         Returns:
-            Generated response text
+            Full generated response text
         """
-        try:
-            # Use the existing chat service to generate response
-            # This maintains consistency with the main chat functionality
-            response = await self.chat_service.generate_response(
-                bot_id=bot.id,
-                messages=conversation_history,
-                system_prompt=system_prompt,
-                user_id=bot.owner_id  # Use bot owner's credentials
-            )
-            
-            return response.get("content", "I'm sorry, I couldn't generate a response.")
+        # Same retrieval and prompt shape as the main chat; widget visitors
+        # chat on the bot owner's credentials
+        deltas: List[str] = []
+        async for delta in self.chat_service.stream_reply(
+            bot, bot.owner_id, conversation_history, user_input
+        ):
+            deltas.append(delta)
+            await websocket.send_text(json.dumps({
+                "type": "bot_token",
+                "data": {"content": delta}
+            }))
         
-        except Exception as e:
-            logger.error(f"Error in bot response generation: {e}")
-            return "I'm sorry, I'm having trouble responding right now. Please try again later."
\ No newline at end of file
+        return "".join(deltas)
@@ -1,6 +1,7 @@
 """
 Encryption utilities for API key management.
 """
+from functools import lru_cache
 from cryptography.fernet import Fernet
 import base64
 import hashlib
@@ -22,6 +23,20 @@ def _get_encryption_key() -> bytes:
     return base64.urlsafe_b64encode(digest)
 
 
+@lru_cache(maxsize=1)
+def _get_fernet() -> Fernet:
+    """
+    Get the Fernet instance for the configured secret key.
+    
+    The key is derived once per process; Fernet objects are stateless and
+    safe to share between threads.
+    
+    Returns:
+        Fernet instance
+    """
+    return Fernet(_get_encryption_key())
+
+
 def encrypt_api_key(api_key: str) -> str:
     """
     Encrypt an API key for secure storage.
@@ -32,8 +47,7 @@ def encrypt_api_key(api_key: str) -> str:
     Returns:
         Encrypted API key as string
     """
-    fernet = Fernet(_get_encryption_key())
-    encrypted_key = fernet.encrypt(api_key.encode())
+    encrypted_key = _get_fernet().encrypt(api_key.encode())
     return encrypted_key.decode()
 
 
@@ -50,6 +64,5 @@ def decrypt_api_key(encrypted_api_key: str) -> str:
     Raises:
         Exception: If decryption fails
     """
-    fernet = Fernet(_get_encryption_key())
-    decrypted_key = fernet.decrypt(encrypted_api_key.encode())
+    decrypted_key = _get_fernet().decrypt(encrypted_api_key.encode())
     return decrypted_key.decode()
\ No newline at end of file
@@ -0,0 +1,193 @@
+"""
+MinHash signatures and LSH banding for near-duplicate chunk detection.
+
+A chunk is reduced to the set of character shingles of its normalized text,
+and each of NUM_PERMUTATIONS seeded hash functions keeps the minimum hash over
+that set. Two signatures agree in a position with probability equal to the
+Jaccard similarity of the shingle sets. LSH splits the signature into bands
+and only chunks that collide on a whole band become candidate pairs, so
+near-duplicates are found without comparing every pair.
+
+Signatures are persisted on DocumentChunk.minhash_signature, so the hash
+parameters below are part of the stored format. A stored signature starts
+with its SIGNATURE_VERSION byte; bump it when changing them, and signatures
+of other versions decode as missing and are recomputed.
+"""
+import re
+import zlib
+from collections import defaultdict
+from typing import Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+SIGNATURE_VERSION = 1
+NUM_PERMUTATIONS = 128
+SHINGLE_SIZE = 5
+LSH_BANDS = 32
+LSH_ROWS = NUM_PERMUTATIONS // LSH_BANDS
+
+# Universal hashing (a * x + b) mod p over 32-bit shingle hashes; p > 2^32
+# keeps the products below 2^64, so uint64 arithmetic is exact.
+_PRIME = np.uint64(4294967311)
+_MAX_HASH = np.uint64(0xFFFFFFFF)
+_rng = np.random.RandomState(SIGNATURE_VERSION)
+_PERM_A = _rng.randint(1, 2 ** 32 - 1, size=NUM_PERMUTATIONS, dtype=np.uint64)
+_PERM_B = _rng.randint(0, 2 ** 32 - 1, size=NUM_PERMUTATIONS, dtype=np.uint64)
+
+SIGNATURE_DTYPE = np.dtype('<u4')
+_VERSION_PREFIX = bytes([SIGNATURE_VERSION])
+SIGNATURE_BYTES = len(_VERSION_PREFIX) + NUM_PERMUTATIONS * SIGNATURE_DTYPE.itemsize
+
+
+def _shingles(content: str) -> Set[str]:
+    """Character shingles of the text, normalized as the exact similarity scorer does."""
+    normalized = re.sub(r'\s+', ' ', content.strip().lower())
+    if len(normalized) <= SHINGLE_SIZE:
+        return {normalized} if normalized else set()
+    return {
+        normalized[i:i + SHINGLE_SIZE]
+        for i in range(len(normalized) - SHINGLE_SIZE + 1)
+    }
+
+
+def compute_minhash_signature(content: str) -> bytes:
+    """
+    Compute the MinHash signature of a chunk's text.
+
+    Args:
+        content: Chunk text
+
+    Returns:
+        Signature as the version byte followed by NUM_PERMUTATIONS
+        little-endian uint32 values
+    """
+    shingles = _shingles(content)
+    if not shingles:
+        return _VERSION_PREFIX + np.full(NUM_PERMUTATIONS, _MAX_HASH, dtype=SIGNATURE_DTYPE).tobytes()
+
+    hashes = np.fromiter(
+        (zlib.crc32(shingle.encode('utf-8')) for shingle in shingles),
+        dtype=np.uint64,
+        count=len(shingles)
+    )
+    permuted = (np.outer(_PERM_A, hashes) + _PERM_B[:, None]) % _PRIME
+    signature = (permuted & _MAX_HASH).min(axis=1)
+    return _VERSION_PREFIX + signature.astype(SIGNATURE_DTYPE).tobytes()
+
+
+def decode_signature(raw: Optional[bytes]) -> Optional[np.ndarray]:
+    """
+    Read a stored signature.
+
+    Args:
+        raw: Bytes from DocumentChunk.minhash_signature
+
+    Returns:
+        uint32 array, or None if missing or of another version or size
+    """
+    if not raw or len(raw) != SIGNATURE_BYTES or raw[0] != SIGNATURE_VERSION:
+        return None
+    return np.frombuffer(raw, dtype=SIGNATURE_DTYPE, offset=len(_VERSION_PREFIX))
+
+
+def estimate_jaccard(signature1: np.ndarray, signature2: np.ndarray) -> float:
+    """
+    Estimate the Jaccard similarity of two chunks' shingle sets.
+
+    Args:
+        signature1: First signature
+        signature2: Second signature
+
+    Returns:
+        Fraction of agreeing signature positions
+    """
+    return float(np.count_nonzero(signature1 == signature2)) / NUM_PERMUTATIONS
+
+
+class MinHashLSHIndex:
+    """In-memory LSH banding index over MinHash signatures."""
+
+    def __init__(self, bands: int = LSH_BANDS):
+        """
+        Initialize an empty index.
+
+        Args:
+            bands: Number of bands; each band hashes NUM_PERMUTATIONS // bands rows
+        """
+        if NUM_PERMUTATIONS % bands:
+            raise ValueError(f"bands must divide {NUM_PERMUTATIONS}")
+        self.bands = bands
+        self.rows = NUM_PERMUTATIONS // bands
+        self._buckets: List[Dict[bytes, List[Hashable]]] = [
+            defaultdict(list) for _ in range(bands)
+        ]
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, key: Hashable, signature: np.ndarray):
+        """
+        Add a chunk to the index.
+
+        Args:
+            key: Chunk identifier
+            signature: Chunk MinHash signature
+        """
+        band_keys = signature.reshape(self.bands, self.rows)
+        for band, band_key in enumerate(band_keys):
+            self._buckets[band][band_key.tobytes()].append(key)
+        self._size += 1
+
+    def query(self, signature: np.ndarray) -> Set[Hashable]:
+        """
+        Find indexed chunks that share at least one band with a signature.
+
+        Args:
+            signature: MinHash signature to look up
+
+        Returns:
+            Keys of candidate near-duplicates
+        """
+        candidates = set()
+        band_keys = signature.reshape(self.bands, self.rows)
+        for band, band_key in enumerate(band_keys):
+            candidates.update(self._buckets[band].get(band_key.tobytes(), ()))
+        return candidates
+
+    def candidate_pairs(self) -> Set[Tuple[Hashable, Hashable]]:
+        """
+        Collect every pair of indexed chunks that collide in some band.
+
+        Returns:
+            Unordered candidate pairs, each as a (key, key) tuple in insertion order
+        """
+        pairs = set()
+        for buckets in self._buckets:
+            for keys in buckets.values():
+                if len(keys) < 2:
+                    continue
+                for i, key1 in enumerate(keys):
+                    for key2 in keys[i + 1:]:
+                        pairs.add((key1, key2))
+        return pairs
+
+
+def build_lsh_index(
+    entries: Iterable[Tuple[Hashable, np.ndarray]],
+    bands: int = LSH_BANDS
+) -> MinHashLSHIndex:
+    """
+    Build an LSH index from (key, signature) pairs.
+
+    Args:
+        entries: Chunk keys with their signatures
+        bands: Number of LSH bands
+
+    Returns:
+        Populated index
+    """
+    index = MinHashLSHIndex(bands)
+    for key, signature in entries:
+        index.add(key, signature)
+    return index
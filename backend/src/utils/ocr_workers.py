@@ -0,0 +1,119 @@
+"""
+Process pool for CPU-bound OCR work.
+
+Tesseract runs in a separate process per call, but rendering, PNG decoding and
+waiting on it all happen in the caller. Page OCR is therefore fanned out to a
+shared, bounded ProcessPoolExecutor: the extractor renders pages in the parent
+and submits only image bytes, so tasks pickle cheaply and never reopen the PDF.
+"""
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from typing import List, Optional, Tuple
+
+from ..core.ocr_config import ocr_settings
+
+logger = logging.getLogger(__name__)
+
+# Tesseract config used for page and embedded-image OCR
+PAGE_OCR_CONFIG = '--psm 6'  # Uniform block of text
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+def get_ocr_worker_count() -> int:
+    """
+    Get the configured OCR process count.
+
+    Returns:
+        Number of OCR worker processes (CPU count when not configured)
+    """
+    return ocr_settings.ocr_max_workers or os.cpu_count() or 1
+
+
+def get_ocr_pool() -> ProcessPoolExecutor:
+    """
+    Get the shared OCR process pool, creating it on first use.
+
+    Returns:
+        Process pool sized by ocr_max_workers
+    """
+    global _pool, _pool_workers
+
+    with _pool_lock:
+        if _pool is None:
+            _pool_workers = get_ocr_worker_count()
+            _pool = ProcessPoolExecutor(max_workers=_pool_workers)
+            logger.info(f"Started OCR process pool with {_pool_workers} workers")
+        return _pool
+
+
+def shutdown_ocr_pool():
+    """Shut down the shared OCR process pool, if it was started."""
+    global _pool
+
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+            logger.info("OCR process pool shut down")
+
+
+def ocr_page_images(
+    page_image: Optional[bytes],
+    embedded_images: List[bytes],
+    language: str,
+    timeout: int
+) -> Tuple[Optional[str], List[Optional[str]]]:
+    """
+    OCR one PDF page's rendered image and its embedded images.
+
+    Runs inside a pool worker. The timeout is shared by all images of the page
+    and is enforced on each Tesseract call, so a stuck page frees its worker.
+
+    Args:
+        page_image: PNG of the rendered page, or None if the page has text
+        embedded_images: PNGs of images embedded in the page
+        language: Tesseract language code
+        timeout: Time budget for the whole page in seconds (0 for no limit)
+
+    Returns:
+        Tuple of (page OCR text or None, text per embedded image or None on failure)
+    """
+    import pytesseract
+    from PIL import Image
+
+    deadline = time.monotonic() + timeout if timeout else None
+
+    def _ocr(png: bytes) -> str:
+        remaining = 0
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise RuntimeError("Tesseract process timeout")
+        with Image.open(BytesIO(png)) as image:
+            return pytesseract.image_to_string(
+                image, lang=language, config=PAGE_OCR_CONFIG, timeout=remaining
+            )
+
+    page_text = None
+    if page_image is not None:
+        try:
+            page_text = _ocr(page_image)
+        except Exception as e:
+            logger.warning(f"Page OCR failed: {e}")
+
+    image_texts = []
+    for png in embedded_images:
+        try:
+            image_texts.append(_ocr(png))
+        except Exception as e:
+            logger.warning(f"Embedded image OCR failed: {e}")
+            image_texts.append(None)
+
+    return page_text, image_texts
@@ -2,13 +2,18 @@
 Text processing utilities for document chunking and extraction with OCR support.
 """
 import re
+import codecs
 import logging
-from typing import List, Dict, Any, Optional, Tuple, Union
+from bisect import bisect_right
+from typing import List, Dict, Any, Optional, Tuple, Union, Iterable, Iterator
 from pathlib import Path
 from io import BytesIO
 import tempfile
 import os
-from dataclasses import dataclass, asdict
+import sys
+from collections import deque
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, asdict, field
 from enum import Enum
 
 # PDF processing with OCR support
@@ -16,6 +21,9 @@ import fitz  # PyMuPDF
 import pytesseract
 from PIL import Image
 
+from ..core.ocr_config import ocr_settings
+from .ocr_workers import get_ocr_pool, get_ocr_worker_count, ocr_page_images
+
 # Try to import python-magic, fall back to mimetypes if not available
 try:
     import magic
@@ -506,6 +514,31 @@ class TextChunk:
         }
 
 
+class PdfExtractionError(ValueError):
+    """PDF pages could not be extracted; OCR may be the cause, so a retry without it can succeed."""
+
+
+@dataclass
+class PdfExtractionStats:
+    """Running totals recorded while PDF pages are extracted."""
+    total_pages: int = 0
+    ocr_pages: List[int] = field(default_factory=list)
+    images_processed: int = 0
+    page_metadata: List[Dict[str, Any]] = field(default_factory=list)
+    
+    def to_metadata(self, ocr_enabled: bool) -> Dict[str, Any]:
+        """Build the extraction metadata reported for a PDF."""
+        return {
+            "total_pages": self.total_pages,
+            "extracted_pages": len(self.page_metadata),
+            "ocr_pages": self.ocr_pages,
+            "ocr_enabled": ocr_enabled,
+            "images_processed": self.images_processed,
+            "page_metadata": self.page_metadata,
+            "extraction_method": "PyMuPDF + OCR" if self.ocr_pages else "PyMuPDF"
+        }
+
+
 class DocumentExtractor:
     """Handles text extraction from various document formats with OCR support and security checks."""
     
@@ -521,6 +554,13 @@ class DocumentExtractor:
     }
     
     MAX_FILE_SIZE = 50 * 1024 * 1024  # 50MB
+    HEADER_SIZE = 8192  # Bytes read for MIME detection of stored files
+    TEXT_BLOCK_SIZE = 64 * 1024  # Bytes read at a time from stored text files
+    TEXT_ENCODINGS = ['utf-8', 'utf-16', 'latin-1', 'cp1252']
+    TEXT_MIME_TYPES = ['text/plain', 'text/x-python', 'application/x-empty']
+    # Whitespace runs of blank lines between text, where stored text files are
+    # split into segments; normalization turns each such run into "\n\n"
+    PARAGRAPH_BREAK = re.compile(r'(?<!\s)[ \t]*\n[ \t\n]*\n[ \t]*(?=\S)')
     
     def __init__(self, enable_ocr: bool = True, ocr_language: str = 'eng'):
         """
@@ -544,20 +584,51 @@ class DocumentExtractor:
                 self.enable_ocr = False
     
     @classmethod
-    def validate_file(cls, file_path: Path, file_content: bytes) -> Tuple[bool, str, str]:
+    def validate_stored_file(cls, stored_path: Path, filename: str) -> Tuple[bool, str, str]:
+        """
+        Validate a file on disk without reading it whole.
+        
+        Args:
+            stored_path: Where the file is stored
+            filename: Original filename, used for the extension checks
+            
+        Returns:
+            Tuple of (is_valid, mime_type, error_message)
+        """
+        try:
+            file_size = os.path.getsize(stored_path)
+            with open(stored_path, 'rb') as f:
+                header = f.read(cls.HEADER_SIZE)
+        except OSError as e:
+            logger.error(f"Error reading file {stored_path}: {e}")
+            return False, "", f"File validation error: {str(e)}"
+        
+        return cls.validate_file(Path(filename), header, file_size=file_size)
+    
+    @classmethod
+    def validate_file(
+        cls,
+        file_path: Path,
+        file_content: bytes,
+        file_size: Optional[int] = None
+    ) -> Tuple[bool, str, str]:
         """
         Validate file type and size with security checks.
         
         Args:
             file_path: Path to the file
-            file_content: File content as bytes
+            file_content: File content as bytes, or just its first bytes when
+                file_size is given (MIME detection only needs the header)
+            file_size: Size of the whole file, if file_content is partial
             
         Returns:
             Tuple of (is_valid, mime_type, error_message)
         """
         try:
             # Check file size
-            if len(file_content) > cls.MAX_FILE_SIZE:
+            if file_size is None:
+                file_size = len(file_content)
+            if file_size > cls.MAX_FILE_SIZE:
                 return False, "", f"File size exceeds maximum allowed size of {cls.MAX_FILE_SIZE} bytes"
             
             # Check file extension
@@ -619,7 +690,7 @@ class DocumentExtractor:
         try:
             if mime_type == 'application/pdf':
                 return self._extract_pdf_text(file_content, filename)
-            elif mime_type in ['text/plain', 'text/x-python', 'application/x-empty']:
+            elif mime_type in self.TEXT_MIME_TYPES:
                 return self._extract_text_file(file_content, filename)
             elif mime_type.startswith('image/'):
                 return self._extract_image_text(file_content, filename)
@@ -632,16 +703,110 @@ class DocumentExtractor:
     
     def _extract_pdf_text(self, file_content: bytes, filename: str) -> Tuple[str, Dict[str, Any]]:
         """Extract text from PDF file with OCR fallback for scanned documents."""
+        stats = PdfExtractionStats()
+        full_text = "\n".join(
+            page_text for page_text, _ in self._iter_pdf_pages(file_content, filename, stats)
+        )
+        return full_text, stats.to_metadata(self.enable_ocr)
+    
+    def iter_pdf_pages(
+        self,
+        file_path: Union[str, Path],
+        filename: str,
+        stats: Optional['PdfExtractionStats'] = None
+    ) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Yield the text of each non-empty page of a PDF on disk.
+        
+        PyMuPDF reads pages from the file as they are loaded, so the file is
+        never held in memory whole. See _iter_pdf_pages.
+        
+        Args:
+            file_path: Path to the PDF file
+            filename: Original filename
+            stats: Optional stats object filled in as pages are produced
+            
+        Yields:
+            Tuple of (page_text, page_metadata)
+        """
+        return self._iter_pdf_pages(Path(file_path), filename, stats)
+    
+    def _iter_pdf_pages(
+        self,
+        source: Union[bytes, Path],
+        filename: str,
+        stats: Optional['PdfExtractionStats'] = None
+    ) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Yield the text of each non-empty PDF page in order, with OCR fallback.
+        
+        Pages are read in order in this process. Low-text pages and embedded
+        images are rendered here and OCR'd in the shared process pool, with at
+        most ocr_max_pending_pages pages in flight. Character offsets are
+        tracked with a running counter and refer to the page texts joined with
+        "\n", so only the pages in flight are held in memory.
+        
+        Args:
+            source: PDF file content, or the path of the PDF file
+            filename: Original filename
+            stats: Optional stats object filled in as pages are produced
+            
+        Yields:
+            Tuple of (page_text, page_metadata)
+        """
+        stats = stats if stats is not None else PdfExtractionStats()
         pdf_document = None
         try:
             # Open PDF with PyMuPDF
-            pdf_document = fitz.open(stream=file_content, filetype="pdf")
+            if isinstance(source, bytes):
+                pdf_document = fitz.open(stream=source, filetype="pdf")
+            else:
+                pdf_document = fitz.open(source, filetype="pdf")
             
-            text_parts = []
-            page_metadata = []
-            ocr_pages = []
-            total_images_processed = 0
             total_pages = len(pdf_document)
+            stats.total_pages = total_pages
+            next_offset = 0
+            
+            pool = get_ocr_pool() if self.enable_ocr else None
+            max_pending = ocr_settings.ocr_max_pending_pages or 2 * get_ocr_worker_count()
+            # (page_num, page_text, image_count, embedded image indices, OCR future)
+            pending = deque()
+            
+            def collect_page() -> Optional[Tuple[str, Dict[str, Any]]]:
+                nonlocal next_offset
+                page_num, page_text, image_count, image_indices, future = pending.popleft()
+                used_ocr = False
+                
+                if future is not None:
+                    ocr_text, image_texts = self._wait_for_page_ocr(future, page_num)
+                    
+                    if ocr_text and ocr_text.strip():
+                        page_text = ocr_text
+                        used_ocr = True
+                        stats.ocr_pages.append(page_num + 1)
+                        logger.info(f"OCR extracted {len(ocr_text)} characters from page {page_num + 1}")
+                    
+                    for img_index, img_text in zip(image_indices, image_texts):
+                        if img_text and img_text.strip():
+                            page_text += f"\n[Image {img_index + 1} text]: {img_text}"
+                            stats.images_processed += 1
+                
+                if not page_text.strip():
+                    return None
+                
+                char_start = next_offset
+                char_end = char_start + len(page_text)
+                # The next page starts after the "\n" separator
+                next_offset = char_end + 1
+                page_meta = {
+                    "page_number": page_num + 1,
+                    "char_start": char_start,
+                    "char_end": char_end,
+                    "used_ocr": used_ocr,
+                    "image_count": image_count
+                }
+                stats.page_metadata.append(page_meta)
+                return page_text, page_meta
             
             for page_num in range(total_pages):
                 try:
@@ -649,105 +814,47 @@ class DocumentExtractor:
                     
                     # First, try to extract text directly
                     page_text = page.get_text()
+                    images = page.get_images()
                     
-                    # If no text or very little text, try OCR on the page
-                    if self.enable_ocr and (not page_text.strip() or len(page_text.strip()) < 50):
-                        logger.info(f"Page {page_num + 1} has little/no text, attempting OCR")
-                        
-                        try:
-                            # Render page as image
-                            mat = fitz.Matrix(2.0, 2.0)  # 2x zoom for better OCR
-                            pix = page.get_pixmap(matrix=mat)
-                            img_data = pix.tobytes("png")
-                            
-                            # Clean up pixmap immediately
-                            pix = None
-                            
-                            # Convert to PIL Image and run OCR
-                            image = Image.open(BytesIO(img_data))
-                            ocr_text = pytesseract.image_to_string(
-                                image, 
-                                lang=self.ocr_language,
-                                config='--psm 6'  # Uniform block of text
-                            )
-                            
-                            # Clean up image
-                            image.close()
-                            
-                            if ocr_text.strip():
-                                page_text = ocr_text
-                                ocr_pages.append(page_num + 1)
-                                logger.info(f"OCR extracted {len(ocr_text)} characters from page {page_num + 1}")
-                            
-                        except Exception as e:
-                            logger.warning(f"OCR failed for page {page_num + 1}: {e}")
-                    
-                    # Also extract text from images within the page
-                    if self.enable_ocr:
-                        try:
-                            image_list = page.get_images()
-                            for img_index, img in enumerate(image_list):
-                                try:
-                                    xref = img[0]
-                                    pix = fitz.Pixmap(pdf_document, xref)
-                                    
-                                    if pix.n - pix.alpha < 4:  # GRAY or RGB
-                                        img_data = pix.tobytes("png")
-                                        image = Image.open(BytesIO(img_data))
-                                        
-                                        # Run OCR on the image
-                                        img_text = pytesseract.image_to_string(
-                                            image,
-                                            lang=self.ocr_language,
-                                            config='--psm 6'
-                                        )
-                                        
-                                        # Clean up image
-                                        image.close()
-                                        
-                                        if img_text.strip():
-                                            page_text += f"\n[Image {img_index + 1} text]: {img_text}"
-                                            total_images_processed += 1
-                                    
-                                    # Clean up pixmap immediately
-                                    pix = None
-                                    
-                                except Exception as e:
-                                    logger.warning(f"Failed to extract text from image {img_index + 1} on page {page_num + 1}: {e}")
-                        except Exception as e:
-                            logger.warning(f"Failed to process images on page {page_num + 1}: {e}")
+                    future = None
+                    image_indices = []
+                    if pool is not None:
+                        page_image, embedded_images = self._render_page_for_ocr(
+                            pdf_document, page, page_num, page_text, images
+                        )
+                        image_indices = [img_index for img_index, _ in embedded_images]
+                        if page_image is not None or embedded_images:
+                            try:
+                                future = pool.submit(
+                                    ocr_page_images,
+                                    page_image,
+                                    [png for _, png in embedded_images],
+                                    self.ocr_language,
+                                    ocr_settings.ocr_timeout
+                                )
+                            except Exception as e:
+                                logger.warning(f"Could not schedule OCR for page {page_num + 1}: {e}")
                     
-                    if page_text.strip():
-                        text_parts.append(page_text)
-                        page_metadata.append({
-                            "page_number": page_num + 1,
-                            "char_start": len("\n".join(text_parts[:-1])) + (1 if text_parts[:-1] else 0),
-                            "char_end": len("\n".join(text_parts)),
-                            "used_ocr": (page_num + 1) in ocr_pages,
-                            "image_count": len(page.get_images()) if hasattr(page, 'get_images') else 0
-                        })
+                    pending.append((page_num, page_text, len(images), image_indices, future))
                 
                 except Exception as e:
                     logger.warning(f"Error processing page {page_num + 1}: {e}")
                     continue
+                
+                # Bound rendered pages held in memory while OCR catches up
+                while len(pending) > max_pending:
+                    collected = collect_page()
+                    if collected is not None:
+                        yield collected
             
-            full_text = "\n".join(text_parts)
-            
-            metadata = {
-                "total_pages": total_pages,
-                "extracted_pages": len(page_metadata),
-                "ocr_pages": ocr_pages,
-                "ocr_enabled": self.enable_ocr,
-                "images_processed": total_images_processed,
-                "page_metadata": page_metadata,
-                "extraction_method": "PyMuPDF + OCR" if ocr_pages else "PyMuPDF"
-            }
-            
-            return full_text, metadata
+            while pending:
+                collected = collect_page()
+                if collected is not None:
+                    yield collected
             
         except Exception as e:
             logger.error(f"PDF extraction failed for {filename}: {e}")
-            raise ValueError(f"PDF extraction failed: {str(e)}")
+            raise PdfExtractionError(f"PDF extraction failed: {str(e)}")
         finally:
             # Ensure PDF document is properly closed
             if pdf_document is not None:
@@ -756,6 +863,73 @@ class DocumentExtractor:
                 except:
                     pass
     
+    def _render_page_for_ocr(
+        self,
+        pdf_document,
+        page,
+        page_num: int,
+        page_text: str,
+        images: List[Any]
+    ) -> Tuple[Optional[bytes], List[Tuple[int, bytes]]]:
+        """
+        Render the parts of a PDF page that need OCR as PNG bytes.
+        
+        Args:
+            pdf_document: Open PyMuPDF document
+            page: Page to render
+            page_num: Zero-based page number
+            page_text: Text extracted directly from the page
+            images: Result of page.get_images()
+            
+        Returns:
+            Tuple of (page PNG if the page has little/no text, [(image index, PNG)])
+        """
+        page_image = None
+        if not page_text.strip() or len(page_text.strip()) < 50:
+            logger.info(f"Page {page_num + 1} has little/no text, attempting OCR")
+            try:
+                mat = fitz.Matrix(2.0, 2.0)  # 2x zoom for better OCR
+                page_image = page.get_pixmap(matrix=mat).tobytes("png")
+            except Exception as e:
+                logger.warning(f"OCR failed for page {page_num + 1}: {e}")
+        
+        embedded_images = []
+        for img_index, img in enumerate(images):
+            try:
+                xref = img[0]
+                pix = fitz.Pixmap(pdf_document, xref)
+                if pix.n - pix.alpha < 4:  # GRAY or RGB
+                    embedded_images.append((img_index, pix.tobytes("png")))
+                pix = None
+            except Exception as e:
+                logger.warning(f"Failed to extract text from image {img_index + 1} on page {page_num + 1}: {e}")
+        
+        return page_image, embedded_images
+    
+    def _wait_for_page_ocr(self, future: Future, page_num: int) -> Tuple[Optional[str], List[Optional[str]]]:
+        """
+        Wait for a page's OCR result, falling back to no OCR on failure or timeout.
+        
+        Workers enforce ocr_timeout per page themselves; the wait here is a
+        backstop that also covers time the page spent queued behind others.
+        
+        Args:
+            future: Future returned by the OCR pool
+            page_num: Zero-based page number
+            
+        Returns:
+            Tuple of (page OCR text or None, text per embedded image)
+        """
+        wait_timeout = ocr_settings.ocr_timeout * 3 if ocr_settings.ocr_timeout else None
+        try:
+            return future.result(timeout=wait_timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            logger.warning(f"OCR timed out for page {page_num + 1}")
+        except Exception as e:
+            logger.warning(f"OCR failed for page {page_num + 1}: {e}")
+        return None, []
+    
     def _extract_image_text(self, file_content: bytes, filename: str) -> Tuple[str, Dict[str, Any]]:
         """Extract text from image file using OCR."""
         if not self.enable_ocr:
@@ -798,9 +972,7 @@ class DocumentExtractor:
         """Extract text from plain text file."""
         try:
             # Try different encodings
-            encodings = ['utf-8', 'utf-16', 'latin-1', 'cp1252']
-            
-            for encoding in encodings:
+            for encoding in self.TEXT_ENCODINGS:
                 try:
                     text = file_content.decode(encoding)
                     metadata = {
@@ -825,6 +997,114 @@ class DocumentExtractor:
         except Exception as e:
             logger.error(f"Text file extraction failed for {filename}: {e}")
             raise ValueError(f"Text file extraction failed: {str(e)}")
+    
+    def iter_text_file(
+        self,
+        file_path: Union[str, Path],
+        filename: str,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> Iterator[str]:
+        """
+        Yield the text of a text file on disk in segments split at blank lines.
+        
+        The file is decoded TEXT_BLOCK_SIZE bytes at a time, with the first
+        of TEXT_ENCODINGS that decodes the whole file (found in a first pass).
+        Segments end at paragraph breaks, so joined with "\n\n" they normalize
+        to the same text as the whole file; only the current paragraph and
+        block are held in memory.
+        
+        Args:
+            file_path: Path to the text file
+            filename: Original filename
+            metadata: Optional dict filled in with encoding, line_count and
+                char_count once the file has been read
+            
+        Yields:
+            Text segments in file order
+        """
+        metadata = metadata if metadata is not None else {}
+        try:
+            encoding = self._detect_text_encoding(file_path)
+            
+            line_count = 0
+            char_count = 0
+            last_char = ""
+            pending = ""
+            with open(file_path, 'rb') as f:
+                block = f.read(self.TEXT_BLOCK_SIZE)
+                if encoding is not None:
+                    decoder = self._text_decoder(encoding, block)
+                else:
+                    # If all encodings fail, use utf-8 with error handling
+                    decoder = self._text_decoder('utf-8', block, errors='replace')
+                
+                while True:
+                    text = decoder.decode(block, final=not block)
+                    if text:
+                        # Count lines as str.splitlines() does on the whole text
+                        line_count += len(text.splitlines())
+                        if last_char and last_char.splitlines() != ['']:
+                            # The block continues the previous block's last line
+                            line_count -= 1
+                        elif last_char == "\r" and text[0] == "\n":
+                            # A "\r\n" split across blocks is one line break
+                            line_count -= 1
+                        last_char = text[-1]
+                        char_count += len(text)
+                        
+                        # A break can only start in the trailing whitespace of
+                        # what was already scanned
+                        scan_from = len(pending.rstrip())
+                        pending += text
+                        last_break = None
+                        for last_break in self.PARAGRAPH_BREAK.finditer(pending, scan_from):
+                            pass
+                        if last_break is not None:
+                            yield pending[:last_break.start()]
+                            pending = pending[last_break.end():]
+                    
+                    if not block:
+                        break
+                    block = f.read(self.TEXT_BLOCK_SIZE)
+            
+            if pending:
+                yield pending
+            
+            metadata.update({
+                "encoding": encoding or "utf-8 (with errors replaced)",
+                "line_count": line_count,
+                "char_count": char_count
+            })
+            
+        except Exception as e:
+            logger.error(f"Text file extraction failed for {filename}: {e}")
+            raise ValueError(f"Text file extraction failed: {str(e)}")
+    
+    def _detect_text_encoding(self, file_path: Union[str, Path]) -> Optional[str]:
+        """Return the first of TEXT_ENCODINGS that decodes the whole file, if any."""
+        for encoding in self.TEXT_ENCODINGS:
+            try:
+                with open(file_path, 'rb') as f:
+                    block = f.read(self.TEXT_BLOCK_SIZE)
+                    decoder = self._text_decoder(encoding, block)
+                    while True:
+                        decoder.decode(block, final=not block)
+                        if not block:
+                            break
+                        block = f.read(self.TEXT_BLOCK_SIZE)
+                return encoding
+            except UnicodeDecodeError:
+                continue
+        return None
+    
+    @staticmethod
+    def _text_decoder(encoding: str, first_block: bytes, errors: str = 'strict') -> codecs.IncrementalDecoder:
+        """Return an incremental decoder that decodes like bytes.decode(encoding)."""
+        if encoding == 'utf-16' and not first_block.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+            # bytes.decode() reads UTF-16 without a BOM in native byte order,
+            # where the incremental decoder would refuse it
+            encoding = 'utf-16-le' if sys.byteorder == 'little' else 'utf-16-be'
+        return codecs.getincrementaldecoder(encoding)(errors)
 
 
 class SemanticTextChunker:
@@ -1151,7 +1431,8 @@ class SemanticTextChunker:
         
         Args:
             text: Text to chunk
-            document_metadata: Optional metadata to include in chunks
+            document_metadata: Optional metadata added to every chunk; keep it to
+                small chunk-level fields, since each chunk stores its own copy
             document_format: Document format hint (e.g., 'markdown', 'plain', 'code')
             
         Returns:
@@ -1215,6 +1496,87 @@ class SemanticTextChunker:
         
         return text_chunks
     
+    def chunk_segments(
+        self,
+        segments: Iterable[str],
+        document_metadata: Optional[Dict[str, Any]] = None,
+        document_format: Optional[str] = None,
+        separator: str = "\n",
+        window_chunks: int = 8,
+        track_segments: bool = False
+    ) -> Iterator[TextChunk]:
+        """
+        Chunk text that arrives in segments (e.g. PDF pages) without joining it.
+        
+        Segments are buffered until about window_chunks chunks' worth of text
+        is available. The buffer is chunked, every chunk but the last is
+        yielded, and the last is carried forward so chunks can still span
+        segment boundaries. Memory stays bounded by the window plus one segment.
+        
+        Args:
+            segments: Text segments in document order
+            document_metadata: Optional metadata added to every chunk
+            document_format: Document format hint (detected from the first window if None)
+            separator: Separator the segments are joined with in the document
+            window_chunks: Buffered text, in multiples of chunk_size, before chunking
+            track_segments: Record the 0-based positions of the first and last
+                non-empty segment each chunk overlaps as segment_start and
+                segment_end in its metadata
+            
+        Yields:
+            TextChunk objects with document-wide indexes and offsets
+        """
+        window = self.chunk_size * window_chunks
+        buffer = ""
+        buffer_offset = 0
+        chunk_index = 0
+        # Document-wide offsets at which each non-empty segment starts
+        segment_starts: List[int] = []
+        document_length = 0
+        
+        def emit(chunk: TextChunk) -> TextChunk:
+            nonlocal chunk_index
+            chunk.chunk_index = chunk_index
+            chunk.start_char += buffer_offset
+            chunk.end_char += buffer_offset
+            chunk_index += 1
+            if track_segments:
+                last_char = max(chunk.start_char, chunk.end_char - 1)
+                chunk.metadata["segment_start"] = max(0, bisect_right(segment_starts, chunk.start_char) - 1)
+                chunk.metadata["segment_end"] = max(0, bisect_right(segment_starts, last_char) - 1)
+            return chunk
+        
+        for segment in segments:
+            # Normalizing segments one by one keeps the joined buffer normalized,
+            # so chunk_text offsets are document offsets shifted by buffer_offset
+            segment = self._normalize_text(segment)
+            if not segment:
+                continue
+            segment_starts.append(document_length + len(separator) if segment_starts else 0)
+            document_length = segment_starts[-1] + len(segment)
+            
+            buffer = f"{buffer}{separator}{segment}" if buffer else segment
+            if len(buffer) < window:
+                continue
+            
+            if document_format is None:
+                document_format = self._detect_document_format(buffer)
+            
+            chunks = self.chunk_text(buffer, document_metadata, document_format)
+            if len(chunks) < 2:
+                continue
+            
+            tail_start = chunks[-1].start_char
+            for chunk in chunks[:-1]:
+                yield emit(chunk)
+            
+            buffer = buffer[tail_start:]
+            buffer_offset += tail_start
+        
+        if buffer.strip():
+            for chunk in self.chunk_text(buffer, document_metadata, document_format):
+                yield emit(chunk)
+    
     def _detect_document_format(self, text: str) -> str:
         """
         Detect document format based on content patterns.
@@ -2173,14 +2535,15 @@ class DocumentProcessor:
             **(additional_metadata or {})
         }
         
-        # Step 4: Chunk text with optimization
+        # Step 4: Chunk text with optimization. Document metadata is returned
+        # once, never copied into every chunk.
         should_optimize = optimize_chunking if optimize_chunking is not None else self.auto_optimize
         
         if hasattr(self.chunker, 'chunk_with_adaptive_optimization') and should_optimize:
             # Use adaptive optimization
             document_format = self._detect_document_format_from_file(filename, extracted_text)
             chunks, chunking_metrics, optimization_report = self.chunker.chunk_with_adaptive_optimization(
-                extracted_text, document_metadata, document_format, auto_optimize=True
+                extracted_text, None, document_format, auto_optimize=True
             )
             
             # Add optimization results to metadata
@@ -2193,7 +2556,7 @@ class DocumentProcessor:
         elif hasattr(self.chunker, '_calculate_chunking_metrics'):
             # Use semantic chunking without optimization
             document_format = self._detect_document_format_from_file(filename, extracted_text)
-            chunks = self.chunker.chunk_text(extracted_text, document_metadata, document_format)
+            chunks = self.chunker.chunk_text(extracted_text, None, document_format)
             
             # Calculate basic metrics
             import time
@@ -2207,7 +2570,7 @@ class DocumentProcessor:
             })
         else:
             # Use legacy chunking
-            chunks = self.chunker.chunk_text(extracted_text, document_metadata)
+            chunks = self.chunker.chunk_text(extracted_text)
             
             # Add basic metrics for legacy chunking
             document_metadata.update({
@@ -2229,6 +2592,113 @@ class DocumentProcessor:
         
         return chunks, document_metadata
     
+    def stream_document_chunks(
+        self,
+        file_path: Union[str, Path],
+        filename: str,
+        document_id: str,
+        additional_metadata: Optional[Dict[str, Any]] = None
+    ) -> Tuple[Iterator[TextChunk], Dict[str, Any]]:
+        """
+        Process a stored document into chunks incrementally, without the file
+        or its full text in memory.
+        
+        PDF pages are extracted one at a time and text files are read in
+        blocks, and both are fed to the chunker as they arrive; images are
+        OCR'd whole. Chunking optimization and per-document chunk totals need
+        the whole text and are skipped. Chunks carry only chunk-local metadata;
+        PDF chunks get the page_start and page_end of the pages they span.
+        
+        Args:
+            file_path: Path to the stored file
+            filename: Original filename
+            document_id: Unique document identifier
+            additional_metadata: Additional metadata to include
+            
+        Returns:
+            Tuple of (chunk iterator, document_metadata). text_length and
+            extraction_metadata are filled in once the iterator is exhausted.
+        """
+        file_path = Path(file_path)
+        
+        is_valid, mime_type, error_msg = self.extractor.validate_stored_file(file_path, filename)
+        if not is_valid:
+            raise ValueError(f"File validation failed: {error_msg}")
+        
+        document_metadata = {
+            "document_id": document_id,
+            "filename": filename,
+            "mime_type": mime_type,
+            "file_size": os.path.getsize(file_path),
+            **(additional_metadata or {})
+        }
+        
+        def chunks() -> Iterator[TextChunk]:
+            text_length = 0
+            # Page number of each non-empty page, in the order fed to the chunker
+            page_numbers: List[int] = []
+            
+            separator = "\n"
+            
+            if mime_type == 'application/pdf':
+                stats = PdfExtractionStats()
+                
+                def page_texts() -> Iterator[str]:
+                    nonlocal text_length
+                    for page_text, page_meta in self.extractor.iter_pdf_pages(file_path, filename, stats):
+                        text_length = page_meta["char_end"]
+                        page_numbers.append(page_meta["page_number"])
+                        yield page_text
+                
+                segments = page_texts()
+            elif mime_type in self.extractor.TEXT_MIME_TYPES:
+                extraction_metadata = {}
+                segments = self.extractor.iter_text_file(file_path, filename, extraction_metadata)
+                # Text file segments are split at paragraph breaks
+                separator = "\n\n"
+            else:
+                # OCR needs the whole image decoded anyway
+                extracted_text, extraction_metadata = self.extractor.extract_text(
+                    file_path.read_bytes(), mime_type, filename
+                )
+                text_length = len(extracted_text)
+                segments = iter([extracted_text])
+            
+            # Plain text formats are detected from content by the chunker
+            document_format = None
+            if Path(filename).suffix.lower() not in ['.txt', '.rtf']:
+                document_format = self._detect_document_format_from_file(filename, "")
+            
+            produced = 0
+            for chunk in self.chunker.chunk_segments(
+                segments,
+                document_format=document_format,
+                separator=separator,
+                track_segments=mime_type == 'application/pdf'
+            ):
+                first_segment = chunk.metadata.pop("segment_start", None)
+                last_segment = chunk.metadata.pop("segment_end", None)
+                if page_numbers and first_segment is not None:
+                    chunk.metadata["page_start"] = page_numbers[first_segment]
+                    chunk.metadata["page_end"] = page_numbers[last_segment]
+                produced += 1
+                yield chunk
+            
+            if mime_type == 'application/pdf':
+                extraction_metadata = stats.to_metadata(self.extractor.enable_ocr)
+            elif mime_type in self.extractor.TEXT_MIME_TYPES:
+                text_length = extraction_metadata["char_count"]
+            if not produced:
+                raise ValueError("No text content found in document")
+            
+            document_metadata.update({
+                "text_length": text_length,
+                "extraction_metadata": extraction_metadata
+            })
+            logger.info(f"Streamed document {filename}: {produced} chunks created")
+        
+        return chunks(), document_metadata
+    
     def process_document_with_custom_config(
         self,
         file_content: bytes,
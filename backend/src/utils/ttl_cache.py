@@ -0,0 +1,111 @@
+"""
+Thread-safe in-process TTL cache with hit/miss counters.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+
+class TTLCache:
+    """Bounded mapping whose entries expire a fixed time after being set."""
+
+    def __init__(self, ttl: float, max_entries: int = 10000):
+        """
+        Initialize the cache.
+
+        Args:
+            ttl: Seconds an entry stays valid
+            max_entries: Entries kept before the oldest are evicted
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        # key -> (value, expiry); oldest insertion first
+        self._entries: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """
+        Look up an entry.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Tuple of (found, value); cached values may themselves be None
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > time.monotonic():
+                self.hits += 1
+                return True, entry[0]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return False, None
+
+    def set(self, key: Hashable, value: Any):
+        """
+        Store an entry, evicting the oldest ones if the cache is full.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (value, time.monotonic() + self.ttl)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable):
+        """Drop one entry."""
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self.invalidations += 1
+
+    def invalidate_where(self, predicate: Callable[[Hashable], bool]) -> int:
+        """
+        Drop every entry whose key matches a predicate.
+
+        Args:
+            predicate: Function of the key
+
+        Returns:
+            Number of entries dropped
+        """
+        with self._lock:
+            keys = [key for key in self._entries if predicate(key)]
+            for key in keys:
+                del self._entries[key]
+            self.invalidations += len(keys)
+            return len(keys)
+
+    def clear(self):
+        """Drop all entries."""
+        with self._lock:
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache counters.
+
+        Returns:
+            Dictionary with hits, misses, hit rate, invalidations and size
+        """
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "invalidations": self.invalidations,
+            "entries": len(self._entries),
+            "ttl_seconds": self.ttl
+        }